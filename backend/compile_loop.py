@@ -36,6 +36,9 @@ def _find_bin(name: str, fallback: str) -> str:
 PDFLATEX_BIN = _find_bin("pdflatex", PDFLATEX_BIN)
 PDFTOTEXT_BIN = _find_bin("pdftotext", PDFTOTEXT_BIN)
 
+# Upper bound for one pdflatex run; a job deadline can shorten it further.
+PDFLATEX_TIMEOUT_SECONDS = 120
+
 
 class CompileResult:
     def __init__(self):
@@ -246,7 +249,12 @@ REPAIR_HANDLERS = {
 }
 
 
-def compile_pdf(tex_content: str, work_dir: str, name: str = "tailored_resume") -> CompileResult:
+def compile_pdf(
+    tex_content: str,
+    work_dir: str,
+    name: str = "tailored_resume",
+    timeout: float = PDFLATEX_TIMEOUT_SECONDS,
+) -> CompileResult:
     """Single pdflatex compile attempt. Doesn't retry — that's the caller's job."""
     result = CompileResult()
     t0 = time.time()
@@ -276,10 +284,11 @@ def compile_pdf(tex_content: str, work_dir: str, name: str = "tailored_resume")
         proc = subprocess.run(
             [PDFLATEX_BIN, "-no-shell-escape", "-interaction=nonstopmode",
              "-halt-on-error=false", f"{name}.tex"],
-            capture_output=True, cwd=work_dir, timeout=120, env=restricted_env,
+            capture_output=True, cwd=work_dir, timeout=timeout, env=restricted_env,
         )
     except subprocess.TimeoutExpired:
-        result.errors.append({"type": "timeout", "line": None, "message": "pdflatex timed out after 120s"})
+        result.errors.append({"type": "timeout", "line": None,
+                              "message": f"pdflatex timed out after {timeout:.0f}s"})
         result.latency_ms = int((time.time() - t0) * 1000)
         return result
     except FileNotFoundError as e:
@@ -420,6 +429,24 @@ def _trim_to_fit_one_page(tex: str) -> tuple[str, str]:
     return tex, ""  # nothing more to trim
 
 
+def _accept_compiled(result: CompileResult, target_max_pages: int, ats_expected: dict | None) -> CompileResult:
+    """Finish a compiled result: over-page warning, ATS extractability check."""
+    if result.page_count and result.page_count > target_max_pages:
+        result.warnings.append(f"PDF has {result.page_count} pages (target ≤ {target_max_pages}) — could not trim further")
+    # Validate ATS extractability
+    if ats_expected:
+        result.ats_validation = validate_ats_extractability(result.pdf_path, ats_expected)
+        result.extracted_text = pdftotext(result.pdf_path)
+        if not result.ats_validation.get("overall_ok"):
+            result.warnings.append("ATS extractability check failed: " + json.dumps(result.ats_validation))
+            _clog.warning(f"ATS check failed — {result.ats_validation}")
+        else:
+            _clog.info(f"ATS check passed — extracted_len={result.ats_validation.get('extracted_text_len')}")
+    _clog.info(f"compile_with_retry DONE — success=True attempts={result.attempts} "
+               f"pages={result.page_count} repairs={result.repair_actions}")
+    return result
+
+
 def compile_with_retry(
     tex_content: str,
     work_dir: str,
@@ -428,20 +455,40 @@ def compile_with_retry(
     max_attempts: int = 5,
     target_max_pages: int = 1,
     ats_expected: dict | None = None,
+    timeout_s: float | None = None,
 ) -> CompileResult:
     """Compile with auto-repair retry + page-trimming. Returns final CompileResult.
 
     target_max_pages: desired max pages. If exceeded, trim and recompile.
+    timeout_s: wall-clock budget for the whole job (all attempts); each pdflatex
+    run is capped at what remains, and no new attempt starts once it is spent.
     """
     current_tex = tex_content
     final_result = None
+    deadline = time.monotonic() + timeout_s if timeout_s else None
 
     _clog.info(f"compile_with_retry start — max_attempts={max_attempts} "
                f"target_pages={target_max_pages} tex_chars={len(tex_content)}")
 
     for attempt in range(1, max_attempts + 1):
         _clog.debug(f"Attempt {attempt}/{max_attempts} — tex_chars={len(current_tex)}")
-        result = compile_pdf(current_tex, work_dir, name=name)
+        run_timeout = PDFLATEX_TIMEOUT_SECONDS
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                if final_result is not None and final_result.success:
+                    # Out of time mid-trim: keep the last PDF that compiled.
+                    _clog.warning(f"compile_with_retry out of time before attempt {attempt} — "
+                                  f"accepting {final_result.page_count} pages")
+                    return _accept_compiled(final_result, target_max_pages, ats_expected)
+                if final_result is None:
+                    final_result = CompileResult()
+                final_result.errors.append({"type": "timeout", "line": None,
+                                            "message": f"compile job exceeded {timeout_s:.0f}s"})
+                _clog.error(f"compile_with_retry TIMED OUT before attempt {attempt}")
+                break
+            run_timeout = min(run_timeout, remaining)
+        result = compile_pdf(current_tex, work_dir, name=name, timeout=run_timeout)
         result.attempts = attempt
         final_result = result
 
@@ -458,20 +505,8 @@ def compile_with_retry(
                         continue  # recompile
                     else:
                         _clog.warning(f"Trim returned no change — accepting {result.page_count} pages")
-                # Still over budget — accept with warning
-                result.warnings.append(f"PDF has {result.page_count} pages (target ≤ {target_max_pages}) — could not trim further")
-            # Validate ATS extractability
-            if ats_expected:
-                result.ats_validation = validate_ats_extractability(result.pdf_path, ats_expected)
-                result.extracted_text = pdftotext(result.pdf_path)
-                if not result.ats_validation.get("overall_ok"):
-                    result.warnings.append("ATS extractability check failed: " + json.dumps(result.ats_validation))
-                    _clog.warning(f"ATS check failed — {result.ats_validation}")
-                else:
-                    _clog.info(f"ATS check passed — extracted_len={result.ats_validation.get('extracted_text_len')}")
-            _clog.info(f"compile_with_retry DONE — success=True attempts={attempt} "
-                       f"pages={result.page_count} repairs={result.repair_actions}")
-            return result
+            # Within budget, or still over it and accepted with a warning
+            return _accept_compiled(result, target_max_pages, ats_expected)
 
         # Compile failed — log errors and try LaTeX repair
         error_types = [e.get("type") for e in result.errors]
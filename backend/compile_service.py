@@ -0,0 +1,148 @@
+"""
+Compile Service — bounded pool of isolated pdflatex jobs.
+
+Every compile used to write tailored_resume.* into the backend directory, so
+/generate-pdf and queue approvals serialized behind one global lock. Here each
+job gets its own temporary work directory, and jobs run on a fixed pool of
+worker threads (each one drives a single pdflatex subprocess at a time), sized
+to the CPU count by default:
+
+  - queueing: submissions beyond the worker count wait in the pool's queue;
+    past `max_queue` waiting jobs, `submit` raises CompileQueueFull instead of
+    letting latency grow without bound.
+  - per-job timeout: the whole retry/trim loop gets one wall-clock budget
+    (compile_loop.compile_with_retry(timeout_s=...)).
+  - metrics: `stats()` reports queue depth, running jobs, completions,
+    failures, rejections and mean queue wait.
+
+Results carry the PDF as bytes (the work dir is removed when the job ends).
+`publish_to` optionally copies a successful PDF to a stable path with an
+atomic rename, so readers never see a half-written file.
+
+Env knobs: SMARTAPPLY_PDF_WORKERS, SMARTAPPLY_PDF_QUEUE, SMARTAPPLY_PDF_JOB_TIMEOUT.
+"""
+import asyncio
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+import compile_loop
+from logger import get_logger
+
+_slog = get_logger("compile_service")
+
+PDF_WORKERS = int(os.getenv("SMARTAPPLY_PDF_WORKERS", "0")) or (os.cpu_count() or 2)
+PDF_QUEUE_LIMIT = int(os.getenv("SMARTAPPLY_PDF_QUEUE", "0")) or PDF_WORKERS * 8
+PDF_JOB_TIMEOUT_SECONDS = float(os.getenv("SMARTAPPLY_PDF_JOB_TIMEOUT", "300"))
+
+
+class CompileQueueFull(RuntimeError):
+    """Raised by submit() when `max_queue` jobs are already waiting."""
+
+
+def _publish(pdf_bytes: bytes, dest: str) -> None:
+    """Write `pdf_bytes` to `dest` via temp file + os.replace (atomic on POSIX)."""
+    fd, tmp = tempfile.mkstemp(prefix=".publish-", suffix=".pdf", dir=os.path.dirname(dest) or ".")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(pdf_bytes)
+        os.replace(tmp, dest)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+class CompileService:
+    def __init__(self, workers: int = PDF_WORKERS, max_queue: int = PDF_QUEUE_LIMIT,
+                 job_timeout: float = PDF_JOB_TIMEOUT_SECONDS):
+        self.workers = max(1, int(workers))
+        self.max_queue = max(0, int(max_queue))
+        self.job_timeout = job_timeout
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pdflatex")
+        self._lock = threading.Lock()
+        self._counters = {"queued": 0, "running": 0, "completed": 0, "failed": 0,
+                          "timed_out": 0, "rejected": 0}
+        self._wait_ms_total = 0.0
+        self._started_jobs = 0
+
+    def submit(self, tex_content: str, *, publish_to: str | None = None,
+               **compile_kwargs: Any) -> Future:
+        """Queue one compile; returns a Future[CompileResult]. Extra kwargs go to
+        compile_loop.compile_with_retry (name, max_attempts, target_max_pages, ...)."""
+        with self._lock:
+            if self._counters["queued"] >= self.max_queue:
+                self._counters["rejected"] += 1
+                raise CompileQueueFull(
+                    f"{self._counters['queued']} compile jobs already queued (limit {self.max_queue})"
+                )
+            self._counters["queued"] += 1
+        return self._executor.submit(self._run, tex_content, publish_to, time.monotonic(), compile_kwargs)
+
+    async def compile(self, tex_content: str, **kwargs: Any):
+        """Await a compile from async code without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(tex_content, **kwargs))
+
+    def _run(self, tex_content: str, publish_to: str | None, enqueued: float,
+             compile_kwargs: dict[str, Any]):
+        wait_ms = (time.monotonic() - enqueued) * 1000
+        with self._lock:
+            self._counters["queued"] -= 1
+            self._counters["running"] += 1
+            self._wait_ms_total += wait_ms
+            self._started_jobs += 1
+        work_dir = tempfile.mkdtemp(prefix="smartapply-pdf-")
+        result = None
+        try:
+            compile_kwargs.setdefault("timeout_s", self.job_timeout)
+            result = compile_loop.compile_with_retry(tex_content, work_dir, **compile_kwargs)
+            if result is not None and result.success and result.pdf_bytes:
+                result.pdf_path = None  # the work dir is about to go away
+                if publish_to:
+                    _publish(result.pdf_bytes, publish_to)
+                    result.pdf_path = publish_to
+            return result
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            ok = bool(result is not None and result.success)
+            timed_out = bool(result is not None and any(
+                e.get("type") == "timeout" for e in result.errors))
+            with self._lock:
+                self._counters["running"] -= 1
+                self._counters["completed" if ok else "failed"] += 1
+                self._counters["timed_out"] += int(timed_out)
+            _slog.debug(f"compile job done — ok={ok} wait_ms={wait_ms:.0f}")
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            out: dict[str, Any] = dict(self._counters)
+            started = self._started_jobs
+            wait_total = self._wait_ms_total
+        out["queue_depth"] = out.pop("queued")
+        out["workers"] = self.workers
+        out["max_queue"] = self.max_queue
+        out["avg_wait_ms"] = round(wait_total / started, 1) if started else 0.0
+        return out
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+
+_service: CompileService | None = None
+_service_lock = threading.Lock()
+
+
+def get_service() -> CompileService:
+    """The process-wide compile pool (created on first use)."""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = CompileService()
+                _slog.info(f"compile pool ready — workers={_service.workers} "
+                           f"max_queue={_service.max_queue} job_timeout={_service.job_timeout}s")
+    return _service
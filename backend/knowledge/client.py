@@ -179,6 +179,24 @@ def search(pid: str, query_text: str, k: int = 5, kind_filter: str | None = None
     return data if isinstance(data, list) else []
 
 
+def search_many(
+    pid: str, queries: list[str], k: int = 5, kind_filter: str | None = None
+) -> list[list[dict[str, Any]]]:
+    """Batched :func:`search` — one result list per query, in order."""
+    if not _use_http():
+        return semantic.search_many(pid, queries, k, kind_filter)
+    data = _request(
+        "POST",
+        "/search/many",
+        pid,
+        params={"pid": pid},
+        json={"queries": list(queries), "k": int(k), "kind_filter": kind_filter},
+    )
+    if not isinstance(data, list) or len(data) != len(queries):
+        return [[] for _ in queries]
+    return [hits if isinstance(hits, list) else [] for hits in data]
+
+
 def create_stub(pid: str, name: str) -> None:
     """Create a new profile stub with parity to in-process behavior."""
     save_profile(
@@ -0,0 +1,197 @@
+"""Content-addressed embedding cache (disk + in-process LRU).
+
+``embeddings.embed`` used to run the sentence-transformer on every call, so the
+same JD, evidence item, or query was re-embedded by features.ensure_job_features,
+candidate_features, semantic.embed_profile, every semantic.search, and the
+numpy fallback (which re-embeds the whole corpus per query). Vectors are now
+keyed by (model name, sha256 of whitespace-normalized text) and persisted as
+compact float32 (or float16, via SMARTAPPLY_EMBED_CACHE_DTYPE) BLOBs in
+embed_cache.db, with an LRU in front. Identical text costs one model call for
+the lifetime of the install.
+
+Whitespace-normalized text is also what gets embedded on a miss, so two texts
+that share a key always share a vector. SMARTAPPLY_EMBED_CACHE=0 disables the
+cache (every call goes straight to the model).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Sequence
+
+import numpy as np
+
+try:
+    from backend import sqlite_pool
+except ImportError:  # pragma: no cover - backend/ on sys.path
+    import sqlite_pool  # type: ignore
+
+CACHE_DB_PATH = os.getenv(
+    "SMARTAPPLY_EMBED_CACHE_DB", os.path.join(os.path.dirname(__file__), "embed_cache.db")
+)
+CACHE_ENABLED = os.getenv("SMARTAPPLY_EMBED_CACHE", "1").strip().lower() not in ("0", "false", "no", "off")
+CACHE_DTYPE = "float16" if os.getenv("SMARTAPPLY_EMBED_CACHE_DTYPE", "").strip() == "float16" else "float32"
+LRU_SIZE = int(os.getenv("SMARTAPPLY_EMBED_LRU", "8192"))
+# SQLite caps host parameters per statement; batch lookups chunk below it.
+_LOOKUP_CHUNK = 500
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(str(text or "").split())
+
+
+def text_key(text: str) -> str:
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS embeddings (
+            model TEXT NOT NULL,
+            text_hash TEXT NOT NULL,
+            dim INTEGER NOT NULL,
+            dtype TEXT NOT NULL,
+            vector BLOB NOT NULL,
+            created_at TEXT NOT NULL,
+            PRIMARY KEY (model, text_hash)
+        ) WITHOUT ROWID
+        """
+    )
+
+
+_SCHEMA = sqlite_pool.Schema("embed_cache", 1, _migrate)
+
+
+class EmbeddingCache:
+    """Batch get-or-compute over (model, text hash) → unit vector."""
+
+    def __init__(
+        self,
+        model: str,
+        db_path: str | Path = CACHE_DB_PATH,
+        *,
+        lru_size: int = LRU_SIZE,
+        dtype: str = CACHE_DTYPE,
+    ) -> None:
+        self.model = model
+        self.db_path = str(db_path)
+        self.lru_size = max(0, int(lru_size))
+        self.dtype = np.dtype(dtype)
+        self._lru: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+    # ── LRU ───────────────────────────────────────────────────────────
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        if not self.lru_size:
+            return
+        with self._lock:
+            self._lru[key] = vector
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.lru_size:
+                self._lru.popitem(last=False)
+
+    def _recall(self, key: str) -> np.ndarray | None:
+        with self._lock:
+            vector = self._lru.get(key)
+            if vector is not None:
+                self._lru.move_to_end(key)
+            return vector
+
+    def _count(self, name: str, n: int) -> None:
+        if n:
+            with self._lock:
+                self._counters[name] += n
+
+    # ── batch API ─────────────────────────────────────────────────────
+    def lookup_many(self, keys: Sequence[str]) -> dict[str, np.ndarray]:
+        """Cached vectors for whichever ``keys`` are known (LRU first, then disk)."""
+        found: dict[str, np.ndarray] = {}
+        pending: list[str] = []
+        for key in dict.fromkeys(keys):
+            vector = self._recall(key)
+            if vector is not None:
+                found[key] = vector
+            else:
+                pending.append(key)
+        self._count("memory_hits", len(found))
+        if not pending:
+            return found
+        disk = 0
+        with sqlite_pool.connection(self.db_path, _SCHEMA) as conn:
+            for i in range(0, len(pending), _LOOKUP_CHUNK):
+                chunk = pending[i : i + _LOOKUP_CHUNK]
+                placeholders = ", ".join("?" for _ in chunk)
+                rows = conn.execute(
+                    f"SELECT text_hash, dtype, vector FROM embeddings "
+                    f"WHERE model = ? AND text_hash IN ({placeholders})",
+                    (self.model, *chunk),
+                ).fetchall()
+                for row in rows:
+                    vector = np.frombuffer(row["vector"], dtype=row["dtype"]).astype(np.float32)
+                    found[row["text_hash"]] = vector
+                    self._remember(row["text_hash"], vector)
+                    disk += 1
+        self._count("disk_hits", disk)
+        return found
+
+    def fill_many(self, items: dict[str, Sequence[float]]) -> None:
+        """Persist freshly computed vectors (and warm the LRU)."""
+        if not items:
+            return
+        now = datetime.now(timezone.utc).isoformat()
+        rows = []
+        for key, values in items.items():
+            vector = np.asarray(values, dtype=np.float32)
+            self._remember(key, vector)
+            rows.append(
+                (self.model, key, int(vector.size), self.dtype.name,
+                 vector.astype(self.dtype).tobytes(), now)
+            )
+        with sqlite_pool.connection(self.db_path, _SCHEMA) as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings "
+                "(model, text_hash, dim, dtype, vector, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def embed(
+        self, texts: Sequence[str], encode: Callable[[list[str]], Sequence[Sequence[float]]]
+    ) -> list[list[float]]:
+        """Vectors for ``texts`` in order; only unseen normalized texts reach
+        ``encode`` (once each, in one batch)."""
+        normalized = [normalize_text(t) for t in texts]
+        keys = [hashlib.sha256(t.encode("utf-8")).hexdigest() for t in normalized]
+        found = self.lookup_many(keys)
+        missing: dict[str, str] = {}
+        for key, text in zip(keys, normalized):
+            if key not in found and key not in missing:
+                missing[key] = text
+        self._count("misses", len(missing))
+        if missing:
+            vectors = encode(list(missing.values()))
+            if len(vectors) != len(missing):
+                raise ValueError(
+                    f"encoder returned {len(vectors)} vectors for {len(missing)} texts"
+                )
+            computed = dict(zip(missing, vectors))
+            self.fill_many(computed)
+            for key, values in computed.items():
+                found[key] = np.asarray(values, dtype=np.float32)
+        return [found[key].tolist() for key in keys]
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            counters = dict(self._counters)
+            counters["lru_entries"] = len(self._lru)
+        hits = counters["memory_hits"] + counters["disk_hits"]
+        lookups = hits + counters["misses"]
+        counters["hit_rate"] = round(hits / lookups, 4) if lookups else 0.0
+        return counters
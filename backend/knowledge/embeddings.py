@@ -7,9 +7,12 @@ from typing import Iterable
 
 from sentence_transformers import SentenceTransformer
 
+from .embed_cache import CACHE_ENABLED, EmbeddingCache
+
 EMBEDDING_MODEL_NAME = os.getenv("SMARTAPPLY_EMBED_MODEL", "BAAI/bge-small-en-v1.5")
 
 _MODEL: SentenceTransformer | None = None
+_CACHE: EmbeddingCache | None = None
 
 
 def _get_model() -> SentenceTransformer:
@@ -19,11 +22,14 @@ def _get_model() -> SentenceTransformer:
     return _MODEL
 
 
-def embed(texts: Iterable[str]) -> list[list[float]]:
-    """Embed texts using the configured local sentence-transformers model."""
-    text_list = [str(t or "") for t in texts]
-    if not text_list:
-        return []
+def _get_cache() -> EmbeddingCache:
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = EmbeddingCache(EMBEDDING_MODEL_NAME)
+    return _CACHE
+
+
+def _encode(text_list: list[str]) -> list[list[float]]:
     model = _get_model()
     vectors = model.encode(
         text_list,
@@ -32,3 +38,22 @@ def embed(texts: Iterable[str]) -> list[list[float]]:
         show_progress_bar=False,
     )
     return vectors.tolist()
+
+
+def embed(texts: Iterable[str]) -> list[list[float]]:
+    """Embed texts using the configured local sentence-transformers model.
+
+    Served through the content-addressed cache (embed_cache.py): only texts
+    never embedded before by this model reach the model.
+    """
+    text_list = [str(t or "") for t in texts]
+    if not text_list:
+        return []
+    if not CACHE_ENABLED:
+        return _encode(text_list)
+    return _get_cache().embed(text_list, _encode)
+
+
+def cache_stats() -> dict[str, float]:
+    """Hit/miss counters for the embedding cache (this process)."""
+    return _get_cache().stats()
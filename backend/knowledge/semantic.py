@@ -14,6 +14,11 @@ try:
 except ImportError:  # pragma: no cover - environment dependent
     sqlite_vec = None
 
+try:
+    from backend import sqlite_pool
+except ImportError:  # pragma: no cover - backend/ on sys.path
+    import sqlite_pool  # type: ignore
+
 from . import store
 from .embeddings import embed
 
@@ -70,6 +75,8 @@ def _migrate_evidence_schema(conn: sqlite3.Connection) -> None:
 
 
 def ensure_semantic_schema(conn: sqlite3.Connection) -> None:
+    """Evidence + vec0 tables on knowledge.db. Loads sqlite-vec into ``conn``, so
+    callers on pooled connections run it via sqlite_pool.ensure_once."""
     _migrate_evidence_schema(conn)
     conn.execute(
         """
@@ -241,7 +248,7 @@ def _text_hash(text: str) -> str:
 def embed_profile(pid: str) -> int:
     pid = str(pid or "default")
     with store._connect() as conn:
-        ensure_semantic_schema(conn)
+        sqlite_pool.ensure_once(conn, "semantic", ensure_semantic_schema)
         corpus = _build_corpus(conn, pid)
         if not SQLITE_VEC_AVAILABLE:
             return len(corpus)
@@ -308,77 +315,113 @@ def embed_profile(pid: str) -> int:
         ).fetchone()["c"]
 
 
-def _fallback_search(pid: str, query_text: str, k: int, kind_filter: str | None) -> list[dict[str, Any]]:
-    with store._connect() as conn:
-        corpus = _build_corpus(conn, pid)
-    if kind_filter:
-        corpus = [item for item in corpus if item[0] == kind_filter]
-    if not corpus:
-        return []
-
-    texts = [text for _, _, text in corpus]
-    vectors = np.array(embed(texts), dtype=float)
-    query_vector = np.array(embed([query_text])[0], dtype=float)
-    scores = vectors @ query_vector
-    top_indices = np.argsort(scores)[::-1][:k]
-    return [
-        {
-            "evidence_id": int(i),
-            "kind": corpus[int(i)][0],
-            "ref_id": corpus[int(i)][1],
-            "text": corpus[int(i)][2],
-            # Raw cosine of unit-norm vectors, clamped to match the vec path.
-            "score": max(0.0, min(1.0, float(scores[int(i)]))),
-            "evidence_ref": f"{corpus[int(i)][0]}:{corpus[int(i)][1]}",
-        }
-        for i in top_indices
-    ]
-
-
-def search(pid: str, query_text: str, k: int = 10, kind_filter: str | None = None) -> list[dict[str, Any]]:
-    query_text = _normalize_text(query_text)
-    if not query_text:
-        return []
-
+def _search_args(pid: str, k: int, kind_filter: str | None) -> tuple[str, int, str | None]:
     pid = str(pid or "default")
     k = max(1, min(int(k or 10), 100))
     kind_filter = _normalize_text(kind_filter) or None
     if kind_filter and kind_filter not in ALLOWED_KINDS:
         raise ValueError(f"Unsupported kind_filter: {kind_filter}")
-    if not SQLITE_VEC_AVAILABLE:
-        return _fallback_search(pid=pid, query_text=query_text, k=k, kind_filter=kind_filter)
+    return pid, k, kind_filter
+
 
+def _fallback_search_many(
+    pid: str, query_vectors: np.ndarray, k: int, kind_filter: str | None
+) -> list[list[dict[str, Any]]]:
+    """Numpy path: embed the corpus once and score every query in one matmul."""
     with store._connect() as conn:
-        ensure_semantic_schema(conn)
-        query_vector = sqlite_vec.serialize_float32(embed([query_text])[0])
-        sql = """
-            SELECT
-                e.id AS evidence_id,
-                e.kind AS kind,
-                e.ref_id AS ref_id,
-                e.text AS text,
-                v.distance AS score
-            FROM vec_evidence AS v
-            JOIN evidence AS e ON e.id = v.rowid
-            WHERE v.embedding MATCH ? AND v.k = ? AND e.profile_id = ?
-        """
-        params: list[Any] = [query_vector, k, pid]
-        if kind_filter:
-            sql += " AND e.kind = ?"
-            params.append(kind_filter)
-        sql += " ORDER BY v.distance ASC"
-
-        rows = conn.execute(sql, tuple(params)).fetchall()
-        return [
+        corpus = _build_corpus(conn, pid)
+    if kind_filter:
+        corpus = [item for item in corpus if item[0] == kind_filter]
+    if not corpus:
+        return [[] for _ in range(len(query_vectors))]
+
+    vectors = np.array(embed([text for _, _, text in corpus]), dtype=float)
+    scores = vectors @ query_vectors.T          # corpus × queries
+    results: list[list[dict[str, Any]]] = []
+    for col in range(scores.shape[1]):
+        column = scores[:, col]
+        top_indices = np.argsort(column)[::-1][:k]
+        results.append([
             {
-                "evidence_id": row["evidence_id"],
-                "kind": row["kind"],
-                "ref_id": row["ref_id"],
-                "text": row["text"],
-                # vec0 returns L2 distance; embeddings are unit-norm, so
-                # cosine = 1 - d^2/2 — same scale as the numpy fallback path.
-                "score": max(0.0, min(1.0, 1.0 - (float(row["score"]) ** 2) / 2.0)),
-                "evidence_ref": f'{row["kind"]}:{row["ref_id"]}',
+                "evidence_id": int(i),
+                "kind": corpus[int(i)][0],
+                "ref_id": corpus[int(i)][1],
+                "text": corpus[int(i)][2],
+                # Raw cosine of unit-norm vectors, clamped to match the vec path.
+                "score": max(0.0, min(1.0, float(column[int(i)]))),
+                "evidence_ref": f"{corpus[int(i)][0]}:{corpus[int(i)][1]}",
             }
-            for row in rows
-        ]
+            for i in top_indices
+        ])
+    return results
+
+
+def _vec_search_many(
+    pid: str, query_vectors: np.ndarray, k: int, kind_filter: str | None
+) -> list[list[dict[str, Any]]]:
+    """sqlite-vec path: one pooled connection, one k-NN query per vector."""
+    sql = """
+        SELECT
+            e.id AS evidence_id,
+            e.kind AS kind,
+            e.ref_id AS ref_id,
+            e.text AS text,
+            v.distance AS score
+        FROM vec_evidence AS v
+        JOIN evidence AS e ON e.id = v.rowid
+        WHERE v.embedding MATCH ? AND v.k = ? AND e.profile_id = ?
+    """
+    if kind_filter:
+        sql += " AND e.kind = ?"
+    sql += " ORDER BY v.distance ASC"
+
+    results: list[list[dict[str, Any]]] = []
+    with store._connect() as conn:
+        sqlite_pool.ensure_once(conn, "semantic", ensure_semantic_schema)
+        for vector in query_vectors:
+            params: list[Any] = [sqlite_vec.serialize_float32(vector.tolist()), k, pid]
+            if kind_filter:
+                params.append(kind_filter)
+            rows = conn.execute(sql, tuple(params)).fetchall()
+            results.append([
+                {
+                    "evidence_id": row["evidence_id"],
+                    "kind": row["kind"],
+                    "ref_id": row["ref_id"],
+                    "text": row["text"],
+                    # vec0 returns L2 distance; embeddings are unit-norm, so
+                    # cosine = 1 - d^2/2 — same scale as the numpy fallback path.
+                    "score": max(0.0, min(1.0, 1.0 - (float(row["score"]) ** 2) / 2.0)),
+                    "evidence_ref": f'{row["kind"]}:{row["ref_id"]}',
+                }
+                for row in rows
+            ])
+    return results
+
+
+def search_many(
+    pid: str, queries: list[str], k: int = 10, kind_filter: str | None = None
+) -> list[list[dict[str, Any]]]:
+    """Top-k evidence for each query, aligned with ``queries``.
+
+    All distinct queries are embedded in one model call and answered over one
+    connection (one corpus embedding on the numpy path). Blank queries get [].
+    """
+    pid, k, kind_filter = _search_args(pid, k, kind_filter)
+    normalized = [_normalize_text(q) for q in queries]
+    distinct = list(dict.fromkeys(q for q in normalized if q))
+    if not distinct:
+        return [[] for _ in normalized]
+
+    query_vectors = np.array(embed(distinct), dtype=float)
+    if SQLITE_VEC_AVAILABLE:
+        answers = _vec_search_many(pid, query_vectors, k, kind_filter)
+    else:
+        answers = _fallback_search_many(pid, query_vectors, k, kind_filter)
+    by_query = dict(zip(distinct, answers))
+    # Fresh dicts per slot so callers may mutate results independently.
+    return [[dict(hit) for hit in by_query.get(q, [])] for q in normalized]
+
+
+def search(pid: str, query_text: str, k: int = 10, kind_filter: str | None = None) -> list[dict[str, Any]]:
+    return search_many(pid, [query_text], k, kind_filter)[0]
@@ -83,6 +83,12 @@ class SearchRequest(BaseModel):
     kind_filter: str | None = None
 
 
+class SearchManyRequest(BaseModel):
+    queries: list[str]
+    k: int = 5
+    kind_filter: str | None = None
+
+
 @app.get("/profile")
 def get_profile_header(x_profile_id: str | None = Header(default=None)) -> dict[str, Any]:
     return store.get_profile(_pid_or_default(x_profile_id=x_profile_id))
@@ -249,6 +255,20 @@ def post_search(
     )
 
 
+@app.post("/search/many")
+def post_search_many(
+    payload: SearchManyRequest,
+    pid: str | None = None,
+    x_profile_id: str | None = Header(default=None),
+) -> list[list[dict[str, Any]]]:
+    return semantic.search_many(
+        _pid_or_default(pid=pid, x_profile_id=x_profile_id),
+        payload.queries,
+        payload.k,
+        payload.kind_filter,
+    )
+
+
 def main() -> None:
     port = int(os.getenv("KNOWLEDGE_SERVICE_PORT", "5100"))
     uvicorn.run("knowledge.service:app", host="127.0.0.1", port=port, reload=False)
@@ -6,8 +6,14 @@ import json
 import os
 import sqlite3
 from collections import defaultdict
+from contextlib import contextmanager
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Iterator
+
+try:
+    from backend import sqlite_pool
+except ImportError:  # pragma: no cover - backend/ on sys.path
+    import sqlite_pool  # type: ignore
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "knowledge.db")
 
@@ -35,12 +41,15 @@ def _utc_now() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
-def _connect() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+def _foreign_keys_on(conn: sqlite3.Connection) -> None:
     conn.execute("PRAGMA foreign_keys = ON")
-    _ensure_schema(conn)
-    return conn
+
+
+@contextmanager
+def _connect() -> Iterator[sqlite3.Connection]:
+    # DB_PATH is read per call (tests monkeypatch it); the pool keys on the path.
+    with sqlite_pool.connection(DB_PATH, _SCHEMA) as conn:
+        yield conn
 
 
 def _ensure_schema(conn: sqlite3.Connection) -> None:
@@ -89,6 +98,9 @@ def _ensure_schema(conn: sqlite3.Connection) -> None:
         conn.commit()
 
 
+_SCHEMA = sqlite_pool.Schema("knowledge", SCHEMA_VERSION, _ensure_schema, on_connect=_foreign_keys_on)
+
+
 def profile_exists(pid: str) -> bool:
     with _connect() as conn:
         count = conn.execute(
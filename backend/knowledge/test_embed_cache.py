@@ -0,0 +1,61 @@
+"""Tests for the content-addressed embedding cache. tmp_path db, fake encoder."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from backend import sqlite_pool
+from backend.knowledge.embed_cache import EmbeddingCache, text_key
+
+
+@pytest.fixture
+def encoder():
+    calls: list[list[str]] = []
+
+    def encode(texts):
+        calls.append(list(texts))
+        return [[float(len(t)), 1.0, 0.5] for t in texts]
+
+    encode.calls = calls
+    yield encode
+    sqlite_pool.close_all()
+
+
+def test_identical_texts_embed_once(tmp_path, encoder):
+    cache = EmbeddingCache("m", tmp_path / "c.db")
+    out = cache.embed(["a b", "a  b\n", "cde"], encoder)
+    assert encoder.calls == [["a b", "cde"]]          # whitespace-normalized + deduped
+    assert out[0] == out[1] == [3.0, 1.0, 0.5]
+    cache.embed(["cde", "a b"], encoder)
+    assert len(encoder.calls) == 1                    # second call fully from the LRU
+    stats = cache.stats()
+    assert stats["misses"] == 2 and stats["memory_hits"] == 2
+
+
+def test_disk_cache_survives_new_instance(tmp_path, encoder):
+    EmbeddingCache("m", tmp_path / "c.db").embed(["hello world"], encoder)
+    fresh = EmbeddingCache("m", tmp_path / "c.db")
+    assert fresh.embed(["hello world"], encoder) == [[11.0, 1.0, 0.5]]
+    assert len(encoder.calls) == 1
+    assert fresh.stats()["disk_hits"] == 1
+
+
+def test_model_is_part_of_the_key(tmp_path, encoder):
+    EmbeddingCache("m1", tmp_path / "c.db").embed(["x"], encoder)
+    EmbeddingCache("m2", tmp_path / "c.db").embed(["x"], encoder)
+    assert len(encoder.calls) == 2
+
+
+def test_float16_storage_round_trips_closely(tmp_path, encoder):
+    EmbeddingCache("m", tmp_path / "c.db", dtype="float16").embed(["abc"], encoder)
+    fresh = EmbeddingCache("m", tmp_path / "c.db", dtype="float16")
+    got = fresh.lookup_many([text_key("abc")])[text_key("abc")]
+    assert got.dtype == np.float32
+    assert np.allclose(got, [3.0, 1.0, 0.5], atol=1e-3)
+
+
+def test_lru_is_bounded(tmp_path, encoder):
+    cache = EmbeddingCache("m", tmp_path / "c.db", lru_size=2)
+    cache.embed(["a", "bb", "ccc"], encoder)
+    assert cache.stats()["lru_entries"] == 2
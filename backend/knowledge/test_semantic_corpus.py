@@ -146,3 +146,33 @@ def test_vec_and_fallback_scores_agree(temp_db, monkeypatch):
     assert shared, "expected overlapping results between vec and fallback paths"
     for ref in shared:
         assert vec_scores[ref] == pytest.approx(fb_scores[ref], abs=1e-4)
+
+
+def test_search_many_matches_search_with_one_query_embed(temp_db, monkeypatch):
+    monkeypatch.setattr(semantic, "SQLITE_VEC_AVAILABLE", False)
+    queries = ["large language models in production", "", "transfer learning",
+               "large language models in production"]
+    expected = [semantic.search("default", q, k=4) for q in queries]
+
+    calls: list[int] = []
+
+    def counting_embed(texts):
+        calls.append(len(texts))
+        return _fake_embed(texts)
+
+    monkeypatch.setattr(semantic, "embed", counting_embed)
+    batched = semantic.search_many("default", queries, k=4)
+
+    assert [[h["evidence_ref"] for h in hits] for hits in batched] == \
+        [[h["evidence_ref"] for h in hits] for hits in expected]
+    for got, want in zip(batched, expected):
+        for g, w in zip(got, want):
+            assert g["score"] == pytest.approx(w["score"], abs=1e-9)
+    assert batched[1] == []
+    # Two distinct queries in one call, then the corpus once.
+    assert calls[0] == 2 and len(calls) == 2
+
+
+def test_search_many_rejects_unknown_kind(temp_db):
+    with pytest.raises(ValueError):
+        semantic.search_many("default", ["python"], kind_filter="bogus")
@@ -0,0 +1,213 @@
+"""LLM response cache — SQLite-backed, TTL + size cap, single-flight.
+
+call_llm had no memory: the JD extraction prompt and scoring.score_job's
+five-dimension prompt were re-sent to the model every time /analyze,
+/analyze-deep, /tailor-resume or the matcher touched the same job. Callers
+with deterministic prompts opt in (``call_llm(cache=True)``, usually with a
+``validate`` so unparseable replies are not stored); generative prompts
+(cover letters, tailoring, rewrites) stay uncached so a retry regenerates.
+Responses are stored in llm_cache.db keyed by
+
+    (provider, model, sha256(system + messages), fingerprint)
+
+where the fingerprint carries temperature and a format version, so a change
+to any of them is a different entry. Entries expire after a TTL and the table
+is pruned back to a row cap (least recently used first).
+
+Single-flight: concurrent identical requests in this process coalesce onto one
+in-flight model call; followers wait for the leader's response (or error).
+
+Env knobs:
+    SMARTAPPLY_LLM_CACHE=0               disable (read per call)
+    SMARTAPPLY_LLM_CACHE_DB              path (default backend/llm_cache.db)
+    SMARTAPPLY_LLM_CACHE_TTL_HOURS       default 168 (7 days)
+    SMARTAPPLY_LLM_CACHE_MAX_ROWS        default 5000
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time as _time
+from typing import Callable
+
+try:
+    import sqlite_pool
+    from logger import get_logger
+except ImportError:  # invoked as backend.* from repo root
+    from backend import sqlite_pool
+    from backend.logger import get_logger
+
+log = get_logger("llm_cache")
+
+CACHE_DB_PATH = os.getenv(
+    "SMARTAPPLY_LLM_CACHE_DB",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "llm_cache.db"),
+)
+TTL_SECONDS = float(os.getenv("SMARTAPPLY_LLM_CACHE_TTL_HOURS", "168")) * 3600
+MAX_ROWS = int(os.getenv("SMARTAPPLY_LLM_CACHE_MAX_ROWS", "5000"))
+# Bump when the cached payload or key layout changes.
+FORMAT_VERSION = 1
+# Prune (expired + over-cap rows) once every this many stores.
+_PRUNE_EVERY = 50
+
+
+def cache_enabled() -> bool:
+    return os.getenv("SMARTAPPLY_LLM_CACHE", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def prompt_hash(messages: list, system: str = "") -> str:
+    canonical = json.dumps({"system": system or "", "messages": messages},
+                           sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def fingerprint(temperature: float) -> str:
+    return f"t={float(temperature):.3f};v={FORMAT_VERSION}"
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS responses (
+            provider TEXT NOT NULL,
+            model TEXT NOT NULL,
+            prompt_hash TEXT NOT NULL,
+            fingerprint TEXT NOT NULL,
+            response TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            accessed_at REAL NOT NULL,
+            hits INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (provider, model, prompt_hash, fingerprint)
+        ) WITHOUT ROWID
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)")
+
+
+_SCHEMA = sqlite_pool.Schema("llm_cache", 1, _migrate)
+
+CacheKey = tuple[str, str, str, str]
+
+
+class _Flight:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: str | None = None
+        self.error: BaseException | None = None
+
+
+class LLMResponseCache:
+    def __init__(self, db_path: str = CACHE_DB_PATH, *, ttl_seconds: float = TTL_SECONDS,
+                 max_rows: int = MAX_ROWS) -> None:
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        self._flights: dict[CacheKey, _Flight] = {}
+        self._counters = {"hits": 0, "misses": 0, "coalesced": 0, "stores": 0, "errors": 0}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    # ── storage ───────────────────────────────────────────────────────
+    def get(self, key: CacheKey) -> str | None:
+        now = _time.time()
+        try:
+            with sqlite_pool.connection(self.db_path, _SCHEMA) as conn:
+                row = conn.execute(
+                    "SELECT response, created_at FROM responses "
+                    "WHERE provider = ? AND model = ? AND prompt_hash = ? AND fingerprint = ?",
+                    key,
+                ).fetchone()
+                if row is None or now - row["created_at"] > self.ttl_seconds:
+                    return None
+                conn.execute(
+                    "UPDATE responses SET accessed_at = ?, hits = hits + 1 "
+                    "WHERE provider = ? AND model = ? AND prompt_hash = ? AND fingerprint = ?",
+                    (now, *key),
+                )
+                return row["response"]
+        except sqlite3.Error as e:  # a broken cache must never break an LLM call
+            self._count("errors")
+            log.warning(f"llm cache read failed — {e}")
+            return None
+
+    def put(self, key: CacheKey, response: str) -> None:
+        now = _time.time()
+        try:
+            with sqlite_pool.connection(self.db_path, _SCHEMA) as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses "
+                    "(provider, model, prompt_hash, fingerprint, response, created_at, accessed_at, hits) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, 0)",
+                    (*key, response, now, now),
+                )
+                with self._lock:
+                    self._counters["stores"] += 1
+                    prune = self._counters["stores"] % _PRUNE_EVERY == 0
+                if prune:
+                    self._prune(conn, now)
+        except sqlite3.Error as e:
+            self._count("errors")
+            log.warning(f"llm cache write failed — {e}")
+
+    def _prune(self, conn: sqlite3.Connection, now: float) -> None:
+        conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+        total = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        if total > self.max_rows:
+            conn.execute(
+                "DELETE FROM responses WHERE (provider, model, prompt_hash, fingerprint) IN ("
+                "  SELECT provider, model, prompt_hash, fingerprint FROM responses "
+                "  ORDER BY accessed_at ASC LIMIT ?)",
+                (total - self.max_rows,),
+            )
+
+    # ── get-or-compute ────────────────────────────────────────────────
+    def get_or_call(self, key: CacheKey, call: Callable[[], tuple[str, bool]]) -> str:
+        """Cached response for ``key``, else run ``call`` once for every
+        concurrent asker. ``call`` returns (response, cacheable)."""
+        cached = self.get(key)
+        if cached is not None:
+            self._count("hits")
+            return cached
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self._counters["misses"] += 1
+            else:
+                self._counters["coalesced"] += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value  # type: ignore[return-value]
+        try:
+            response, cacheable = call()
+            if cacheable and response:
+                self.put(key, response)
+            flight.value = response
+            return response
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            out: dict[str, float] = dict(self._counters)
+            out["in_flight"] = len(self._flights)
+        lookups = out["hits"] + out["misses"] + out["coalesced"]
+        out["hit_rate"] = round((out["hits"] + out["coalesced"]) / lookups, 4) if lookups else 0.0
+        return out
@@ -12,10 +12,13 @@ import json
 import os
 import re
 import time as _time
+from typing import Callable
 
 try:
+    import llm_cache
     from logger import get_logger, log_event
 except ImportError:  # invoked as backend.* from repo root
+    from backend import llm_cache
     from backend.logger import get_logger, log_event
 
 log = get_logger("llm")
@@ -374,13 +377,49 @@ def _dispatch_provider(provider: str, messages: list, temperature: float,
     )
 
 
+_response_cache: llm_cache.LLMResponseCache | None = None
+
+
+def _get_response_cache() -> llm_cache.LLMResponseCache:
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = llm_cache.LLMResponseCache()
+    return _response_cache
+
+
+def llm_cache_stats() -> dict:
+    """Hit/miss/coalesced counters for this process's LLM response cache."""
+    return _get_response_cache().stats()
+
+
+def _cache_model(provider: str, model: str | None) -> str:
+    """Model name a request will run on, for the cache key (no network probe)."""
+    if model:
+        return model
+    if provider == "ollama":
+        return OLLAMA_MODEL
+    providers = load_llm_config()["providers"]
+    if provider in ("claude", "anthropic"):
+        return ((providers.get("anthropic") or {}).get("models") or [None])[0] or DEFAULT_ANTHROPIC_MODEL
+    entry = providers.get(provider)
+    return str(((entry or {}).get("models") or [""])[0] or "") if isinstance(entry, dict) else ""
+
+
 def call_llm(messages: list, temperature: float = 0.3, system: str = "",
-             prefer: str = "ollama", timeout: int = 600, model: str = None) -> str:
+             prefer: str = "ollama", timeout: int = 600, model: str = None,
+             cache: bool = False, validate: Callable[[str], bool] | None = None) -> str:
     """Try preferred provider first, auto-fallback to ollama then claude.
 
     prefer: "ollama" | "claude" | "ollama/<model-name>" | "<provider>" |
     "<provider>/<model>" for any provider configured in llm_config.json.
     model: explicit model name override.
+    cache: look up / store the response in the llm_cache response cache and
+    coalesce identical in-flight calls. Off by default — opt in only for
+    deterministic prompts (JD extraction, score_job); a cached cover letter or
+    rewrite could never be regenerated. Only answers from the preferred
+    provider are stored (a fallback answer belongs to a different key).
+    validate: with cache, a reply is stored only if validate(reply) is true,
+    so a malformed answer is not pinned for every retry (see json_reply_ok).
     """
     provider_key, parsed_model = normalize_llm_prefer(prefer or "ollama")
     model_override = model or parsed_model
@@ -391,18 +430,40 @@ def call_llm(messages: list, temperature: float = 0.3, system: str = "",
             providers.append(candidate)
     if provider_key == "claude":
         providers = ["claude", "ollama"]
-    last_err = None
-    for provider in providers:
-        try:
-            # The parsed model belongs to the requested provider only.
-            active_model = model_override if provider == provider_key else None
-            return _dispatch_provider(provider, messages, temperature, system,
-                                      timeout, active_model)
-        except Exception as e:
-            last_err = e
-            log.warning(f"LLM provider '{provider}' failed — {e}. Trying next...")
-    log.error(f"All LLM providers failed. Last error: {last_err}")
-    raise RuntimeError(f"All LLM providers failed. Last error: {last_err}")
+
+    def _call() -> tuple[str, bool]:
+        last_err = None
+        for provider in providers:
+            try:
+                # The parsed model belongs to the requested provider only.
+                active_model = model_override if provider == provider_key else None
+                result = _dispatch_provider(provider, messages, temperature, system,
+                                            timeout, active_model)
+                return result, provider == provider_key and (validate is None or validate(result))
+            except Exception as e:
+                last_err = e
+                log.warning(f"LLM provider '{provider}' failed — {e}. Trying next...")
+        log.error(f"All LLM providers failed. Last error: {last_err}")
+        raise RuntimeError(f"All LLM providers failed. Last error: {last_err}")
+
+    if not (cache and llm_cache.cache_enabled()):
+        return _call()[0]
+    key = (
+        provider_key,
+        _cache_model(provider_key, model_override),
+        llm_cache.prompt_hash(messages, system),
+        llm_cache.fingerprint(temperature),
+    )
+    return _get_response_cache().get_or_call(key, _call)
+
+
+def json_reply_ok(raw: str) -> bool:
+    """Cache validator for JSON prompts: true when clean_json(raw) parses."""
+    try:
+        json.loads(clean_json(raw))
+    except (json.JSONDecodeError, ValueError, TypeError):
+        return False
+    return True
 
 
 def clean_json(raw: str) -> str:
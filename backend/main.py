@@ -20,6 +20,7 @@ from jinja2 import Environment, BaseLoader
 
 # Production-grade resume pipeline modules
 import compile_loop
+import compile_service
 import constraints as constraints_engine
 import resume_versions
 import latex_ast
@@ -370,9 +371,8 @@ def _reindex_default_profile_background():
 
 _reindex_default_profile_background()
 
-# GLOBAL LOCK (The "Traffic Light") — serializes pdflatex compiles and the
-# shared tailored_resume.* output files ONLY. LLM calls use llm_semaphore.
-processing_lock = asyncio.Lock()
+# PDF compiles run on compile_service's bounded pool, each in its own temp
+# work dir — no global lock. LLM calls use llm_semaphore.
 
 # LLM concurrency cap: local Ollama handles a couple of in-flight requests
 # fine; cloud providers tolerate more. Independent prompts (analyze extraction
@@ -822,10 +822,13 @@ def delete_variant(variant_id: str, request: Request):
     return {"deleted": variant_id}
 
 
+_LAST_RESUME_PATH = os.path.join(os.path.dirname(__file__), "tailored_resume.pdf")
+
+
 @app.get("/last-resume")
 def last_resume():
     """Return the most recently generated resume PDF for upload by the extension."""
-    path = os.path.join(os.path.dirname(__file__), "tailored_resume.pdf")
+    path = _LAST_RESUME_PATH
     if os.path.exists(path):
         return FileResponse(path, media_type="application/pdf", filename="resume.pdf")
     raise HTTPException(status_code=404, detail="No resume generated yet")
@@ -1021,6 +1024,8 @@ def llm_status():
             "pdftotext": bool(compile_loop.PDFTOTEXT_BIN and os.path.exists(compile_loop.PDFTOTEXT_BIN)),
             "pdfinfo": bool(shutil.which("pdfinfo")),
         },
+        "pdf_compile": compile_service.get_service().stats(),
+        "llm_cache": llm_provider.llm_cache_stats(),
     }
 
 
@@ -1557,19 +1562,27 @@ def jobs_stats():
 
 @app.get("/jobs/latest")
 def jobs_latest(hours: int = 72, days: int | None = None, q: str | None = None,
-                company: str | None = None, limit: int = 100):
-    """Freshest active jobs (sourcing-v3 §5.3). q and company are comma-separated."""
+                company: str | None = None, limit: int = 100, search: str | None = None,
+                order: str | None = None, cursor: str | None = None):
+    """Freshest active jobs (sourcing-v3 §5.3). q and company are comma-separated;
+    search is full-text ("phrase", prefix*, OR) and ranks by relevance. Pass
+    next_cursor back as cursor for the following page."""
     try:
         from backend.scraper.store import latest_jobs
     except ImportError:
         from scraper.store import latest_jobs  # type: ignore
     keywords = [k.strip() for k in q.split(",") if k.strip()] if q else None
     companies = [c.strip() for c in company.split(",") if c.strip()] if company else None
-    rows = latest_jobs(
-        hours_first_seen=hours, days_posted=days,
-        keywords=keywords, companies=companies, limit=min(int(limit), 500),
-    )
-    return {"count": len(rows), "jobs": rows}
+    limit = max(1, min(int(limit), 500))
+    try:
+        rows = latest_jobs(
+            hours_first_seen=hours, days_posted=days, keywords=keywords, companies=companies,
+            limit=limit, search=search, order=order, cursor=cursor,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    next_cursor = rows[-1]["cursor"] if len(rows) == limit else None
+    return {"count": len(rows), "jobs": rows, "next_cursor": next_cursor}
 
 
 @app.get("/jobs/runs")
@@ -1989,8 +2002,7 @@ async def approve_queue_item(match_id: int, request: Request, payload: dict = No
             "_role": title,
             "_jd": item.get("jd_text", ""),
         }
-        async with processing_lock:
-            ctx = _render_compile_version(pid, pdf_data)
+        ctx = await _render_compile_version(pid, pdf_data)
         result = ctx["result"]
         if not (result.success and ctx["variant_meta"]):
             raise HTTPException(status_code=500, detail={
@@ -2267,9 +2279,11 @@ async def analyze_job(req: JobRequest, request: Request):
     async with llm_semaphore:  # borderline adjudication may make one LLM call
         judgments = await asyncio.to_thread(
             scoring.judge_requirements, pid, must, user_data,
-            knowledge_semantic.search, req.llm, True)
+            knowledge_semantic.search, req.llm, True,
+            knowledge_search_many=knowledge_semantic.search_many)
     nice_judgments = await asyncio.to_thread(
-        scoring.judge_requirements, pid, nice, user_data, knowledge_semantic.search)
+        scoring.judge_requirements, pid, nice, user_data, knowledge_semantic.search,
+        knowledge_search_many=knowledge_semantic.search_many)
     scored = scoring.compute_match_score(judgments, nice_judgments)
 
     # Canonical overall score: five-dimension scorer (same as Tailor + matcher).
@@ -2637,9 +2651,11 @@ async def analyze_deep(req: DeepAnalyzeRequest, request: Request):
     must = [s["skill"] for s in extracted.get("must_have_skills") or []]
     nice = [s["skill"] for s in extracted.get("nice_to_have_skills") or []]
     judgments = await asyncio.to_thread(
-        scoring.judge_requirements, pid, must, user_data, knowledge_semantic.search)
+        scoring.judge_requirements, pid, must, user_data, knowledge_semantic.search,
+        knowledge_search_many=knowledge_semantic.search_many)
     nice_judgments = await asyncio.to_thread(
-        scoring.judge_requirements, pid, nice, user_data, knowledge_semantic.search)
+        scoring.judge_requirements, pid, nice, user_data, knowledge_semantic.search,
+        knowledge_search_many=knowledge_semantic.search_many)
     scored = scoring.compute_match_score(judgments, nice_judgments)
     profile_haystack = scoring.build_profile_haystack(user_data)
     async with llm_semaphore:
@@ -2997,19 +3013,14 @@ def _build_grounded_edits(
         )
 
     profile_terms = tailor_edits.collect_profile_terms(master)
-    grounded: list[dict] = []
-    for e in edits:
-        origin_ref = e.pop("_origin_ref", None)
-        grounded.append(
-            tailor_edits.ground_edit(
-                e,
-                pid=pid,
-                jd_text=jd_text,
-                knowledge_search=knowledge_semantic.search,
-                origin_ref=origin_ref,
-                profile_terms=profile_terms,
-            )
-        )
+    grounded = tailor_edits.ground_edits(
+        edits,
+        pid=pid,
+        jd_text=jd_text,
+        knowledge_search=knowledge_semantic.search,
+        knowledge_search_many=knowledge_semantic.search_many,
+        profile_terms=profile_terms,
+    )
     fabrication_count = sum(1 for g in grounded if g.get("stretch_level") == "fabrication")
     return tailor_edits.renderable_edits(grounded), fabrication_count
 
@@ -3050,9 +3061,8 @@ async def run_tailoring(
         user_instruction=user_instruction or "", llm=llm or "",
     )
     # This pipeline is read-only (LLM calls are capped by llm_semaphore inside
-    # _llm_json) — it no longer holds processing_lock, which is reserved for
-    # pdflatex compiles and the shared tailored_resume.* files. The block shape
-    # is kept to avoid re-indenting the prompt f-strings below.
+    # _llm_json) and takes no global lock. The block shape is kept to avoid
+    # re-indenting the prompt f-strings below.
     async with contextlib.nullcontext():
         user_data = _enrich_profile_with_resume_sources(load_pdata(pid))
         style = _build_style_fingerprint(user_data)
@@ -3376,7 +3386,8 @@ OUTPUT JSON ONLY:
             if must:
                 base_judgments = await asyncio.to_thread(
                     scoring.judge_requirements, pid, must, user_data,
-                    knowledge_semantic.search)
+                    knowledge_semantic.search,
+                    knowledge_search_many=knowledge_semantic.search_many)
         prior_fit = (analysis or {}).get("fit") or (analysis or {}).get("deep", {}).get("fit")
         if base_judgments:
             tailored_texts = [result.get("tailored_summary", "")]
@@ -3624,12 +3635,14 @@ def _inject_pdf_metadata(tex: str, *, author: str, title: str) -> str:
     return metadata_block + tex
 
 
-def _render_compile_version(pid: str, data: dict) -> dict:
+async def _render_compile_version(pid: str, data: dict) -> dict:
     """Merge tailored data → render → compile → persist an exact resume variant.
 
     Shared by POST /generate-pdf and the M6 queue approve path so both link the
-    precise PDF artifact. Callers must hold `processing_lock`. Raises HTTPException on
-    preflight/hygiene/render failure; on compile failure returns result.success=False.
+    precise PDF artifact. The compile runs on the shared compile pool in an
+    isolated work dir, so concurrent callers do not serialize. Raises
+    HTTPException on preflight/hygiene/render failure or a full compile queue
+    (503); on compile failure returns result.success=False.
     """
     profile_dir = _profile_dir(pid)
     master = _enrich_profile_with_resume_sources(load_pdata(pid))
@@ -3687,20 +3700,28 @@ def _render_compile_version(pid: str, data: dict) -> dict:
             },
         )
 
-    # 4. Compile with retry + repair
-    backend_dir = os.path.dirname(__file__)
+    # 4. Compile with retry + repair (isolated work dir on the compile pool;
+    #    the finished PDF is also published for GET /last-resume)
     ats_expected = {
         "name": merged.get("contact_info", {}).get("name", ""),
         "email": merged.get("contact_info", {}).get("email", ""),
     }
-    result = compile_loop.compile_with_retry(
-        rendered_tex,
-        work_dir=backend_dir,
-        name="tailored_resume",
-        max_attempts=12,  # 1-page enforcement may need many trim passes
-        target_max_pages=1,
-        ats_expected=ats_expected,
-    )
+    try:
+        result = await compile_service.get_service().compile(
+            rendered_tex,
+            publish_to=_LAST_RESUME_PATH,
+            name="tailored_resume",
+            max_attempts=12,  # 1-page enforcement may need many trim passes
+            target_max_pages=1,
+            ats_expected=ats_expected,
+        )
+    except compile_service.CompileQueueFull as e:
+        log.warning(f"[generate-pdf] compile queue full — pid={pid}: {e}")
+        raise HTTPException(
+            status_code=503,
+            detail={"error": "PDF compile queue is full — try again shortly.",
+                    "compile_queue": compile_service.get_service().stats()},
+        )
 
     log_event(log, "INFO" if result.success else "ERROR", "compile_result",
               pid=pid, success=result.success, attempts=result.attempts,
@@ -3777,58 +3798,55 @@ async def generate_pdf(data: dict, request: Request):
     _pdf_t0 = _time.time()
     log_event(log, "INFO", "request", endpoint="POST /generate-pdf", pid=pid,
               role=data.get("_role","?"), company=data.get("_company","?"))
-    async with processing_lock:
-        ctx = _render_compile_version(pid, data)
-        result = ctx["result"]
-        variant_meta = ctx["variant_meta"]
-        problems = ctx["problems"]
-
-        # 6. Return PDF if success
-        total_ms = int((_time.time() - _pdf_t0) * 1000)
-        if result.success and result.pdf_path:
-            log_event(log, "INFO", "pdf_ok", pid=pid, total_ms=total_ms,
-                      variant=variant_meta["id"] if variant_meta else "unsaved")
-            headers = {
-                "X-PDF-Attempts": str(result.attempts),
-                "X-PDF-Pages": str(result.page_count or "?"),
-                "X-PDF-ATS-OK": str(result.ats_validation.get("overall_ok", False)).lower(),
-                "X-PDF-Latency-Ms": str(result.latency_ms),
-            }
-            if variant_meta:
-                headers["X-PDF-Variant-Id"] = variant_meta["id"]
-            return FileResponse(
-                result.pdf_path,
-                media_type="application/pdf",
-                filename="tailored_resume.pdf",
-                headers=headers,
-            )
+    ctx = await _render_compile_version(pid, data)
+    result = ctx["result"]
+    variant_meta = ctx["variant_meta"]
+    problems = ctx["problems"]
 
-        # 7. Hard failure — return detailed error so user knows what happened
-        missing_tools = [e for e in result.errors if e.get("type") == "missing_binary"]
-        if missing_tools:
-            raise HTTPException(
-                status_code=500,
-                detail={
-                    "error": "Local PDF toolchain is missing.",
-                    "missing_tools": [
-                        "pdflatex" if "pdflatex" in (e.get("message") or "").lower() else "unknown"
-                        for e in missing_tools
-                    ],
-                    "hint": "Install a TeX distribution that provides `pdflatex`. For ATS validation, also install `pdftotext` and `pdfinfo`.",
-                    "compile_result": result.to_dict(),
-                },
-            )
-        log.error(f"[generate-pdf] FAILED after {result.attempts} attempts — pid={pid} "
-                  f"errors={[e.get('type') for e in result.errors]}")
+    # 6. Return PDF if success
+    total_ms = int((_time.time() - _pdf_t0) * 1000)
+    if result.success and result.pdf_bytes:
+        log_event(log, "INFO", "pdf_ok", pid=pid, total_ms=total_ms,
+                  variant=variant_meta["id"] if variant_meta else "unsaved")
+        headers = {
+            "X-PDF-Attempts": str(result.attempts),
+            "X-PDF-Pages": str(result.page_count or "?"),
+            "X-PDF-ATS-OK": str(result.ats_validation.get("overall_ok", False)).lower(),
+            "X-PDF-Latency-Ms": str(result.latency_ms),
+        }
+        if variant_meta:
+            headers["X-PDF-Variant-Id"] = variant_meta["id"]
+        headers["Content-Disposition"] = 'attachment; filename="tailored_resume.pdf"'
+        # Serve this job's bytes: the published copy may already belong to a
+        # concurrent compile.
+        return Response(content=result.pdf_bytes, media_type="application/pdf", headers=headers)
+
+    # 7. Hard failure — return detailed error so user knows what happened
+    missing_tools = [e for e in result.errors if e.get("type") == "missing_binary"]
+    if missing_tools:
         raise HTTPException(
             status_code=500,
             detail={
-                "error": "PDF generation failed after retries",
+                "error": "Local PDF toolchain is missing.",
+                "missing_tools": [
+                    "pdflatex" if "pdflatex" in (e.get("message") or "").lower() else "unknown"
+                    for e in missing_tools
+                ],
+                "hint": "Install a TeX distribution that provides `pdflatex`. For ATS validation, also install `pdftotext` and `pdfinfo`.",
                 "compile_result": result.to_dict(),
-                "latex_balance_problems": problems,
-                "hint": "Check that LaTeX template + master_data are consistent.",
             },
         )
+    log.error(f"[generate-pdf] FAILED after {result.attempts} attempts — pid={pid} "
+              f"errors={[e.get('type') for e in result.errors]}")
+    raise HTTPException(
+        status_code=500,
+        detail={
+            "error": "PDF generation failed after retries",
+            "compile_result": result.to_dict(),
+            "latex_balance_problems": problems,
+            "hint": "Check that LaTeX template + master_data are consistent.",
+        },
+    )
 
 
 # ─────────────────────────────────────────────────────────────────
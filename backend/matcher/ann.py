@@ -0,0 +1,205 @@
+"""Approximate nearest-neighbour index over job embeddings (features.db).
+
+An inverted-file (IVF) index: job ``embedding_main`` vectors are clustered
+into ~sqrt(N) lists by spherical k-means, and each job is filed under its
+nearest centroid. A query scores the centroids, then reads and dot-products
+only the embeddings filed under the best few lists, so its cost grows with
+sqrt(N) rather than N. Everything lives in features.db next to job_features
+and is read with plain sqlite3 — no extension needed.
+
+``ensure_job_features`` files new or re-embedded jobs under their nearest
+existing centroid; the lists are re-trained from scratch when the corpus has
+doubled (or halved) since the last training, or the embedding size changed.
+"""
+
+from __future__ import annotations
+
+import math
+import sqlite3
+from pathlib import Path
+from typing import Any, Iterable
+
+import numpy as np
+
+# Below this many vectors one list is as fast as any clustering.
+MIN_TRAIN = 256
+MAX_LISTS = 1024
+KMEANS_ITERS = 8
+# A query reads at least this share of the lists, and keeps widening until it
+# has scored OVERSAMPLE × k allowed jobs (IVF recall drops when k is large
+# next to a list).
+PROBE_FRACTION = 0.1
+OVERSAMPLE = 8
+_CHUNK = 500
+
+
+def ensure_ann_schema(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ann_lists (
+          list_id INTEGER PRIMARY KEY,
+          centroid BLOB NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ann_members (
+          job_key TEXT PRIMARY KEY,
+          list_id INTEGER NOT NULL
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_ann_members_list ON ann_members(list_id)")
+    conn.execute("CREATE TABLE IF NOT EXISTS ann_meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+
+
+def _unit(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms > 0, norms, 1.0)
+
+
+def _meta(conn: sqlite3.Connection) -> dict[str, int]:
+    return {str(k): int(v) for k, v in conn.execute("SELECT key, value FROM ann_meta")}
+
+
+def _centroids(conn: sqlite3.Connection, dim: int) -> np.ndarray:
+    rows = conn.execute("SELECT centroid FROM ann_lists ORDER BY list_id").fetchall()
+    if not rows:
+        return np.zeros((0, dim), dtype=np.float32)
+    return np.stack([np.frombuffer(r[0], dtype=np.float32) for r in rows])
+
+
+def _all_vectors(conn: sqlite3.Connection, dim: int) -> tuple[list[str], np.ndarray]:
+    keys: list[str] = []
+    vecs: list[np.ndarray] = []
+    for key, blob in conn.execute("SELECT job_key, embedding_main FROM job_features"):
+        if len(blob) == dim * 4:
+            keys.append(str(key))
+            vecs.append(np.frombuffer(blob, dtype=np.float32))
+    return keys, (np.stack(vecs) if vecs else np.zeros((0, dim), dtype=np.float32))
+
+
+def _kmeans(vectors: np.ndarray, n_lists: int) -> np.ndarray:
+    """Spherical k-means (dot-product assignment), deterministic seeding."""
+    rng = np.random.default_rng(0)
+    data = _unit(vectors)
+    centroids = data[rng.choice(len(data), size=n_lists, replace=False)].copy()
+    for _ in range(KMEANS_ITERS):
+        assign = np.argmax(data @ centroids.T, axis=1)
+        for idx in range(n_lists):
+            members = data[assign == idx]
+            if len(members):
+                centroids[idx] = members.mean(axis=0)
+        centroids = _unit(centroids)
+    return centroids.astype(np.float32)
+
+
+def train(conn: sqlite3.Connection, dim: int) -> int:
+    """(Re)build the lists from every stored embedding of size `dim`."""
+    ensure_ann_schema(conn)
+    keys, vectors = _all_vectors(conn, dim)
+    conn.execute("DELETE FROM ann_lists")
+    conn.execute("DELETE FROM ann_members")
+    if not keys:
+        conn.execute("DELETE FROM ann_meta")
+        return 0
+    n_lists = 1 if len(keys) < MIN_TRAIN else min(MAX_LISTS, int(math.sqrt(len(keys))))
+    centroids = _kmeans(vectors, n_lists) if n_lists > 1 else _unit(vectors.mean(axis=0, keepdims=True))
+    conn.executemany(
+        "INSERT INTO ann_lists (list_id, centroid) VALUES (?, ?)",
+        [(idx, c.astype(np.float32).tobytes()) for idx, c in enumerate(centroids)],
+    )
+    assign = np.argmax(_unit(vectors) @ centroids.T, axis=1)
+    conn.executemany(
+        "INSERT INTO ann_members (job_key, list_id) VALUES (?, ?)",
+        list(zip(keys, map(int, assign))),
+    )
+    conn.executemany(
+        "INSERT OR REPLACE INTO ann_meta (key, value) VALUES (?, ?)",
+        [("dim", dim), ("trained_size", len(keys))],
+    )
+    print(f"[ann] trained lists={len(centroids)} vectors={len(keys)} dim={dim}")
+    return len(keys)
+
+
+def add_vectors(conn: sqlite3.Connection, items: Iterable[tuple[str, Any]]) -> None:
+    """File (re-)embedded jobs under their nearest list, re-training instead
+    when the index is missing, stale in size, or built for another dim."""
+    items = [(key, np.asarray(vec, dtype=np.float32)) for key, vec in items]
+    ensure_ann_schema(conn)
+    meta = _meta(conn)
+    if not items:
+        # Nothing re-embedded: only a features.db that predates the index needs work.
+        if not meta:
+            row = conn.execute("SELECT length(embedding_main) FROM job_features LIMIT 1").fetchone()
+            if row is not None:
+                train(conn, int(row[0]) // 4)
+        return
+    dim = int(items[0][1].size)
+    size = conn.execute("SELECT COUNT(*) FROM job_features").fetchone()[0]
+    trained = meta.get("trained_size", 0)
+    if meta.get("dim") != dim or not trained or size > 2 * trained or (
+        trained >= MIN_TRAIN and size < trained // 2
+    ):
+        train(conn, dim)
+        return
+    centroids = _centroids(conn, dim)
+    same = [(key, vec) for key, vec in items if vec.size == dim]
+    assign = np.argmax(_unit(np.stack([vec for _, vec in same])) @ centroids.T, axis=1)
+    conn.executemany(
+        "INSERT OR REPLACE INTO ann_members (job_key, list_id) VALUES (?, ?)",
+        [(key, int(list_id)) for (key, _), list_id in zip(same, assign)],
+    )
+
+
+def nearest(
+    db_path: str | Path,
+    vector: Any,
+    k: int,
+    *,
+    job_keys: Iterable[str] | None = None,
+) -> list[str]:
+    """Up to k job_keys whose embedding_main has the highest dot product with
+    `vector`, restricted to `job_keys` when given. Probes more lists until
+    enough allowed jobs are scored or every list has been read."""
+    query = np.asarray(vector, dtype=np.float32)
+    allowed = set(job_keys) if job_keys is not None else None
+    if k <= 0 or query.ndim != 1 or (allowed is not None and not allowed):
+        return []
+    conn = sqlite3.connect(str(db_path))
+    try:
+        ensure_ann_schema(conn)
+        if _meta(conn).get("dim") != query.size:
+            return []
+        centroids = _centroids(conn, query.size)
+        order = [int(i) for i in np.argsort(-(centroids @ query), kind="stable")]
+        probe = max(1, math.ceil(len(order) * PROBE_FRACTION))
+        keys: list[str] = []
+        scores: list[np.ndarray] = []
+        start = 0
+        while start < len(order):
+            lists = order[start:start + probe]
+            start += len(lists)
+            for i in range(0, len(lists), _CHUNK):
+                chunk = lists[i:i + _CHUNK]
+                rows = conn.execute(
+                    "SELECT m.job_key, f.embedding_main FROM ann_members m "
+                    "JOIN job_features f ON f.job_key = m.job_key "
+                    f"WHERE m.list_id IN ({', '.join('?' for _ in chunk)})",
+                    chunk,
+                ).fetchall()
+                rows = [r for r in rows if (allowed is None or r[0] in allowed) and len(r[1]) == query.size * 4]
+                if rows:
+                    keys.extend(str(r[0]) for r in rows)
+                    scores.append(np.stack([np.frombuffer(r[1], dtype=np.float32) for r in rows]) @ query)
+            if len(keys) >= k * OVERSAMPLE:
+                break
+            probe *= 2
+    finally:
+        conn.close()
+    if not keys:
+        return []
+    flat = np.concatenate(scores)
+    top = np.argsort(-flat, kind="stable")[:k]
+    return [keys[i] for i in top]
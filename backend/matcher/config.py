@@ -43,6 +43,17 @@ class MatcherConfig:
     hybrid_weights: dict = field(default_factory=lambda: dict(_HYBRID_DEFAULT_WEIGHTS))
     features_db_path: str = "backend/matcher/features.db"
     scoring_version: str = "v1"
+    # Score only jobs that are new/changed since the profile's last run and
+    # carry cached hybrid + fit results forward (matcher/incremental.py).
+    incremental_matching: bool = True
+    # Fetch full detail pages for summary-only survivors (Workday, SmartRecruiters)
+    # before ranking; at most hydrate_limit detail fetches per run.
+    hydrate_descriptions: bool = True
+    hydrate_limit: int = 200
+    # Hybrid-score only a shortlist of this many nearest jobs (IVF index over
+    # job embeddings, matcher/ann.py) plus as many BM25 hits when the jobs to
+    # score outnumber it; 0 scores every job.
+    semantic_shortlist: int = 500
 
 
 def _merge(base: dict[str, Any], incoming: dict[str, Any]) -> dict[str, Any]:
@@ -87,6 +98,10 @@ def load_config(config_path: str | Path | None = None) -> MatcherConfig:
         hybrid_weights=_valid_weights(merged.get("hybrid_weights"), base.hybrid_weights),
         features_db_path=str(merged.get("features_db_path", base.features_db_path)),
         scoring_version=str(merged.get("scoring_version", base.scoring_version)),
+        incremental_matching=bool(merged.get("incremental_matching", base.incremental_matching)),
+        hydrate_descriptions=bool(merged.get("hydrate_descriptions", base.hydrate_descriptions)),
+        hydrate_limit=int(merged.get("hydrate_limit", base.hydrate_limit)),
+        semantic_shortlist=int(merged.get("semantic_shortlist", base.semantic_shortlist)),
     )
 
 
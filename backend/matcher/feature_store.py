@@ -0,0 +1,454 @@
+"""Memory-mapped, columnar copy of job_features for the hybrid scorer.
+
+``features.get_features`` hands back one dict per job (JSON-decoded skills,
+one ``np.frombuffer`` per embedding BLOB), which the scorer then re-packs into
+arrays. This store keeps the same data already packed, next to features.db:
+
+- ``<features.db>.vec.<gen>``: a float32 matrix, one embedding per row,
+  append-only. Readers ``np.memmap`` it read-only, so every scorer in the
+  process — API requests and pipeline threads alike — shares the page cache
+  instead of holding its own copy;
+- ``store_rows`` (in features.db): per job, the matrix rows of its main and
+  requirements embeddings, a domain bitmask, a level code and its skills as
+  one packed (code, kind, weight) array;
+- ``store_codes``: the skill / domain / level vocabularies behind those codes.
+
+``ensure_job_features`` appends re-embedded jobs in the same transaction that
+writes job_features; the rows they replace become dead space until
+``compact`` (run automatically once dead rows outnumber live ones, or by hand
+with ``python -m backend.matcher.feature_store --compact``) rewrites the live
+rows into a new generation file. A store that is missing, out of step with
+job_features, or built for another embedding size is never read — callers
+fall back to ``get_features``.
+"""
+
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterable
+
+import numpy as np
+
+# One packed entry per (job, skill): kind 0 = required, 1 = preferred.
+SKILL_DTYPE = np.dtype([("code", "<i4"), ("kind", "<i4"), ("weight", "<f8")])
+# Requirements row value for a requirements vector of the wrong size (NULL
+# means the job has none and scores against its main vector).
+_NO_VECTOR = -1
+_CHUNK = 500
+
+_MAPS: dict[str, tuple[Path, np.ndarray]] = {}
+_MAPS_LOCK = threading.Lock()
+
+
+@dataclass(slots=True)
+class StoredFeatures:
+    """Columnar features for the requested jobs that are in the store
+    (row i == keys[i]). ``vectors`` is the shared read-only matrix; rows index
+    it, -1 where a job has no usable vector."""
+
+    keys: list[str]
+    dim: int
+    vectors: np.ndarray
+    main_row: np.ndarray          # N int64
+    req_row: np.ndarray           # N int64 (main_row when no requirements vector)
+    domain_bits: np.ndarray       # N int64, bit i == domain_names[i]
+    level_code: np.ndarray        # N int64
+    skills: np.ndarray            # SKILL_DTYPE entries, grouped by row
+    skill_offsets: np.ndarray     # N+1 int64: row i owns skills[off[i]:off[i+1]]
+    skill_names: list[str]
+    domain_names: list[str]
+    level_names: list[str]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def skill_rows(self) -> np.ndarray:
+        return np.repeat(np.arange(len(self.keys), dtype=np.int64), np.diff(self.skill_offsets))
+
+    def features(self, row: int) -> dict[str, Any]:
+        """One job's skills, domains and level in get_features' shape."""
+        entries = self.skills[self.skill_offsets[row]:self.skill_offsets[row + 1]]
+        required: dict[str, float] = {}
+        preferred: dict[str, float] = {}
+        for code, kind, weight in entries.tolist():
+            (required if kind == 0 else preferred)[self.skill_names[code]] = weight
+        bits = int(self.domain_bits[row])
+        return {
+            "required_skills": required,
+            "preferred_skills": preferred,
+            "domain_tags": [name for i, name in enumerate(self.domain_names) if bits >> i & 1],
+            "level": self.level_names[int(self.level_code[row])],
+        }
+
+
+def ensure_store_schema(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS store_rows (
+          job_key TEXT PRIMARY KEY,
+          desc_hash TEXT NOT NULL,
+          main_row INTEGER,
+          req_row INTEGER,
+          domain_bits INTEGER NOT NULL,
+          level_code INTEGER NOT NULL,
+          skills BLOB NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS store_codes (
+          kind TEXT NOT NULL,
+          name TEXT NOT NULL,
+          code INTEGER NOT NULL,
+          PRIMARY KEY (kind, name)
+        )
+        """
+    )
+    conn.execute("CREATE TABLE IF NOT EXISTS store_meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+
+
+def vector_path(db_path: str | Path, gen: int) -> Path:
+    return Path(f"{db_path}.vec.{gen}")
+
+
+def _meta(conn: sqlite3.Connection) -> dict[str, int]:
+    return {str(k): int(v) for k, v in conn.execute("SELECT key, value FROM store_meta")}
+
+
+def _set_meta(conn: sqlite3.Connection, **values: int) -> None:
+    conn.executemany(
+        "INSERT OR REPLACE INTO store_meta (key, value) VALUES (?, ?)", list(values.items())
+    )
+
+
+def _names(conn: sqlite3.Connection, kind: str) -> list[str]:
+    rows = conn.execute("SELECT name FROM store_codes WHERE kind = ? ORDER BY code", (kind,))
+    return [str(r[0]) for r in rows]
+
+
+class _Coder:
+    """name -> code for one vocabulary, adding unseen names as it goes."""
+
+    def __init__(self, conn: sqlite3.Connection, kind: str) -> None:
+        self.conn, self.kind = conn, kind
+        self.codes = {name: i for i, name in enumerate(_names(conn, kind))}
+
+    def __call__(self, name: str) -> int:
+        code = self.codes.get(name)
+        if code is None:
+            code = self.codes[name] = len(self.codes)
+            self.conn.execute(
+                "INSERT INTO store_codes (kind, name, code) VALUES (?, ?, ?)", (self.kind, name, code)
+            )
+        return code
+
+
+def _domain_coder(conn: sqlite3.Connection) -> _Coder:
+    # Seeded in DOMAIN_KEYWORDS order so a job's bits read back in the order
+    # _detect_domains found them.
+    try:
+        from backend.matcher.features import DOMAIN_KEYWORDS
+    except ImportError:  # pragma: no cover - backend/ on sys.path
+        from matcher.features import DOMAIN_KEYWORDS  # type: ignore
+    coder = _Coder(conn, "domain")
+    for tag in DOMAIN_KEYWORDS:
+        coder(tag)
+    return coder
+
+
+def _pack_skills(code: _Coder, required: dict[str, Any], preferred: dict[str, Any]) -> bytes:
+    entries = [(code(str(k)), 0, float(v)) for k, v in required.items()]
+    entries += [(code(str(k)), 1, float(v)) for k, v in preferred.items()]
+    return np.array(entries, dtype=SKILL_DTYPE).tobytes()
+
+
+def _append(
+    conn: sqlite3.Connection, db_path: str | Path, meta: dict[str, int], entries: list[dict[str, Any]]
+) -> None:
+    """Write `entries` (job_key, desc_hash, required/preferred_skills,
+    domain_tags, level, embedding_main, embedding_requirements) onto the end
+    of the current generation file and point their store_rows at them."""
+    dim, base = meta["dim"], meta["rows"]
+    skills, domains, levels = _Coder(conn, "skill"), _domain_coder(conn), _Coder(conn, "level")
+    vectors: list[np.ndarray] = []
+
+    def _row(vec: Any) -> int | None:
+        if vec is None:
+            return None
+        arr = np.asarray(vec, dtype=np.float32)
+        if arr.ndim != 1 or arr.size != dim:
+            return _NO_VECTOR
+        vectors.append(arr)
+        return base + len(vectors) - 1
+
+    records = []
+    for e in entries:
+        main = _row(e["embedding_main"])
+        req = _row(e.get("embedding_requirements"))
+        bits = 0
+        for tag in e.get("domain_tags") or []:
+            if tag:
+                bits |= 1 << domains(str(tag))
+        records.append((
+            e["job_key"], e["desc_hash"], None if main == _NO_VECTOR else main, req, bits,
+            levels(str(e.get("level") or "unknown").lower()),
+            _pack_skills(skills, e.get("required_skills") or {}, e.get("preferred_skills") or {}),
+        ))
+
+    dead = 0
+    keys = [r[0] for r in records]
+    for i in range(0, len(keys), _CHUNK):
+        chunk = keys[i:i + _CHUNK]
+        for main_row, req_row in conn.execute(
+            f"SELECT main_row, req_row FROM store_rows WHERE job_key IN ({', '.join('?' for _ in chunk)})",
+            chunk,
+        ):
+            dead += sum(1 for r in (main_row, req_row) if r is not None and r >= 0)
+
+    with open(vector_path(db_path, meta["gen"]), "a+b") as fh:
+        fh.truncate(base * dim * 4)    # drop rows a failed earlier write left behind
+        if vectors:
+            fh.write(np.stack(vectors).astype("<f4").tobytes())
+    conn.executemany(
+        "INSERT OR REPLACE INTO store_rows (job_key, desc_hash, main_row, req_row, domain_bits, "
+        "level_code, skills) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        records,
+    )
+    _set_meta(conn, rows=base + len(vectors), dead=meta.get("dead", 0) + dead)
+
+
+def _source_entries(conn: sqlite3.Connection) -> Iterable[dict[str, Any]]:
+    for row in conn.execute(
+        "SELECT job_key, desc_hash, required_skills, preferred_skills, domain_tags, level, "
+        "embedding_main, embedding_requirements FROM job_features"
+    ):
+        yield {
+            "job_key": row[0], "desc_hash": row[1],
+            "required_skills": json.loads(row[2]), "preferred_skills": json.loads(row[3]),
+            "domain_tags": json.loads(row[4]), "level": row[5],
+            "embedding_main": np.frombuffer(row[6], dtype=np.float32),
+            "embedding_requirements": None if row[7] is None else np.frombuffer(row[7], dtype=np.float32),
+        }
+
+
+def rebuild(conn: sqlite3.Connection, db_path: str | Path, dim: int) -> int:
+    """Write a fresh generation from every job_features row. Vectors of any
+    size other than `dim` are stored as missing."""
+    ensure_store_schema(conn)
+    conn.execute("DELETE FROM store_rows")
+    conn.execute("DELETE FROM store_meta")
+    meta = {"dim": dim, "gen": time.time_ns(), "rows": 0, "dead": 0}
+    _set_meta(conn, **meta)
+    vector_path(db_path, meta["gen"]).touch()
+    batch: list[dict[str, Any]] = []
+    count = 0
+    for entry in _source_entries(conn):
+        batch.append(entry)
+        if len(batch) == _CHUNK:
+            _append(conn, db_path, meta, batch)
+            meta.update(_meta(conn))
+            count, batch = count + len(batch), []
+    if batch:
+        _append(conn, db_path, meta, batch)
+        count += len(batch)
+    print(f"[feature_store] rebuilt jobs={count} dim={dim}")
+    return count
+
+
+def sync(conn: sqlite3.Connection, db_path: str | Path, written: list[dict[str, Any]]) -> None:
+    """Bring the store up to date with job_features rows `written` in this
+    transaction, rebuilding it when it is missing or built for another size."""
+    ensure_store_schema(conn)
+    meta = _meta(conn)
+    if written:
+        dim = int(np.asarray(written[0]["embedding_main"]).size)
+    else:
+        row = conn.execute("SELECT length(embedding_main) FROM job_features LIMIT 1").fetchone()
+        dim = meta.get("dim") or (int(row[0]) // 4 if row is not None else 0)
+    if not dim:
+        return
+    if meta.get("dim") != dim:
+        rebuild(conn, db_path, dim)
+    elif written:
+        _append(conn, db_path, meta, written)
+
+
+def needs_compaction(db_path: str | Path) -> bool:
+    conn = sqlite3.connect(str(db_path))
+    try:
+        ensure_store_schema(conn)
+        meta = _meta(conn)
+    finally:
+        conn.close()
+    return meta.get("dead", 0) > max(_CHUNK, meta.get("rows", 0) // 2)
+
+
+def compact(db_path: str | Path) -> dict[str, int]:
+    """Copy the live rows into a new generation file and drop the old one."""
+    conn = sqlite3.connect(str(db_path))
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        ensure_store_schema(conn)
+        meta = _meta(conn)
+        if not meta.get("dim"):
+            conn.rollback()
+            return {"rows": 0, "dropped": 0}
+        dim = meta["dim"]
+        old = np.fromfile(vector_path(db_path, meta["gen"]), dtype="<f4", count=meta["rows"] * dim)
+        old = old.reshape(meta["rows"], dim)
+        live = conn.execute("SELECT job_key, main_row, req_row FROM store_rows").fetchall()
+        keep: list[int] = []
+        renumbered = []
+        for key, main_row, req_row in live:
+            new = []
+            for r in (main_row, req_row):
+                if r is None or r < 0:
+                    new.append(r)
+                else:
+                    new.append(len(keep))
+                    keep.append(r)
+            renumbered.append((new[0], new[1], key))
+        gen = time.time_ns()
+        old[np.asarray(keep, dtype=np.int64)].astype("<f4").tofile(vector_path(db_path, gen))
+        conn.executemany("UPDATE store_rows SET main_row = ?, req_row = ? WHERE job_key = ?", renumbered)
+        _set_meta(conn, gen=gen, rows=len(keep), dead=0)
+        conn.commit()
+    finally:
+        conn.close()
+    sweep(db_path)
+    print(f"[feature_store] compacted rows={len(keep)} dropped={meta['rows'] - len(keep)}")
+    return {"rows": len(keep), "dropped": meta["rows"] - len(keep)}
+
+
+def sweep(db_path: str | Path) -> None:
+    """Delete generation files older than the current one. Newer ones may be a
+    rebuild still in flight elsewhere and are left alone."""
+    conn = sqlite3.connect(str(db_path))
+    try:
+        ensure_store_schema(conn)
+        gen = _meta(conn).get("gen")
+    finally:
+        conn.close()
+    if gen is None:
+        return
+    base = Path(db_path)
+    for path in base.parent.glob(f"{base.name}.vec.*"):
+        suffix = path.name.rsplit(".", 1)[-1]
+        if suffix.isdigit() and int(suffix) < gen:
+            try:
+                path.unlink()
+            except OSError:  # still mapped on a platform that forbids it; next sweep
+                pass
+
+
+def _matrix(db_path: str | Path, meta: dict[str, int]) -> np.ndarray:
+    """The current generation, memory-mapped once per process and re-mapped
+    only when it has grown past the cached view or been replaced."""
+    dim, rows = meta["dim"], meta["rows"]
+    path = vector_path(db_path, meta["gen"])
+    if not rows:
+        return np.zeros((0, dim), dtype=np.float32)
+    with _MAPS_LOCK:
+        cached = _MAPS.get(str(db_path))
+        if cached is None or cached[0] != path or cached[1].shape[0] < rows:
+            cached = (path, np.memmap(path, dtype="<f4", mode="r", shape=(rows, dim)))
+            _MAPS[str(db_path)] = cached
+        return cached[1]
+
+
+def read(db_path: str | Path, job_keys: list[str]) -> StoredFeatures | None:
+    """Stored features for `job_keys` (those with features, in input order),
+    or None when the store cannot stand in for job_features for this batch."""
+    conn = sqlite3.connect(str(db_path))
+    try:
+        ensure_store_schema(conn)
+        conn.execute("BEGIN")    # meta, rows and the mapped generation from one snapshot
+        meta = _meta(conn)
+        if not meta.get("dim"):
+            return None
+        try:
+            vectors = _matrix(db_path, meta)
+        except (OSError, ValueError):
+            return None
+        found: dict[str, tuple[Any, ...]] = {}
+        for i in range(0, len(job_keys), _CHUNK):
+            chunk = list(job_keys[i:i + _CHUNK])
+            for row in conn.execute(
+                "SELECT s.job_key, s.main_row, s.req_row, s.domain_bits, s.level_code, s.skills, "
+                "f.desc_hash IS s.desc_hash FROM store_rows s JOIN job_features f ON f.job_key = s.job_key "
+                f"WHERE s.job_key IN ({', '.join('?' for _ in chunk)})",
+                chunk,
+            ):
+                if not row[6]:
+                    return None    # job_features was rewritten behind the store's back
+                found[row[0]] = row
+        if len(found) < len(set(job_keys)):
+            absent = [k for k in dict.fromkeys(job_keys) if k not in found]
+            for i in range(0, len(absent), _CHUNK):
+                chunk = absent[i:i + _CHUNK]
+                if conn.execute(
+                    f"SELECT 1 FROM job_features WHERE job_key IN ({', '.join('?' for _ in chunk)}) LIMIT 1",
+                    chunk,
+                ).fetchone():
+                    return None
+        names = {kind: _names(conn, kind) for kind in ("skill", "domain", "level")}
+    finally:
+        conn.close()
+
+    rows = [found[k] for k in job_keys if k in found]
+    main_row = np.array([-1 if r[1] is None else r[1] for r in rows], dtype=np.int64)
+    req_row = np.array([m if r[2] is None else r[2] for r, m in zip(rows, main_row)], dtype=np.int64)
+    blobs = [r[5] for r in rows]
+    offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum([len(b) // SKILL_DTYPE.itemsize for b in blobs], out=offsets[1:])
+    return StoredFeatures(
+        keys=[r[0] for r in rows],
+        dim=meta["dim"],
+        vectors=vectors,
+        main_row=main_row,
+        req_row=req_row,
+        domain_bits=np.array([r[3] for r in rows], dtype=np.int64),
+        level_code=np.array([r[4] for r in rows], dtype=np.int64),
+        skills=np.frombuffer(b"".join(blobs), dtype=SKILL_DTYPE),
+        skill_offsets=offsets,
+        skill_names=names["skill"],
+        domain_names=names["domain"],
+        level_names=names["level"],
+    )
+
+
+def main() -> int:
+    try:
+        from backend.matcher.features import FEATURES_DB
+    except ImportError:  # pragma: no cover - backend/ on sys.path
+        from matcher.features import FEATURES_DB  # type: ignore
+    parser = argparse.ArgumentParser(description="Maintain the memory-mapped job feature store.")
+    parser.add_argument("--db", default=str(FEATURES_DB))
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument("--compact", action="store_true", help="drop dead rows from the vector file")
+    action.add_argument("--rebuild", action="store_true", help="rebuild the store from job_features")
+    args = parser.parse_args()
+    if args.compact:
+        compact(args.db)
+        return 0
+    conn = sqlite3.connect(args.db)
+    try:
+        ensure_store_schema(conn)
+        conn.execute("DELETE FROM store_meta")
+        sync(conn, args.db, [])
+        conn.commit()
+    finally:
+        conn.close()
+    sweep(args.db)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,23 +1,41 @@
 """Per-job feature extraction and cache for hybrid filtering (Phase-2 §3.2).
 
 Owns backend/matcher/features.db (rule 8): a job_features table plus an FTS5
-index used for BM25 lexical scoring. JD text is untrusted input (rule 6): it is
+index used for BM25 lexical scoring, an IVF index over the job embeddings
+(matcher/ann.py) for the semantic shortlist, and the memory-mapped columnar
+copy the hybrid scorer reads (matcher/feature_store.py). JD text is untrusted input (rule 6): it is
 only ever regex-matched or embedded here, never templated into an LLM prompt.
 """
 
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor
 import hashlib
 import json
+import multiprocessing
+import os
 import re
 import sqlite3
+import tempfile
+import time
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Callable
 
 import numpy as np
 
+try:
+    from backend.matcher import ann, feature_store
+except ImportError:  # pragma: no cover - backend/ on sys.path
+    from matcher import ann, feature_store  # type: ignore
+
 FEATURES_DB = Path(__file__).with_name("features.db")
+# Stale jobs built, embedded and committed per step of ensure_job_features.
+EMBED_BATCH = 256
+# Extraction worker processes; builds smaller than PARALLEL_MIN_JOBS stay
+# in-process (a spawned worker costs more to start than it saves).
+FEATURE_WORKERS = int(os.getenv("SMARTAPPLY_FEATURE_WORKERS", "0")) or (os.cpu_count() or 1)
+PARALLEL_MIN_JOBS = 500
 
 # Domain tag -> keyword phrases (matched case-insensitively with word boundaries).
 # Agent C's candidate_features.py imports this table — keep the name stable.
@@ -122,6 +140,12 @@ _REMOTE_RE = re.compile(
 
 _FTS_SANITIZE_RE = re.compile(r"[^A-Za-z0-9+#. -]")
 
+# One word-bounded alternation per domain tag, in DOMAIN_KEYWORDS order.
+_DOMAIN_PATTERNS: list[tuple[str, re.Pattern[str]]] = [
+    (tag, re.compile(r"\b(?:" + "|".join(re.escape(p) for p in phrases) + r")\b"))
+    for tag, phrases in DOMAIN_KEYWORDS.items()
+]
+
 
 def _job_key(job: dict[str, Any]) -> str:
     return f"{job.get('source_ats') or ''}:{job.get('external_id') or ''}"
@@ -175,13 +199,7 @@ def _split_sections(text: str) -> tuple[str, str]:
 
 def _detect_domains(text: str) -> list[str]:
     lowered = (text or "").lower()
-    tags: list[str] = []
-    for tag, phrases in DOMAIN_KEYWORDS.items():
-        for phrase in phrases:
-            if re.search(rf"\b{re.escape(phrase)}\b", lowered):
-                tags.append(tag)
-                break
-    return tags
+    return [tag for tag, pattern in _DOMAIN_PATTERNS if pattern.search(lowered)]
 
 
 def _extract_level(title: str) -> str:
@@ -306,6 +324,185 @@ def _write_features(
     )
 
 
+# --- parallel extraction ------------------------------------------------------
+# build_job_features is regex-bound, so large builds shard it across worker
+# processes. Each worker is started once per ensure_job_features call with the
+# ontology and loads the compiled SkillMatcher from a JSON file the parent
+# wrote, rather than rebuilding it; results come back as plain tuples and the
+# parent stays the only writer of features.db.
+
+_FEATURE_FIELDS = (
+    "job_key", "desc_hash", "required_skills", "preferred_skills", "domain_tags",
+    "level", "is_remote", "full_text", "requirements_text",
+)
+_JOB_FIELDS = ("source_ats", "external_id", "title", "company", "location", "description_text")
+_WORKER_ONTOLOGY: dict[str, Any] | None = None
+
+
+def _init_worker(ontology: dict[str, Any] | None, matcher_path: str) -> None:
+    global _WORKER_ONTOLOGY
+    try:
+        from backend.matcher.ontology import compiled_matcher, load_ontology
+    except ImportError:  # pragma: no cover - backend/ on sys.path
+        from matcher.ontology import compiled_matcher, load_ontology  # type: ignore
+    os.environ["SMARTAPPLY_ONTOLOGY_MATCHER_CACHE"] = matcher_path
+    _WORKER_ONTOLOGY = ontology if ontology is not None else load_ontology()
+    compiled_matcher(_WORKER_ONTOLOGY)
+
+
+def _extract_shard(jobs: list[tuple[Any, ...]]) -> list[tuple[Any, ...]]:
+    """Worker side: (True, *feature fields) or (False, job_key, error) per job."""
+    out: list[tuple[Any, ...]] = []
+    for values in jobs:
+        job = dict(zip(_JOB_FIELDS, values))
+        try:
+            feats = build_job_features(job, _WORKER_ONTOLOGY)
+            out.append((True, *(feats[name] for name in _FEATURE_FIELDS)))
+        except Exception as exc:
+            out.append((False, _job_key(job), str(exc)))
+    return out
+
+
+def _extraction_pool(ontology: dict[str, Any] | None, workers: int) -> tuple[ProcessPoolExecutor, str] | None:
+    """A started worker pool and the matcher file it reads, or None when one
+    cannot be started here (the build then extracts in-process)."""
+    try:
+        from backend.matcher.ontology import compiled_matcher
+    except ImportError:  # pragma: no cover - backend/ on sys.path
+        from matcher.ontology import compiled_matcher  # type: ignore
+    fd, matcher_path = tempfile.mkstemp(prefix="smartapply-matcher-", suffix=".json")
+    os.close(fd)
+    try:
+        compiled_matcher(ontology).save(matcher_path)
+        # spawn, not fork: the API process has threads and open connections.
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(ontology, matcher_path),
+        )
+    except Exception as exc:
+        Path(matcher_path).unlink(missing_ok=True)
+        print(f"[features] extraction workers unavailable ({exc}); extracting in-process")
+        return None
+    return pool, matcher_path
+
+
+def _extract_batch(
+    jobs: list[dict[str, Any]], pool: ProcessPoolExecutor, workers: int
+) -> tuple[list[dict[str, Any]], int]:
+    """build_job_features for `jobs` across the pool, in input order."""
+    shard = (len(jobs) + workers - 1) // workers
+    payload = [tuple(job.get(name) for name in _JOB_FIELDS) for job in jobs]
+    pending: list[dict[str, Any]] = []
+    failed = 0
+    for results in pool.map(_extract_shard, [payload[i:i + shard] for i in range(0, len(payload), shard)]):
+        for ok, *values in results:
+            if ok:
+                pending.append(dict(zip(_FEATURE_FIELDS, values)))
+            else:
+                failed += 1
+                print(f"[features] skip {values[0]}: {values[1]}")
+    return pending, failed
+
+
+def _stale_jobs(
+    conn: sqlite3.Connection, jobs: list[dict[str, Any]]
+) -> tuple[list[dict[str, Any]], int, int]:
+    """(jobs whose features are missing or built from another description,
+    reused count, failed count), diffed against job_features in one join."""
+    probe: list[tuple[int, str, str]] = []
+    failed = 0
+    for pos, job in enumerate(jobs):
+        job_key = _job_key(job)
+        try:
+            probe.append((pos, job_key, _sha256(job.get("description_text") or "")))
+        except Exception as exc:
+            failed += 1
+            print(f"[features] skip {job_key}: {exc}")
+    conn.execute(
+        "CREATE TEMP TABLE IF NOT EXISTS feature_probe "
+        "(pos INTEGER PRIMARY KEY, job_key TEXT NOT NULL, desc_hash TEXT NOT NULL)"
+    )
+    conn.execute("DELETE FROM feature_probe")
+    conn.executemany("INSERT INTO feature_probe (pos, job_key, desc_hash) VALUES (?, ?, ?)", probe)
+    stale = [
+        jobs[pos]
+        for (pos,) in conn.execute(
+            "SELECT p.pos FROM feature_probe p LEFT JOIN job_features f ON f.job_key = p.job_key "
+            "WHERE f.desc_hash IS NOT p.desc_hash ORDER BY p.pos"
+        )
+    ]
+    conn.execute("DELETE FROM feature_probe")
+    conn.commit()
+    return stale, len(probe) - len(stale), failed
+
+
+def _embed_pending(
+    pending: list[dict[str, Any]], embed_fn: Callable[[list[str]], list[list[float]]]
+) -> tuple[list[tuple[dict[str, Any], list[Any]]], int]:
+    """Embed one batch in a single embed_fn call; if that fails, retry per job
+    so one bad job is logged and skipped. Returns (embedded, failed)."""
+    texts: list[str] = []
+    spans: list[tuple[int, int]] = []
+    for feats in pending:
+        start = len(texts)
+        texts.extend(_embed_texts_for(feats))
+        spans.append((start, len(texts)))
+    try:
+        batch_vectors = embed_fn(texts)
+        if len(batch_vectors) != len(texts):
+            raise ValueError(
+                f"embed_fn returned {len(batch_vectors)} vectors "
+                f"for {len(texts)} texts"
+            )
+        return [(feats, list(batch_vectors[a:b])) for feats, (a, b) in zip(pending, spans)], 0
+    except Exception as exc:
+        print(f"[features] batch embed failed ({exc}); retrying per job")
+    embedded: list[tuple[dict[str, Any], list[Any]]] = []
+    failed = 0
+    for feats in pending:
+        job_texts = _embed_texts_for(feats)
+        try:
+            vectors = embed_fn(job_texts)
+            if len(vectors) != len(job_texts):
+                raise ValueError(
+                    f"embed_fn returned {len(vectors)} vectors "
+                    f"for {len(job_texts)} texts"
+                )
+            embedded.append((feats, list(vectors)))
+        except Exception as exc:
+            failed += 1
+            print(f"[features] skip {feats['job_key']}: {exc}")
+    return embedded, failed
+
+
+def _sync_indexes(
+    conn: sqlite3.Connection,
+    db_path: str | Path,
+    written: list[dict[str, Any]],
+) -> None:
+    """Bring the feature store and the ANN index up to date with `written`
+    (already in the open transaction) and commit. Neither failing loses the
+    features themselves."""
+    conn.execute("SAVEPOINT feature_store")
+    try:
+        feature_store.sync(conn, db_path, written)
+        conn.execute("RELEASE feature_store")
+    except Exception as exc:  # readers fall back to get_features until a rebuild
+        conn.execute("ROLLBACK TO feature_store")
+        conn.execute("DELETE FROM store_meta")
+        conn.execute("RELEASE feature_store")
+        print(f"[features] feature store update failed: {exc}")
+    conn.commit()
+    try:
+        ann.add_vectors(conn, [(w["job_key"], w["embedding_main"]) for w in written])
+        conn.commit()
+    except Exception as exc:  # the index only narrows ranking; features stand
+        conn.rollback()
+        print(f"[features] ann index update failed: {exc}")
+
+
 def ensure_job_features(
     jobs: list[dict[str, Any]],
     db_path: str | Path = FEATURES_DB,
@@ -313,86 +510,97 @@ def ensure_job_features(
     ontology: dict[str, Any] | None = None,
     embed_fn: Callable[[list[str]], list[list[float]]] | None = None,
     mapper: Callable[..., dict[str, float]] | None = None,
+    batch_size: int = EMBED_BATCH,
+    workers: int | None = None,
 ) -> dict[str, int]:
     """Incrementally build features for jobs (keyed by desc_hash).
 
-    Batches embeddings for new/changed jobs in one embed_fn call; if the batch
-    call fails, falls back to per-job embedding so one bad job is logged and
-    skipped, never killing the run (rule 7).
+    Stale jobs are found with one set-based diff, then built, embedded and
+    committed ``batch_size`` at a time, so memory stays bounded by one batch
+    and an interrupted build resumes where it stopped. Each batch is one
+    embed_fn call; if it fails, falls back to per-job embedding so one bad
+    job is logged and skipped, never killing the run (rule 7).
+
+    With the default mapper, builds of at least PARALLEL_MIN_JOBS stale jobs
+    extract features in ``workers`` processes (default FEATURE_WORKERS).
     """
-    built = reused = failed = 0
+    built = failed = 0
+    started = time.monotonic()
+    workers = max(1, FEATURE_WORKERS if workers is None else int(workers))
+    pool: tuple[ProcessPoolExecutor, str] | None = None
     conn = sqlite3.connect(str(db_path))
     try:
         ensure_features_schema(conn)
-
-        pending: list[dict[str, Any]] = []
-        for job in jobs:
-            job_key = _job_key(job)
-            try:
-                desc_hash = _sha256(job.get("description_text") or "")
-                row = conn.execute(
-                    "SELECT desc_hash FROM job_features WHERE job_key = ?",
-                    (job_key,),
-                ).fetchone()
-                if row is not None and row[0] == desc_hash:
-                    reused += 1
-                    continue
-                pending.append(build_job_features(job, ontology, mapper=mapper))
-            except Exception as exc:
-                failed += 1
-                print(f"[features] skip {job_key}: {exc}")
-
-        embeddable: list[tuple[dict[str, Any], list[Any]]] = []
-        if pending:
-            if embed_fn is None:
-                embed_fn = _default_embed()
-            texts: list[str] = []
-            spans: list[tuple[int, int]] = []
-            for feats in pending:
-                start = len(texts)
-                texts.extend(_embed_texts_for(feats))
-                spans.append((start, len(texts)))
-            batch_vectors: Any = None
-            try:
-                batch_vectors = embed_fn(texts)
-                if len(batch_vectors) != len(texts):
-                    raise ValueError(
-                        f"embed_fn returned {len(batch_vectors)} vectors "
-                        f"for {len(texts)} texts"
-                    )
-            except Exception as exc:
-                print(f"[features] batch embed failed ({exc}); retrying per job")
-                batch_vectors = None
-            if batch_vectors is not None:
-                for feats, (start, end) in zip(pending, spans):
-                    embeddable.append((feats, list(batch_vectors[start:end])))
-            else:
-                for feats in pending:
-                    job_texts = _embed_texts_for(feats)
+        stale, reused, failed = _stale_jobs(conn, jobs)
+        if mapper is None and workers > 1 and len(stale) >= PARALLEL_MIN_JOBS:
+            pool = _extraction_pool(ontology, workers)
+        if not stale:
+            # Nothing to embed: only a features.db that predates the store or
+            # the ANN index needs work.
+            _sync_indexes(conn, db_path, [])
+        size = max(1, int(batch_size))
+        batches = (len(stale) + size - 1) // size
+        for number, start in enumerate(range(0, len(stale), size), 1):
+            batch = stale[start:start + size]
+            pending: list[dict[str, Any]] = []
+            if pool is not None:
+                try:
+                    pending, extract_failed = _extract_batch(batch, pool[0], workers)
+                    failed += extract_failed
+                except Exception as exc:  # e.g. a worker died; finish in-process
+                    print(f"[features] extraction workers failed ({exc}); extracting in-process")
+                    pool[0].shutdown(cancel_futures=True)
+                    Path(pool[1]).unlink(missing_ok=True)
+                    pool, pending = None, []
+            if pool is None:
+                for job in batch:
                     try:
-                        vectors = embed_fn(job_texts)
-                        if len(vectors) != len(job_texts):
-                            raise ValueError(
-                                f"embed_fn returned {len(vectors)} vectors "
-                                f"for {len(job_texts)} texts"
-                            )
-                        embeddable.append((feats, list(vectors)))
+                        pending.append(build_job_features(job, ontology, mapper=mapper))
                     except Exception as exc:
                         failed += 1
-                        print(f"[features] skip {feats['job_key']}: {exc}")
-
-        now = datetime.now(timezone.utc).isoformat(timespec="seconds")
-        for feats, vectors in embeddable:
-            try:
-                _write_features(conn, feats, vectors, now)
-                built += 1
-            except Exception as exc:
-                failed += 1
-                print(f"[features] skip {feats['job_key']}: {exc}")
-        conn.commit()
+                        print(f"[features] skip {_job_key(job)}: {exc}")
+            embedded: list[tuple[dict[str, Any], list[Any]]] = []
+            if pending:
+                if embed_fn is None:
+                    embed_fn = _default_embed()
+                embedded, embed_failed = _embed_pending(pending, embed_fn)
+                failed += embed_failed
+
+            now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+            written: list[dict[str, Any]] = []
+            for feats, vectors in embedded:
+                try:
+                    _write_features(conn, feats, vectors, now)
+                    built += 1
+                    written.append({
+                        **feats,
+                        "embedding_main": vectors[0],
+                        "embedding_requirements": vectors[1] if len(vectors) > 1 else None,
+                    })
+                except Exception as exc:
+                    failed += 1
+                    print(f"[features] skip {feats['job_key']}: {exc}")
+            _sync_indexes(conn, db_path, written)
+            if batches > 1:
+                done = min(start + size, len(stale))
+                rate = done / max(time.monotonic() - started, 1e-9)
+                print(
+                    f"[features] batch {number}/{batches}: {done}/{len(stale)} stale jobs "
+                    f"({rate:.0f} jobs/s, eta {(len(stale) - done) / rate:.0f}s)"
+                )
     finally:
         conn.close()
-    print(f"[features] built={built} reused={reused} failed={failed}")
+        if pool is not None:
+            pool[0].shutdown(cancel_futures=True)
+            Path(pool[1]).unlink(missing_ok=True)
+    try:
+        if feature_store.needs_compaction(db_path):
+            feature_store.compact(db_path)
+        feature_store.sweep(db_path)
+    except Exception as exc:  # dead rows only cost disk until the next pass
+        print(f"[features] feature store compaction failed: {exc}")
+    elapsed = time.monotonic() - started
+    print(f"[features] built={built} reused={reused} failed={failed} in {elapsed:.1f}s")
     return {"built": built, "reused": reused, "failed": failed}
 
 
@@ -3,8 +3,9 @@
 Fuses five LLM-free components — ontology skill coverage, FTS5 BM25 lexical
 relevance, dense-embedding similarity, domain alignment, and level fit — into a
 single 0–100 score with fixed, versioned weights. Runs over EVERY prefilter
-survivor so the expensive LLM five-dimension fit (matcher stage 3) is spent only
-on the hybrid top-K rather than a noisy semantic top-50.
+survivor (as whole-batch NumPy ops — see the columnar engine below) so the
+expensive LLM five-dimension fit (matcher stage 3) is spent only on the hybrid
+top-K rather than a noisy semantic top-50.
 
 No network, no LLM, no randomness: the same (candidate, job, features, weights)
 always yields the same score, which is what makes calibration and cross-run
@@ -13,14 +14,17 @@ comparison meaningful.
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from typing import Any, Callable
 
 import numpy as np
 
 try:
+    from backend.matcher import feature_store
     from backend.matcher.features import FEATURES_DB, bm25_scores, get_features
     from backend.matcher.ontology import load_ontology, match_strength
 except ImportError:  # pragma: no cover - package-style import
+    from matcher import feature_store  # type: ignore
     from matcher.features import FEATURES_DB, bm25_scores, get_features  # type: ignore
     from matcher.ontology import load_ontology, match_strength  # type: ignore
 
@@ -212,6 +216,333 @@ def _explain(
     }
 
 
+# ── columnar engine ──────────────────────────────────────────────────
+# score_jobs_hybrid scores the whole batch at once: the features are packed
+# into arrays (sparse job×skill COO triples keyed by the ontology, an N×d
+# embedding matrix, a job×domain bool matrix, a level column), then every
+# component and the weighted total are NumPy ops. The arrays come straight
+# from the memory-mapped feature store when it is current, else one Python
+# pass packs get_features' per-job dicts. The scalar
+# score_* functions above stay the reference semantics — test_hybrid asserts
+# parity — and _explain runs only for the rows that are returned explained.
+
+
+@dataclass(slots=True)
+class FeatureColumns:
+    """Columnar view of N jobs' features (row i == keys[i])."""
+
+    keys: list[str]
+    skill_ids: list[str]
+    # COO triples (row, skill column, weight) for required / preferred skills,
+    # plus the required-over-preferred merge used when a job has no required.
+    req: tuple[np.ndarray, np.ndarray, np.ndarray]
+    pref: tuple[np.ndarray, np.ndarray, np.ndarray]
+    merged: tuple[np.ndarray, np.ndarray, np.ndarray]
+    emb_main: np.ndarray          # N×d float32; zero row where dim mismatched
+    emb_main_ok: np.ndarray       # N bool
+    emb_req: np.ndarray           # N×d float32 (main when no requirements vector)
+    emb_req_ok: np.ndarray        # N bool
+    domains: np.ndarray           # N×T bool
+    domain_tags: list[str]
+    levels: list[str]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+def _coo(rows: list[int], cols: list[int], vals: list[float]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    return (
+        np.asarray(rows, dtype=np.int64),
+        np.asarray(cols, dtype=np.int64),
+        np.asarray(vals, dtype=np.float64),
+    )
+
+
+def _vector_dim(candidate: dict[str, Any], feats: dict[str, dict[str, Any]], keys: list[str]) -> int:
+    """Embedding width the batch is scored in: the profile's, else an
+    experience vector's, else the first job's. Vectors of any other width dot
+    to 0, exactly as score_embedding's shape guard does."""
+    probes: list[Any] = [candidate.get("profile_embedding")]
+    probes.extend(candidate.get("experience_embeddings") or [])
+    probes.extend(feats[k].get("embedding_main") for k in keys[:1] if isinstance(feats[k], dict))
+    for vec in probes:
+        if vec is not None and np.asarray(vec).ndim == 1 and np.asarray(vec).size:
+            return int(np.asarray(vec).size)
+    return 0
+
+
+def build_feature_columns(
+    keys: list[str],
+    feats: dict[str, dict[str, Any]],
+    ontology: dict[str, Any],
+    dim: int,
+) -> tuple[FeatureColumns, list[str]]:
+    """Pack feature dicts into a FeatureColumns. Returns (columns, skipped keys):
+    a malformed row is logged and left out rather than failing the batch."""
+    skill_index: dict[str, int] = {sid: i for i, sid in enumerate(ontology or {})}
+    domain_index: dict[str, int] = {}
+    triples: dict[str, tuple[list[int], list[int], list[float]]] = {
+        name: ([], [], []) for name in ("req", "pref", "merged")
+    }
+    main_rows: list[Any] = []
+    req_rows: list[Any] = []
+    domain_rows: list[list[int]] = []
+    levels: list[str] = []
+    kept: list[str] = []
+    skipped: list[str] = []
+
+    def _col(skill_id: str) -> int:
+        col = skill_index.get(skill_id)
+        if col is None:
+            col = skill_index[skill_id] = len(skill_index)
+        return col
+
+    def _vec(value: Any) -> np.ndarray | None:
+        if value is None:
+            return None
+        arr = np.asarray(value, dtype=np.float32)
+        return arr if arr.ndim == 1 and arr.size == dim and dim else None
+
+    for key in keys:
+        try:
+            feat = feats[key]
+            required = {str(k): float(v) for k, v in (feat.get("required_skills") or {}).items()}
+            preferred = {str(k): float(v) for k, v in (feat.get("preferred_skills") or {}).items()}
+            main = feat.get("embedding_main")
+            req_vec = feat.get("embedding_requirements")
+            tags = [str(d) for d in (feat.get("domain_tags") or []) if d]
+            level = str(feat.get("level") or "unknown").lower()
+        except Exception as exc:  # noqa: BLE001 — one bad job never kills the batch
+            print(f"[hybrid] skip {key}: {type(exc).__name__}: {exc}")
+            skipped.append(key)
+            continue
+        row = len(kept)
+        kept.append(key)
+        for name, skills in (
+            ("req", required),
+            ("pref", preferred),
+            ("merged", {**preferred, **required}),
+        ):
+            rows, cols, vals = triples[name]
+            for sid, w in skills.items():
+                rows.append(row)
+                cols.append(_col(sid))
+                vals.append(w)
+        main_rows.append(_vec(main))
+        req_rows.append(_vec(req_vec) if req_vec is not None else _vec(main))
+        domain_rows.append([domain_index.setdefault(t, len(domain_index)) for t in tags])
+        levels.append(level)
+
+    n = len(kept)
+    width = max(dim, 1)
+    emb_main = np.zeros((n, width), dtype=np.float32)
+    emb_req = np.zeros((n, width), dtype=np.float32)
+    main_ok = np.zeros(n, dtype=bool)
+    req_ok = np.zeros(n, dtype=bool)
+    for i, (m, r) in enumerate(zip(main_rows, req_rows)):
+        if m is not None:
+            emb_main[i] = m
+            main_ok[i] = True
+        if r is not None:
+            emb_req[i] = r
+            req_ok[i] = True
+    domains = np.zeros((n, len(domain_index)), dtype=bool)
+    for i, cols in enumerate(domain_rows):
+        domains[i, cols] = True
+
+    columns = FeatureColumns(
+        keys=kept,
+        skill_ids=list(skill_index),
+        req=_coo(*triples["req"]),
+        pref=_coo(*triples["pref"]),
+        merged=_coo(*triples["merged"]),
+        emb_main=emb_main,
+        emb_main_ok=main_ok,
+        emb_req=emb_req,
+        emb_req_ok=req_ok,
+        domains=domains,
+        domain_tags=list(domain_index),
+        levels=levels,
+    )
+    return columns, skipped
+
+
+def store_feature_columns(
+    stored: feature_store.StoredFeatures, ontology: dict[str, Any]
+) -> FeatureColumns:
+    """FeatureColumns from the feature store with no per-job Python work:
+    skill codes map to columns through one lookup table, embeddings are
+    gathered from the mapped matrix and domain bits unpack with a shift."""
+    n = len(stored)
+    skill_index: dict[str, int] = {sid: i for i, sid in enumerate(ontology or {})}
+    code_col = np.zeros(len(stored.skill_names), dtype=np.int64)
+    for code in np.unique(stored.skills["code"]).tolist():
+        code_col[code] = skill_index.setdefault(stored.skill_names[code], len(skill_index))
+
+    rows = stored.skill_rows()
+    cols = code_col[stored.skills["code"]]
+    vals = stored.skills["weight"].astype(np.float64)
+    is_req = stored.skills["kind"] == 0
+    # merged == {**preferred, **required}: a preferred entry yields to a
+    # required one for the same skill.
+    pair = rows * max(len(skill_index), 1) + cols
+    keep_pref = ~is_req & ~np.isin(pair, pair[is_req])
+    merged = is_req | keep_pref
+
+    width = max(stored.dim, 1)
+    main_ok = stored.main_row >= 0
+    req_ok = stored.req_row >= 0
+    emb_main = np.zeros((n, width), dtype=np.float32)
+    emb_req = np.zeros((n, width), dtype=np.float32)
+    emb_main[main_ok] = stored.vectors[stored.main_row[main_ok]]
+    emb_req[req_ok] = stored.vectors[stored.req_row[req_ok]]
+    shifts = np.arange(len(stored.domain_names), dtype=np.int64)
+    domains = (stored.domain_bits[:, None] >> shifts) & 1 == 1
+    return FeatureColumns(
+        keys=list(stored.keys),
+        skill_ids=list(skill_index),
+        req=(rows[is_req], cols[is_req], vals[is_req]),
+        pref=(rows[~is_req], cols[~is_req], vals[~is_req]),
+        merged=(rows[merged], cols[merged], vals[merged]),
+        emb_main=emb_main,
+        emb_main_ok=main_ok,
+        emb_req=emb_req,
+        emb_req_ok=req_ok,
+        domains=domains,
+        domain_tags=list(stored.domain_names),
+        levels=[stored.level_names[c] for c in stored.level_code.tolist()],
+    )
+
+
+def _stored_columns(
+    db_path: Any, keys: list[str], candidate: dict[str, Any], ontology: dict[str, Any]
+) -> tuple[FeatureColumns, feature_store.StoredFeatures] | None:
+    """Columns from the feature store, or None when it cannot serve this
+    batch (stale, missing, or embedded at another width than the candidate)."""
+    try:
+        stored = feature_store.read(db_path, keys)
+    except Exception as exc:  # noqa: BLE001 — the dict path still works
+        print(f"[hybrid] feature store unreadable ({type(exc).__name__}: {exc}); using get_features")
+        return None
+    if stored is None:
+        return None
+    probes: list[Any] = [candidate.get("profile_embedding")]
+    probes.extend(candidate.get("experience_embeddings") or [])
+    for vec in probes:
+        if vec is not None and np.asarray(vec).ndim == 1 and np.asarray(vec).size:
+            if np.asarray(vec).size != stored.dim:
+                return None
+            break
+    return store_feature_columns(stored, ontology), stored
+
+
+def _coverage_matrix(
+    coo: tuple[np.ndarray, np.ndarray, np.ndarray], strength: np.ndarray, n: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorized _coverage: (coverage, defined) per row via bincount matvec."""
+    rows, cols, vals = coo
+    total = np.bincount(rows, weights=vals, minlength=n)
+    earned = np.bincount(rows, weights=vals * strength[cols], minlength=n)
+    present = np.bincount(rows, minlength=n) > 0
+    defined = present & (total > 0)
+    cov = np.divide(earned, total, out=np.zeros(n), where=defined)
+    return cov, defined
+
+
+def score_skills_matrix(
+    candidate_skills: dict[str, float], columns: FeatureColumns, ontology: dict[str, Any]
+) -> np.ndarray:
+    """score_skills over every row. match_strength is evaluated once per skill
+    column (not once per job×skill), then coverage is a sparse mat-vec."""
+    n = len(columns)
+    strength = np.array(
+        [match_strength(candidate_skills, sid, ontology) for sid in columns.skill_ids],
+        dtype=np.float64,
+    )
+    cov_req, has_req = _coverage_matrix(columns.req, strength, n)
+    cov_pref, has_pref = _coverage_matrix(columns.pref, strength, n)
+    cov_all, has_all = _coverage_matrix(columns.merged, strength, n)
+
+    blended = np.where(has_pref, _ALPHA_REQUIRED * cov_req + _BETA_PREFERRED * cov_pref, cov_req)
+    with_req = np.clip(blended, 0.0, 1.0)
+    fallback = np.where(has_all, np.minimum(1.0, cov_all), 0.0)
+    return np.round(np.where(has_req, with_req, fallback) * 100.0, 2)
+
+
+def normalize_bm25_array(raw: dict[str, float], job_keys: list[str]) -> np.ndarray:
+    """normalize_bm25 as an array aligned with job_keys."""
+    vals = np.array([float(raw.get(k, 0.0)) for k in job_keys], dtype=np.float64)
+    if not vals.size:
+        return vals
+    lo, hi = float(vals.min()), float(vals.max())
+    if hi - lo <= 1e-12:
+        return np.full(vals.shape, 50.0)
+    return np.round((vals - lo) / (hi - lo) * 100.0, 2)
+
+
+def score_embedding_matrix(
+    profile_embedding: np.ndarray | None,
+    experience_embeddings: list[np.ndarray],
+    columns: FeatureColumns,
+) -> np.ndarray:
+    """score_embedding over every row: one mat-vec for the profile and one
+    N×E mat-mat for the experiences, max-reduced per row."""
+    n = len(columns)
+    dim = columns.emb_main.shape[1]
+
+    def _ok(vec: Any) -> bool:
+        return vec is not None and np.asarray(vec).ndim == 1 and np.asarray(vec).size == dim
+
+    if _ok(profile_embedding):
+        p = np.asarray(profile_embedding, dtype=np.float32)
+        sim_profile = np.where(columns.emb_main_ok, columns.emb_main @ p, 0.0).astype(np.float64)
+    else:
+        sim_profile = np.zeros(n)
+
+    best_exp = sim_profile
+    if experience_embeddings:
+        good = [np.asarray(e, dtype=np.float32) for e in experience_embeddings if _ok(e)]
+        if good:
+            sims = (columns.emb_req @ np.stack(good).T).astype(np.float64)
+            sims[~columns.emb_req_ok] = 0.0
+            best_exp = sims.max(axis=1)
+            if len(good) < len(experience_embeddings):
+                best_exp = np.maximum(best_exp, 0.0)   # a shape-mismatched vector dots to 0
+        else:
+            best_exp = np.zeros(n)
+    sim = 0.6 * sim_profile + 0.4 * best_exp
+    return np.round(np.maximum(0.0, sim) * 100.0, 2)
+
+
+def score_domain_matrix(candidate_domains: list[str], columns: FeatureColumns) -> np.ndarray:
+    """score_domain ladder over every row via the job×domain bool matrix."""
+    n = len(columns)
+    cand = {d for d in candidate_domains if d}
+    adjacent: set[str] = set()
+    for c in cand:
+        adjacent |= _ADJACENCY.get(c, set())
+    direct_mask = np.array([t in cand for t in columns.domain_tags], dtype=bool)
+    adjacent_mask = np.array([t in adjacent for t in columns.domain_tags], dtype=bool)
+    has_job = columns.domains.any(axis=1)
+    direct = (columns.domains & direct_mask).any(axis=1)
+    adjacent_hit = (columns.domains & adjacent_mask).any(axis=1)
+    out = np.full(n, 30.0)
+    if not cand:
+        out[:] = 50.0
+    else:
+        out[~has_job] = 50.0
+    out[adjacent_hit] = 70.0
+    out[direct] = 100.0
+    return out
+
+
+def score_level_matrix(target_level: str, columns: FeatureColumns) -> np.ndarray:
+    """score_level over every row: one matrix lookup per distinct job level."""
+    vocab = sorted(set(columns.levels))
+    lookup = {lvl: score_level(target_level, lvl) for lvl in vocab}
+    return np.array([lookup[lvl] for lvl in columns.levels], dtype=np.float64)
+
+
 def score_jobs_hybrid(
     candidate: dict[str, Any],
     jobs: list[dict[str, Any]],
@@ -221,18 +552,22 @@ def score_jobs_hybrid(
     ontology: dict[str, Any] | None = None,
     bm25_fn: Callable[..., dict[str, float]] | None = None,
     get_features_fn: Callable[..., dict[str, dict[str, Any]]] | None = None,
+    explain_top: int | None = None,
+    bm25_keys: list[str] | None = None,
 ) -> list[dict[str, Any]]:
     """Score every job deterministically; return items sorted by hybrid_total desc.
 
     Jobs whose features are not yet built are skipped with a loud log line (they
     are picked up on the next feature-build pass). One malformed job never kills
-    the batch (rule 7).
+    the batch (rule 7). ``explain_top`` limits the per-job skill explanation to
+    the top-N results (None explains all); the rest carry an empty dict.
+    ``bm25_keys`` widens the BM25 min–max population beyond ``jobs`` (incremental
+    runs score only the delta but normalize against every survivor).
     """
     weights = _validate_weights(weights or DEFAULT_WEIGHTS)
     if ontology is None:
         ontology = load_ontology()
     bm25_fn = bm25_fn or bm25_scores
-    get_features_fn = get_features_fn or get_features
 
     key_to_job: dict[str, dict[str, Any]] = {}
     ordered_keys: list[str] = []
@@ -241,8 +576,17 @@ def score_jobs_hybrid(
         key_to_job[key] = job
         ordered_keys.append(key)
 
-    feats = get_features_fn(db_path, ordered_keys)
-    present_keys = [k for k in ordered_keys if k in feats]
+    # Injected get_features_fn (tests, tools) always takes the dict path.
+    from_store = None if get_features_fn else _stored_columns(db_path, ordered_keys, candidate, ontology)
+    if from_store is not None:
+        columns, stored = from_store
+        present_keys = columns.keys
+        row_of = {k: i for i, k in enumerate(columns.keys)}
+        feature_of: Callable[[str], dict[str, Any]] = lambda key: stored.features(row_of[key])
+    else:
+        feats = (get_features_fn or get_features)(db_path, ordered_keys)
+        present_keys = [k for k in ordered_keys if k in feats]
+        feature_of = feats.__getitem__
     missing = len(ordered_keys) - len(present_keys)
     if missing:
         print(f"[hybrid] {missing} job(s) missing features — skipped this run")
@@ -250,8 +594,10 @@ def score_jobs_hybrid(
         return []
 
     query_terms = candidate.get("query_terms") or []
-    raw_bm25 = bm25_fn(db_path, query_terms, present_keys)
-    bm25_norm = normalize_bm25(raw_bm25, present_keys)
+    population = present_keys
+    if bm25_keys:
+        population = list(dict.fromkeys([*bm25_keys, *present_keys]))
+    raw_bm25 = bm25_fn(db_path, query_terms, population)
 
     cand_skills = candidate.get("skills") or {}
     cand_domains = candidate.get("domains") or []
@@ -259,47 +605,59 @@ def score_jobs_hybrid(
     profile_emb = candidate.get("profile_embedding")
     exp_embs = candidate.get("experience_embeddings") or []
 
+    if from_store is None:
+        columns, _ = build_feature_columns(
+            present_keys, feats, ontology, _vector_dim(candidate, feats, present_keys)
+        )
+    if not len(columns):
+        return []
+
+    # BM25 is normalized over every present job (as before), then aligned to rows.
+    bm25_col = normalize_bm25_array(raw_bm25, population)
+    if len(columns) != len(population):
+        position = {k: i for i, k in enumerate(population)}
+        bm25_col = bm25_col[[position[k] for k in columns.keys]]
+
+    component_cols = {
+        "skills": score_skills_matrix(cand_skills, columns, ontology),
+        "bm25": bm25_col,
+        "embedding": score_embedding_matrix(profile_emb, exp_embs, columns),
+        "domain": score_domain_matrix(cand_domains, columns),
+        "level": score_level_matrix(target_level, columns),
+    }
+    totals = np.zeros(len(columns))
+    for name in weights:
+        totals = totals + weights[name] * component_cols[name]
+    totals = np.round(totals, 2)
+
+    order = np.argsort(-totals, kind="stable")
+    limit = len(order) if explain_top is None else max(0, int(explain_top))
     results: list[dict[str, Any]] = []
-    for key in present_keys:
-        try:
-            feat = feats[key]
-            components = {
-                "skills": score_skills(
+    for rank, row in enumerate(order):
+        key = columns.keys[row]
+        explanation: dict[str, Any] = {}
+        if rank < limit:
+            try:
+                feat = feature_of(key)
+                explanation = _explain(
                     cand_skills,
                     feat.get("required_skills") or {},
                     feat.get("preferred_skills") or {},
                     ontology,
-                ),
-                "bm25": bm25_norm.get(key, 50.0),
-                "embedding": score_embedding(
-                    profile_emb,
-                    exp_embs,
-                    feat.get("embedding_main"),
-                    feat.get("embedding_requirements"),
-                ),
-                "domain": score_domain(cand_domains, feat.get("domain_tags") or []),
-                "level": score_level(target_level, feat.get("level") or "unknown"),
+                    feat.get("domain_tags") or [],
+                    feat.get("level") or "unknown",
+                )
+            except Exception as exc:  # noqa: BLE001 — one bad job never kills the batch
+                print(f"[hybrid] skip {key}: {type(exc).__name__}: {exc}")
+                continue
+        results.append(
+            {
+                "job_key": key,
+                "job": key_to_job[key],
+                "hybrid_total": float(totals[row]),
+                "components": {name: float(col[row]) for name, col in component_cols.items()},
+                "explanation": explanation,
+                "scoring_version": SCORING_VERSION,
             }
-            total = round(sum(weights[k] * components[k] for k in weights), 2)
-            results.append(
-                {
-                    "job_key": key,
-                    "job": key_to_job[key],
-                    "hybrid_total": total,
-                    "components": components,
-                    "explanation": _explain(
-                        cand_skills,
-                        feat.get("required_skills") or {},
-                        feat.get("preferred_skills") or {},
-                        ontology,
-                        feat.get("domain_tags") or [],
-                        feat.get("level") or "unknown",
-                    ),
-                    "scoring_version": SCORING_VERSION,
-                }
-            )
-        except Exception as exc:  # noqa: BLE001 — one bad job never kills the batch
-            print(f"[hybrid] skip {key}: {type(exc).__name__}: {exc}")
-
-    results.sort(key=lambda item: item["hybrid_total"], reverse=True)
+        )
     return results
@@ -0,0 +1,137 @@
+"""Incremental matching — a nightly run costs the day's delta, not the corpus.
+
+Each profile keeps a watermark in matches.db (``match_state``): the scoring
+signature it was last matched under and the newest ``jobs.last_seen`` that run
+saw. Per job, ``match_scores`` caches the content fingerprint plus the hybrid
+result and (for jobs that reached stage 3) the LLM fit. A run then:
+
+- fingerprints only survivors the scraper has written since the watermark
+  (an untouched row cannot have changed) and compares them with the cache,
+- hybrid-scores and fit-scores only new or changed jobs,
+- carries the cached hybrid + fit results forward for everything else, and
+- drops the profile's cache when the signature changes (profile hash, hybrid
+  weights, SCORING_VERSION, ontology version, fit LLM or search boost).
+
+Carried-forward hybrid totals keep the BM25 normalization of the run that
+produced them; new jobs are normalized against the full survivor set so they
+rank on the same scale. ``run_pipeline(full=True)`` (``--full``) rescores
+everything.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Any
+
+# Job fields that feed the hybrid scorer or the LLM fit; a change to any of
+# them makes the job part of the delta.
+FINGERPRINT_FIELDS: tuple[str, ...] = (
+    "title", "company", "location", "description_text", "matched_searches", "is_internship",
+)
+
+
+def job_key(job: dict[str, Any]) -> str:
+    return f"{job.get('source_ats') or ''}:{job.get('external_id') or ''}"
+
+
+def job_fingerprint(job: dict[str, Any]) -> str:
+    """The scraper's content_hash when the row has one (plus the detail_hash
+    of a hydrated description), else a hash of the fields above (rows written
+    before jobs.content_hash existed)."""
+    if job.get("content_hash"):
+        if job.get("detail_hash"):
+            return f"{job['content_hash']}:{job['detail_hash']}"
+        return str(job["content_hash"])
+    payload = json.dumps([job.get(name) for name in FINGERPRINT_FIELDS], ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def match_signature(
+    *,
+    profile_hash: str,
+    weights: dict[str, float],
+    scoring_version: str,
+    ontology_version: str,
+    target_level: str,
+    llm_prefer: str,
+    search_boost: int,
+) -> str:
+    """Everything a cached score depends on besides the job itself."""
+    payload = json.dumps(
+        {
+            "profile": profile_hash,
+            "weights": {k: round(float(v), 6) for k, v in sorted(weights.items())},
+            "scoring_version": scoring_version,
+            "ontology": ontology_version,
+            "target_level": target_level,
+            "llm": llm_prefer,
+            "search_boost": int(search_boost),
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def fit_is_cacheable(fit: dict[str, Any] | None) -> bool:
+    """False for the all-zero fallback fit (LLM down / parse failure) so a
+    transient outage is retried next run instead of being carried forward."""
+    if not fit:
+        return False
+    dims = fit.get("dimensions") or {}
+    return any(int((cell or {}).get("score") or 0) for cell in dims.values())
+
+
+@dataclass(slots=True)
+class MatchPlan:
+    signature: str
+    watermark: str | None                   # newest last_seen among survivors
+    delta: list[dict[str, Any]]             # new or changed survivors, in survivor order
+    carried: dict[str, dict[str, Any]]      # job_key -> cached {"job_hash","hybrid","fit"}
+    fingerprints: dict[str, str] = field(default_factory=dict)  # job_key -> hash for every survivor
+    reset: bool = False                     # signature changed → cache dropped
+
+
+def plan_incremental(
+    survivors: list[dict[str, Any]],
+    *,
+    signature: str,
+    state: dict[str, Any] | None,
+    cached: dict[str, dict[str, Any]],
+) -> MatchPlan:
+    """Split survivors into the delta to score and the cached rows to carry."""
+    reset = state is not None and state.get("signature") != signature
+    if reset or state is None:
+        cached = {}
+    previous = (state or {}).get("watermark") if not reset else None
+
+    delta: list[dict[str, Any]] = []
+    carried: dict[str, dict[str, Any]] = {}
+    fingerprints: dict[str, str] = {}
+    watermark: str | None = None
+    for job in survivors:
+        key = job_key(job)
+        seen = job.get("last_seen")
+        if seen and (watermark is None or str(seen) > watermark):
+            watermark = str(seen)
+        row = cached.get(key)
+        if row is not None and previous and seen and str(seen) <= previous:
+            # Not written by the scraper since the last match → unchanged.
+            fingerprints[key] = row["job_hash"]
+            carried[key] = row
+            continue
+        fingerprint = job_fingerprint(job)
+        fingerprints[key] = fingerprint
+        if row is not None and row.get("job_hash") == fingerprint:
+            carried[key] = row
+        else:
+            delta.append(job)
+    return MatchPlan(
+        signature=signature,
+        watermark=watermark or previous,
+        delta=delta,
+        carried=carried,
+        fingerprints=fingerprints,
+        reset=reset,
+    )
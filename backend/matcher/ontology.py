@@ -1,11 +1,20 @@
 """Curated skills ontology + deterministic text→skills mapping (Phase-2 §3.1).
 
 No LLM, no network. Pure regex over a hand-curated YAML taxonomy.
+
+Matching is single-pass: a ``SkillMatcher`` built once per ontology version
+indexes every synonym by its first alphanumeric token. One tokenization of the
+text yields the few candidate skills; only those run their exact synonym regex
+(same word-boundary and ambiguity rules as before) to count hits. The matcher
+serializes to JSON so worker processes can load it instead of rebuilding.
 """
 
 from __future__ import annotations
 
+import hashlib
+import json
 import math
+import os
 import re
 from dataclasses import dataclass, field
 from functools import lru_cache
@@ -66,6 +75,157 @@ def _compile(synonyms: tuple[str, ...]) -> re.Pattern[str]:
     return re.compile("|".join(parts), re.IGNORECASE)
 
 
+# ── single-pass matcher ───────────────────────────────────────────────
+# Every synonym regex requires its match to start and end on a non-[a-z0-9]
+# boundary, so the synonym's first [a-z0-9]+ run always shows up as a whole
+# token of the (lowercased) text when the synonym matches. Tokens are the
+# trigger index; synonyms without any alphanumeric run are always checked.
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+MATCHER_FORMAT = 1
+
+
+def _trigger(synonym: str) -> str | None:
+    m = _TOKEN_RE.search(synonym.strip().lower())
+    return m.group(0) if m else None
+
+
+@dataclass(slots=True)
+class SkillMatcher:
+    version: str
+    order: tuple[str, ...]                    # ontology order → output order
+    triggers: dict[str, tuple[str, ...]]      # token → skill ids
+    always: tuple[str, ...]                   # skills with no trigger token
+    sources: dict[str, str]                   # skill id → synonym regex source
+    _patterns: dict[str, re.Pattern[str]] = field(default_factory=dict, repr=False)
+
+    def pattern(self, sid: str) -> re.Pattern[str]:
+        pat = self._patterns.get(sid)
+        if pat is None:
+            pat = self._patterns[sid] = re.compile(self.sources[sid], re.IGNORECASE)
+        return pat
+
+    def candidates(self, body: str) -> list[str]:
+        """Skill ids that could match ``body`` (lowercased), in ontology order."""
+        hit = set(self.always)
+        triggers = self.triggers
+        for tok in set(_TOKEN_RE.findall(body)):
+            sids = triggers.get(tok)
+            if sids:
+                hit.update(sids)
+        return [sid for sid in self.order if sid in hit]
+
+    def hits(self, body: str) -> dict[str, int]:
+        """{skill_id: term frequency} for every skill found in ``body``."""
+        out: dict[str, int] = {}
+        for sid in self.candidates(body):
+            tf = sum(1 for _ in self.pattern(sid).finditer(body))
+            if tf:
+                out[sid] = tf
+        return out
+
+    # ── serialization ──
+    def to_json(self) -> str:
+        return json.dumps({
+            "format": MATCHER_FORMAT,
+            "version": self.version,
+            "order": list(self.order),
+            "triggers": {tok: list(sids) for tok, sids in self.triggers.items()},
+            "always": list(self.always),
+            "sources": self.sources,
+        }, sort_keys=True)
+
+    @classmethod
+    def from_json(cls, raw: str) -> "SkillMatcher":
+        data = json.loads(raw)
+        if data.get("format") != MATCHER_FORMAT:
+            raise ValueError(f"unsupported matcher format: {data.get('format')}")
+        return cls(
+            version=data["version"],
+            order=tuple(data["order"]),
+            triggers={tok: tuple(sids) for tok, sids in data["triggers"].items()},
+            always=tuple(data["always"]),
+            sources=dict(data["sources"]),
+        )
+
+    def save(self, path: str | Path) -> None:
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(self.to_json(), encoding="utf-8")
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "SkillMatcher":
+        return cls.from_json(Path(path).read_text(encoding="utf-8"))
+
+
+def _signature(onto: dict[str, Skill]) -> tuple[tuple[str, tuple[str, ...]], ...]:
+    return tuple((sid, tuple(skill.synonyms)) for sid, skill in onto.items())
+
+
+def ontology_version(onto: dict[str, Skill]) -> str:
+    """Stable hash of skill ids + synonyms (what the matcher depends on)."""
+    payload = json.dumps([[sid, list(syns)] for sid, syns in _signature(onto)])
+    return hashlib.sha256(f"{MATCHER_FORMAT}:{payload}".encode("utf-8")).hexdigest()[:16]
+
+
+def build_matcher(onto: dict[str, Skill]) -> SkillMatcher:
+    triggers: dict[str, list[str]] = {}
+    always: list[str] = []
+    sources: dict[str, str] = {}
+    for sid, skill in onto.items():
+        sources[sid] = _compile(tuple(skill.synonyms)).pattern
+        tokens = []
+        for syn in skill.synonyms:
+            if _synonym_pattern(syn) is None:
+                continue
+            tok = _trigger(syn)
+            if tok is None:
+                tokens = []
+                always.append(sid)
+                break
+            tokens.append(tok)
+        for tok in dict.fromkeys(tokens):
+            triggers.setdefault(tok, []).append(sid)
+    return SkillMatcher(
+        version=ontology_version(onto),
+        order=tuple(onto),
+        triggers={tok: tuple(sids) for tok, sids in triggers.items()},
+        always=tuple(always),
+        sources=sources,
+    )
+
+
+@lru_cache(maxsize=32)
+def _matcher_for(signature: tuple[tuple[str, tuple[str, ...]], ...]) -> SkillMatcher:
+    onto = {sid: Skill(id=sid, name=sid, synonyms=list(syns)) for sid, syns in signature}
+    cache_path = os.getenv("SMARTAPPLY_ONTOLOGY_MATCHER_CACHE")
+    version = ontology_version(onto)
+    if cache_path:
+        try:
+            cached = SkillMatcher.load(cache_path)
+            if cached.version == version:
+                return cached
+        except (OSError, ValueError, KeyError):
+            pass
+    matcher = build_matcher(onto)
+    if cache_path:
+        try:
+            matcher.save(cache_path)
+        except OSError:
+            pass
+    return matcher
+
+
+def compiled_matcher(ontology: dict[str, Skill] | None = None) -> SkillMatcher:
+    """The matcher for ``ontology`` (default: the YAML one), built once per version.
+
+    Set SMARTAPPLY_ONTOLOGY_MATCHER_CACHE to a file path to persist it across
+    processes (rebuilt automatically when the ontology version changes).
+    """
+    onto = ontology if ontology is not None else load_ontology()
+    return _matcher_for(_signature(onto))
+
+
 # ── loading ──────────────────────────────────────────────────────────
 def _resolve(path: str | Path | None) -> str:
     if path is None:
@@ -115,14 +275,11 @@ def map_text_to_skills(
     head = (title or "").lower()
     onto = ontology if ontology is not None else load_ontology()
 
+    matcher = compiled_matcher(onto)
     out: dict[str, float] = {}
-    for sid, skill in onto.items():
-        pat = _compile(tuple(skill.synonyms))
-        tf = sum(1 for _ in pat.finditer(body))
-        if tf == 0:
-            continue
-        w = skill.weight * (1.0 + math.log1p(tf))
-        if head and pat.search(head):
+    for sid, tf in matcher.hits(body).items():
+        w = onto[sid].weight * (1.0 + math.log1p(tf))
+        if head and matcher.pattern(sid).search(head):
             w *= 2.0
         out[sid] = w
     return out
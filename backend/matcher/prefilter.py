@@ -1,7 +1,16 @@
-"""Stage 0 prefilter over scraped jobs."""
+"""Stage 0 prefilter over scraped jobs.
+
+The filter config is pushed down into SQL: location, sponsorship and role-mode
+gates are predicates over the stored flag and search-tag columns (covered by
+the scraper's ``idx_jobs_targeted`` index), so only candidate rows
+leave SQLite, and only as (rowid, title, tags). The remaining text rule,
+``fulltime_only_excludes`` on the title, is one precompiled word-boundary
+pattern. Full rows, description included, are then read for survivors only.
+"""
 
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
 import json
 import re
@@ -10,6 +19,13 @@ from typing import Any
 
 import yaml
 
+# Survivors are read back by rowid in chunks of this many (SQLite's host
+# parameter limit is 999 on older builds).
+FETCH_CHUNK = 500
+
+# Tags a sweep stored when nothing matched; a job with these is not search-tagged.
+_EMPTY_TAGS = ("", "[]")
+
 
 def _load_filters(filters_path: str | Path) -> dict[str, Any]:
     path = Path(filters_path)
@@ -19,36 +35,72 @@ def _load_filters(filters_path: str | Path) -> dict[str, Any]:
     return data if isinstance(data, dict) else {}
 
 
-def _matches_any_token(text: str, tokens: list[str]) -> bool:
-    lowered = (text or "").lower()
-    for token in tokens:
-        token = (token or "").strip().lower()
-        if not token:
-            continue
-        if re.search(rf"\b{re.escape(token)}\b", lowered):
-            return True
-    return False
-
-
-def _parse_matched_searches(item: dict[str, Any]) -> list[str]:
-    tags: list[str] = []
-    raw_tags = item.get("matched_searches")
-    if isinstance(raw_tags, list):
-        return [str(t) for t in raw_tags if t]
-    if isinstance(raw_tags, str) and raw_tags.strip():
-        try:
-            parsed = json.loads(raw_tags)
-            if isinstance(parsed, list):
-                tags = [str(t) for t in parsed if t]
-        except json.JSONDecodeError:
-            tags = []
-    if tags:
-        return tags
+@lru_cache(maxsize=8)
+def _token_pattern(tokens: tuple[str, ...]) -> re.Pattern[str] | None:
+    """One word-boundary alternation over `tokens` (matched on lowercased text)."""
+    cleaned = sorted({t.strip().lower() for t in tokens if t and t.strip()}, key=len, reverse=True)
+    if not cleaned:
+        return None
+    return re.compile(r"\b(?:" + "|".join(re.escape(t) for t in cleaned) + r")\b")
+
+
+def _stored_tags(raw: Any) -> list[str] | None:
+    """Search tags as stored by the sweep, or None when the row has none to
+    trust (missing or unreadable) and they must be computed."""
+    if isinstance(raw, list):
+        return [str(t) for t in raw if t]
+    if not isinstance(raw, str):
+        return None
+    try:
+        parsed = json.loads(raw) if raw.strip() else []
+    except json.JSONDecodeError:
+        return None
+    return [str(t) for t in parsed if t] if isinstance(parsed, list) else None
+
+
+def _compute_tags(title: str, description: str) -> list[str]:
     try:
         from scraper.searches import match_searches
     except ImportError:
         from backend.scraper.searches import match_searches  # type: ignore
-    return match_searches(item.get("title") or "", item.get("description_text") or "")
+    return match_searches(title or "", description or "")
+
+
+def _role_mode(role_mode: str) -> str:
+    role_mode = (role_mode or "internship").lower().strip()
+    return role_mode if role_mode in {"internship", "fulltime", "both"} else "internship"
+
+
+def passes_targeting(job: dict[str, Any], role_mode: str, search_bypass_internship: bool = True) -> bool:
+    """The location / sponsorship / role-mode gates of ``_candidate_sql`` (and
+    the bypass rule that a non-internship needs search tags) for one job dict.
+    Used to re-check a job after its flags changed, e.g. by hydration."""
+    if int(job.get("location_match") or 0) != 1 or int(job.get("sponsorship_knockout") or 0) != 0:
+        return False
+    is_internship = int(job.get("is_internship") or 0) == 1
+    role_mode = _role_mode(role_mode)
+    if role_mode == "fulltime":
+        return not is_internship
+    if role_mode == "internship" and not is_internship:
+        return search_bypass_internship and bool(_stored_tags(job.get("matched_searches")))
+    return True
+
+
+def _candidate_sql(role_mode: str, search_bypass_internship: bool, has_tags: bool) -> str:
+    # Keep in step with passes_targeting.
+    where = ["location_match = 1", "sponsorship_knockout = 0", "status = 'active'"]
+    if role_mode == "internship":
+        if search_bypass_internship and has_tags:
+            where.append(
+                "(is_internship = 1 OR matched_searches IS NULL OR matched_searches NOT IN "
+                f"({', '.join(repr(t) for t in _EMPTY_TAGS)}))"
+            )
+        elif not search_bypass_internship:
+            where.append("is_internship = 1")
+    elif role_mode == "fulltime":
+        where.append("is_internship = 0")
+    tags = "matched_searches" if has_tags else "NULL AS matched_searches"
+    return f"SELECT rowid AS _rid, title, is_internship, {tags} FROM jobs WHERE {' AND '.join(where)}"
 
 
 def prefilter_jobs(
@@ -60,54 +112,64 @@ def prefilter_jobs(
 ) -> list[dict[str, Any]]:
     filters = _load_filters(filters_path)
     fulltime_only_excludes = filters.get("fulltime_only_excludes", []) or []
-    role_mode = (role_mode or "internship").lower().strip()
-    if role_mode not in {"internship", "fulltime", "both"}:
-        role_mode = "internship"
+    role_mode = _role_mode(role_mode)
 
     with sqlite3.connect(str(jobs_db_path)) as conn:
         conn.row_factory = sqlite3.Row
         cols = {str(r[1]) for r in conn.execute("PRAGMA table_info(jobs)").fetchall()}
+        has_tags = "matched_searches" in cols
+        candidates = conn.execute(_candidate_sql(role_mode, search_bypass_internship, has_tags)).fetchall()
+
+        excludes = _token_pattern(tuple(map(str, fulltime_only_excludes))) if role_mode == "fulltime" else None
+        # (rowid, stored tags or None, bypass-only) for rows that pass the title rules.
+        keep: list[tuple[int, list[str] | None, bool]] = []
+        for row in candidates:
+            if excludes is not None and excludes.search((row["title"] or "").lower()):
+                continue
+            tags = _stored_tags(row["matched_searches"])
+            is_internship = int(row["is_internship"] or 0) == 1
+            bypass_only = role_mode == "internship" and not is_internship
+            if bypass_only and tags is not None and not tags:
+                continue
+            keep.append((int(row["_rid"]), tags, bypass_only))
+        keep.sort(key=lambda k: k[0])  # table order, whichever index the query used
+
         select_cols = [
             "source_ats", "company", "external_id", "title", "location",
             "description_text", "apply_url", "is_internship", "location_match",
             "sponsorship_knockout", "status",
         ]
-        for optional in ("first_seen", "last_seen", "matched_searches"):
+        for optional in ("first_seen", "last_seen", "matched_searches", "content_hash", "detail_hash"):
             if optional in cols:
                 select_cols.append(optional)
-        rows = conn.execute(
-            f"SELECT {', '.join(select_cols)} FROM jobs WHERE status = 'active'"
-        ).fetchall()
+        full: dict[int, dict[str, Any]] = {}
+        for start in range(0, len(keep), FETCH_CHUNK):
+            chunk = [rid for rid, _, _ in keep[start:start + FETCH_CHUNK]]
+            for r in conn.execute(
+                f"SELECT rowid AS _rid, {', '.join(select_cols)} FROM jobs "
+                f"WHERE rowid IN ({', '.join('?' for _ in chunk)})",
+                chunk,
+            ):
+                full[int(r["_rid"])] = dict(r)
 
     survivors: list[dict[str, Any]] = []
     bypassed = 0
-    for row in rows:
-        item = dict(row)
-        if int(item.get("location_match") or 0) != 1:
-            continue
-        if int(item.get("sponsorship_knockout") or 0) == 1:
+    for rid, tags, bypass_only in keep:
+        item = full.get(rid)
+        if item is None:  # row vanished between the two reads
             continue
-
-        tags = _parse_matched_searches(item)
+        del item["_rid"]
+        if tags is None:
+            tags = _compute_tags(item.get("title") or "", item.get("description_text") or "")
         item["matched_searches"] = tags
-
-        is_internship = int(item.get("is_internship") or 0) == 1
-        title = item.get("title") or ""
-        if role_mode == "internship" and not is_internship:
-            if search_bypass_internship and tags:
-                bypassed += 1
-            else:
-                continue
-        if role_mode == "fulltime":
-            if is_internship:
+        if bypass_only:
+            if not tags:
                 continue
-            if fulltime_only_excludes and _matches_any_token(title, fulltime_only_excludes):
-                continue
-
+            bypassed += 1
         survivors.append(item)
 
     print(
-        f"[prefilter] active={len(rows)} survivors={len(survivors)} "
+        f"[prefilter] candidates={len(candidates)} survivors={len(survivors)} "
         f"search_bypass={bypassed} "
         f"(role_mode={role_mode}, location_match=true, sponsorship_knockout=false)"
     )
@@ -6,12 +6,21 @@ import argparse
 import json
 from pathlib import Path
 
+from . import incremental
 from .config import load_config
 from .fit import fit_candidates
-from .prefilter import prefilter_jobs
+from .prefilter import passes_targeting, prefilter_jobs
 from .recall import recall_candidates
 from .rerank import rerank_candidates
-from .store import gate_and_store
+from .store import (
+    clear_match_scores,
+    gate_and_store,
+    load_match_scores,
+    load_match_state,
+    save_match_scores,
+    save_match_state,
+    wait_for_liveness,
+)
 
 # role_mode -> hybrid candidate target level.
 _ROLE_TO_LEVEL = {"internship": "intern", "fulltime": "entry", "both": "intern"}
@@ -47,20 +56,59 @@ def _legacy_rank(profile_id: str, survivors: list[dict], cfg) -> list[dict]:
     return reranked
 
 
-def _hybrid_rank(profile_id: str, survivors: list[dict], cfg, features_db: Path) -> list[dict]:
-    """Deterministic hybrid ranking over ALL survivors (Phase-2 §3.5).
+def _reranked_item(job: dict, hybrid: dict) -> dict:
+    return {
+        "job": job,
+        # schema compatibility with the legacy path / matches columns
+        "stage1_score": float(hybrid["components"]["embedding"]) / 100.0,
+        "stage2_score": float(hybrid["total"]) / 100.0,
+        "hybrid": hybrid,
+    }
+
+
+def _shortlist(candidate: dict, jobs: list[dict], features_db: Path, k: int) -> list[dict]:
+    """The k jobs nearest the profile embedding (ANN) plus the k best BM25
+    matches, in input order; [] when the index has nothing to offer."""
+    from . import ann
+    from .features import bm25_scores
+
+    keys = [incremental.job_key(job) for job in jobs]
+    near = ann.nearest(features_db, candidate.get("profile_embedding"), k, job_keys=keys)
+    if not near:
+        return []
+    lexical = bm25_scores(features_db, candidate.get("query_terms") or [], keys)
+    top_lexical = sorted((key for key, score in lexical.items() if score > 0), key=lambda key: -lexical[key])[:k]
+    keep = {*near, *top_lexical}
+    return [job for job, key in zip(jobs, keys) if key in keep]
+
+
+def _hybrid_rank(
+    profile_id: str,
+    survivors: list[dict],
+    cfg,
+    features_db: Path,
+    *,
+    only: list[dict] | None = None,
+) -> list[dict]:
+    """Deterministic hybrid ranking over the survivors (Phase-2 §3.5).
 
     Builds/refreshes job features (incremental), builds the cached candidate
-    features, scores every survivor, and returns reranked-shaped items so the
+    features, scores the survivors, and returns reranked-shaped items so the
     downstream LLM fit + gate stages are unchanged. Raises on any hard failure
-    so the caller can fall back to the legacy path (rule 7)."""
+    so the caller can fall back to the legacy path (rule 7).
+
+    ``only`` restricts feature building and scoring to that subset (the
+    incremental delta) while BM25 is still normalized over every survivor.
+    Above ``semantic_shortlist`` jobs only the shortlist is scored; jobs left
+    out are not cached, so an incremental run offers them again next time."""
     from .candidate_features import build_candidate_features
     from .features import ensure_job_features
     from .hybrid import score_jobs_hybrid
     from .ontology import load_ontology
 
     ontology = load_ontology()
-    stats = ensure_job_features(survivors, features_db, ontology=ontology)
+    targets = survivors if only is None else only
+    stats = ensure_job_features(targets, features_db, ontology=ontology)
     print(f"[hybrid] features built={stats['built']} reused={stats['reused']} failed={stats['failed']}")
 
     candidate = build_candidate_features(
@@ -69,8 +117,16 @@ def _hybrid_rank(profile_id: str, survivors: list[dict], cfg, features_db: Path)
         target_level=_ROLE_TO_LEVEL.get(cfg.role_mode, "intern"),
         db_path=features_db,
     )
+    bm25_keys = None if only is None else [incremental.job_key(j) for j in survivors]
+    if cfg.semantic_shortlist and len(targets) > cfg.semantic_shortlist:
+        shortlisted = _shortlist(candidate, targets, features_db, cfg.semantic_shortlist)
+        if shortlisted:
+            print(f"[hybrid] shortlist {len(shortlisted)} of {len(targets)} (semantic + bm25)")
+            targets = shortlisted
+            bm25_keys = [incremental.job_key(j) for j in survivors]
     scored = score_jobs_hybrid(
-        candidate, survivors, features_db, weights=cfg.hybrid_weights, ontology=ontology,
+        candidate, targets, features_db, weights=cfg.hybrid_weights, ontology=ontology,
+        explain_top=cfg.top_fit, bm25_keys=bm25_keys,
     )
     if not scored:
         return []
@@ -86,27 +142,127 @@ def _hybrid_rank(profile_id: str, survivors: list[dict], cfg, features_db: Path)
             f"{job.get('title', '')} @ {job.get('company', '')}"
         )
 
-    reranked: list[dict] = []
-    for s in scored:
-        reranked.append(
+    return [
+        _reranked_item(
+            s["job"],
             {
-                "job": s["job"],
-                # schema compatibility with the legacy path / matches columns
-                "stage1_score": float(s["components"]["embedding"]) / 100.0,
-                "stage2_score": float(s["hybrid_total"]) / 100.0,
-                "hybrid": {
-                    "total": s["hybrid_total"],
-                    "components": s["components"],
-                    "explanation": s["explanation"],
-                    "scoring_version": s["scoring_version"],
-                },
-            }
+                "total": s["hybrid_total"],
+                "components": s["components"],
+                "explanation": s["explanation"],
+                "scoring_version": s["scoring_version"],
+            },
         )
-    return reranked
+        for s in scored
+    ]
+
+
+def _hydrate(survivors: list[dict], jobs_db: Path, cfg) -> list[dict]:
+    """Detail pages for summary-only survivors (scraper.hydrate); jobs the full
+    description knocks out (sponsorship, location, role mode) leave the run."""
+    try:
+        from scraper.hydrate import hydrate_jobs
+    except ImportError:
+        from backend.scraper.hydrate import hydrate_jobs  # type: ignore
+    try:
+        stats = hydrate_jobs(survivors, jobs_db, limit=cfg.hydrate_limit)
+    except Exception as exc:  # noqa: BLE001 — summaries still rank, just worse
+        print(f"[hydrate] skipped: {type(exc).__name__}: {exc}")
+        return survivors
+    # Prefilter already passed every survivor on its summary flags, so only a
+    # hydrated description (new flags or search tags) can knock one out here.
+    kept = [
+        job for job in survivors
+        if not job.get("detail_hash")
+        or passes_targeting(job, cfg.role_mode, cfg.search_bypass_internship)
+    ]
+    if stats["candidates"]:
+        print(
+            f"[hydrate] candidates={stats['candidates']} hydrated={stats['hydrated']} "
+            f"failed={stats['failed']} deferred={stats['deferred']} "
+            f"knocked_out={len(survivors) - len(kept)}"
+        )
+    return kept
+
 
+def _plan_incremental(profile_id: str, survivors: list[dict], cfg, matches_db: Path) -> incremental.MatchPlan:
+    """Signature + cached scores → which survivors need scoring this run."""
+    from .candidate_features import _get_profile, profile_hash
+    from .hybrid import SCORING_VERSION
+    from .ontology import load_ontology, ontology_version
 
-def run_pipeline(profile_id: str = "default", config: str = "") -> dict:
-    """Full recall → rerank → fit → gate run. Callable from CLI, nightly, or the API."""
+    signature = incremental.match_signature(
+        profile_hash=profile_hash(_get_profile(profile_id)),
+        weights=cfg.hybrid_weights,
+        scoring_version=f"{SCORING_VERSION}/{cfg.scoring_version}",
+        ontology_version=ontology_version(load_ontology()),
+        target_level=_ROLE_TO_LEVEL.get(cfg.role_mode, "intern"),
+        llm_prefer=cfg.llm_prefer,
+        search_boost=cfg.search_alignment_boost,
+    )
+    state = load_match_state(matches_db, profile_id)
+    plan = incremental.plan_incremental(
+        survivors, signature=signature, state=state,
+        cached=load_match_scores(matches_db, profile_id) if state else {},
+    )
+    if plan.reset:
+        clear_match_scores(matches_db, profile_id)
+        print("[incremental] profile/weights/scoring version changed — cache invalidated")
+    print(
+        f"[incremental] watermark={(state or {}).get('watermark')} → {plan.watermark} "
+        f"delta={len(plan.delta)} carried={len(plan.carried)}"
+    )
+    return plan
+
+
+def _incremental_rank(
+    profile_id: str, survivors: list[dict], cfg, features_db: Path, plan: incremental.MatchPlan
+) -> tuple[list[dict], list[dict]]:
+    """Score the delta and merge it with the carried-forward results.
+
+    Returns (scored delta items, top_fit items still needing an LLM fit). Top
+    items whose fit is cached are left out: they are already in matches.db."""
+    scored = _hybrid_rank(profile_id, survivors, cfg, features_db, only=plan.delta) if plan.delta else []
+    by_key = {incremental.job_key(job): job for job in survivors}
+    merged = list(scored)
+    for key, row in plan.carried.items():
+        item = _reranked_item(by_key[key], row["hybrid"])
+        if row.get("fit"):
+            item["fit"] = row["fit"]
+        merged.append(item)
+    merged.sort(key=lambda item: -item["stage2_score"])
+    top = merged[: cfg.top_fit]
+    to_fit = [item for item in top if "fit" not in item]
+    print(f"[incremental] top_fit={len(top)} to_fit={len(to_fit)} fit_cached={len(top) - len(to_fit)}")
+    return scored, to_fit
+
+
+def _save_incremental(
+    profile_id: str, matches_db: Path, plan: incremental.MatchPlan, items: list[dict]
+) -> None:
+    """Cache hybrid (+ usable fit) for every item scored this run, prune jobs
+    that left the survivor set, and advance the watermark."""
+    rows = []
+    for item in items:
+        key = incremental.job_key(item["job"])
+        fit = item.get("fit")
+        if fit is not None:
+            fit = {k: v for k, v in fit.items() if k != "hybrid"}
+        rows.append({
+            "job_key": key,
+            "job_hash": plan.fingerprints.get(key) or incremental.job_fingerprint(item["job"]),
+            "hybrid": item["hybrid"],
+            "fit": fit if incremental.fit_is_cacheable(fit) else None,
+        })
+    save_match_scores(matches_db, profile_id, rows, keep_keys=set(plan.fingerprints))
+    save_match_state(matches_db, profile_id, signature=plan.signature, watermark=plan.watermark)
+
+
+def run_pipeline(profile_id: str = "default", config: str = "", *, full: bool = False) -> dict:
+    """Full recall → rerank → fit → gate run. Callable from CLI, nightly, or the API.
+
+    With ``incremental_matching`` on (and the hybrid ranker), only jobs that are
+    new or changed since the profile's last run are scored; ``full`` forces a
+    complete rescore."""
     cfg = load_config(config or None)
     root = Path(__file__).resolve().parents[2]
 
@@ -121,13 +277,36 @@ def run_pipeline(profile_id: str = "default", config: str = "") -> dict:
         filters_path=filters_path,
         search_bypass_internship=cfg.search_bypass_internship,
     )
+    if survivors and cfg.hydrate_descriptions:
+        survivors = _hydrate(survivors, jobs_db, cfg)
     if not survivors:
         print("[done] no survivors after prefilter")
         return {"stored": 0, "strong": 0, "stretch": 0, "stage": "prefilter"}
 
+    plan: incremental.MatchPlan | None = None
+    if cfg.use_hybrid_ranking and cfg.incremental_matching and not full:
+        try:
+            plan = _plan_incremental(profile_id, survivors, cfg, matches_db)
+        except Exception as exc:  # noqa: BLE001 — a broken cache only costs a full run
+            print(f"[incremental] unavailable: {type(exc).__name__}: {exc} — scoring every survivor")
+
     ranking = "legacy"
     reranked: list[dict] = []
-    if cfg.use_hybrid_ranking:
+    scored: list[dict] = []
+    if plan is not None:
+        try:
+            scored, reranked = _incremental_rank(profile_id, survivors, cfg, features_db, plan)
+            ranking = "hybrid/incremental"
+        except Exception as exc:  # noqa: BLE001
+            print(f"[hybrid] failed: {type(exc).__name__}: {exc} — falling back to legacy recall/rerank")
+            plan = None
+        else:
+            if not reranked:
+                _save_incremental(profile_id, matches_db, plan, scored)
+                print("[done] no new or changed jobs reach the fit stage")
+                return {"stored": 0, "strong": 0, "stretch": 0, "stage": "unchanged",
+                        "scored": len(scored), "carried": len(plan.carried)}
+    elif cfg.use_hybrid_ranking:
         try:
             reranked = _hybrid_rank(profile_id, survivors, cfg, features_db)
             ranking = "hybrid"
@@ -167,7 +346,7 @@ def run_pipeline(profile_id: str = "default", config: str = "") -> dict:
         fitted = fit_candidates(
             profile_id=profile_id,
             reranked=reranked,
-            top_fit=cfg.top_fit,
+            top_fit=cfg.top_fit if plan is None else len(reranked),
             llm_prefer=cfg.llm_prefer,
             search_boost=cfg.search_alignment_boost,
             strong_threshold=cfg.strong_threshold,
@@ -195,6 +374,7 @@ def run_pipeline(profile_id: str = "default", config: str = "") -> dict:
             fitted=fitted,
             match_threshold=cfg.match_threshold,
             strong_threshold=cfg.strong_threshold,
+            jobs_db_path=jobs_db,
         )
     else:
         stored = {"stored": 0, "strong": 0, "stretch": 0}
@@ -204,6 +384,12 @@ def run_pipeline(profile_id: str = "default", config: str = "") -> dict:
         f"strong={stored['strong']} stretch={stored['stretch']} "
         f"(MATCH_THRESHOLD={cfg.match_threshold}, STRONG={cfg.strong_threshold})"
     )
+    if plan is not None:
+        # Carried-forward jobs pulled into the top_fit were refit; cache them too.
+        scored_ids = {id(item) for item in scored}
+        refit = [item for item in reranked if id(item) not in scored_ids]
+        _save_incremental(profile_id, matches_db, plan, [*scored, *refit])
+        return {**stored, "stage": "done", "scored": len(scored), "carried": len(plan.carried)}
     return {**stored, "stage": "done"}
 
 
@@ -211,8 +397,11 @@ def main() -> int:
     parser = argparse.ArgumentParser(description="Matcher pipeline")
     parser.add_argument("--profile-id", default="default")
     parser.add_argument("--config", default="")
+    parser.add_argument("--full", action="store_true", help="rescore every survivor (ignore the incremental cache)")
     args = parser.parse_args()
-    run_pipeline(profile_id=args.profile_id, config=args.config)
+    run_pipeline(profile_id=args.profile_id, config=args.config, full=args.full)
+    # Liveness verdicts land from a background thread; let it finish before exiting.
+    wait_for_liveness()
     return 0
 
 
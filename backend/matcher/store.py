@@ -2,11 +2,17 @@
 
 from __future__ import annotations
 
+from contextlib import contextmanager
 from datetime import datetime, timezone
 import json
 from pathlib import Path
 import sqlite3
-from typing import Any
+from typing import Any, Iterator
+
+try:
+    from backend import sqlite_pool
+except ImportError:  # pragma: no cover - backend/ on sys.path
+    import sqlite_pool  # type: ignore
 
 
 def _utc_now() -> str:
@@ -27,11 +33,7 @@ _QUEUE_COLUMNS: tuple[tuple[str, str], ...] = (
 )
 
 
-def _connect(path: str | Path) -> sqlite3.Connection:
-    db_path = Path(path)
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(db_path))
-    conn.row_factory = sqlite3.Row
+def _migrate(conn: sqlite3.Connection) -> None:
     conn.execute(
         """
         CREATE TABLE IF NOT EXISTS matches (
@@ -71,10 +73,43 @@ def _connect(path: str | Path) -> sqlite3.Connection:
         conn.execute(
             "UPDATE matches SET review_status = 'customized' WHERE review_status = 'approved'"
         )
-        conn.commit()
     except sqlite3.OperationalError:
         pass
-    return conn
+    # Incremental matching (matcher/incremental.py): per-profile watermark plus
+    # the hybrid/fit results carried forward for jobs that have not changed.
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS match_state (
+            profile_id TEXT PRIMARY KEY,
+            signature TEXT NOT NULL,
+            watermark TEXT,
+            updated_at TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS match_scores (
+            profile_id TEXT NOT NULL,
+            job_key TEXT NOT NULL,
+            job_hash TEXT NOT NULL,
+            hybrid_json TEXT NOT NULL,
+            fit_json TEXT,
+            scored_at TEXT NOT NULL,
+            PRIMARY KEY (profile_id, job_key)
+        )
+        """
+    )
+
+
+# Bump the version whenever _migrate gains a step so stamped databases re-run it.
+_SCHEMA = sqlite_pool.Schema("matches", 2, _migrate)
+
+
+@contextmanager
+def _connect(path: str | Path) -> Iterator[sqlite3.Connection]:
+    with sqlite_pool.connection(path, _SCHEMA) as conn:
+        yield conn
 
 
 def band_for(match_pct: int, strong_threshold: int = 85) -> str:
@@ -82,26 +117,103 @@ def band_for(match_pct: int, strong_threshold: int = 85) -> str:
     return "strong" if int(match_pct) >= int(strong_threshold) else "stretch"
 
 
+def _liveness_module():
+    try:
+        from scraper import liveness
+    except ImportError:
+        try:
+            from backend.scraper import liveness  # type: ignore
+        except ImportError:
+            return None
+    return liveness
+
+
+def apply_liveness(
+    matches_db_path: str | Path, profile_id: str, verdicts: dict[str, dict[str, Any]]
+) -> int:
+    """Write finished liveness verdicts into fit_json of the profile's matches
+    with that apply_url. Returns the number of rows updated."""
+    updated = 0
+    with _connect(matches_db_path) as conn:
+        for url, verdict in verdicts.items():
+            cur = conn.execute(
+                """
+                UPDATE matches
+                SET fit_json = json_set(COALESCE(NULLIF(fit_json, ''), '{}'), '$.liveness', json(?))
+                WHERE profile_id = ? AND apply_url = ?
+                """,
+                (json.dumps(verdict, ensure_ascii=False), profile_id, url),
+            )
+            updated += cur.rowcount
+    return updated
+
+
+def _settle_earlier_pending(
+    liveness: Any,
+    matches_db_path: str | Path,
+    profile_id: str,
+    queued: set[Any],
+    jobs_kw: dict[str, Any],
+) -> list[dict[str, Any]]:
+    """Matches stored by an earlier run whose liveness is still ``pending``
+    (its background refresh never finished) or a transient fetch error:
+    patch in verdicts the cache has by now and return the jobs still
+    unchecked, to be queued again."""
+    codes = ("pending", *getattr(liveness, "TRANSIENT_CODES", ()))
+    with _connect(matches_db_path) as conn:
+        rows = conn.execute(
+            f"""
+            SELECT source_ats, external_id, apply_url FROM matches
+            WHERE profile_id = ?
+              AND json_extract(fit_json, '$.liveness.code') IN ({', '.join('?' * len(codes))})
+            """,
+            (profile_id, *codes),
+        ).fetchall()
+    jobs = [dict(r) for r in rows if r["apply_url"] not in queued]
+    if not jobs:
+        return []
+    cached = liveness.cached_verdicts([j["apply_url"] for j in jobs], **jobs_kw)
+    if cached:
+        apply_liveness(matches_db_path, profile_id, cached)
+    return [j for j in jobs if j["apply_url"] not in cached]
+
+
+def wait_for_liveness(timeout: float | None = None) -> int:
+    """Join this process's background liveness refreshes (CLI runs call this
+    before exiting so pending verdicts get written). Returns how many are
+    still running."""
+    liveness = _liveness_module()
+    if liveness is None:
+        return 0
+    return liveness.wait_for_refreshes(*(() if timeout is None else (timeout,)))
+
+
 def gate_and_store(
     matches_db_path: str | Path,
     profile_id: str,
     fitted: list[dict[str, Any]],
     match_threshold: int = 70,
     strong_threshold: int = 85,
+    *,
+    jobs_db_path: str | Path | None = None,
 ) -> dict[str, int]:
     survivors = [row for row in fitted if int(row.get("match_pct", 0)) >= int(match_threshold)]
     counts = {"stored": 0, "strong": 0, "stretch": 0}
-    if not survivors:
-        return counts
 
-    # Liveness on queue entry (plain HTTP) — never blocks storage.
-    try:
-        from scraper.liveness import check_url
-    except ImportError:
+    # Liveness on queue entry — never blocks storage. Only cached verdicts are
+    # read here; URLs without a fresh one are checked in the background and
+    # patched into fit_json when the checks finish.
+    liveness = _liveness_module()
+    jobs_kw = {"db_path": jobs_db_path} if jobs_db_path is not None else {}
+    verdicts: dict[str, dict[str, Any]] = {}
+    liveness_error: str | None = None
+    if liveness is not None and survivors:
         try:
-            from backend.scraper.liveness import check_url  # type: ignore
-        except ImportError:
-            check_url = None  # type: ignore
+            verdicts = liveness.cached_verdicts(
+                [row["job"].get("apply_url") or "" for row in survivors], **jobs_kw
+            )
+        except Exception as exc:  # noqa: BLE001
+            liveness_error = type(exc).__name__
 
     with _connect(matches_db_path) as conn:
         for row in survivors:
@@ -109,23 +221,16 @@ def gate_and_store(
             band = band_for(row.get("match_pct", 0), strong_threshold)
             counts[band] += 1
             fit_obj = dict(row.get("fit") or {})
-            if check_url:
-                try:
-                    live = check_url(job.get("apply_url") or "")
-                    fit_obj["liveness"] = live
-                    # Also persist onto jobs row when identity is known
-                    try:
-                        from scraper.liveness import persist_job_liveness
-                    except ImportError:
-                        from backend.scraper.liveness import persist_job_liveness  # type: ignore
-                    if job.get("source_ats") and job.get("external_id"):
-                        persist_job_liveness(job["source_ats"], job["external_id"], live)
-                except Exception as exc:  # noqa: BLE001
+            if liveness is not None:
+                url = job.get("apply_url") or ""
+                if liveness_error:
                     fit_obj["liveness"] = {
                         "result": "uncertain",
                         "code": "liveness_error",
-                        "reason": type(exc).__name__,
+                        "reason": liveness_error,
                     }
+                else:
+                    fit_obj["liveness"] = verdicts.get(url) or liveness.pending_verdict(url)
             conn.execute(
                 """
                 INSERT INTO matches (
@@ -162,6 +267,24 @@ def gate_and_store(
             )
         conn.commit()
     counts["stored"] = len(survivors)
+
+    if liveness is not None and not liveness_error:
+        pending = [
+            row["job"] for row in survivors
+            if str(row["job"].get("apply_url") or "").startswith("http")
+            and row["job"].get("apply_url") not in verdicts
+        ]
+        try:
+            pending += _settle_earlier_pending(
+                liveness, matches_db_path, profile_id, {j.get("apply_url") for j in pending}, jobs_kw
+            )
+        except Exception as exc:  # noqa: BLE001 — earlier rows wait for the next run
+            print(f"[liveness] could not settle earlier pending matches: {type(exc).__name__}: {exc}")
+        if pending:
+            liveness.refresh_in_background(
+                pending, **jobs_kw,
+                on_done=lambda done: apply_liveness(matches_db_path, profile_id, done),
+            )
     return counts
 
 
@@ -315,3 +438,101 @@ def list_customized(
         ).fetchall()
     return [_row_to_queue_item(r) for r in rows]
 
+
+
+# ── Incremental matching state ────────────────────────────────────────────────
+
+def load_match_state(matches_db_path: str | Path, profile_id: str) -> dict[str, Any] | None:
+    """The profile's last match signature + watermark, or None before the first run."""
+    with _connect(matches_db_path) as conn:
+        row = conn.execute(
+            "SELECT signature, watermark, updated_at FROM match_state WHERE profile_id = ?",
+            (profile_id,),
+        ).fetchone()
+    return dict(row) if row else None
+
+
+def load_match_scores(matches_db_path: str | Path, profile_id: str) -> dict[str, dict[str, Any]]:
+    """{job_key: {"job_hash", "hybrid", "fit"}} cached for a profile (fit may be None)."""
+    out: dict[str, dict[str, Any]] = {}
+    with _connect(matches_db_path) as conn:
+        rows = conn.execute(
+            "SELECT job_key, job_hash, hybrid_json, fit_json FROM match_scores WHERE profile_id = ?",
+            (profile_id,),
+        ).fetchall()
+    for row in rows:
+        try:
+            hybrid = json.loads(row["hybrid_json"])
+            fit = json.loads(row["fit_json"]) if row["fit_json"] else None
+        except (json.JSONDecodeError, TypeError):
+            continue  # unreadable row → the job is simply rescored
+        out[row["job_key"]] = {"job_hash": row["job_hash"], "hybrid": hybrid, "fit": fit}
+    return out
+
+
+def save_match_scores(
+    matches_db_path: str | Path,
+    profile_id: str,
+    rows: list[dict[str, Any]],
+    *,
+    keep_keys: set[str] | None = None,
+) -> None:
+    """Upsert cached rows ({"job_key", "job_hash", "hybrid", "fit"}); when
+    ``keep_keys`` is given, drop every other cached row for the profile
+    (expired or filtered-out jobs)."""
+    now = _utc_now()
+    with _connect(matches_db_path) as conn:
+        conn.executemany(
+            """
+            INSERT INTO match_scores (profile_id, job_key, job_hash, hybrid_json, fit_json, scored_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(profile_id, job_key) DO UPDATE SET
+                job_hash = excluded.job_hash,
+                hybrid_json = excluded.hybrid_json,
+                fit_json = excluded.fit_json,
+                scored_at = excluded.scored_at
+            """,
+            [
+                (
+                    profile_id,
+                    row["job_key"],
+                    row["job_hash"],
+                    json.dumps(row["hybrid"], ensure_ascii=False),
+                    json.dumps(row["fit"], ensure_ascii=False) if row.get("fit") is not None else None,
+                    now,
+                )
+                for row in rows
+            ],
+        )
+        if keep_keys is not None:
+            cached = conn.execute(
+                "SELECT job_key FROM match_scores WHERE profile_id = ?", (profile_id,)
+            ).fetchall()
+            stale = [(profile_id, r["job_key"]) for r in cached if r["job_key"] not in keep_keys]
+            conn.executemany(
+                "DELETE FROM match_scores WHERE profile_id = ? AND job_key = ?", stale
+            )
+
+
+def save_match_state(
+    matches_db_path: str | Path, profile_id: str, *, signature: str, watermark: str | None
+) -> None:
+    with _connect(matches_db_path) as conn:
+        conn.execute(
+            """
+            INSERT INTO match_state (profile_id, signature, watermark, updated_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(profile_id) DO UPDATE SET
+                signature = excluded.signature,
+                watermark = excluded.watermark,
+                updated_at = excluded.updated_at
+            """,
+            (profile_id, signature, watermark, _utc_now()),
+        )
+
+
+def clear_match_scores(matches_db_path: str | Path, profile_id: str) -> None:
+    """Forget every carried-forward score for a profile (signature changed)."""
+    with _connect(matches_db_path) as conn:
+        conn.execute("DELETE FROM match_scores WHERE profile_id = ?", (profile_id,))
+        conn.execute("DELETE FROM match_state WHERE profile_id = ?", (profile_id,))
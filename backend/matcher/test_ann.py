@@ -0,0 +1,107 @@
+"""Tests for the IVF job-embedding index (matcher/ann.py) and the semantic
+shortlist it feeds in run._shortlist.
+
+Offline: vectors are seeded random clusters or a one-hot fake embed_fn keyed
+on the job text; tmp_path databases only.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+
+import numpy as np
+
+from backend.matcher import ann, features
+from backend.matcher import run as run_mod
+
+
+def _clustered(n: int, dim: int = 32, clusters: int = 40) -> np.ndarray:
+    rng = np.random.default_rng(7)
+    centers = rng.normal(size=(clusters, dim))
+    vecs = centers[rng.integers(0, clusters, size=n)] + 0.35 * rng.normal(size=(n, dim))
+    return (vecs / np.linalg.norm(vecs, axis=1, keepdims=True)).astype(np.float32)
+
+
+def _seed(db, vectors: np.ndarray, start: int = 0) -> None:
+    conn = sqlite3.connect(str(db))
+    features.ensure_features_schema(conn)
+    conn.executemany(
+        "INSERT OR REPLACE INTO job_features (job_key, desc_hash, required_skills, preferred_skills, "
+        "domain_tags, level, full_text, embedding_main, updated_at) "
+        "VALUES (?, '', '{}', '{}', '[]', 'unknown', '', ?, '')",
+        [(f"gh:{start + i}", v.tobytes()) for i, v in enumerate(vectors)],
+    )
+    ann.add_vectors(conn, [(f"gh:{start + i}", v) for i, v in enumerate(vectors)])
+    conn.commit()
+    conn.close()
+
+
+def _members(db) -> dict[str, int]:
+    with sqlite3.connect(str(db)) as conn:
+        return dict(conn.execute("SELECT job_key, list_id FROM ann_members"))
+
+
+def _lists(db) -> int:
+    with sqlite3.connect(str(db)) as conn:
+        return conn.execute("SELECT COUNT(*) FROM ann_lists").fetchone()[0]
+
+
+def test_ivf_recall_matches_brute_force(tmp_path):
+    db = tmp_path / "features.db"
+    vectors = _clustered(3000)
+    _seed(db, vectors)
+    assert _lists(db) == int(np.sqrt(3000))
+
+    queries = _clustered(3020)[3000:]
+    hits = 0
+    for q in queries:
+        exact = {f"gh:{i}" for i in np.argsort(-(vectors @ q))[:20]}
+        hits += len(exact & set(ann.nearest(db, q, 20)))
+    assert hits / (20 * len(queries)) >= 0.9
+
+    # restricted to a subset: widening probes still finds k allowed jobs
+    allowed = [f"gh:{i}" for i in range(0, 3000, 97)]
+    got = ann.nearest(db, queries[0], 10, job_keys=allowed)
+    sub = np.array([int(k[3:]) for k in allowed])
+    assert got == [f"gh:{i}" for i in sub[np.argsort(-(vectors[sub] @ queries[0]), kind="stable")][:10]]
+
+
+def test_index_tracks_growth_and_dimension(tmp_path):
+    db = tmp_path / "features.db"
+    _seed(db, _clustered(300))
+    assert _lists(db) == int(np.sqrt(300))
+    _seed(db, _clustered(200), start=300)                 # filed, not retrained
+    assert len(_members(db)) == 500 and _lists(db) == int(np.sqrt(300))
+    _seed(db, _clustered(200), start=500)                 # 700 > 2 × 300 → retrain
+    assert len(_members(db)) == 700 and _lists(db) == int(np.sqrt(700))
+
+    _seed(db, _clustered(5, dim=16))                      # new embedding model
+    assert set(_members(db)) == {f"gh:{i}" for i in range(5)}
+    assert ann.nearest(db, np.ones(32, dtype=np.float32), 3) == []
+
+
+def _one_hot_embed(texts):
+    out = []
+    for text in texts:
+        vec = np.zeros(8, dtype=np.float32)
+        vec[sum(map(ord, text)) % 8] = 1.0
+        out.append(vec.tolist())
+    return out
+
+
+def test_ensure_job_features_maintains_index_and_shortlist(tmp_path):
+    db = tmp_path / "features.db"
+    jobs = [{"source_ats": "gh", "external_id": str(i), "title": f"Role {i}", "company": "Acme",
+             "description_text": f"Build {word} systems"} for i, word in
+            enumerate(["rust", "kafka", "python", "kotlin", "golang", "scala"])]
+    features.ensure_job_features(jobs, db, ontology={}, embed_fn=_one_hot_embed, mapper=lambda *a, **k: {})
+    assert set(_members(db)) == {f"gh:{j['external_id']}" for j in jobs}
+
+    target = np.asarray(_one_hot_embed([features.build_job_features(jobs[2], {}, mapper=lambda *a, **k: {})
+                                        ["full_text"]])[0])
+    assert ann.nearest(db, target, 1) == ["gh:2"]
+
+    candidate = {"profile_embedding": target, "query_terms": ["kotlin"]}
+    picked = run_mod._shortlist(candidate, jobs, db, 1)
+    assert [j["external_id"] for j in picked] == ["2", "3"]      # nearest + best BM25, input order
+    assert run_mod._shortlist({"profile_embedding": None}, jobs, db, 1) == []
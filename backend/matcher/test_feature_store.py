@@ -0,0 +1,146 @@
+"""Tests for the memory-mapped job feature store (matcher/feature_store.py)
+and the hybrid scorer reading through it.
+
+Offline: a hash-seeded fake embed_fn, the real ontology, tmp_path databases.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+
+import numpy as np
+import pytest
+
+from backend.matcher import feature_store, features, hybrid
+from backend.matcher.ontology import load_ontology
+
+DIM = 16
+
+
+def _embed(texts):
+    out = []
+    for text in texts:
+        seed = int(hashlib.sha256(text.encode()).hexdigest()[:8], 16)
+        vec = np.random.default_rng(seed).normal(size=DIM).astype(np.float32)
+        out.append(vec / np.linalg.norm(vec))
+    return out
+
+
+def _jobs(n: int, *, variant: str = "") -> list[dict]:
+    bodies = [
+        "Requirements:\nPython, PyTorch and machine learning.\nPreferred:\nStatistics, SQL.",
+        "Requirements:\nJava, microservices, REST APIs and Kafka.",
+        "We build computer vision models with OpenCV for medical imaging.",
+        "Preferred:\nReact, TypeScript and CSS.\nRequirements:\nPython.",
+    ]
+    titles = ["Machine Learning Intern", "Senior Backend Engineer", "Research Associate", "Frontend Co-op"]
+    return [
+        {"source_ats": "gh", "external_id": str(i), "title": titles[i % 4], "company": "Acme",
+         "location": "Remote" if i % 3 else "NYC", "description_text": bodies[i % 4] + variant + f" #{i}"}
+        for i in range(n)
+    ]
+
+
+def _candidate() -> dict:
+    return {
+        "skills": {"skill:python": 1.0, "skill:machine-learning": 0.9, "skill:pytorch": 0.8},
+        "domains": ["ml"],
+        "target_level": "intern",
+        "profile_embedding": _embed(["profile"])[0],
+        "experience_embeddings": _embed(["exp a", "exp b"]),
+        "query_terms": ["python", "machine learning"],
+    }
+
+
+def _meta(db) -> dict:
+    with sqlite3.connect(str(db)) as conn:
+        return dict(conn.execute("SELECT key, value FROM store_meta"))
+
+
+def _score(db, jobs, **kw):
+    return hybrid.score_jobs_hybrid(_candidate(), jobs, db, ontology=load_ontology(), **kw)
+
+
+def test_store_scores_match_get_features(tmp_path, capsys):
+    db = tmp_path / "features.db"
+    jobs = _jobs(24)
+    features.ensure_job_features(jobs, db, embed_fn=_embed)
+
+    stored = feature_store.read(db, [features._job_key(j) for j in jobs])
+    assert stored is not None and len(stored) == 24
+    assert isinstance(stored.vectors, np.memmap)
+    assert feature_store.read(db, ["gh:0"]).vectors is stored.vectors   # one mapping per process
+    reference = features.get_features(db, stored.keys)
+    for row, key in enumerate(stored.keys):
+        want = reference[key]
+        got = stored.features(row)
+        for name in ("required_skills", "preferred_skills", "domain_tags", "level"):
+            assert got[name] == want[name], (key, name)
+        assert np.array_equal(stored.vectors[stored.main_row[row]], want["embedding_main"])
+
+    fast = _score(db, jobs, explain_top=5)
+    slow = _score(db, jobs, explain_top=5, get_features_fn=features.get_features)
+    assert [(i["job_key"], i["hybrid_total"], i["components"]) for i in fast] == [
+        (i["job_key"], i["hybrid_total"], i["components"]) for i in slow
+    ]
+    assert [i["explanation"] for i in fast] == [i["explanation"] for i in slow]
+
+    # a job without features is skipped exactly as on the dict path
+    capsys.readouterr()
+    extra = {"source_ats": "gh", "external_id": "new", "title": "x", "description_text": "y"}
+    assert len(_score(db, [*jobs, extra])) == 24
+    assert "1 job(s) missing features" in capsys.readouterr().out
+
+
+def test_reembedded_jobs_append_and_compact(tmp_path):
+    db = tmp_path / "features.db"
+    jobs = _jobs(8)
+    features.ensure_job_features(jobs, db, embed_fn=_embed)
+    first = _meta(db)
+    live_rows = first["rows"]
+
+    features.ensure_job_features(_jobs(3, variant=" (updated)") + jobs[3:], db, embed_fn=_embed)
+    grown = _meta(db)
+    assert grown["gen"] == first["gen"] and grown["rows"] > live_rows and grown["dead"] > 0
+    before = _score(db, jobs)
+
+    result = feature_store.compact(db)
+    after_meta = _meta(db)
+    assert result["dropped"] == grown["dead"] and after_meta["rows"] == live_rows
+    assert after_meta["dead"] == 0 and after_meta["gen"] != first["gen"]
+    assert [p.name for p in tmp_path.glob("features.db.vec.*")] == [f"features.db.vec.{after_meta['gen']}"]
+    assert _score(db, jobs) == before
+
+    stored = feature_store.read(db, ["gh:0"])
+    reference = features.get_features(db, ["gh:0"])["gh:0"]
+    assert np.array_equal(stored.vectors[stored.main_row[0]], reference["embedding_main"])
+
+
+def test_store_falls_back_when_out_of_step(tmp_path):
+    db = tmp_path / "features.db"
+    jobs = _jobs(6)
+    features.ensure_job_features(jobs, db, embed_fn=_embed)
+    keys = [features._job_key(j) for j in jobs]
+
+    # job_features rewritten without the store (an older writer): not served
+    with sqlite3.connect(str(db)) as conn:
+        conn.execute("UPDATE job_features SET desc_hash = 'other' WHERE job_key = 'gh:2'")
+    assert feature_store.read(db, keys) is None
+    assert len(_score(db, jobs)) == 6
+
+    # a features.db from before the store is backfilled by the next build pass
+    with sqlite3.connect(str(db)) as conn:
+        conn.execute("UPDATE job_features SET desc_hash = (SELECT desc_hash FROM store_rows s "
+                     "WHERE s.job_key = job_features.job_key)")
+        conn.execute("DROP TABLE store_rows")
+        conn.execute("DROP TABLE store_meta")
+    assert feature_store.read(db, keys) is None
+    assert features.ensure_job_features(jobs, db, embed_fn=_embed)["reused"] == 6
+    assert feature_store.read(db, keys) is not None
+    assert len(list(tmp_path.glob("features.db.vec.*"))) == 1
+
+    # a candidate embedded at another width is scored from job_features
+    cand = dict(_candidate(), profile_embedding=np.ones(4, dtype=np.float32) / 2, experience_embeddings=[])
+    out = hybrid.score_jobs_hybrid(cand, jobs, db, ontology=load_ontology())
+    assert len(out) == 6 and all(i["components"]["embedding"] == pytest.approx(0.0) for i in out)
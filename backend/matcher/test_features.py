@@ -7,6 +7,7 @@ dict + fake mapper (ontology.py may not exist yet), tmp_path databases only.
 from __future__ import annotations
 
 import hashlib
+import re
 import sqlite3
 
 import numpy as np
@@ -215,6 +216,82 @@ def test_incremental_skip_and_rebuild(tmp_path):
     assert scores["greenhouse:j1"] == 0.0
 
 
+def test_stale_jobs_stream_through_committed_batches(tmp_path, capsys):
+    db = tmp_path / "features.db"
+    calls = []
+
+    def counting_embed(texts):
+        calls.append(len(texts))
+        return fake_embed(texts)
+
+    def stopping_mapper(text, ontology=None, *, title=""):
+        if "STOP" in text:
+            raise KeyboardInterrupt
+        return fake_mapper(text, ontology, title=title)
+
+    jobs = [make_job(f"j{i}", description=f"Python role {i}.") for i in range(5)]
+    interrupted = jobs[:4] + [make_job("j4", description="Python role STOP.")]
+    with pytest.raises(KeyboardInterrupt):
+        features.ensure_job_features(
+            interrupted, db_path=db, ontology=FAKE_ONTOLOGY,
+            embed_fn=counting_embed, mapper=stopping_mapper, batch_size=2,
+        )
+    assert calls == [2, 2]  # one embed call per batch, both batches committed
+    assert "batch 2/3: 4/5 stale jobs" in capsys.readouterr().out
+
+    # The rerun diffs against what was committed and only builds the rest.
+    result = features.ensure_job_features(
+        jobs, db_path=db, ontology=FAKE_ONTOLOGY,
+        embed_fn=counting_embed, mapper=fake_mapper, batch_size=2,
+    )
+    assert result == {"built": 1, "reused": 4, "failed": 0}
+    assert calls == [2, 2, 1]
+    assert set(features.get_features(db, [f"greenhouse:j{i}" for i in range(5)])) == {
+        f"greenhouse:j{i}" for i in range(5)
+    }
+
+
+def test_worker_extraction_matches_in_process(tmp_path, monkeypatch):
+    from backend.matcher.ontology import load_ontology
+
+    monkeypatch.setattr(features, "PARALLEL_MIN_JOBS", 1)
+    descriptions = [
+        JD_TEXT,
+        "We use PyTorch for computer vision and medical imaging. Remote friendly.",
+        "Requirements:\nJava, Kafka and REST APIs.\nNice to have:\nKubernetes.",
+        "Bioinformatics internship: Python, genomics, single-cell analysis.",
+    ]
+    jobs = [make_job(f"j{i}", title=("ML Intern" if i % 2 else "Senior Engineer"),
+                     description=descriptions[i % 4] + f" ({i})") for i in range(9)]
+    ontology = load_ontology()
+    serial, parallel = tmp_path / "serial.db", tmp_path / "parallel.db"
+    for db, workers in ((serial, 1), (parallel, 2)):
+        result = features.ensure_job_features(jobs, db, ontology=ontology, embed_fn=fake_embed,
+                                              batch_size=4, workers=workers)
+        assert result == {"built": 9, "reused": 0, "failed": 0}
+
+    keys = [f"greenhouse:j{i}" for i in range(9)]
+    want, got = features.get_features(serial, keys), features.get_features(parallel, keys)
+    for key in keys:
+        for name in ("desc_hash", "required_skills", "preferred_skills", "domain_tags", "level",
+                     "is_remote", "full_text"):
+            assert got[key][name] == want[key][name], (key, name)
+        assert np.array_equal(got[key]["embedding_main"], want[key]["embedding_main"])
+    assert want["greenhouse:j1"]["required_skills"]  # the real ontology did map skills
+
+
+def test_domain_patterns_match_phrase_loop():
+    texts = [JD_TEXT, "Fintech payments and fraud detection", "ROS robots; not a robotic arm",
+             "front-end react/typescript", "RAG pipelines with LLMs", "nothing relevant", ""]
+    for text in texts:
+        lowered = text.lower()
+        expected = [
+            tag for tag, phrases in features.DOMAIN_KEYWORDS.items()
+            if any(re.search(rf"\b{re.escape(p)}\b", lowered) for p in phrases)
+        ]
+        assert features._detect_domains(text) == expected
+
+
 def test_get_features_roundtrip(tmp_path):
     db = tmp_path / "features.db"
     job_with_sections = make_job("j1")
@@ -246,3 +246,90 @@ def test_end_to_end_real_features_db(tmp_path):
     for item in out:
         assert 0.0 <= item["hybrid_total"] <= 100.0
         assert set(item["components"]) == {"skills", "bm25", "embedding", "domain", "level"}
+
+
+# ── columnar engine parity with the scalar reference functions ────────────────
+def test_vectorized_components_match_scalar_reference():
+    ont = _fake_ontology()
+    rng = np.random.default_rng(7)
+    skill_ids = list(ont) + ["skill:unlisted"]
+    tag_pool = ["ml", "cv", "fintech", "biomed", "healthcare", ""]
+    levels = ["intern", "entry", "mid", "senior", "unknown", "weird"]
+    feats, jobs = {}, []
+    for i in range(60):
+        def _pick():
+            chosen = rng.choice(skill_ids, size=int(rng.integers(0, 4)), replace=False)
+            return {str(s): float(rng.uniform(0.5, 2.0)) for s in chosen}
+        main = rng.normal(size=3).astype(np.float32)
+        main /= np.linalg.norm(main)
+        req = None if i % 3 else (rng.normal(size=3).astype(np.float32))
+        feats[f"gh:{i}"] = {
+            "required_skills": _pick(),
+            "preferred_skills": _pick(),
+            "domain_tags": [str(t) for t in rng.choice(tag_pool, size=int(rng.integers(0, 3)))],
+            "level": str(rng.choice(levels)),
+            "embedding_main": main,
+            "embedding_requirements": req,
+        }
+        jobs.append({"source_ats": "gh", "external_id": str(i)})
+    cand = _candidate(experience_embeddings=[
+        np.array([1.0, 0.0, 0.0], dtype=np.float32),
+        np.array([0.0, 0.6, 0.8], dtype=np.float32),
+    ])
+    raw = {f"gh:{i}": float(i % 7) for i in range(60)}
+    out = hybrid.score_jobs_hybrid(
+        cand, jobs, ontology=ont,
+        get_features_fn=lambda db, keys: feats,
+        bm25_fn=lambda db, terms, keys: raw,
+    )
+    assert len(out) == 60
+    bm25 = hybrid.normalize_bm25(raw, list(raw))
+    for item in out:
+        f = feats[item["job_key"]]
+        expected = {
+            "skills": hybrid.score_skills(cand["skills"], f["required_skills"],
+                                          f["preferred_skills"], ont),
+            "bm25": bm25[item["job_key"]],
+            "embedding": hybrid.score_embedding(cand["profile_embedding"],
+                                                cand["experience_embeddings"],
+                                                f["embedding_main"],
+                                                f["embedding_requirements"]),
+            "domain": hybrid.score_domain(cand["domains"], f["domain_tags"]),
+            "level": hybrid.score_level(cand["target_level"], f["level"]),
+        }
+        for name, val in expected.items():
+            assert item["components"][name] == pytest.approx(val, abs=0.011), name
+    totals = [i["hybrid_total"] for i in out]
+    assert totals == sorted(totals, reverse=True)
+
+
+def test_explain_top_limits_explanations():
+    jobs = [{"source_ats": "gh", "external_id": "1", "title": "ML Intern"},
+            {"source_ats": "gh", "external_id": "2", "title": "Other"}]
+    feats = _one_job_features()
+    feats["gh:2"] = dict(feats["gh:1"], level="senior")
+    out = hybrid.score_jobs_hybrid(
+        _candidate(), jobs,
+        ontology=_fake_ontology(),
+        get_features_fn=lambda db, keys: feats,
+        bm25_fn=lambda db, terms, keys: {},
+        explain_top=1,
+    )
+    assert out[0]["job_key"] == "gh:1"
+    assert "Python" in out[0]["explanation"]["matched_skills"]
+    assert out[1]["explanation"] == {}
+
+
+def test_bm25_keys_normalize_a_subset_against_the_full_population():
+    jobs = [{"source_ats": "gh", "external_id": str(i), "title": "ML Intern"} for i in (1, 2, 3)]
+    feats = _one_job_features()
+    feats["gh:2"] = dict(feats["gh:1"])
+    feats["gh:3"] = dict(feats["gh:1"])
+    raw = {"gh:1": 2.0, "gh:2": 6.0, "gh:3": 10.0}
+    kw = dict(ontology=_fake_ontology(), get_features_fn=lambda db, keys: {k: feats[k] for k in keys},
+              bm25_fn=lambda db, terms, keys: {k: raw[k] for k in keys})
+    full = {i["job_key"]: i for i in hybrid.score_jobs_hybrid(_candidate(), jobs, **kw)}
+    subset = hybrid.score_jobs_hybrid(_candidate(), jobs[1:2], bm25_keys=["gh:1", "gh:2", "gh:3"], **kw)
+    assert [i["job_key"] for i in subset] == ["gh:2"]
+    assert subset[0]["components"]["bm25"] == full["gh:2"]["components"]["bm25"] == 50.0
+    assert subset[0]["hybrid_total"] == full["gh:2"]["hybrid_total"]
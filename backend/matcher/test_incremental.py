@@ -0,0 +1,92 @@
+"""Tests for incremental matching state (matcher/incremental.py + store tables)."""
+
+from __future__ import annotations
+
+from backend.matcher import incremental, store
+
+
+def _job(i: int, **over) -> dict:
+    job = {"source_ats": "gh", "external_id": str(i), "title": f"Role {i}", "company": "Acme",
+           "description_text": f"desc {i}", "last_seen": "2026-10-01T00:00:00"}
+    job.update(over)
+    return job
+
+
+def _cached(jobs: list[dict]) -> dict:
+    return {incremental.job_key(j): {"job_hash": incremental.job_fingerprint(j),
+                                     "hybrid": {"total": 1.0}, "fit": None} for j in jobs}
+
+
+def test_first_run_everything_is_delta():
+    plan = incremental.plan_incremental([_job(1), _job(2)], signature="s", state=None, cached={})
+    assert [j["external_id"] for j in plan.delta] == ["1", "2"]
+    assert plan.carried == {} and plan.watermark == "2026-10-01T00:00:00"
+
+
+def test_unchanged_and_changed_jobs_split():
+    old = [_job(1), _job(2), _job(3)]
+    state = {"signature": "s", "watermark": "2026-10-01T00:00:00"}
+    now = [
+        _job(1),                                                      # untouched
+        _job(2, last_seen="2026-10-02T00:00:00"),                      # re-seen, same content
+        _job(3, description_text="edited", last_seen="2026-10-02T00:00:00"),
+        _job(4, last_seen="2026-10-02T00:00:00"),                      # new
+    ]
+    plan = incremental.plan_incremental(now, signature="s", state=state, cached=_cached(old))
+    assert [j["external_id"] for j in plan.delta] == ["3", "4"]
+    assert set(plan.carried) == {"gh:1", "gh:2"}
+    assert plan.watermark == "2026-10-02T00:00:00"
+    assert not plan.reset
+
+
+def test_signature_change_resets_cache():
+    jobs = [_job(1)]
+    state = {"signature": "old", "watermark": "2026-10-01T00:00:00"}
+    plan = incremental.plan_incremental(jobs, signature="new", state=state, cached=_cached(jobs))
+    assert plan.reset and plan.carried == {} and len(plan.delta) == 1
+
+
+def test_signature_covers_weights_and_scoring_version():
+    base = dict(profile_hash="p", weights={"skills": 1.0}, scoring_version="v1",
+                ontology_version="o", target_level="intern", llm_prefer="ollama", search_boost=5)
+    sig = incremental.match_signature(**base)
+    assert sig == incremental.match_signature(**base)
+    assert sig != incremental.match_signature(**{**base, "weights": {"skills": 0.9}})
+    assert sig != incremental.match_signature(**{**base, "scoring_version": "v2"})
+    assert sig != incremental.match_signature(**{**base, "profile_hash": "q"})
+
+
+def test_fallback_fit_is_not_cacheable():
+    assert not incremental.fit_is_cacheable(None)
+    assert not incremental.fit_is_cacheable({"dimensions": {"a": {"score": 0}, "b": {"score": 0}}})
+    assert incremental.fit_is_cacheable({"dimensions": {"a": {"score": 0}, "b": {"score": 40}}})
+
+
+def test_store_round_trip_and_prune(tmp_path):
+    db = tmp_path / "matches.db"
+    assert store.load_match_state(db, "p") is None
+    rows = [{"job_key": "gh:1", "job_hash": "h1", "hybrid": {"total": 70.0}, "fit": {"match_pct": 80}},
+            {"job_key": "gh:2", "job_hash": "h2", "hybrid": {"total": 60.0}, "fit": None}]
+    store.save_match_scores(db, "p", rows)
+    store.save_match_state(db, "p", signature="sig", watermark="w1")
+    cached = store.load_match_scores(db, "p")
+    assert cached["gh:1"]["fit"] == {"match_pct": 80} and cached["gh:2"]["fit"] is None
+    assert store.load_match_state(db, "p")["watermark"] == "w1"
+
+    store.save_match_scores(db, "p", [], keep_keys={"gh:2"})
+    assert set(store.load_match_scores(db, "p")) == {"gh:2"}
+
+    store.clear_match_scores(db, "p")
+    assert store.load_match_scores(db, "p") == {} and store.load_match_state(db, "p") is None
+
+
+def test_fingerprint_prefers_scraper_content_hash():
+    assert incremental.job_fingerprint(_job(1, content_hash="abc")) == "abc"
+    assert incremental.job_fingerprint(_job(1)) == incremental.job_fingerprint(_job(1))
+
+
+def test_hydrated_description_changes_the_fingerprint():
+    summary = incremental.job_fingerprint(_job(1, content_hash="abc"))
+    hydrated = incremental.job_fingerprint(_job(1, content_hash="abc", detail_hash="d1"))
+    assert hydrated != summary
+    assert hydrated != incremental.job_fingerprint(_job(1, content_hash="abc", detail_hash="d2"))
@@ -164,3 +164,60 @@ def test_real_ontology_maps_realistic_jd():
     for sid in ("skill:rag", "skill:langchain", "skill:pytorch", "skill:aws",
                 "skill:docker", "skill:llm"):
         assert sid in got
+
+
+# ── single-pass matcher ────────────────────────────────────────────────
+def test_matcher_candidates_skip_skills_without_a_trigger_token():
+    matcher = ontology.build_matcher(_mini())
+    assert matcher.candidates("we use pytorch daily") == ["skill:pytorch"]
+    assert matcher.candidates("torchbearer") == []
+
+
+def test_matcher_agrees_with_per_skill_regex_on_real_ontology():
+    onto = load_ontology()
+    matcher = ontology.compiled_matcher(onto)
+    text = ("ml/ai engineer: c++, c#, node.js, ci/cd, a/b testing, r, go, "
+            "large language models, pytorch, scikit-learn and rag. " * 2).lower()
+    expected = {}
+    for sid, skill in onto.items():
+        tf = sum(1 for _ in ontology._compile(tuple(skill.synonyms)).finditer(text))
+        if tf:
+            expected[sid] = tf
+    assert matcher.hits(text) == expected
+
+
+def test_matcher_json_round_trip():
+    matcher = ontology.build_matcher(_mini())
+    clone = ontology.SkillMatcher.from_json(matcher.to_json())
+    assert clone.version == matcher.version
+    text = "machine learning in python and r with torch"
+    assert clone.hits(text) == matcher.hits(text)
+
+
+def test_matcher_is_built_once_per_ontology_version():
+    assert ontology.compiled_matcher(_mini()) is ontology.compiled_matcher(_mini())
+    changed = _mini()
+    changed["skill:python"] = Skill("skill:python", "Python", ["python", "py"], [], [])
+    assert ontology.compiled_matcher(changed).version != ontology.compiled_matcher(_mini()).version
+    assert "skill:python" in map_text_to_skills("scripts in py", changed)
+
+
+def test_matcher_disk_cache_reused_and_rebuilt_on_version_change(tmp_path, monkeypatch):
+    path = tmp_path / "matcher.json"
+    monkeypatch.setenv("SMARTAPPLY_ONTOLOGY_MATCHER_CACHE", str(path))
+    ontology._matcher_for.cache_clear()
+    try:
+        onto = _mini()
+        built = ontology.compiled_matcher(onto)
+        assert ontology.SkillMatcher.load(path).version == built.version
+
+        ontology._matcher_for.cache_clear()
+        assert ontology.compiled_matcher(onto).to_json() == built.to_json()
+
+        onto["skill:go"] = Skill("skill:go", "Go", ["golang"], [], [])
+        ontology._matcher_for.cache_clear()
+        rebuilt = ontology.compiled_matcher(onto)
+        assert rebuilt.version != built.version
+        assert ontology.SkillMatcher.load(path).version == rebuilt.version
+    finally:
+        ontology._matcher_for.cache_clear()
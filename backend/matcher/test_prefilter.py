@@ -0,0 +1,115 @@
+"""Tests for the SQL-pushdown stage 0 prefilter (matcher/prefilter.py).
+
+Jobs are inserted straight into a tmp jobs.db; the reference below is the
+row-by-row Python filter the pushdown replaced.
+"""
+
+from __future__ import annotations
+
+from itertools import product
+import json
+from pathlib import Path
+import re
+
+from backend.matcher import prefilter
+from backend.scraper import store
+
+FILTERS = Path(__file__).resolve().parents[1] / "scraper" / "filters.yaml"
+EXCLUDES = ["senior", "staff", "principal", "lead", "manager", "director"]
+
+TITLES = ["ML Intern", "Senior ML Engineer", "Staffing Analyst", "Team Lead, Data", "Research Engineer"]
+TAGS = ["[]", json.dumps(["machine learning intern"])]
+
+
+def _insert(conn, ext, title, *, intern, loc, ko, tags, status="active", desc="Build models."):
+    conn.execute(
+        """
+        INSERT INTO jobs (source_ats, company, external_id, title, location, is_internship,
+            location_match, sponsorship_knockout, description_text, raw_json, first_seen,
+            last_seen, status, matched_searches)
+        VALUES ('greenhouse', 'Acme', ?, ?, 'Remote', ?, ?, ?, ?, '{}', '2026-01-01',
+                '2026-01-01', ?, ?)
+        """,
+        (ext, title, intern, loc, ko, desc, status, tags),
+    )
+
+
+def _grid(db):
+    with store.get_conn(db) as conn:
+        for i, (title, intern, loc, ko, tags, status) in enumerate(
+            product(TITLES, (0, 1), (0, 1), (0, 1), TAGS, ("active", "expired"))
+        ):
+            _insert(conn, str(i), title, intern=intern, loc=loc, ko=ko, tags=tags, status=status)
+        conn.execute("DELETE FROM jobs WHERE external_id = '5'")
+
+
+def _reference(db, role_mode, bypass):
+    with store.get_conn(db) as conn:
+        rows = [dict(r) for r in conn.execute("SELECT * FROM jobs WHERE status = 'active' ORDER BY rowid")]
+    out = []
+    for row in rows:
+        if row["location_match"] != 1 or row["sponsorship_knockout"] == 1:
+            continue
+        tags = json.loads(row["matched_searches"])
+        if role_mode == "internship" and not row["is_internship"] and not (bypass and tags):
+            continue
+        if role_mode == "fulltime" and (row["is_internship"] or any(
+            re.search(rf"\b{t}\b", row["title"].lower()) for t in EXCLUDES
+        )):
+            continue
+        out.append(row["external_id"])
+    return out
+
+
+def test_pushdown_agrees_with_row_scan(tmp_path):
+    db = tmp_path / "jobs.db"
+    _grid(db)
+    for role_mode, bypass in product(("internship", "fulltime", "both"), (True, False)):
+        survivors = prefilter.prefilter_jobs(db, role_mode, FILTERS, search_bypass_internship=bypass)
+        assert [s["external_id"] for s in survivors] == _reference(db, role_mode, bypass), role_mode
+        assert all(s["description_text"] == "Build models." for s in survivors)
+        assert all(isinstance(s["matched_searches"], list) for s in survivors)
+
+
+def test_targeting_predicate_agrees_with_pushdown(tmp_path):
+    db = tmp_path / "jobs.db"
+    _grid(db)
+    with store.get_conn(db) as conn:
+        rows = [dict(r) for r in conn.execute("SELECT * FROM jobs WHERE status = 'active' ORDER BY rowid")]
+    for role_mode, bypass in product(("internship", "fulltime", "both"), (True, False)):
+        kept = [
+            r["external_id"] for r in rows
+            if prefilter.passes_targeting(r, role_mode, bypass)
+            and not (role_mode == "fulltime" and re.search(rf"\b({'|'.join(EXCLUDES)})\b", r["title"].lower()))
+        ]
+        assert kept == _reference(db, role_mode, bypass), (role_mode, bypass)
+
+
+def test_fulltime_excludes_are_whole_words(tmp_path):
+    db = tmp_path / "jobs.db"
+    with store.get_conn(db) as conn:
+        for ext, title in enumerate(["Staffing Analyst", "Staff Engineer", "Leadership Coach", "ML Lead"]):
+            _insert(conn, str(ext), title, intern=0, loc=1, ko=0, tags="[]")
+    survivors = prefilter.prefilter_jobs(db, "fulltime", FILTERS)
+    assert [s["title"] for s in survivors] == ["Staffing Analyst", "Leadership Coach"]
+
+
+def test_unreadable_tags_are_computed_for_bypass(tmp_path):
+    db = tmp_path / "jobs.db"
+    with store.get_conn(db) as conn:
+        _insert(conn, "1", "ML Engineer", intern=0, loc=1, ko=0, tags="not json",
+                desc="Large language model research internship.")
+        _insert(conn, "2", "Java Engineer", intern=0, loc=1, ko=0, tags="not json", desc="Spring.")
+    survivors = prefilter.prefilter_jobs(db, "internship", FILTERS)
+    assert [s["external_id"] for s in survivors] == ["1"]
+    assert survivors[0]["matched_searches"] == ["LLM research intern"]
+
+
+def test_candidate_query_uses_targeting_index(tmp_path):
+    db = tmp_path / "jobs.db"
+    with store.get_conn(db) as conn:
+        for role_mode in ("internship", "fulltime", "both"):
+            plan = conn.execute(
+                "EXPLAIN QUERY PLAN " + prefilter._candidate_sql(role_mode, True, True)
+            ).fetchall()
+            assert "idx_jobs_targeted" in plan[0]["detail"], plan
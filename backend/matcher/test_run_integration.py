@@ -15,6 +15,8 @@ from backend.matcher.config import load_config
 
 def _cfg(**over):
     cfg = load_config()  # real defaults
+    # These cover the full-rescore path; the incremental path has its own tests below.
+    over.setdefault("incremental_matching", False)
     for k, v in over.items():
         object.__setattr__(cfg, k, v)
     return cfg
@@ -104,3 +106,110 @@ def test_flag_false_uses_legacy_not_hybrid(monkeypatch, captured):
 
     run_mod.run_pipeline(profile_id="default", config="")
     assert hybrid_called["hit"] is False         # flag off → hybrid never invoked
+
+
+# ── incremental mode ───────────────────────────────────────────────────
+@pytest.fixture
+def incremental_env(monkeypatch, tmp_path):
+    """Mutable job list + call recorders for the incremental path."""
+    from backend.matcher import candidate_features
+
+    env = {"jobs": [
+        {"source_ats": "gh", "external_id": str(i), "title": f"ML Intern {i}", "company": "Acme",
+         "description_text": f"role {i}", "matched_searches": [], "last_seen": "2026-10-01T00:00:00"}
+        for i in range(4)
+    ], "hybrid_calls": [], "fit_calls": [], "gated": [], "cfg": {}}
+
+    monkeypatch.setattr(run_mod, "prefilter_jobs", lambda **kw: [dict(j) for j in env["jobs"]])
+    monkeypatch.setattr(candidate_features, "_get_profile", lambda pid: {"summary": "ml"})
+
+    def fake_hybrid(profile_id, survivors, cfg, features_db, *, only=None):
+        targets = survivors if only is None else only
+        env["hybrid_calls"].append([j["external_id"] for j in targets])
+        return [run_mod._reranked_item(j, {
+            "total": 50.0 + int(j["external_id"]), "explanation": {}, "scoring_version": "v1",
+            "components": {"skills": 0, "bm25": 0, "embedding": 60, "domain": 0, "level": 0},
+        }) for j in targets]
+
+    def fake_fit(profile_id, reranked, top_fit=30, **kw):
+        env["fit_calls"].append([item["job"]["external_id"] for item in reranked[:top_fit]])
+        for item in reranked[:top_fit]:
+            item["fit"] = {"match_pct": 90, "dimensions": {"technical_skills": {"score": 90}}}
+            item["match_pct"] = 90
+        return reranked[:top_fit]
+
+    def fake_gate(matches_db_path, profile_id, fitted, **kw):
+        env["gated"].append([item["job"]["external_id"] for item in fitted])
+        return {"stored": len(fitted), "strong": len(fitted), "stretch": 0}
+
+    monkeypatch.setattr(run_mod, "_hybrid_rank", fake_hybrid)
+    monkeypatch.setattr(run_mod, "fit_candidates", fake_fit)
+    monkeypatch.setattr(run_mod, "gate_and_store", fake_gate)
+    monkeypatch.setattr(run_mod, "load_config", lambda c=None: _cfg(
+        use_hybrid_ranking=True, incremental_matching=True, top_fit=2,
+        matches_db_path=str(tmp_path / "matches.db"), **env["cfg"]))
+    return env
+
+
+def test_incremental_second_run_scores_nothing_when_jobs_unchanged(incremental_env):
+    first = run_mod.run_pipeline(profile_id="default")
+    assert first["scored"] == 4 and first["carried"] == 0
+    assert incremental_env["fit_calls"] == [["3", "2"]]       # top_fit by hybrid total
+
+    second = run_mod.run_pipeline(profile_id="default")
+    assert second["stage"] == "unchanged" and second["carried"] == 4
+    assert len(incremental_env["hybrid_calls"]) == 1           # no rescoring at all
+    assert len(incremental_env["fit_calls"]) == 1
+
+
+def test_incremental_scores_only_new_and_changed_jobs(incremental_env):
+    run_mod.run_pipeline(profile_id="default")
+    jobs = incremental_env["jobs"]
+    jobs.append({**jobs[0], "external_id": "9", "title": "new", "last_seen": "2026-10-02T00:00:00"})
+    jobs[1] = {**jobs[1], "description_text": "edited", "last_seen": "2026-10-02T00:00:00"}
+    jobs[2] = {**jobs[2], "last_seen": "2026-10-02T00:00:00"}  # re-seen, content identical
+
+    out = run_mod.run_pipeline(profile_id="default")
+    assert sorted(incremental_env["hybrid_calls"][-1]) == ["1", "9"]
+    assert incremental_env["fit_calls"][-1] == ["9"]           # job 3 keeps its cached fit
+    assert incremental_env["gated"][-1] == ["9"]
+    assert out["scored"] == 2 and out["carried"] == 3
+
+
+def test_incremental_cache_invalidated_when_weights_change(incremental_env):
+    run_mod.run_pipeline(profile_id="default")
+    incremental_env["cfg"]["hybrid_weights"] = {
+        "skills": 0.5, "bm25": 0.1, "embedding": 0.2, "domain": 0.1, "level": 0.1}
+    out = run_mod.run_pipeline(profile_id="default")
+    assert sorted(incremental_env["hybrid_calls"][-1]) == ["0", "1", "2", "3"]
+    assert out["carried"] == 0
+
+
+def test_full_flag_bypasses_incremental_cache(incremental_env):
+    run_mod.run_pipeline(profile_id="default")
+    run_mod.run_pipeline(profile_id="default", full=True)
+    assert sorted(incremental_env["hybrid_calls"][-1]) == ["0", "1", "2", "3"]
+
+
+def test_hydrated_flags_are_rechecked_against_role_mode(monkeypatch):
+    try:
+        import scraper.hydrate as hydrate_mod
+    except ImportError:
+        from backend.scraper import hydrate as hydrate_mod
+
+    def hydrate_jobs(jobs, db_path, limit=None):
+        # The detail page shows job 2 is full-time and matches no search.
+        for job in jobs:
+            job.update(detail_hash="d", is_internship=int(job["external_id"] != "2"), matched_searches=[])
+        return {"candidates": len(jobs), "hydrated": len(jobs), "failed": 0, "deferred": 0}
+
+    monkeypatch.setattr(hydrate_mod, "hydrate_jobs", hydrate_jobs)
+    jobs = [
+        {"source_ats": "gh", "external_id": ext, "title": "ML Intern", "location_match": 1,
+         "sponsorship_knockout": 0, "is_internship": 1, "matched_searches": ["ml"]}
+        for ext in ("1", "2")
+    ]
+    kept = run_mod._hydrate([dict(j) for j in jobs], "jobs.db", _cfg(role_mode="internship"))
+    assert [j["external_id"] for j in kept] == ["1"]
+    kept = run_mod._hydrate([dict(j) for j in jobs], "jobs.db", _cfg(role_mode="both"))
+    assert [j["external_id"] for j in kept] == ["1", "2"]
@@ -39,9 +39,11 @@ def run_nightly(
     # Imported lazily: pulls in the FastAPI app + pipeline, heavier than the matcher CLI.
     try:
         import backend.main as app_main
+        from backend.matcher.store import wait_for_liveness
         from backend.tracker import pacing as tracker_pacing
     except ImportError:
         import main as app_main  # type: ignore
+        from matcher.store import wait_for_liveness  # type: ignore
         from tracker import pacing as tracker_pacing  # type: ignore
 
     summary: dict = {"profile_id": profile_id}
@@ -66,6 +68,9 @@ def run_nightly(
         print("[nightly] 3/3 pacing skipped")
         summary["pacing"] = None
 
+    # The matcher's liveness refresh ran alongside tailoring/pacing; join it
+    # before the process exits so its verdicts are written.
+    wait_for_liveness()
     print(f"[nightly] done: {summary}")
     return summary
 
@@ -19,9 +19,16 @@ import re
 from typing import Any, Callable
 
 try:
-    from llm_provider import call_llm, clean_json
+    from llm_provider import call_llm, clean_json, json_reply_ok
 except ImportError:  # pragma: no cover - package-style import
-    from backend.llm_provider import call_llm, clean_json
+    from backend.llm_provider import call_llm, clean_json, json_reply_ok
+
+
+def _cached_llm_call(messages: list, **kwargs: Any) -> str:
+    """call_llm for this module's low-temperature JSON prompts: the same JD
+    (or JD + profile) asks the same question, so the reply is cached — but
+    only when it parses, so a malformed answer is retried, not replayed."""
+    return call_llm(messages, cache=True, validate=json_reply_ok, **kwargs)
 
 # ── Five-dimension weights (must sum to 1.0) ─────────────────────────
 DIMENSION_WEIGHTS: dict[str, float] = {
@@ -93,6 +100,36 @@ MUST_WEIGHT = 2.0
 NICE_WEIGHT = 1.0
 
 KnowledgeSearch = Callable[[str, str, int], list[dict[str, Any]]]
+KnowledgeSearchMany = Callable[[str, list[str], int], list[list[dict[str, Any]]]]
+
+
+def batched_search(
+    pid: str,
+    queries: list[str],
+    k: int,
+    knowledge_search: KnowledgeSearch,
+    knowledge_search_many: KnowledgeSearchMany | None,
+) -> KnowledgeSearch:
+    """A KnowledgeSearch answering ``queries`` from one batched lookup.
+
+    Queries outside the batch (or a failed batch) go to ``knowledge_search``,
+    so callers keep their per-query contract either way.
+    """
+    prefetched: dict[str, list[dict[str, Any]]] = {}
+    wanted = [q for q in dict.fromkeys(queries) if q]
+    if knowledge_search_many is not None and wanted:
+        try:
+            for query, hits in zip(wanted, knowledge_search_many(pid, wanted, k) or []):
+                prefetched[query] = hits or []
+        except Exception:
+            prefetched.clear()
+
+    def search(pid_: str, query: str, k_: int) -> list[dict[str, Any]]:
+        if pid_ == pid and k_ == k and query in prefetched:
+            return prefetched[query]
+        return knowledge_search(pid_, query, k_)
+
+    return search
 
 
 # ── Company + JD requirement extraction (the one shared LLM call) ────
@@ -125,7 +162,7 @@ def extract_jd_requirements(
 ) -> dict[str, Any]:
     """Parse a JD into structured requirements. No scoring here — verdicts and
     the match score are computed deterministically by the caller."""
-    llm_call = llm_call or call_llm
+    llm_call = llm_call or _cached_llm_call
     inferred_company = extract_company(jd_text, company_hint)
 
     prompt = f"""You are a senior technical recruiter parsing a SPECIFIC job description.
@@ -328,14 +365,21 @@ def judge_requirements(
     llm: str = "ollama",
     adjudicate_borderline: bool = False,
     llm_call: Callable[..., str] | None = None,
+    knowledge_search_many: KnowledgeSearchMany | None = None,
 ) -> list[dict[str, Any]]:
     haystack = build_profile_haystack(profile)
+    if knowledge_search_many is not None:
+        # One embedding call + one connection for every requirement.
+        knowledge_search = batched_search(
+            pid, [str(r or "").strip() for r in requirements], 3,
+            knowledge_search, knowledge_search_many,
+        )
     judgments = [
         judge_requirement(pid, req, haystack, knowledge_search, profile=profile)
         for req in requirements
     ]
     if adjudicate_borderline:
-        _adjudicate_borderline(judgments, llm, llm_call or call_llm)
+        _adjudicate_borderline(judgments, llm, llm_call or _cached_llm_call)
     return judgments
 
 
@@ -692,7 +736,7 @@ def score_job(
             search_boost=0,
         )
 
-    llm_call = llm_call or call_llm
+    llm_call = llm_call or _cached_llm_call
     profile_text = _profile_snapshot_for_fit(profile)
     prompt = _five_dim_prompt(jd_text, profile_text, title=title, company=company)
     try:
@@ -0,0 +1,165 @@
+"""Async fetch engine for scraper runs.
+
+``execute_run`` used to submit every company to a 4-thread pool with a fixed
+0.35s sleep between submits, so a full sweep took ~N × 0.35s no matter which
+ATS hosts were involved. This engine schedules the sweep on an asyncio loop:
+
+- a global in-flight cap (``SCRAPER_MAX_IN_FLIGHT``, default 16);
+- a per-host cap at the company level, taken from the same ``HostPolicy``
+  table the HTTP limiter uses, so one slow Workday tenant cannot park every
+  worker while Greenhouse boards wait;
+- entries interleaved round-robin by provider so the first wave spreads across
+  hosts;
+- an in-run circuit breaker: once a provider fails ``cooldown_after`` times in
+  a row (the same threshold ``store.update_source_health`` uses for its
+  persisted cooldown), its remaining companies are skipped with
+  ``SourceCooldownError`` instead of burning retries against a dead host.
+  Only host failures count (transport errors, 5xx, exhausted 429s); a 404
+  from a stale board token says nothing about the host and leaves the streak
+  as it was.
+
+Provider ``fetch`` callables are blocking (``requests``), so each one runs on a
+bounded thread pool; request pacing itself lives in ``providers.ratelimit``.
+
+With a ``sink``, each result is handed over from the worker thread as soon as
+it completes instead of being collected: the worker keeps its in-flight slot
+until the sink returns, so a sink that blocks (a full queue in front of the
+store writer) throttles fetching instead of buffering payloads. Setting
+``cancel`` (the writer gave up) makes every company not yet started return
+without fetching, so the run winds down after the ones already in flight.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+import requests
+
+from .providers.base import CompanyEntry
+from .providers.ratelimit import host_of, policy_for
+from .providers.registry import resolve_provider
+from .store import COOLDOWN_AFTER
+
+MAX_IN_FLIGHT = int(os.getenv("SCRAPER_MAX_IN_FLIGHT", "16"))
+
+FetchResult = tuple[CompanyEntry, str, Any, float]
+
+
+class SourceCooldownError(RuntimeError):
+    """The provider tripped the in-run breaker; this company was not fetched."""
+
+
+def _host_failure(error: Exception) -> bool:
+    """True when `error` says the provider's host is unhealthy: a transport
+    error, a 5xx, or a 429 that outlasted the retries. Other 4xx (a stale
+    token's 404) and parse errors are about the one company."""
+    if isinstance(error, requests.HTTPError):
+        status = getattr(error.response, "status_code", None)
+        return status is None or status == 429 or status >= 500
+    return isinstance(error, (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError))
+
+
+def _route(entry: CompanyEntry, providers: dict, resolve: Callable) -> tuple[str, str]:
+    """(provider id, host key) for scheduling; unknown hosts share the pid key."""
+    provider = resolve(entry, providers)
+    if provider is None:
+        return entry.ats or "unknown", ""
+    url = ""
+    detect = getattr(provider, "detect", None)
+    if callable(detect):
+        try:
+            url = detect(entry) or ""
+        except Exception:
+            url = ""
+    return provider.id, host_of(url) or provider.id
+
+
+def interleave(routed: list[tuple[CompanyEntry, str, str]]) -> list[tuple[CompanyEntry, str, str]]:
+    """Round-robin across providers, preserving order within each provider."""
+    queues: dict[str, deque] = defaultdict(deque)
+    for item in routed:
+        queues[item[1]].append(item)
+    ordered: list[tuple[CompanyEntry, str, str]] = []
+    while queues:
+        for pid in list(queues):
+            ordered.append(queues[pid].popleft())
+            if not queues[pid]:
+                del queues[pid]
+    return ordered
+
+
+async def _fetch_all(
+    entries: list[CompanyEntry],
+    providers: dict,
+    fetch_one: Callable[[CompanyEntry, dict], FetchResult],
+    max_in_flight: int,
+    cooldown_after: int,
+    resolve: Callable,
+    sink: Callable[[FetchResult], None] | None = None,
+    cancel: threading.Event | None = None,
+) -> list[FetchResult]:
+    loop = asyncio.get_running_loop()
+    in_flight = asyncio.Semaphore(max_in_flight)
+    host_gates: dict[str, asyncio.Semaphore] = {}
+    streaks: dict[str, int] = defaultdict(int)
+
+    def host_gate(host: str) -> asyncio.Semaphore:
+        gate = host_gates.get(host)
+        if gate is None:
+            gate = host_gates[host] = asyncio.Semaphore(policy_for(host).max_concurrency)
+        return gate
+
+    async def run_one(executor: ThreadPoolExecutor, entry: CompanyEntry, pid: str, host: str) -> FetchResult | None:
+        # Host gate first so a company waiting on a busy host never holds a
+        # global slot another host could use.
+        async with host_gate(host), in_flight:
+            if cancel is not None and cancel.is_set():
+                return None
+            if cooldown_after and streaks[pid] >= cooldown_after:
+                result: FetchResult = (entry, pid, SourceCooldownError(
+                    f"{pid} failed {streaks[pid]} times in a row this run"
+                ), 0.0)
+                if sink is None:
+                    return result
+            else:
+                result = await loop.run_in_executor(executor, fetch_one, entry, providers)
+                outcome = result[2]
+                if not isinstance(outcome, Exception):
+                    streaks[pid] = 0
+                elif _host_failure(outcome):
+                    streaks[pid] += 1
+            if sink is not None:
+                await loop.run_in_executor(executor, sink, result)
+                return None
+        return result
+
+    routed = [(entry, *_route(entry, providers, resolve)) for entry in entries]
+    with ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="scrape") as executor:
+        results = await asyncio.gather(*(run_one(executor, e, pid, host) for e, pid, host in interleave(routed)))
+    return [result for result in results if result is not None]
+
+
+def fetch_all(
+    entries: list[CompanyEntry],
+    providers: dict,
+    fetch_one: Callable[[CompanyEntry, dict], FetchResult],
+    *,
+    max_in_flight: int | None = None,
+    cooldown_after: int = COOLDOWN_AFTER,
+    resolve: Callable = resolve_provider,
+    sink: Callable[[FetchResult], None] | None = None,
+    cancel: threading.Event | None = None,
+) -> list[FetchResult]:
+    """Fetch every entry; results are (entry, provider_id, raw_or_error, latency_ms)
+    in interleaved submission order, or — with `sink` — passed to it in
+    completion order (the returned list is then empty). Entries not yet started
+    when `cancel` is set are skipped (no result). Never raises per company."""
+    if not entries:
+        return []
+    limit = max(1, int(max_in_flight or MAX_IN_FLIGHT))
+    return asyncio.run(_fetch_all(entries, providers, fetch_one, limit, cooldown_after, resolve, sink, cancel))
@@ -0,0 +1,105 @@
+"""Lazy description hydration for summary-only providers.
+
+Workday list pages carry only ``bulletFields`` and SmartRecruiters' postings
+list has no job ad at all, so a sweep stores a near-empty description. Rather
+than fetching a detail page for every posting on every board, the matcher
+calls ``hydrate_jobs`` on the prefilter survivors: only those jobs get their
+provider's ``fetch_detail``, and the result is written onto the jobs row with a
+``detail_hash``.
+
+The hydrated text survives later sweeps of the same posting (the upsert only
+bumps last_seen while the content fingerprint is unchanged); a sweep that does
+rewrite the row resets ``detail_hash``, which queues the job for hydration
+again. Detail fetches therefore scale with new or changed candidate jobs, not
+with board size.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+from pathlib import Path
+from typing import Any
+
+from .matchers import current_matcher
+from .normalize import detect_remote_flag, html_to_text
+from .providers.registry import load_providers
+from .store import DB_PATH, get_conn, save_job_details, utc_now_iso
+
+# Detail requests in flight; the per-host limiter still paces each host.
+MAX_WORKERS = 4
+
+
+def detail_providers(providers: dict[str, Any] | None = None) -> dict[str, Any]:
+    """{source_ats: provider} for providers that can fetch a detail page."""
+    providers = providers if providers is not None else load_providers()
+    return {pid: p for pid, p in providers.items() if callable(getattr(p, "fetch_detail", None))}
+
+
+def needs_hydration(job: dict[str, Any], providers: dict[str, Any]) -> bool:
+    return not job.get("detail_hash") and job.get("source_ats") in providers
+
+
+def _hydrated_fields(job: dict[str, Any], html: str) -> dict[str, Any]:
+    """The columns a detail page changes, recomputed the way normalize does."""
+    summary = str(job.get("description_text") or "")
+    text = html_to_text(html) or summary
+    title, location = str(job.get("title") or ""), str(job.get("location") or "")
+    flags, matched = current_matcher().classify(title, location, text)
+    return {
+        "description_text": text,
+        "detail_hash": hashlib.sha256(text.encode("utf-8")).hexdigest(),
+        "remote_flag": detect_remote_flag(title, location, text),
+        "is_internship": flags["is_internship"],
+        "location_match": flags["location_match"],
+        "sponsorship_knockout": flags["sponsorship_knockout"],
+        "matched_searches": matched,
+    }
+
+
+def hydrate_jobs(
+    jobs: list[dict[str, Any]],
+    db_path: Path | str = DB_PATH,
+    *,
+    providers: dict[str, Any] | None = None,
+    limit: int | None = None,
+    max_workers: int = MAX_WORKERS,
+) -> dict[str, int]:
+    """Fetch detail pages for the jobs that still need one (at most `limit`),
+    store them, and update the job dicts in place. A failed fetch leaves the
+    job as it was and it is retried on the next call."""
+    providers = detail_providers(providers)
+    pending = [job for job in jobs if needs_hydration(job, providers)]
+    skipped = 0
+    if limit is not None and len(pending) > limit:
+        skipped = len(pending) - limit
+        pending = pending[:limit]
+    stats = {"candidates": len(pending) + skipped, "hydrated": 0, "failed": 0, "deferred": skipped}
+    if not pending:
+        return stats
+
+    def fetch(job: dict[str, Any]) -> str | Exception:
+        try:
+            return str(providers[job["source_ats"]].fetch_detail(job) or "")
+        except Exception as exc:  # per-job isolation
+            return exc
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="hydrate") as pool:
+        results = list(pool.map(fetch, pending))
+
+    rows: list[dict[str, Any]] = []
+    now = utc_now_iso()
+    for job, result in zip(pending, results):
+        if isinstance(result, Exception):
+            stats["failed"] += 1
+            continue
+        fields = _hydrated_fields(job, result)
+        job.update(fields)
+        job["last_seen"] = now
+        rows.append({**fields, "source_ats": job["source_ats"], "external_id": job["external_id"],
+                     "last_seen": now})
+    if rows:
+        with get_conn(db_path) as conn:
+            save_job_details(conn, rows)
+    stats["hydrated"] = len(rows)
+    return stats
@@ -3,20 +3,67 @@
 Status: live | expired | uncertain
 BOT_CHALLENGE / access-blocked → UNCERTAIN, never expired (keep reasoning as comments).
 
+Verdicts are cached per URL in jobs.db (``liveness_checks``) for
+LIVENESS_TTL_HOURS. Match runs only read that cache (``cached_verdicts``) and
+hand the URLs it lacks to ``refresh_in_background``, whose threads a CLI run
+joins (``wait_for_refreshes``) before the interpreter exits; ``sweep``
+(scheduled next to the nightly scrape, or ``python -m backend.scraper.liveness``)
+re-checks verdicts that went stale, then active jobs never checked at all.
+Checks run concurrently through the scraper's per-host limiter and read pages
+as a stream, stopping after READ_LIMIT_BYTES or as soon as an expired banner /
+bot challenge is visible.
+
 Run on queue entry; re-run on approval.
 """
 
 from __future__ import annotations
 
+import codecs
+from concurrent.futures import ThreadPoolExecutor
+import os
 import re
-from datetime import datetime, timezone
-from typing import Any
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable
 from urllib.parse import urlparse
 
-import requests
 
+try:
+    from backend import sqlite_pool
+except ImportError:  # pragma: no cover - backend/ on sys.path
+    import sqlite_pool  # type: ignore
+
+from .providers import base
 from .providers.base import USER_AGENT, DEFAULT_TIMEOUT_SECONDS
-from .store import get_conn, DB_PATH
+from .store import (
+    DB_PATH,
+    get_conn,
+    load_liveness_checks,
+    save_liveness_checks,
+    stale_liveness_urls,
+    unchecked_liveness_urls,
+)
+
+# Verdicts younger than this are reused instead of refetching the page.
+LIVENESS_TTL_HOURS = float(os.getenv("SMARTAPPLY_LIVENESS_TTL_HOURS", "24"))
+# Pages checked at once; each host is still paced by providers.ratelimit.
+MAX_WORKERS = 8
+# Banners, challenges and apply buttons sit near the top of a posting; the
+# rest of a large page is scripts and footer.
+READ_LIMIT_BYTES = 256 * 1024
+CHUNK_BYTES = 16 * 1024
+# Verdicts about the fetch rather than the posting (a network blip); never
+# cached, and a match holding one is re-checked like a pending one.
+TRANSIENT_CODES = ("fetch_error",)
+# Stale or never-checked URLs checked per sweep.
+SWEEP_LIMIT = 500
+# How long a CLI run waits for its background refreshes before exiting.
+REFRESH_JOIN_SECONDS = float(os.getenv("SMARTAPPLY_LIVENESS_JOIN_SECONDS", "120"))
+
+_REFRESHES: list[threading.Thread] = []
+_REFRESHES_LOCK = threading.Lock()
 
 # Hard-expired banners (multi-language) — from career-ops liveness-core.mjs
 HARD_EXPIRED_PATTERNS = [
@@ -172,6 +219,56 @@ def classify_liveness(
     }
 
 
+_SCRIPT_RE = re.compile(r"<script[\s\S]*?</script>", re.I)
+_STYLE_RE = re.compile(r"<style[\s\S]*?</style>", re.I)
+_OPEN_BLOCK_RE = re.compile(r"<(?:script|style)\b", re.I)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+def visible_text(html: str) -> str:
+    """Strip scripts, styles and tags lightly for pattern matching. A script or
+    style block left open at the end (a partial read) is dropped."""
+    body = _SCRIPT_RE.sub(" ", html or "")
+    body = _STYLE_RE.sub(" ", body)
+    unterminated = _OPEN_BLOCK_RE.search(body)
+    if unterminated:
+        body = body[:unterminated.start()]
+    return _TAG_RE.sub(" ", body)
+
+
+def _decisive(text: str) -> bool:
+    """Nothing later in the page can change the verdict once one of these shows."""
+    return bool(_first_match(BOT_CHALLENGE_PATTERNS, text) or _first_match(HARD_EXPIRED_PATTERNS, text))
+
+
+def _read_page(url: str, *, timeout: float, limit: int | None = None) -> tuple[int, str, str]:
+    """(status, final_url, visible_text) from a streamed, rate-limited GET."""
+    limit = READ_LIMIT_BYTES if limit is None else limit
+    # The host slot covers the body too: a page being read still counts
+    # against the host's concurrency cap.
+    with base.HOST_LIMITER.slot(url):
+        resp = base._session().get(
+            url, timeout=timeout, headers={"User-Agent": USER_AGENT},
+            allow_redirects=True, stream=True,
+        )
+        try:
+            try:
+                decoder = codecs.getincrementaldecoder(resp.encoding or "utf-8")(errors="replace")
+            except LookupError:
+                decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            html, read = "", 0
+            for chunk in resp.iter_content(CHUNK_BYTES):
+                html += decoder.decode(chunk)
+                read += len(chunk)
+                if read >= limit or _decisive(visible_text(html)):
+                    break
+            else:
+                html += decoder.decode(b"", final=True)
+        finally:
+            resp.close()
+    return resp.status_code, str(resp.url), visible_text(html)
+
+
 def check_url(url: str, *, timeout: float = DEFAULT_TIMEOUT_SECONDS) -> dict[str, Any]:
     if not url or not str(url).startswith("http"):
         return {
@@ -181,20 +278,11 @@ def check_url(url: str, *, timeout: float = DEFAULT_TIMEOUT_SECONDS) -> dict[str
             "checked_at": datetime.now(timezone.utc).isoformat(),
         }
     try:
-        resp = requests.get(
-            url,
-            timeout=timeout,
-            headers={"User-Agent": USER_AGENT},
-            allow_redirects=True,
-        )
-        # Strip tags lightly for pattern matching
-        body = re.sub(r"<script[\s\S]*?</script>", " ", resp.text or "", flags=re.I)
-        body = re.sub(r"<style[\s\S]*?</style>", " ", body, flags=re.I)
-        body = re.sub(r"<[^>]+>", " ", body)
+        status, final_url, body = _read_page(url, timeout=timeout)
         result = classify_liveness(
-            status=resp.status_code,
+            status=status,
             requested_url=url,
-            final_url=str(resp.url),
+            final_url=final_url,
             body_text=body,
         )
     except Exception as exc:  # noqa: BLE001
@@ -208,6 +296,152 @@ def check_url(url: str, *, timeout: float = DEFAULT_TIMEOUT_SECONDS) -> dict[str
     return result
 
 
+# ── cached, concurrent checks ──────────────────────────────────────────────────
+
+def _fresh_since(ttl_hours: float) -> str:
+    return (datetime.now(timezone.utc) - timedelta(hours=ttl_hours)).isoformat()
+
+
+def _checkable(url: Any) -> bool:
+    return bool(url) and str(url).startswith("http")
+
+
+def cached_verdicts(
+    urls: list[str],
+    *,
+    db_path: Path | str = DB_PATH,
+    ttl_hours: float = LIVENESS_TTL_HOURS,
+) -> dict[str, dict[str, Any]]:
+    """Stored verdicts for `urls` that are younger than `ttl_hours` (no network)."""
+    wanted = [u for u in urls if _checkable(u)]
+    if not wanted:
+        return {}
+    with get_conn(db_path) as conn:
+        return load_liveness_checks(conn, wanted, since=_fresh_since(ttl_hours))
+
+
+def pending_verdict(url: str) -> dict[str, Any]:
+    """Placeholder for a URL whose check has not finished yet (never expired)."""
+    if not _checkable(url):
+        return {"result": "uncertain", "code": "missing_url", "reason": "no apply URL", "url": url or ""}
+    return {"result": "uncertain", "code": "pending", "reason": "liveness check queued", "url": url}
+
+
+def check_jobs(
+    jobs: list[dict[str, Any]],
+    *,
+    db_path: Path | str = DB_PATH,
+    ttl_hours: float = LIVENESS_TTL_HOURS,
+    max_workers: int = MAX_WORKERS,
+    force: bool = False,
+) -> dict[str, dict[str, Any]]:
+    """{apply_url: verdict} for `jobs`, fetching only URLs without a fresh
+    verdict (all of them with `force`). New verdicts are stored and mirrored
+    onto the jobs rows — except transient ``fetch_error`` ones, which are
+    returned but not cached, so the next run or sweep re-checks the URL."""
+    urls = list(dict.fromkeys(j.get("apply_url") for j in jobs if _checkable(j.get("apply_url"))))
+    fresh = {} if force else cached_verdicts(urls, db_path=db_path, ttl_hours=ttl_hours)
+    todo = [u for u in urls if u not in fresh]
+    if not todo:
+        return fresh
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(todo))),
+                            thread_name_prefix="liveness") as pool:
+        checked = dict(zip(todo, pool.map(check_url, todo)))
+
+    keep = {url: verdict for url, verdict in checked.items() if verdict.get("code") not in TRANSIENT_CODES}
+    rows = [
+        {**keep[j["apply_url"]], "source_ats": j["source_ats"], "external_id": j["external_id"]}
+        for j in jobs
+        if j.get("apply_url") in keep and j.get("source_ats") and j.get("external_id")
+    ]
+    mirrored = {row["url"] for row in rows}
+    rows += [verdict for url, verdict in keep.items() if url not in mirrored]
+    if rows:
+        with get_conn(db_path) as conn:
+            save_liveness_checks(conn, rows)
+    return {**fresh, **checked}
+
+
+def refresh_in_background(
+    jobs: list[dict[str, Any]],
+    *,
+    db_path: Path | str = DB_PATH,
+    on_done: Callable[[dict[str, dict[str, Any]]], None] | None = None,
+) -> threading.Thread:
+    """Run check_jobs on a daemon thread; `on_done` gets its verdicts. The
+    thread is returned and also tracked for ``wait_for_refreshes``."""
+
+    def work() -> None:
+        try:
+            verdicts = check_jobs(jobs, db_path=db_path)
+            if on_done is not None:
+                on_done(verdicts)
+        except Exception as exc:  # noqa: BLE001 — observations only
+            print(f"[liveness] background refresh failed: {type(exc).__name__}: {exc}")
+        finally:
+            sqlite_pool.close_all()  # this thread's pooled connections
+
+    thread = threading.Thread(target=work, name="liveness-refresh", daemon=True)
+    with _REFRESHES_LOCK:
+        _REFRESHES[:] = [t for t in _REFRESHES if t.is_alive()]
+        _REFRESHES.append(thread)
+    thread.start()
+    return thread
+
+
+def wait_for_refreshes(timeout: float = REFRESH_JOIN_SECONDS) -> int:
+    """Join the background refreshes started in this process, waiting at most
+    `timeout` seconds overall. Returns how many are still running."""
+    deadline = time.monotonic() + max(0.0, timeout)
+    with _REFRESHES_LOCK:
+        threads = list(_REFRESHES)
+    for thread in threads:
+        thread.join(max(0.0, deadline - time.monotonic()))
+    running = sum(1 for t in threads if t.is_alive())
+    if running:
+        print(f"[liveness] {running} background refresh(es) still running after {timeout:.0f}s; "
+              "the next sweep picks their URLs up")
+    return running
+
+
+def sweep(
+    db_path: Path | str = DB_PATH,
+    *,
+    ttl_hours: float = LIVENESS_TTL_HOURS,
+    limit: int = SWEEP_LIMIT,
+) -> dict[str, int]:
+    """Re-check stored verdicts older than `ttl_hours` (oldest first), then
+    fill the rest of `limit` with active jobs that were never checked (e.g. a
+    match run's background refresh that did not finish)."""
+    with get_conn(db_path) as conn:
+        urls = stale_liveness_urls(conn, before=_fresh_since(ttl_hours), limit=limit)
+        if len(urls) < limit:
+            urls += unchecked_liveness_urls(conn, limit=limit - len(urls))
+        jobs: list[dict[str, Any]] = []
+        for start in range(0, len(urls), 500):
+            chunk = urls[start:start + 500]
+            jobs += [
+                dict(r)
+                for r in conn.execute(
+                    "SELECT source_ats, external_id, apply_url FROM jobs "
+                    f"WHERE apply_url IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+            ]
+    known = {j["apply_url"] for j in jobs}
+    jobs += [{"apply_url": u} for u in urls if u not in known]
+    verdicts = check_jobs(jobs, db_path=db_path, ttl_hours=ttl_hours, force=True)
+    stats = {"checked": len(verdicts), "live": 0, "expired": 0, "uncertain": 0}
+    for verdict in verdicts.values():
+        key = verdict.get("result")
+        stats[key if key in stats else "uncertain"] += 1
+    print(
+        f"[liveness] sweep checked={stats['checked']} live={stats['live']} "
+        f"expired={stats['expired']} uncertain={stats['uncertain']}"
+    )
+    return stats
+
+
 def persist_job_liveness(
     source_ats: str,
     external_id: str,
@@ -235,3 +469,11 @@ def check_and_store_job(job: dict[str, Any], *, db_path=None) -> dict[str, Any]:
             job["source_ats"], job["external_id"], result, db_path=db_path
         )
     return result
+
+
+def main() -> None:
+    sweep()
+
+
+if __name__ == "__main__":
+    main()
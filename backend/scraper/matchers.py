@@ -0,0 +1,219 @@
+"""Compiled targeting + search matchers shared by normalize, hydrate and prefilter.
+
+Every posting is checked against filters.yaml (internship / location /
+sponsorship patterns) and searches.yaml. ``current_matcher()`` compiles both
+files once into a ``JobMatcher`` instead of walking the pattern lists per job:
+
+- the internship / location substring lists each become one alternation;
+- every sponsorship and search regex gets a set of trigger literals — strings
+  one of which must occur in any match, read off the parsed pattern. A field
+  is folded once per job and a regex only runs when one of its triggers
+  is in it, which for most postings means no regex runs at all (Python's re
+  scans one big alternation slower than a few ``in`` tests);
+- search results come back as a bitmap over the searches in config order.
+
+The matcher is rebuilt when either file's mtime or size changes, so edits are
+picked up by a long-running process without a restart.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+import re
+from typing import Any
+
+import yaml
+
+try:
+    from re import _constants as _sre, _parser as _sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover
+    import sre_constants as _sre  # type: ignore
+    import sre_parse as _sre_parse  # type: ignore
+
+from .searches import SEARCHES_PATH, _compile_query, config_stamp, load_searches
+
+FILTERS_PATH = Path(__file__).resolve().parent / "filters.yaml"
+
+
+def read_filters(path: Path = FILTERS_PATH) -> dict[str, list[str]]:
+    payload = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+    return {
+        "internship_patterns": [str(x) for x in payload.get("internship_patterns", []) if str(x).strip()],
+        "location_allow": [str(x) for x in payload.get("location_allow", []) if str(x).strip()],
+        "sponsorship_knockout": [str(x) for x in payload.get("sponsorship_knockout", []) if str(x).strip()],
+    }
+
+
+def _substring_pattern(patterns: list[str]) -> re.Pattern[str] | None:
+    """Case-insensitive substring test for any of `patterns` (matched on lowercased text)."""
+    if not patterns:
+        return None
+    return re.compile("|".join(re.escape(p.lower()) for p in patterns))
+
+
+# ── trigger literals ────────────────────────────────────────────────────
+def _pick(a: tuple[str, ...] | None, b: tuple[str, ...] | None) -> tuple[str, ...] | None:
+    """The more selective of two trigger sets (longest shortest literal)."""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return b if min(map(len, b)) > min(map(len, a)) else a
+
+
+def _sequence_triggers(items: list[Any]) -> tuple[str, ...] | None:
+    best: tuple[str, ...] | None = None
+    run: list[str] = []
+    for op, av in [*items, (None, None)]:
+        if op is _sre.LITERAL:
+            run.append(chr(av))
+            continue
+        if run:
+            best = _pick(best, ("".join(run),))
+            run = []
+        found: tuple[str, ...] | None = None
+        if op is _sre.SUBPATTERN:
+            found = _sequence_triggers(list(av[-1]))
+        elif op is _sre.BRANCH:
+            alts = [_sequence_triggers(list(branch)) for branch in av[1]]
+            if all(alt is not None for alt in alts):
+                found = tuple(dict.fromkeys(lit for alt in alts for lit in alt))  # type: ignore[union-attr]
+        elif op in (_sre.MAX_REPEAT, _sre.MIN_REPEAT) and av[0] >= 1:
+            found = _sequence_triggers(list(av[2]))
+        best = _pick(best, found)
+    return best
+
+
+def fold(text: str) -> str:
+    """Case-fold so that every ASCII literal re.IGNORECASE would match is a
+    substring. re also matches dotless ı and dotted İ against i; casefold
+    keeps ı and turns İ into i + U+0307, whose combining dot would split
+    "İNTERN" into "i̇ntern"."""
+    return text.casefold().replace("\u0131", "i").replace("\u0307", "")
+
+
+def trigger_literals(pattern: str) -> tuple[str, ...] | None:
+    """Folded literals at least one of which occurs in every match of
+    `pattern`, or None when no such set can be read off it (always run it)."""
+    try:
+        found = _sequence_triggers(list(_sre_parse.parse(pattern, re.IGNORECASE)))
+    except Exception:  # unparseable here → no prescreen, the regex decides
+        return None
+    # Non-ASCII literals have case variants fold() does not cover; skip them.
+    if not found or not all(lit and lit.isascii() for lit in found):
+        return None
+    return tuple(dict.fromkeys(fold(lit) for lit in found))
+
+
+@dataclass(slots=True)
+class _Rule:
+    bit: int
+    pattern: re.Pattern[str]
+    triggers: tuple[str, ...] | None
+
+    def search(self, hay: str, folded: str) -> bool:
+        if self.triggers is not None and not any(t in folded for t in self.triggers):
+            return False
+        return self.pattern.search(hay) is not None
+
+
+def _rule(bit: int, pattern: re.Pattern[str]) -> _Rule:
+    return _Rule(bit, pattern, trigger_literals(pattern.pattern))
+
+
+# ── matchers ────────────────────────────────────────────────────────────
+@dataclass(slots=True)
+class SearchMatcher:
+    names: tuple[str, ...]
+    rules: tuple[tuple[str, _Rule], ...]          # (fields, rule) in config order
+
+    @classmethod
+    def build(cls, searches: list[dict[str, Any]]) -> "SearchMatcher":
+        return cls(
+            names=tuple(entry["name"] for entry in searches),
+            rules=tuple(
+                (entry["fields"], _rule(1 << idx, _compile_query(entry["query"])))
+                for idx, entry in enumerate(searches)
+            ),
+        )
+
+    def bits(self, title: str, description: str, folded: tuple[str, str] | None = None) -> int:
+        """Bitmap of matching searches; `folded` is (fold(title), fold(description))
+        when the caller already has it."""
+        ftitle, fdesc = folded if folded is not None else (fold(title), fold(description))
+        hays = {"title": (title, ftitle), "description": (description, fdesc),
+                "both": (f"{title}\n{description}", f"{ftitle}\n{fdesc}")}
+        out = 0
+        for fields, rule in self.rules:
+            if rule.search(*hays[fields]):
+                out |= rule.bit
+        return out
+
+    def names_for(self, bits: int) -> list[str]:
+        return [name for idx, name in enumerate(self.names) if bits >> idx & 1]
+
+    def match(self, title: str, description: str) -> list[str]:
+        """Names of the searches that match, in searches.yaml order."""
+        bits = self.bits(title, description)
+        return self.names_for(bits) if bits else []
+
+
+@dataclass(slots=True)
+class JobMatcher:
+    internship: re.Pattern[str] | None
+    location: re.Pattern[str] | None
+    knockout: tuple[_Rule, ...]
+    searches: SearchMatcher
+
+    @classmethod
+    def build(cls, filters: dict[str, list[str]], searches: list[dict[str, Any]]) -> "JobMatcher":
+        return cls(
+            internship=_substring_pattern(filters["internship_patterns"]),
+            location=_substring_pattern(filters["location_allow"]),
+            knockout=tuple(
+                _rule(0, re.compile(p, re.IGNORECASE)) for p in filters["sponsorship_knockout"]
+            ),
+            searches=SearchMatcher.build(searches),
+        )
+
+    def flags(
+        self, title: str, location: str, description_text: str, folded: str | None = None
+    ) -> dict[str, bool]:
+        if folded is None and self.knockout:
+            folded = fold(description_text)
+        return {
+            "is_internship": bool(self.internship and self.internship.search(title.lower())),
+            "location_match": bool(self.location and self.location.search(location.lower())),
+            "sponsorship_knockout": any(r.search(description_text, folded) for r in self.knockout),
+        }
+
+    def classify(self, title: str, location: str, description_text: str) -> tuple[dict[str, bool], list[str]]:
+        """Targeting flags and matched search names for one posting, folding
+        the description once for both."""
+        folded = (fold(title), fold(description_text))
+        bits = self.searches.bits(title, description_text, folded)
+        return (
+            self.flags(title, location, description_text, folded[1]),
+            self.searches.names_for(bits) if bits else [],
+        )
+
+
+@lru_cache(maxsize=4)
+def _matcher_for(
+    filters_path: str, filters_stamp: tuple[int, int] | None,
+    searches_path: str, searches_stamp: tuple[int, int] | None,
+) -> JobMatcher:
+    # The stamps only key the cache; the files are read fresh on a miss.
+    return JobMatcher.build(read_filters(Path(filters_path)), load_searches(searches_path))
+
+
+def current_matcher(
+    filters_path: Path = FILTERS_PATH, searches_path: Path = SEARCHES_PATH
+) -> JobMatcher:
+    """The compiled matcher for the config files as they are on disk right now."""
+    return _matcher_for(
+        str(filters_path), config_stamp(filters_path),
+        str(searches_path), config_stamp(searches_path),
+    )
@@ -2,18 +2,23 @@
 
 from __future__ import annotations
 
-from functools import lru_cache
+import hashlib
 from html import unescape
 from html.parser import HTMLParser
 import json
 from pathlib import Path
-import re
 from typing import Any
 
-import yaml
+try:
+    from .matchers import FILTERS_PATH, current_matcher
+except ImportError:  # pragma: no cover
+    from scraper.matchers import FILTERS_PATH, current_matcher  # type: ignore
 
 BASE_DIR = Path(__file__).resolve().parent
-FILTERS_PATH = BASE_DIR / "filters.yaml"
+
+# Bump when normalize_job's output changes for the same raw payload — it is
+# part of normalize_signature(), so conditional fetching re-reads every board.
+NORMALIZE_VERSION = 1
 
 
 class _HTMLTextExtractor(HTMLParser):
@@ -49,32 +54,49 @@ def _serialize_raw(raw_job: dict[str, Any]) -> str:
     return json.dumps(raw_job, ensure_ascii=True, sort_keys=True)
 
 
-@lru_cache(maxsize=1)
-def _load_filters(path: Path = FILTERS_PATH) -> dict[str, list[str]]:
-    payload = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
-    return {
-        "internship_patterns": [str(x) for x in payload.get("internship_patterns", []) if str(x).strip()],
-        "location_allow": [str(x) for x in payload.get("location_allow", []) if str(x).strip()],
-        "sponsorship_knockout": [str(x) for x in payload.get("sponsorship_knockout", []) if str(x).strip()],
-    }
-
-
-def _matches_any_substring(value: str, patterns: list[str]) -> bool:
-    haystack = value.lower()
-    return any(pattern.lower() in haystack for pattern in patterns)
-
-
-def _matches_any_regex(value: str, patterns: list[str]) -> bool:
-    return any(re.search(pattern, value, flags=re.IGNORECASE) for pattern in patterns)
+# Canonical fields covered by a posting's content fingerprint. raw_json is left
+# out on purpose: ATS payloads carry volatile bookkeeping that does not change
+# the posting itself.
+FINGERPRINT_FIELDS: tuple[str, ...] = (
+    "company", "title", "location", "remote_flag", "is_internship", "location_match",
+    "sponsorship_knockout", "department", "description_text", "apply_url",
+    "posted_at", "updated_at", "matched_searches",
+)
+_FLAG_FIELDS = frozenset({"remote_flag", "is_internship", "location_match", "sponsorship_knockout"})
+
+
+def content_fingerprint(job: dict[str, Any]) -> str:
+    """Stable sha256 over the canonical fields (flags as 0/1, lists as-is)."""
+    values = []
+    for name in FINGERPRINT_FIELDS:
+        value = job.get(name)
+        if name in _FLAG_FIELDS:
+            value = int(bool(value))
+        elif name == "matched_searches":
+            value = list(value or [])
+        values.append(value)
+    payload = json.dumps(values, ensure_ascii=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def normalize_signature() -> str:
+    """What a normalized row depends on besides the raw payload: this module's
+    version plus filters.yaml and searches.yaml."""
+    try:
+        from .searches import SEARCHES_PATH
+    except ImportError:  # pragma: no cover
+        from scraper.searches import SEARCHES_PATH  # type: ignore
+    digest = hashlib.sha256(str(NORMALIZE_VERSION).encode("utf-8"))
+    for path in (FILTERS_PATH, SEARCHES_PATH):
+        try:
+            digest.update(path.read_bytes())
+        except OSError:
+            digest.update(b"-")
+    return digest.hexdigest()
 
 
 def compute_targeting_flags(title: str, location: str, description_text: str) -> dict[str, bool]:
-    filters = _load_filters()
-    return {
-        "is_internship": _matches_any_substring(title, filters["internship_patterns"]),
-        "location_match": _matches_any_substring(location, filters["location_allow"]),
-        "sponsorship_knockout": _matches_any_regex(description_text, filters["sponsorship_knockout"]),
-    }
+    return current_matcher().flags(title, location, description_text)
 
 
 def normalize_greenhouse(token: str, raw_job: dict[str, Any]) -> dict[str, Any]:
@@ -364,13 +386,10 @@ def normalize_job(ats: str, token: str, raw_job: dict[str, Any]) -> dict[str, An
     if not fn:
         raise ValueError(f"Unsupported ATS for normalization: {ats}")
     job = fn(token, raw_job)
-    try:
-        from .searches import match_searches
-    except ImportError:  # pragma: no cover
-        from scraper.searches import match_searches  # type: ignore
-    job["matched_searches"] = match_searches(
+    job["matched_searches"] = current_matcher().searches.match(
         str(job.get("title") or ""),
         str(job.get("description_text") or ""),
     )
+    job["content_hash"] = content_fingerprint(job)
     return job
 
@@ -1,13 +1,24 @@
-"""Shared types and HTTP helpers for ATS providers."""
+"""Shared types and HTTP helpers for ATS providers.
+
+All provider traffic goes through one keep-alive ``requests.Session`` and the
+per-host limiter in ``ratelimit`` (token bucket + concurrency cap per host).
+GETs made inside ``conditional.tracking()`` are conditional requests against
+the run's validator cache.
+"""
 
 from __future__ import annotations
 
 import random
+import threading
 import time
 from dataclasses import dataclass, field
 from typing import Any
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from . import conditional
+from .ratelimit import HOST_LIMITER
 
 DEFAULT_TIMEOUT_SECONDS = 20
 DEFAULT_RETRIES = 3
@@ -19,6 +30,27 @@ USER_AGENT = "SmartApplyAI-scraper/1.0 (personal job search)"
 BACKOFF_CAP_SECONDS = 30.0
 RETRY_AFTER_CAP_SECONDS = 60.0
 
+# Keep-alive pool: connections kept per host by the shared session.
+POOL_MAXSIZE = 32
+
+_session_lock = threading.Lock()
+_shared_session: requests.Session | None = None
+
+
+def _session() -> requests.Session:
+    """The process-wide keep-alive session (created on first use)."""
+    global _shared_session
+    if _shared_session is None:
+        with _session_lock:
+            if _shared_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_MAXSIZE, pool_maxsize=POOL_MAXSIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers["User-Agent"] = USER_AGENT
+                _shared_session = session
+    return _shared_session
+
 
 @dataclass
 class CompanyEntry:
@@ -75,21 +107,29 @@ def _request_json(
     retries + 1) on requests timeout/connection errors, HTTP 429, and HTTP 5xx.
     Other 4xx are config errors and fail immediately (single attempt). After
     the final attempt the last exception is (re-)raised. Returns
-    (payload, latency_ms of the successful attempt). No shared mutable state.
+    (payload, latency_ms of the successful attempt).
+
+    Each attempt waits for a slot from the per-host limiter; a backoff also
+    penalizes the host so concurrent workers back off with this one. A tracked
+    GET is sent conditionally; a 304 comes back as the cached payload.
     """
     headers = {"User-Agent": USER_AGENT, "Accept": "application/json"}
+    tracker = conditional.current() if method == "GET" else None
+    if tracker is not None:
+        headers.update(tracker.request_headers(url))
     kwargs: dict[str, Any] = {"timeout": timeout, "headers": headers}
     if method == "POST":
         headers["Content-Type"] = "application/json"
         kwargs["json"] = json_body or {}
     attempts = max(1, retries + 1)
     for attempt in range(attempts):
-        started = time.monotonic()
         try:
-            if method == "POST":
-                resp = requests.post(url, **kwargs)
-            else:
-                resp = requests.get(url, **kwargs)
+            with HOST_LIMITER.slot(url):
+                started = time.monotonic()
+                if method == "POST":
+                    resp = _session().post(url, **kwargs)
+                else:
+                    resp = _session().get(url, **kwargs)
         except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
             if attempt + 1 >= attempts:
                 raise  # final attempt: re-raise the last exception
@@ -99,11 +139,16 @@ def _request_json(
         status = resp.status_code
         retryable = status == 429 or 500 <= status < 600
         if retryable and attempt + 1 < attempts:
-            time.sleep(_backoff_seconds(attempt, resp.headers.get("Retry-After")))
+            delay = _backoff_seconds(attempt, resp.headers.get("Retry-After"))
+            if status == 429:
+                HOST_LIMITER.penalize(url, delay)
+            time.sleep(delay)
             continue
         # Non-retryable 4xx (immediately) and exhausted 429/5xx raise here.
         resp.raise_for_status()
         latency_ms = (time.monotonic() - started) * 1000.0
+        if tracker is not None:
+            tracker.settle(url, resp)
         return resp.json(), latency_ms
     raise AssertionError(f"unreachable: no attempt made for {url}")  # pragma: no cover
 
@@ -152,12 +197,25 @@ def http_post_json(
     return payload
 
 
+def http_get_response(
+    url: str,
+    *,
+    timeout: float = DEFAULT_TIMEOUT_SECONDS,
+    headers: dict[str, str] | None = None,
+) -> requests.Response:
+    """Single rate-limited GET through the shared session (no retries, no raise)."""
+    request_headers = {"User-Agent": USER_AGENT, **(headers or {})}
+    tracker = conditional.current()
+    if tracker is not None:
+        request_headers.update(tracker.request_headers(url))
+    with HOST_LIMITER.slot(url):
+        resp = _session().get(url, timeout=timeout, headers=request_headers, allow_redirects=True)
+    if tracker is not None and (resp.status_code == 304 or resp.ok):
+        tracker.settle(url, resp)
+    return resp
+
+
 def http_get_text(url: str, *, timeout: float = DEFAULT_TIMEOUT_SECONDS) -> tuple[int, str, str]:
     """Return (status, final_url, body_text). Does not raise on 4xx/5xx."""
-    resp = requests.get(
-        url,
-        timeout=timeout,
-        headers={"User-Agent": USER_AGENT},
-        allow_redirects=True,
-    )
+    resp = http_get_response(url, timeout=timeout)
     return resp.status_code, str(resp.url), resp.text or ""
@@ -0,0 +1,157 @@
+"""Conditional GETs for job boards — a local validator cache per URL.
+
+Most boards serve the same payload run after run. While a ``ValidatorCache``
+is active (``execute_run`` installs one), every GET a provider makes through
+``base`` inside ``tracking()`` carries If-None-Match / If-Modified-Since from
+the last stored response for that URL:
+
+- a 304 is turned back into a 200 carrying the stored body, so providers
+  (pagination, multi-source trackers) run unchanged;
+- a 200 is hashed and compared with the stored body hash, which covers
+  servers that send no validators at all.
+
+When every request of a company's fetch came back unchanged, ``_fetch_one``
+marks the result ``unchanged`` and the run skips normalization and the upsert
+for that company. New validators ride along as ``pending`` and are saved only
+after the company's jobs were stored, so a failed sweep never looks unchanged
+next run. Validators are tied to ``normalize.normalize_signature()``: editing
+filters.yaml / searches.yaml re-reads every board once.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+
+import requests
+
+_active: "ValidatorCache | None" = None
+_tracker: ContextVar["Tracker | None"] = ContextVar("smartapply_http_tracker", default=None)
+
+
+class ValidatorCache:
+    """Validators loaded up front (small); bodies fetched only to replay a 304."""
+
+    def __init__(
+        self,
+        validators: dict[str, dict[str, Any]],
+        load_body: Callable[[str], bytes | None],
+        *,
+        signature: str,
+    ) -> None:
+        self.signature = signature
+        self._load_body = load_body
+        # Rows written under another normalize signature are ignored outright.
+        self._validators = {
+            url: row for url, row in validators.items() if row.get("signature") == signature
+        }
+
+    def get(self, url: str) -> dict[str, Any] | None:
+        return self._validators.get(url)
+
+    def body(self, url: str) -> bytes | None:
+        return self._load_body(url)
+
+
+@dataclass(slots=True)
+class Tracker:
+    """Per-company record of what the conditional requests saw."""
+
+    cache: ValidatorCache
+    seen: int = 0
+    changed: int = 0
+    pending: list[dict[str, Any]] = field(default_factory=list)
+    _replay: dict[str, bytes] = field(default_factory=dict)
+
+    @property
+    def unchanged(self) -> bool:
+        return self.seen > 0 and self.changed == 0
+
+    def request_headers(self, url: str) -> dict[str, str]:
+        """Validator headers for `url` — only when its body can be replayed."""
+        row = self.cache.get(url)
+        if row is None or not (row.get("etag") or row.get("last_modified")):
+            return {}
+        body = self.cache.body(url)
+        if body is None:
+            return {}
+        self._replay[url] = body
+        headers: dict[str, str] = {}
+        if row.get("etag"):
+            headers["If-None-Match"] = str(row["etag"])
+        if row.get("last_modified"):
+            headers["If-Modified-Since"] = str(row["last_modified"])
+        return headers
+
+    def settle(self, url: str, resp: requests.Response) -> None:
+        """Record a 200/304 for `url`; a 304 becomes a 200 with the stored body."""
+        row = self.cache.get(url)
+        self.seen += 1
+        if resp.status_code == 304 and url in self._replay:
+            resp.status_code = 200
+            resp._content = self._replay.pop(url)
+            if row and row.get("content_type"):
+                resp.headers["Content-Type"] = str(row["content_type"])
+            return
+        body = resp.content or b""
+        body_hash = hashlib.sha256(body).hexdigest()
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        same_body = row is not None and row.get("body_hash") == body_hash
+        if not same_body:
+            self.changed += 1
+        elif etag == row.get("etag") and last_modified == row.get("last_modified"):
+            return  # nothing new to store
+        self.pending.append({
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "content_type": resp.headers.get("Content-Type"),
+            "body_hash": body_hash,
+            "body": body,
+            "signature": self.cache.signature,
+        })
+
+
+class BoardSnapshot(list):
+    """A provider's raw jobs plus what conditional fetching learned about them."""
+
+    __slots__ = ("unchanged", "validators")
+
+    def __init__(self, jobs: list[Any], *, unchanged: bool, validators: list[dict[str, Any]]) -> None:
+        super().__init__(jobs)
+        self.unchanged = unchanged
+        self.validators = validators
+
+
+def current() -> Tracker | None:
+    return _tracker.get()
+
+
+@contextmanager
+def active(cache: ValidatorCache | None) -> Iterator[None]:
+    """Install `cache` for fetches made while the block runs (any thread)."""
+    global _active
+    previous, _active = _active, cache
+    try:
+        yield
+    finally:
+        _active = previous
+
+
+@contextmanager
+def tracking() -> Iterator[Tracker | None]:
+    """Track one company's requests (None when no cache is active)."""
+    cache = _active
+    if cache is None:
+        yield None
+        return
+    tracker = Tracker(cache)
+    token = _tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _tracker.reset(token)
@@ -7,9 +7,7 @@ import xml.etree.ElementTree as ET
 from typing import Any
 from urllib.parse import urlparse
 
-import requests
-
-from .base import CompanyEntry, USER_AGENT, DEFAULT_TIMEOUT_SECONDS
+from .base import CompanyEntry, http_get_response
 
 ID = "personio"
 
@@ -42,11 +40,7 @@ def fetch(entry: CompanyEntry) -> list[dict[str, Any]]:
         m = re.search(r"https://([\w-]+)\.jobs\.personio", api)
         if m:
             entry.token = m.group(1)
-    resp = requests.get(
-        api,
-        timeout=DEFAULT_TIMEOUT_SECONDS,
-        headers={"User-Agent": USER_AGENT, "Accept": "application/xml"},
-    )
+    resp = http_get_response(api, headers={"Accept": "application/xml"})
     resp.raise_for_status()
     root = ET.fromstring(resp.content)
     jobs: list[dict[str, Any]] = []
@@ -0,0 +1,133 @@
+"""Per-host politeness for provider HTTP calls: token buckets + concurrency caps.
+
+Replaces the old global "sleep 0.35s between submits" pacing. Every request a
+provider makes goes through ``HOST_LIMITER.slot(url)``, which
+
+1. caps in-flight requests to that host (a semaphore per host), and
+2. spends one token from that host's bucket (refilled at ``rate`` per second,
+   up to ``burst``), sleeping until one is available.
+
+A 429/Retry-After or a backoff decision calls ``penalize(url, seconds)`` so
+every worker hitting that host waits, not just the one that got throttled.
+
+Policies are matched by host suffix (longest wins) — so each Workday tenant
+host gets its own bucket, while all Greenhouse boards share boards-api's.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator
+from urllib.parse import urlparse
+
+
+@dataclass(frozen=True, slots=True)
+class HostPolicy:
+    rate_per_sec: float
+    burst: int
+    max_concurrency: int
+
+
+# Default = the old global pacing (1 call / 0.35s, 4 workers), but per host.
+DEFAULT_POLICY = HostPolicy(rate_per_sec=1 / 0.35, burst=4, max_concurrency=4)
+
+# Shared API hosts serve many boards; per-tenant hosts (Workday, Personio)
+# are one company each and are kept gentler.
+HOST_POLICIES: dict[str, HostPolicy] = {
+    "boards-api.greenhouse.io": HostPolicy(rate_per_sec=5.0, burst=5, max_concurrency=4),
+    "api.lever.co": HostPolicy(rate_per_sec=5.0, burst=5, max_concurrency=4),
+    "api.ashbyhq.com": HostPolicy(rate_per_sec=4.0, burst=4, max_concurrency=4),
+    "api.smartrecruiters.com": HostPolicy(rate_per_sec=4.0, burst=4, max_concurrency=4),
+    # One host per tenant; workday.fetch pages a large tenant concurrently.
+    "myworkdayjobs.com": HostPolicy(rate_per_sec=5.0, burst=4, max_concurrency=4),
+    "jobs.personio.de": HostPolicy(rate_per_sec=2.0, burst=2, max_concurrency=2),
+    "raw.githubusercontent.com": HostPolicy(rate_per_sec=2.0, burst=2, max_concurrency=2),
+}
+
+
+def host_of(url: str) -> str:
+    try:
+        return (urlparse(url).hostname or "").lower()
+    except ValueError:
+        return ""
+
+
+def policy_for(host: str, policies: dict[str, HostPolicy] | None = None) -> HostPolicy:
+    table = HOST_POLICIES if policies is None else policies
+    best: tuple[int, HostPolicy] | None = None
+    for suffix, policy in table.items():
+        if host == suffix or host.endswith("." + suffix):
+            if best is None or len(suffix) > best[0]:
+                best = (len(suffix), policy)
+    return best[1] if best else DEFAULT_POLICY
+
+
+class TokenBucket:
+    """Thread-safe token bucket; ``acquire`` blocks until a token is free."""
+
+    def __init__(self, rate_per_sec: float, burst: int, *, clock=time.monotonic, sleep=time.sleep) -> None:
+        self.rate = max(float(rate_per_sec), 1e-6)
+        self.capacity = max(1, int(burst))
+        self._tokens = float(self.capacity)
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> float:
+        """Take one token; returns the seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                if now >= self._blocked_until and self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return waited
+                wait = max(self._blocked_until - now, (1.0 - self._tokens) / self.rate, 0.001)
+            self._sleep(wait)
+            waited += wait
+
+    def penalize(self, seconds: float) -> None:
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, self._clock() + max(0.0, float(seconds)))
+
+
+class HostLimiter:
+    def __init__(self, policies: dict[str, HostPolicy] | None = None) -> None:
+        self._policies = policies
+        self._hosts: dict[str, tuple[TokenBucket, threading.BoundedSemaphore]] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, host: str) -> tuple[TokenBucket, threading.BoundedSemaphore]:
+        with self._lock:
+            entry = self._hosts.get(host)
+            if entry is None:
+                policy = policy_for(host, self._policies)
+                entry = (
+                    TokenBucket(policy.rate_per_sec, policy.burst),
+                    threading.BoundedSemaphore(policy.max_concurrency),
+                )
+                self._hosts[host] = entry
+            return entry
+
+    @contextmanager
+    def slot(self, url: str) -> Iterator[None]:
+        bucket, gate = self._get(host_of(url))
+        with gate:
+            bucket.acquire()
+            yield
+
+    def penalize(self, url: str, seconds: float) -> None:
+        self._get(host_of(url))[0].penalize(seconds)
+
+
+HOST_LIMITER = HostLimiter()
@@ -65,10 +65,28 @@ def fetch(entry: CompanyEntry) -> list[dict[str, Any]]:
     return jobs
 
 
+# jobAd sections that describe the role (companyDescription is boilerplate).
+_DETAIL_SECTIONS = ("jobDescription", "qualifications", "additionalInformation")
+
+
+def fetch_detail(job: dict[str, Any]) -> str:
+    """Full description HTML for one stored posting; the postings list has
+    no jobAd, so normalize only sees the title."""
+    company, posting = str(job.get("company") or ""), str(job.get("external_id") or "")
+    if not company or not posting:
+        raise ValueError("smartrecruiters: detail needs company and external_id")
+    payload = http_get_json(f"https://api.smartrecruiters.com/v1/companies/{company}/postings/{posting}")
+    job_ad = payload.get("jobAd") if isinstance(payload, dict) else None
+    sections = (job_ad or {}).get("sections") or {}
+    parts = [str((sections.get(name) or {}).get("text") or "") for name in _DETAIL_SECTIONS]
+    return "\n".join(part for part in parts if part)
+
+
 class _P:
     id = ID
     detect = staticmethod(detect)
     fetch = staticmethod(fetch)
+    fetch_detail = staticmethod(fetch_detail)
 
 
 PROVIDER = _P()
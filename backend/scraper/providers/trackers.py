@@ -10,9 +10,7 @@ import hashlib
 import re
 from typing import Any
 
-import requests
-
-from .base import CompanyEntry, DEFAULT_TIMEOUT_SECONDS, USER_AGENT
+from .base import CompanyEntry, http_get_response
 
 ID = "tracker"
 
@@ -154,11 +152,7 @@ def _extract_url(text: str) -> str:
 
 
 def _fetch_url(url: str) -> str:
-    resp = requests.get(
-        url,
-        timeout=DEFAULT_TIMEOUT_SECONDS,
-        headers={"User-Agent": USER_AGENT},
-    )
+    resp = http_get_response(url)
     resp.raise_for_status()
     return resp.text
 
@@ -1,22 +1,33 @@
 """Workday CXS public jobs API — POST with paging.
 
 Adapted from career-ops providers/workday.mjs (patterns only).
+
+The first page reports the tenant's total, so the remaining offsets are known
+up front and fetched concurrently (PAGE_CONCURRENCY workers, still paced by
+the per-tenant host policy in ``ratelimit``), reassembled in offset order, with
+one more pass for pages that failed. Without a total the walk stays sequential.
 """
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import re
 import time
 from typing import Any
 from urllib.parse import urlparse
 
-from .base import CompanyEntry, http_post_json
+from .base import CompanyEntry, http_get_json, http_post_json
 
 ID = "workday"
 PAGE_SIZE = 20
 DEFAULT_MAX_PAGES = 50
 MAX_PAGES_CAP = 200
 INTER_PAGE_DELAY_S = 0.15
+# Page requests in flight per tenant; the host limiter still caps what reaches
+# the tenant host (ratelimit.HOST_POLICIES["myworkdayjobs.com"]).
+PAGE_CONCURRENCY = 4
+# Extra passes over pages that failed after http_post_json's own retries.
+PAGE_RETRY_PASSES = 1
 
 _WD_RE = re.compile(
     r"^https://([\w-]+)\.(wd[\w-]*)\.myworkdayjobs\.com/(?:[a-z]{2}-[A-Z]{2}/)?([^/?#]+)",
@@ -77,24 +88,21 @@ def fetch(entry: CompanyEntry) -> list[dict[str, Any]]:
     max_pages = entry.max_pages or DEFAULT_MAX_PAGES
     max_pages = min(max(1, max_pages), MAX_PAGES_CAP)
 
-    body0 = {"limit": PAGE_SIZE, "offset": 0, "searchText": "", "appliedFacets": {}}
-    first = http_post_json(ep["api"], body0)
+    first = http_post_json(ep["api"], _page_body(0))
     jobs = _parse_page(first, ep)
     total = first.get("total") if isinstance(first, dict) else None
     first_n = len((first or {}).get("jobPostings") or []) if isinstance(first, dict) else 0
 
     if isinstance(total, int) and total >= 0:
         pages = min((total + PAGE_SIZE - 1) // PAGE_SIZE, max_pages)
-    else:
-        pages = max_pages if first_n >= PAGE_SIZE else 1
+        jobs.extend(_fetch_known_pages(entry, ep, pages))
+        return jobs
 
+    pages = max_pages if first_n >= PAGE_SIZE else 1
     for page in range(1, pages):
         time.sleep(INTER_PAGE_DELAY_S)
         try:
-            payload = http_post_json(
-                ep["api"],
-                {"limit": PAGE_SIZE, "offset": page * PAGE_SIZE, "searchText": "", "appliedFacets": {}},
-            )
+            payload = http_post_json(ep["api"], _page_body(page * PAGE_SIZE))
         except Exception as exc:
             print(f"⚠️ workday: {entry.label} truncated at page {page + 1}: {exc}")
             break
@@ -106,6 +114,69 @@ def fetch(entry: CompanyEntry) -> list[dict[str, Any]]:
     return jobs
 
 
+def _page_body(offset: int) -> dict[str, Any]:
+    return {"limit": PAGE_SIZE, "offset": offset, "searchText": "", "appliedFacets": {}}
+
+
+def _fetch_offsets(api: str, offsets: list[int]) -> tuple[dict[int, Any], dict[int, Exception]]:
+    """POST every offset with bounded concurrency; (payloads, errors) by offset."""
+    payloads: dict[int, Any] = {}
+    errors: dict[int, Exception] = {}
+    if not offsets:
+        return payloads, errors
+    workers = max(1, min(PAGE_CONCURRENCY, len(offsets)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="workday-page") as pool:
+        futures = {pool.submit(http_post_json, api, _page_body(offset)): offset for offset in offsets}
+        for future in as_completed(futures):
+            offset = futures[future]
+            try:
+                payloads[offset] = future.result()
+            except Exception as exc:  # per-page isolation; retried below
+                errors[offset] = exc
+    return payloads, errors
+
+
+def _fetch_known_pages(entry: CompanyEntry, ep: dict[str, str], pages: int) -> list[dict[str, Any]]:
+    """Pages 2..`pages` once the total is known, in offset order."""
+    offsets = [page * PAGE_SIZE for page in range(1, pages)]
+    payloads, errors = _fetch_offsets(ep["api"], offsets)
+    for _ in range(PAGE_RETRY_PASSES):
+        if not errors:
+            break
+        retried, errors = _fetch_offsets(ep["api"], sorted(errors))
+        payloads.update(retried)
+    for offset, exc in sorted(errors.items()):
+        print(f"⚠️ workday: {entry.label} missing page {offset // PAGE_SIZE + 1}: {exc}")
+    jobs: list[dict[str, Any]] = []
+    for offset in offsets:
+        if offset in payloads:
+            jobs.extend(_parse_page(payloads[offset], ep))
+    return jobs
+
+
+def detail_url(apply_url: str) -> str | None:
+    """CXS detail endpoint for a posting's public URL (``{job_base}{externalPath}``)."""
+    m = _WD_RE.match((apply_url or "").strip())
+    if not m:
+        return None
+    tenant, instance, site = m.group(1), m.group(2), m.group(3)
+    path = apply_url.strip()[m.end():].split("?", 1)[0]
+    if not path.startswith("/job/"):
+        return None
+    return f"https://{tenant}.{instance}.myworkdayjobs.com/wday/cxs/{tenant}/{site}{path}"
+
+
+def fetch_detail(job: dict[str, Any]) -> str:
+    """Full description HTML for one stored posting (list pages carry only
+    bulletFields)."""
+    url = detail_url(str(job.get("apply_url") or ""))
+    if not url:
+        raise ValueError(f"workday: no detail endpoint for {job.get('apply_url')!r}")
+    payload = http_get_json(url)
+    info = payload.get("jobPostingInfo") if isinstance(payload, dict) else None
+    return str((info or {}).get("jobDescription") or "")
+
+
 def _parse_page(json_payload: Any, ep: dict[str, str]) -> list[dict[str, Any]]:
     postings = json_payload.get("jobPostings") if isinstance(json_payload, dict) else None
     if not isinstance(postings, list):
@@ -136,6 +207,7 @@ class _P:
     id = ID
     detect = staticmethod(detect)
     fetch = staticmethod(fetch)
+    fetch_detail = staticmethod(fetch_detail)
 
 
 PROVIDER = _P()
@@ -2,29 +2,35 @@
 
 from __future__ import annotations
 
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from collections import defaultdict
+from contextlib import closing
+from dataclasses import dataclass, field
+import os
 from pathlib import Path
+import queue
+import threading
 import time
-from typing import Any
+from typing import Any, Iterator
 
 import requests
 import yaml
 
-from .normalize import normalize_job
-from .providers.base import (
-    MAX_CONCURRENCY,
-    SLEEP_BETWEEN_CALLS_SECONDS,
-    CompanyEntry,
-)
+from . import fetch_engine
+from .normalize import normalize_job, normalize_signature
+from .providers import conditional
+from .providers.base import CompanyEntry
 from .providers.registry import load_providers, resolve_provider
 from .store import (
     DB_PATH,
+    coverage_baselines,
     get_conn,
-    recent_runs,
+    load_http_body,
+    load_http_validators,
     record_run_end,
     record_run_start,
+    save_http_validators,
     sources_in_cooldown,
+    touch_company_jobs,
     update_source_health,
     upsert_company_jobs,
 )
@@ -36,6 +42,14 @@ DEFAULT_COMPANIES_PATH = BASE_DIR / "companies.yaml"
 _COVERAGE_MIN_BASELINE = 20
 _COVERAGE_DROP_RATIO = 0.3
 
+# Conditional fetching against the validator cache in jobs.db (0 = always
+# download, normalize and upsert every board).
+CONDITIONAL_FETCH = os.getenv("SMARTAPPLY_CONDITIONAL_FETCH", "1") != "0"
+
+# Normalized companies waiting for the store writer; fetch workers block (and
+# stop fetching) while it is full.
+STORE_QUEUE_SIZE = int(os.getenv("SMARTAPPLY_SCRAPE_QUEUE", "8"))
+
 # Backward-compat alias for older tests/imports
 CompanySpec = CompanyEntry
 
@@ -77,30 +91,126 @@ def _fetch_one(entry: CompanyEntry, providers: dict) -> tuple[CompanyEntry, str,
         return entry, "", ValueError(f"no provider for {entry.label}"), 0.0
     started = time.monotonic()
     try:
-        raw = provider.fetch(entry)
+        with conditional.tracking() as tracker:
+            raw = provider.fetch(entry)
+        if tracker is not None and isinstance(raw, list):
+            raw = conditional.BoardSnapshot(raw, unchanged=tracker.unchanged, validators=tracker.pending)
         return entry, provider.id, raw, (time.monotonic() - started) * 1000.0
     except Exception as exc:  # per-provider / per-company isolation
         return entry, provider.id, exc, (time.monotonic() - started) * 1000.0
 
 
+@dataclass(slots=True)
+class CompanyBatch:
+    """One company's fetch result, normalized off the writer thread."""
+
+    entry: CompanyEntry
+    provider_id: str
+    latency_ms: float
+    error: Exception | None = None
+    fetched: int = 0
+    jobs: list[dict[str, Any]] = field(default_factory=list)
+    company_scope: str = ""
+    unchanged: bool = False
+    validators: list[dict[str, Any]] = field(default_factory=list)
+    normalize_error: Exception | None = None
+
+
+def _normalize_result(result: fetch_engine.FetchResult) -> CompanyBatch:
+    """Turn a raw fetch result into rows (runs on the fetch worker)."""
+    entry, provider_id, raw_or_error, latency_ms = result
+    pid = provider_id or entry.ats or "unknown"
+    batch = CompanyBatch(entry=entry, provider_id=pid, latency_ms=latency_ms)
+    if isinstance(raw_or_error, Exception):
+        batch.error = raw_or_error
+        return batch
+    raw_jobs: list[dict[str, Any]] = raw_or_error if isinstance(raw_or_error, list) else []
+    batch.fetched = len(raw_jobs)
+    batch.unchanged = bool(getattr(raw_jobs, "unchanged", False))
+    batch.validators = list(getattr(raw_jobs, "validators", []))
+    if not raw_jobs:
+        return batch
+    token = entry.token or entry.name or pid
+    try:
+        if batch.unchanged:
+            # Only the company scope is needed to bump last_seen.
+            batch.company_scope = normalize_job(pid, token, raw_jobs[0])["company"]
+        else:
+            batch.jobs = [normalize_job(pid, token, job) for job in raw_jobs]
+            batch.company_scope = batch.jobs[0]["company"] if batch.jobs else token
+    except Exception as exc:
+        batch.normalize_error = exc
+        batch.jobs = []
+    return batch
+
+
+def _stream_batches(
+    runnable: list[CompanyEntry], providers: dict, max_in_flight: int | None
+) -> Iterator[CompanyBatch]:
+    """Yield normalized company batches as fetches complete.
+
+    The fetch engine runs on a producer thread; each worker normalizes its own
+    result and puts it on a bounded queue. While the queue is full the worker
+    keeps its in-flight slot, so a slow writer throttles fetching and memory
+    stays at roughly STORE_QUEUE_SIZE companies plus those in flight."""
+    batches: queue.Queue = queue.Queue(maxsize=max(1, STORE_QUEUE_SIZE))
+    done = object()
+    stop = threading.Event()
+    failure: list[BaseException] = []
+
+    def sink(result: fetch_engine.FetchResult) -> None:
+        batch = _normalize_result(result)
+        while not stop.is_set():
+            try:
+                batches.put(batch, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def produce() -> None:
+        try:
+            fetch_engine.fetch_all(
+                runnable, providers, _fetch_one,
+                max_in_flight=max_in_flight, resolve=resolve_provider, sink=sink, cancel=stop,
+            )
+        except BaseException as exc:  # surfaced on the writer thread
+            failure.append(exc)
+        finally:
+            while True:
+                try:
+                    batches.put(done, timeout=0.1)
+                    break
+                except queue.Full:
+                    if stop.is_set():
+                        break
+
+    producer = threading.Thread(target=produce, name="scrape-producer", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = batches.get()
+            if item is done:
+                break
+            yield item
+    finally:
+        # Writer gave up early (or finished): unblock workers, cancel the
+        # companies not yet started, wait out the ones in flight.
+        stop.set()
+        producer.join()
+    if failure:
+        raise failure[0]
+
+
 def _detect_coverage_drops(
     db_path: Path | str, by_provider: dict[str, dict[str, int]]
 ) -> list[dict[str, Any]]:
     """Flag providers whose fetched count collapsed vs the mean of prior runs."""
-    prior = recent_runs(db_path, limit=5)
-    baselines: dict[str, list[int]] = defaultdict(list)
-    for run in prior:
-        stats = run.get("provider_stats") or {}
-        if isinstance(stats, dict):
-            for pid, pstats in stats.items():
-                if isinstance(pstats, dict) and "fetched" in pstats:
-                    baselines[pid].append(int(pstats.get("fetched") or 0))
+    baselines = coverage_baselines(db_path, runs=5)
     anomalies: list[dict[str, Any]] = []
     for pid, pstats in by_provider.items():
-        history = baselines.get(pid) or []
-        if not history:
+        mean = baselines.get(pid)
+        if mean is None:
             continue
-        mean = sum(history) / len(history)
         current = int(pstats.get("fetched") or 0)
         if mean >= _COVERAGE_MIN_BASELINE and current < _COVERAGE_DROP_RATIO * mean:
             anomalies.append(
@@ -110,10 +220,21 @@ def _detect_coverage_drops(
     return anomalies
 
 
+def _validator_cache(db_path: Path | str) -> conditional.ValidatorCache | None:
+    if not CONDITIONAL_FETCH:
+        return None
+    return conditional.ValidatorCache(
+        load_http_validators(db_path),
+        lambda url: load_http_body(db_path, url),
+        signature=normalize_signature(),
+    )
+
+
 def execute_run(
     companies_path: Path = DEFAULT_COMPANIES_PATH,
     mode: str = "on_demand",
     db_path: Path | str = DB_PATH,
+    max_in_flight: int | None = None,
 ) -> dict[str, Any]:
     specs = load_companies(companies_path)
     # Always include the tracker provider once (crowd-sourced internships).
@@ -127,11 +248,11 @@ def execute_run(
     providers = load_providers()
     run_id = record_run_start(db_path, mode)
     totals = {"fetched": 0, "new": 0, "updated": 0, "expired": 0,
-              "suppressed": 0, "superseded": 0}
+              "suppressed": 0, "superseded": 0, "not_modified": 0}
     flag_totals = {"is_internship": 0, "location_match": 0, "sponsorship_knockout": 0}
     by_provider: dict[str, dict[str, int]] = defaultdict(
         lambda: {"companies": 0, "fetched": 0, "new": 0, "updated": 0, "expired": 0,
-                 "errors": 0, "skipped_cooldown": 0}
+                 "errors": 0, "skipped_cooldown": 0, "not_modified": 0}
     )
     dropped_details: list[str] = []
     anomalies: list[dict[str, Any]] = []
@@ -154,56 +275,73 @@ def execute_run(
                 continue
             runnable.append(spec)
 
-        results: list[tuple[CompanyEntry, str, Any, float]] = []
-        with ThreadPoolExecutor(max_workers=MAX_CONCURRENCY) as executor:
-            futures = []
-            for spec in runnable:
-                futures.append(executor.submit(_fetch_one, spec, providers))
-                time.sleep(SLEEP_BETWEEN_CALLS_SECONDS)
-            for fut in as_completed(futures):
-                results.append(fut.result())
-
-        with get_conn(db_path) as conn:
-            for entry, provider_id, raw_or_error, latency_ms in results:
-                pid = provider_id or entry.ats or "unknown"
+        # Per-host pacing lives in providers.ratelimit; the engine bounds
+        # in-flight companies and trips an in-run breaker per provider. Results
+        # stream through a bounded queue to this thread, the single writer,
+        # which commits each company as it arrives.
+        # closing(): a writer error tears the stream down (and cancels the
+        # remaining fetches) before the exception leaves this block.
+        with conditional.active(_validator_cache(db_path)), get_conn(db_path) as conn, \
+                closing(_stream_batches(runnable, providers, max_in_flight)) as stream:
+            for batch in stream:
+                entry, pid = batch.entry, batch.provider_id
                 by_provider[pid]["companies"] += 1
-                health_agg[pid]["latencies"].append(latency_ms)
 
-                if isinstance(raw_or_error, Exception):
+                error = batch.error
+                if isinstance(error, fetch_engine.SourceCooldownError):
+                    # Not fetched: its 0ms must not pull the host's latency EMA down.
+                    by_provider[pid]["skipped_cooldown"] += 1
+                    print(f"[health] skipping {entry.label} — {error}")
+                    continue
+                health_agg[pid]["latencies"].append(batch.latency_ms)
+                if error is not None:
                     by_provider[pid]["errors"] += 1
                     health_agg[pid]["any_error"] = True
-                    health_agg[pid]["last_error"] = type(raw_or_error).__name__
-                    if isinstance(raw_or_error, requests.HTTPError) and raw_or_error.response is not None:
-                        if raw_or_error.response.status_code == 404:
+                    health_agg[pid]["last_error"] = type(error).__name__
+                    if isinstance(error, requests.HTTPError) and error.response is not None:
+                        if error.response.status_code == 404:
                             dropped_details.append(f"{entry.label} (404)")
                             print(f"{entry.label} DROPPED reason=404 provider={pid}")
                             continue
                     print(
                         f"{entry.label} fetched=0 new=0 updated=0 expired=0 "
-                        f"provider={pid} error={type(raw_or_error).__name__}"
+                        f"provider={pid} error={type(error).__name__}"
                     )
                     continue
 
-                raw_jobs: list[dict[str, Any]] = raw_or_error if isinstance(raw_or_error, list) else []
-                if not raw_jobs:
+                if not batch.fetched:
                     dropped_details.append(f"{entry.label} (zero_jobs)")
                     print(f"{entry.label} DROPPED reason=zero_jobs provider={pid}")
                     continue
 
-                token = entry.token or entry.name or pid
-                try:
-                    normalized_jobs = [normalize_job(pid, token, job) for job in raw_jobs]
-                except Exception as exc:
+                if batch.normalize_error is not None:
+                    exc = batch.normalize_error
                     by_provider[pid]["errors"] += 1
                     health_agg[pid]["any_error"] = True
                     health_agg[pid]["last_error"] = type(exc).__name__
                     print(f"{entry.label} normalize_error={type(exc).__name__}: {exc}")
                     continue
 
-                company_scope = normalized_jobs[0]["company"] if normalized_jobs else token
-                stats = upsert_company_jobs(conn, pid, company_scope, normalized_jobs)
+                fetched_count = batch.fetched
+                if batch.unchanged:
+                    # Board identical to the last stored sweep: no normalize, no
+                    # upsert — only last_seen moves. Validators may still have
+                    # rotated (same body, new ETag); keep them current.
+                    touch_company_jobs(conn, pid, batch.company_scope)
+                    save_http_validators(conn, batch.validators)
+                    conn.commit()
+                    totals["fetched"] += fetched_count
+                    totals["not_modified"] += 1
+                    by_provider[pid]["fetched"] += fetched_count
+                    by_provider[pid]["not_modified"] += 1
+                    print(f"{entry.label} provider={pid} fetched={fetched_count} not_modified")
+                    continue
+
+                normalized_jobs = batch.jobs
+                stats = upsert_company_jobs(conn, pid, batch.company_scope, normalized_jobs)
+                save_http_validators(conn, batch.validators)
+                conn.commit()
 
-                fetched_count = len(raw_jobs)
                 totals["fetched"] += fetched_count
                 totals["new"] += stats["new"]
                 totals["updated"] += stats["updated"]
@@ -241,13 +379,15 @@ def execute_run(
             print(
                 f"PROVIDER {pid}: companies={stats['companies']} fetched={stats['fetched']} "
                 f"new={stats['new']} updated={stats['updated']} expired={stats['expired']} "
-                f"err={stats['errors']} skipped_cooldown={stats['skipped_cooldown']}"
+                f"err={stats['errors']} skipped_cooldown={stats['skipped_cooldown']} "
+                f"not_modified={stats['not_modified']}"
             )
         print(
             "TOTAL "
             f"fetched={totals['fetched']} new={totals['new']} "
             f"updated={totals['updated']} expired={totals['expired']} "
-            f"suppressed={totals['suppressed']} superseded={totals['superseded']}"
+            f"suppressed={totals['suppressed']} superseded={totals['superseded']} "
+            f"not_modified={totals['not_modified']}"
         )
         print(
             "FLAGS "
@@ -4,9 +4,16 @@ from __future__ import annotations
 
 from apscheduler.schedulers.blocking import BlockingScheduler
 
+from .liveness import sweep as liveness_sweep
 from .run import execute_run
 
 
+def _nightly() -> None:
+    execute_run(mode="scheduled")
+    # Re-check stale apply-URL verdicts so the next match run finds them cached.
+    liveness_sweep()
+
+
 def start_scheduler(hour: int = 2, minute: int = 0) -> BlockingScheduler:
     """Start a blocking nightly scheduler in local timezone.
 
@@ -17,7 +24,7 @@ def start_scheduler(hour: int = 2, minute: int = 0) -> BlockingScheduler:
     # a run missed while the process was down instead of firing several catch-ups; the
     # grace window lets a late wake (laptop asleep at 02:00) still trigger the run.
     scheduler.add_job(
-        lambda: execute_run(mode="scheduled"), "cron", hour=hour, minute=minute,
+        _nightly, "cron", hour=hour, minute=minute,
         max_instances=1, coalesce=True, misfire_grace_time=3600,
     )
     scheduler.start()
@@ -16,10 +16,25 @@ import yaml
 SEARCHES_PATH = Path(__file__).resolve().parent / "searches.yaml"
 
 
-@lru_cache(maxsize=4)
+def config_stamp(path: Path) -> tuple[int, int] | None:
+    """(mtime_ns, size) of a config file, None when it is missing."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
 def load_searches(path: str | None = None) -> list[dict[str, Any]]:
+    """Parsed searches.yaml, re-read whenever the file changes on disk."""
     p = Path(path) if path else SEARCHES_PATH
-    if not p.is_file():
+    return _load_searches(str(p), config_stamp(p))
+
+
+@lru_cache(maxsize=4)
+def _load_searches(path: str, stamp: tuple[int, int] | None) -> list[dict[str, Any]]:
+    p = Path(path)
+    if stamp is None or not p.is_file():
         return []
     data = yaml.safe_load(p.read_text(encoding="utf-8")) or {}
     raw = data.get("searches") if isinstance(data, dict) else None
@@ -64,16 +79,14 @@ def match_searches(
     path: str | None = None,
 ) -> list[str]:
     """Return list of search *names* that match this job."""
-    entries = searches if searches is not None else load_searches(path)
-    title = title or ""
-    description = description or ""
-    hit: list[str] = []
-    for entry in entries:
-        fields = entry["fields"]
-        hay = title if fields == "title" else description if fields == "description" else f"{title}\n{description}"
-        if _compile_query(entry["query"]).search(hay):
-            hit.append(entry["name"])
-    return hit
+    try:
+        from .matchers import SearchMatcher, current_matcher
+    except ImportError:  # pragma: no cover
+        from scraper.matchers import SearchMatcher, current_matcher  # type: ignore
+    if searches is not None:
+        return SearchMatcher.build(searches).match(title or "", description or "")
+    matcher = current_matcher(searches_path=Path(path)) if path else current_matcher()
+    return matcher.searches.match(title or "", description or "")
 
 
 def max_boost_for_names(names: list[str], *, path: str | None = None) -> int:
@@ -5,12 +5,22 @@ from __future__ import annotations
 from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
+import argparse
+import base64
 import hashlib
 import json
 import re
 import sqlite3
+import zlib
 from typing import Any, Iterator
 
+try:
+    from backend import sqlite_pool
+    from backend.scraper.normalize import content_fingerprint
+except ImportError:  # pragma: no cover - backend/ on sys.path
+    import sqlite_pool  # type: ignore
+    from scraper.normalize import content_fingerprint  # type: ignore
+
 DB_PATH = Path(__file__).resolve().parent / "jobs.db"
 
 # Sources that are always deduped away in favor of a real ATS posting of the
@@ -45,14 +55,9 @@ def compute_dedupe_hash(company: str, title: str, location: str, remote_flag: in
 
 @contextmanager
 def get_conn(db_path: Path | str = DB_PATH) -> Iterator[sqlite3.Connection]:
-    conn = sqlite3.connect(str(db_path))
-    conn.row_factory = sqlite3.Row
-    try:
-        init_db(conn)
+    """Pooled WAL connection; init_db runs once per database (user_version stamp)."""
+    with sqlite_pool.connection(db_path, _SCHEMA) as conn:
         yield conn
-        conn.commit()
-    finally:
-        conn.close()
 
 
 def init_db(conn: sqlite3.Connection) -> None:
@@ -85,7 +90,17 @@ def init_db(conn: sqlite3.Connection) -> None:
         "CREATE INDEX IF NOT EXISTS idx_jobs_source_company_status ON jobs(source_ats, company, status)"
     )
     _ensure_jobs_columns(conn)
+    # Stage-0 prefilter candidates (matcher.prefilter): the gates are equality
+    # tests on these flags, so a run reads only the targeted slice of jobs.
+    # Created after _ensure_jobs_columns: a legacy jobs table gains the flag
+    # columns there.
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_jobs_targeted "
+        "ON jobs(location_match, sponsorship_knockout, status, is_internship)"
+    )
     _ensure_v3_tables(conn)
+    _ensure_search_index(conn)
+    _ensure_counters(conn)
 
 
 def _ensure_v3_tables(conn: sqlite3.Connection) -> None:
@@ -134,6 +149,36 @@ def _ensure_v3_tables(conn: sqlite3.Connection) -> None:
         """
     )
     conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_dedupe ON jobs(dedupe_hash)")
+    # Conditional-fetch validators per board URL (providers.conditional). The
+    # body is kept zlib-compressed so a 304 can be replayed to the provider.
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS http_validators (
+            url TEXT PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT,
+            content_type TEXT,
+            body_hash TEXT NOT NULL,
+            body BLOB NOT NULL,
+            signature TEXT NOT NULL,
+            checked_at TEXT NOT NULL
+        )
+        """
+    )
+    # Apply-page liveness verdicts per URL (scraper.liveness); reused until
+    # older than the TTL so match runs never refetch a recently checked page.
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS liveness_checks (
+            url TEXT PRIMARY KEY,
+            result TEXT NOT NULL,
+            code TEXT NOT NULL,
+            reason TEXT NOT NULL,
+            checked_at TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_liveness_checked ON liveness_checks(checked_at)")
 
 
 def _ensure_jobs_columns(conn: sqlite3.Connection) -> None:
@@ -160,255 +205,459 @@ def _ensure_jobs_columns(conn: sqlite3.Connection) -> None:
     # it on their next scrape).
     if "dedupe_hash" not in existing_columns:
         conn.execute("ALTER TABLE jobs ADD COLUMN dedupe_hash TEXT")
+    # normalize.content_fingerprint of the canonical fields; NULL on rows written
+    # before it existed (backfilled on their next sighting).
+    if "content_hash" not in existing_columns:
+        conn.execute("ALTER TABLE jobs ADD COLUMN content_hash TEXT")
+    # Hash of the detail-page description written by scraper.hydrate; NULL until
+    # hydrated and reset whenever a sweep rewrites the row.
+    if "detail_hash" not in existing_columns:
+        conn.execute("ALTER TABLE jobs ADD COLUMN detail_hash TEXT")
 
 
-def _existing_row(conn: sqlite3.Connection, source_ats: str, external_id: str) -> sqlite3.Row | None:
-    return conn.execute(
-        "SELECT * FROM jobs WHERE source_ats = ? AND external_id = ?",
-        (source_ats, external_id),
-    ).fetchone()
+_SEARCH_COLUMNS: tuple[str, ...] = ("title", "company", "location", "description_text")
+
+
+def _ensure_search_index(conn: sqlite3.Connection) -> None:
+    """FTS5 index for latest_jobs over title/company/location/description.
+
+    External content on jobs, kept in step by triggers; the update trigger only
+    fires when an indexed column really changes, so last_seen bumps and
+    unchanged re-sightings cost nothing. SQLite builds without FTS5 skip it and
+    latest_jobs falls back to LIKE."""
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status_first_seen ON jobs(status, first_seen)")
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'jobs_search'").fetchone() is None:
+        try:
+            conn.execute(
+                f"""
+                CREATE VIRTUAL TABLE jobs_search USING fts5(
+                    {", ".join(_SEARCH_COLUMNS)},
+                    content='jobs', content_rowid='rowid',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+                """
+            )
+        except sqlite3.OperationalError:
+            return
+        conn.execute("INSERT INTO jobs_search(jobs_search) VALUES ('rebuild')")
+    cols = ", ".join(_SEARCH_COLUMNS)
+    new_vals = ", ".join(f"new.{c}" for c in _SEARCH_COLUMNS)
+    old_vals = ", ".join(f"old.{c}" for c in _SEARCH_COLUMNS)
+    changed = " OR ".join(f"old.{c} IS NOT new.{c}" for c in _SEARCH_COLUMNS)
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS jobs_search_ai AFTER INSERT ON jobs BEGIN
+            INSERT INTO jobs_search(rowid, {cols}) VALUES (new.rowid, {new_vals});
+        END
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS jobs_search_ad AFTER DELETE ON jobs BEGIN
+            INSERT INTO jobs_search(jobs_search, rowid, {cols}) VALUES ('delete', old.rowid, {old_vals});
+        END
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS jobs_search_au AFTER UPDATE OF {cols} ON jobs
+        WHEN {changed} BEGIN
+            INSERT INTO jobs_search(jobs_search, rowid, {cols}) VALUES ('delete', old.rowid, {old_vals});
+            INSERT INTO jobs_search(rowid, {cols}) VALUES (new.rowid, {new_vals});
+        END
+        """
+    )
+
+
+# Materialized counters per (source_ats, company): column → expression over a
+# jobs row (bound as new/old in the triggers).
+_COUNTERS: dict[str, str] = {
+    "total": "1",
+    "active": "{r}.status = 'active'",
+    "internships": "{r}.status = 'active' AND {r}.is_internship = 1",
+    "location_matches": "{r}.status = 'active' AND {r}.location_match = 1",
+}
+_COUNTED_COLUMNS = ("source_ats", "company", "status", "is_internship", "location_match")
+_RUN_STAT_FIELDS = ("fetched", "new", "updated", "expired", "errors")
+
+
+def _count_add_sql(r: str) -> str:
+    cols = ", ".join(_COUNTERS)
+    vals = ", ".join(f"({expr.format(r=r)})" for expr in _COUNTERS.values())
+    sums = ", ".join(f"{c} = {c} + excluded.{c}" for c in _COUNTERS)
+    return f"""
+        INSERT INTO job_counts (source_ats, company, {cols}, last_seen)
+        VALUES ({r}.source_ats, {r}.company, {vals}, {r}.last_seen)
+        ON CONFLICT(source_ats, company) DO UPDATE SET {sums},
+            last_seen = CASE WHEN last_seen IS NULL OR excluded.last_seen > last_seen
+                             THEN excluded.last_seen ELSE last_seen END;
+    """
+
+
+def _count_sub_sql(r: str) -> str:
+    diffs = ", ".join(f"{c} = {c} - ({expr.format(r=r)})" for c, expr in _COUNTERS.items())
+    return f"UPDATE job_counts SET {diffs} WHERE source_ats = {r}.source_ats AND company = {r}.company;"
+
+
+def _ensure_counters(conn: sqlite3.Connection) -> None:
+    """Counters behind stats() and the per-run rollup behind coverage drops.
+
+    job_counts is maintained by triggers on jobs, so every ingest path
+    (upsert, expire, hydrate, tracker supersession) updates it inside its own
+    transaction. The update triggers only fire when a counted column changes;
+    last_seen bumps touch one counter row per company, not one per job.
+    Existing databases are backfilled once; rebuild_stats() repairs drift."""
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_first_seen ON jobs(first_seen)")
+    fresh = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'job_counts'").fetchone() is None
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS job_counts (
+            source_ats TEXT NOT NULL,
+            company TEXT NOT NULL,
+            {", ".join(f"{c} INTEGER NOT NULL DEFAULT 0" for c in _COUNTERS)},
+            last_seen TEXT,
+            PRIMARY KEY (source_ats, company)
+        )
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS run_source_stats (
+            run_id INTEGER NOT NULL,
+            source_ats TEXT NOT NULL,
+            {", ".join(f"{c} INTEGER NOT NULL DEFAULT 0" for c in _RUN_STAT_FIELDS)},
+            active INTEGER,
+            PRIMARY KEY (run_id, source_ats)
+        )
+        """
+    )
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS job_counts_ai AFTER INSERT ON jobs BEGIN {_count_add_sql('new')} END")
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS job_counts_ad AFTER DELETE ON jobs BEGIN {_count_sub_sql('old')} END")
+    changed = " OR ".join(f"old.{c} IS NOT new.{c}" for c in _COUNTED_COLUMNS)
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS job_counts_au AFTER UPDATE OF {", ".join(_COUNTED_COLUMNS)} ON jobs
+        WHEN {changed} BEGIN {_count_sub_sql('old')} {_count_add_sql('new')} END
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS job_counts_seen AFTER UPDATE OF last_seen ON jobs
+        WHEN new.last_seen > old.last_seen BEGIN
+            UPDATE job_counts SET last_seen = new.last_seen
+            WHERE source_ats = new.source_ats AND company = new.company
+              AND (last_seen IS NULL OR last_seen < new.last_seen);
+        END
+        """
+    )
+    if fresh:
+        _rebuild_counters(conn)
 
 
-def _is_changed(existing: sqlite3.Row, normalized_job: dict[str, Any]) -> bool:
-    compare_fields = (
-        "company",
-        "title",
-        "location",
-        "remote_flag",
-        "is_internship",
-        "location_match",
-        "sponsorship_knockout",
-        "department",
-        "description_text",
-        "apply_url",
-        "posted_at",
-        "updated_at",
-        "raw_json",
-        "matched_searches",
-    )
-    for field in compare_fields:
-        if field == "matched_searches":
-            existing_value = existing["matched_searches"] if "matched_searches" in existing.keys() else "[]"
-            incoming_value = json.dumps(normalized_job.get("matched_searches") or [], ensure_ascii=True)
-            if existing_value != incoming_value:
-                return True
+def _rebuild_counters(conn: sqlite3.Connection) -> None:
+    cols = ", ".join(_COUNTERS)
+    sums = ", ".join(f"COALESCE(SUM({expr.format(r='jobs')}), 0)" for expr in _COUNTERS.values())
+    conn.execute("DELETE FROM job_counts")
+    conn.execute(
+        f"""
+        INSERT INTO job_counts (source_ats, company, {cols}, last_seen)
+        SELECT source_ats, company, {sums}, MAX(last_seen) FROM jobs GROUP BY source_ats, company
+        """
+    )
+    conn.execute("DELETE FROM run_source_stats")
+    for run in conn.execute("SELECT id, provider_stats_json FROM runs WHERE provider_stats_json IS NOT NULL").fetchall():
+        try:
+            provider_stats = json.loads(run["provider_stats_json"])
+        except (json.JSONDecodeError, TypeError):
             continue
-        existing_value = existing[field]
-        incoming_value = normalized_job[field]
-        if field in {"remote_flag", "is_internship", "location_match", "sponsorship_knockout"}:
-            existing_value = int(existing_value)
-            incoming_value = int(bool(incoming_value))
-        if existing_value != incoming_value:
-            return True
-    return False
-
-
-def _find_canonical(
-    conn: sqlite3.Connection, dedupe_hash: str, exclude_source: str, exclude_id: str
-) -> sqlite3.Row | None:
-    """An active, higher-priority (non-tracker) row sharing this dedupe hash."""
-    placeholders = ",".join("?" for _ in LOW_PRIORITY_SOURCES)
-    return conn.execute(
+        _save_run_source_stats(conn, run["id"], provider_stats, snapshot=False)
+
+
+# Bump the version whenever init_db gains a step so stamped databases re-run it.
+_SCHEMA = sqlite_pool.Schema("jobs", 8, init_db)
+
+
+# Fields compared to decide whether a legacy row (no content_hash yet) changed.
+_CHANGE_FIELDS: tuple[str, ...] = (
+    "company",
+    "title",
+    "location",
+    "remote_flag",
+    "is_internship",
+    "location_match",
+    "sponsorship_knockout",
+    "department",
+    "description_text",
+    "apply_url",
+    "posted_at",
+    "updated_at",
+    "raw_json",
+    "matched_searches",
+)
+
+# Columns written from the staged batch (first_seen only on insert).
+_STAGE_COLUMNS: tuple[str, ...] = (
+    "external_id", "company", "title", "location", "remote_flag", "is_internship",
+    "location_match", "sponsorship_knockout", "department", "description_text",
+    "apply_url", "posted_at", "updated_at", "raw_json", "matched_searches", "dedupe_hash",
+    "content_hash",
+)
+
+
+def _stage_batch(conn: sqlite3.Connection, normalized_jobs: list[dict[str, Any]]) -> None:
+    """Load the batch into the connection's temp staging table (one executemany).
+    A repeated external_id keeps its last occurrence, as sequential upserts would."""
+    conn.execute(
         f"""
-        SELECT source_ats, external_id, apply_url FROM jobs
-        WHERE dedupe_hash = ? AND status = 'active'
-          AND source_ats NOT IN ({placeholders})
-          AND NOT (source_ats = ? AND external_id = ?)
-        LIMIT 1
-        """,
-        (dedupe_hash, *sorted(LOW_PRIORITY_SOURCES), exclude_source, exclude_id),
-    ).fetchone()
+        CREATE TEMP TABLE IF NOT EXISTS _stage_jobs (
+            pos INTEGER NOT NULL,
+            {", ".join(_STAGE_COLUMNS)},
+            canon_rowid INTEGER,
+            PRIMARY KEY (external_id)
+        )
+        """
+    )
+    conn.execute("DELETE FROM _stage_jobs")
+    rows = []
+    for pos, job in enumerate(normalized_jobs):
+        rows.append((
+            pos,
+            job["external_id"],
+            job["company"],
+            job["title"],
+            job["location"],
+            int(bool(job["remote_flag"])),
+            int(bool(job["is_internship"])),
+            int(bool(job["location_match"])),
+            int(bool(job["sponsorship_knockout"])),
+            job["department"],
+            job["description_text"],
+            job["apply_url"],
+            job["posted_at"],
+            job["updated_at"],
+            job["raw_json"],
+            json.dumps(job.get("matched_searches") or [], ensure_ascii=True),
+            compute_dedupe_hash(
+                job["company"], job["title"], job["location"], job.get("remote_flag") or 0
+            ),
+            job.get("content_hash") or content_fingerprint(job),
+        ))
+    conn.executemany(
+        f"INSERT OR REPLACE INTO _stage_jobs (pos, {', '.join(_STAGE_COLUMNS)}) "
+        f"VALUES ({', '.join('?' for _ in range(len(_STAGE_COLUMNS) + 1))})",
+        rows,
+    )
 
 
-def _record_job_source(
-    conn: sqlite3.Connection, canonical: tuple[str, str], alt: tuple[str, str],
-    alt_apply_url: str, now: str
-) -> None:
+def _suppress_staged_duplicates(conn: sqlite3.Connection, source_ats: str, now: str) -> int:
+    """Low-priority batch: staged rows whose dedupe hash already has an active
+    ATS posting are linked to it as alternate sources, their existing row (if
+    any) is expired, and they are dropped from the stage."""
+    low = sorted(LOW_PRIORITY_SOURCES)
+    placeholders = ",".join("?" for _ in low)
+    conn.execute(
+        f"""
+        UPDATE _stage_jobs SET canon_rowid = (
+            SELECT j.rowid FROM jobs j
+            WHERE j.dedupe_hash = _stage_jobs.dedupe_hash AND j.status = 'active'
+              AND j.source_ats NOT IN ({placeholders})
+            LIMIT 1
+        )
+        """,
+        low,
+    )
     conn.execute(
         """
         INSERT OR REPLACE INTO job_sources (
             canonical_source_ats, canonical_external_id,
             alt_source_ats, alt_external_id, alt_apply_url, first_seen
-        ) VALUES (?, ?, ?, ?, ?, ?)
+        )
+        SELECT j.source_ats, j.external_id, ?, s.external_id, COALESCE(s.apply_url, ''), ?
+        FROM _stage_jobs s JOIN jobs j ON j.rowid = s.canon_rowid
+        """,
+        (source_ats, now),
+    )
+    conn.execute(
+        """
+        UPDATE jobs SET status = 'expired',
+            dedupe_hash = (SELECT s.dedupe_hash FROM _stage_jobs s
+                           WHERE s.external_id = jobs.external_id)
+        WHERE source_ats = ? AND status = 'active'
+          AND external_id IN (SELECT external_id FROM _stage_jobs WHERE canon_rowid IS NOT NULL)
         """,
-        (canonical[0], canonical[1], alt[0], alt[1], alt_apply_url, now),
+        (source_ats,),
     )
+    suppressed = conn.execute("DELETE FROM _stage_jobs WHERE canon_rowid IS NOT NULL").rowcount
+    return max(suppressed, 0)
 
 
-def _supersede_trackers(
-    conn: sqlite3.Connection, dedupe_hash: str, canonical_source: str,
-    canonical_id: str, now: str
-) -> int:
-    """Flip active low-priority (tracker) rows with this hash to expired and
-    record them as alternate sources of the canonical ATS posting."""
-    placeholders = ",".join("?" for _ in LOW_PRIORITY_SOURCES)
+def _supersede_staged_trackers(conn: sqlite3.Connection, source_ats: str, now: str) -> int:
+    """ATS batch: active low-priority rows sharing a staged dedupe hash are
+    expired and recorded as alternate sources of the first staged match."""
+    low = sorted(LOW_PRIORITY_SOURCES)
+    placeholders = ",".join("?" for _ in low)
     rows = conn.execute(
         f"""
-        SELECT source_ats, external_id, apply_url FROM jobs
-        WHERE dedupe_hash = ? AND status = 'active'
-          AND source_ats IN ({placeholders})
+        SELECT t.source_ats, t.external_id, t.apply_url,
+               (SELECT s.external_id FROM _stage_jobs s
+                WHERE s.dedupe_hash = t.dedupe_hash ORDER BY s.pos LIMIT 1) AS canonical_id
+        FROM jobs t
+        WHERE t.status = 'active' AND t.source_ats IN ({placeholders})
+          AND t.dedupe_hash IN (SELECT dedupe_hash FROM _stage_jobs)
         """,
-        (dedupe_hash, *sorted(LOW_PRIORITY_SOURCES)),
+        low,
     ).fetchall()
-    count = 0
-    for row in rows:
-        _record_job_source(
-            conn, (canonical_source, canonical_id),
-            (row["source_ats"], row["external_id"]), row["apply_url"] or "", now,
-        )
-        conn.execute(
-            "UPDATE jobs SET status = 'expired' WHERE source_ats = ? AND external_id = ?",
-            (row["source_ats"], row["external_id"]),
-        )
-        count += 1
-    return count
+    if not rows:
+        return 0
+    conn.executemany(
+        """
+        INSERT OR REPLACE INTO job_sources (
+            canonical_source_ats, canonical_external_id,
+            alt_source_ats, alt_external_id, alt_apply_url, first_seen
+        ) VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        [(source_ats, r["canonical_id"], r["source_ats"], r["external_id"], r["apply_url"] or "", now)
+         for r in rows],
+    )
+    conn.executemany(
+        "UPDATE jobs SET status = 'expired' WHERE source_ats = ? AND external_id = ?",
+        [(r["source_ats"], r["external_id"]) for r in rows],
+    )
+    return len(rows)
 
 
 def upsert_company_jobs(
     conn: sqlite3.Connection, source_ats: str, company_scope: str, normalized_jobs: list[dict[str, Any]]
 ) -> dict[str, int]:
+    """Ingest one company's sweep as a handful of set statements.
+
+    The batch is staged into a temp table, then cross-source dedupe, the
+    insert/update upsert, tracker supersession and expire-via-absence each run
+    as one statement over the stage instead of per job. Runs inside the
+    caller's transaction (get_conn commits on exit).
+
+    Change detection is by content fingerprint: an active row whose
+    content_hash matches the sighting only gets its last_seen bumped — the
+    large text columns (and raw_json) are not rewritten.
+    """
     now = utc_now_iso()
-    inserted = 0
-    updated = 0
-    suppressed = 0
-    superseded = 0
-    seen_ids: set[str] = set()
     is_low_priority = source_ats in LOW_PRIORITY_SOURCES
+    _stage_batch(conn, normalized_jobs)
 
-    for job in normalized_jobs:
-        external_id = job["external_id"]
-        existing = _existing_row(conn, source_ats, external_id)
-        matched_json = json.dumps(job.get("matched_searches") or [], ensure_ascii=True)
-        dedupe_hash = compute_dedupe_hash(
-            job["company"], job["title"], job["location"], job.get("remote_flag") or 0
-        )
+    # Cross-source dedupe: a tracker job that duplicates a live ATS posting
+    # is suppressed (the ATS row is canonical). Suppressed rows leave the stage,
+    # so expire-via-absence below leaves them alone.
+    suppressed = _suppress_staged_duplicates(conn, source_ats, now) if is_low_priority else 0
 
-        # Cross-source dedupe: a tracker job that duplicates a live ATS posting
-        # is suppressed (the ATS row is canonical). Not added to seen_ids so
-        # expire-via-absence leaves it alone.
-        if is_low_priority:
-            canonical = _find_canonical(conn, dedupe_hash, source_ats, external_id)
-            if canonical is not None:
-                _record_job_source(
-                    conn, (canonical["source_ats"], canonical["external_id"]),
-                    (source_ats, external_id), job.get("apply_url") or "", now,
-                )
-                if existing is not None and existing["status"] == "active":
-                    conn.execute(
-                        "UPDATE jobs SET status = 'expired', dedupe_hash = ? "
-                        "WHERE source_ats = ? AND external_id = ?",
-                        (dedupe_hash, source_ats, external_id),
-                    )
-                suppressed += 1
-                continue
-
-        seen_ids.add(external_id)
-        if not existing:
-            conn.execute(
-                """
-                INSERT INTO jobs (
-                    source_ats, company, external_id, title, location, remote_flag, is_internship,
-                    location_match, sponsorship_knockout, department,
-                    description_text, apply_url, posted_at, updated_at, raw_json,
-                    first_seen, last_seen, status, matched_searches, dedupe_hash
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'active', ?, ?)
-                """,
-                (
-                    source_ats,
-                    job["company"],
-                    external_id,
-                    job["title"],
-                    job["location"],
-                    int(bool(job["remote_flag"])),
-                    int(bool(job["is_internship"])),
-                    int(bool(job["location_match"])),
-                    int(bool(job["sponsorship_knockout"])),
-                    job["department"],
-                    job["description_text"],
-                    job["apply_url"],
-                    job["posted_at"],
-                    job["updated_at"],
-                    job["raw_json"],
-                    now,
-                    now,
-                    matched_json,
-                    dedupe_hash,
-                ),
-            )
-            inserted += 1
-        else:
-            changed = _is_changed(existing, job) or existing["status"] != "active"
-            conn.execute(
-                """
-                UPDATE jobs
-                SET company = ?, title = ?, location = ?, remote_flag = ?, is_internship = ?,
-                    location_match = ?, sponsorship_knockout = ?, department = ?,
-                    description_text = ?, apply_url = ?, posted_at = ?, updated_at = ?, raw_json = ?,
-                    last_seen = ?, status = 'active', matched_searches = ?, dedupe_hash = ?
-                WHERE source_ats = ? AND external_id = ?
-                """,
-                (
-                    job["company"],
-                    job["title"],
-                    job["location"],
-                    int(bool(job["remote_flag"])),
-                    int(bool(job["is_internship"])),
-                    int(bool(job["location_match"])),
-                    int(bool(job["sponsorship_knockout"])),
-                    job["department"],
-                    job["description_text"],
-                    job["apply_url"],
-                    job["posted_at"],
-                    job["updated_at"],
-                    job["raw_json"],
-                    now,
-                    matched_json,
-                    dedupe_hash,
-                    source_ats,
-                    external_id,
-                ),
-            )
-            if changed:
-                updated += 1
-
-        # A real ATS posting supersedes any tracker duplicates of the same role.
-        if not is_low_priority:
-            superseded += _supersede_trackers(conn, dedupe_hash, source_ats, external_id, now)
-
-    if seen_ids:
-        placeholders = ",".join("?" for _ in seen_ids)
-        params = [source_ats, company_scope, *sorted(seen_ids)]
-        query = f"""
-            UPDATE jobs
-            SET status = 'expired'
-            WHERE source_ats = ?
-              AND company = ?
-              AND status = 'active'
-              AND external_id NOT IN ({placeholders})
+    # Legacy rows (content_hash NULL) fall back to the field comparison so the
+    # one-time backfill is not reported as a sweep of updates.
+    legacy_changed = " OR ".join(f"j.{col} IS NOT s.{col}" for col in _CHANGE_FIELDS)
+    counts = conn.execute(
+        f"""
+        SELECT COALESCE(SUM(j.rowid IS NULL), 0) AS inserted,
+               COALESCE(SUM(j.rowid IS NOT NULL AND (
+                   j.status != 'active' OR CASE WHEN j.content_hash IS NULL
+                       THEN ({legacy_changed}) ELSE j.content_hash != s.content_hash END
+               )), 0) AS updated
+        FROM _stage_jobs s
+        LEFT JOIN jobs j ON j.source_ats = ? AND j.external_id = s.external_id
+        """,
+        (source_ats,),
+    ).fetchone()
+
+    # Unchanged sightings: a last_seen bump, nothing else (the upsert below
+    # skips them; they stay staged so expire-via-absence still sees them).
+    conn.execute(
         """
-        cursor = conn.execute(query, params)
-    else:
-        cursor = conn.execute(
-            """
-            UPDATE jobs
-            SET status = 'expired'
-            WHERE source_ats = ?
-              AND company = ?
-              AND status = 'active'
-            """,
-            (source_ats, company_scope),
+        UPDATE jobs SET last_seen = ?
+        WHERE source_ats = ? AND external_id IN (SELECT external_id FROM _stage_jobs)
+          AND status = 'active'
+          AND content_hash = (SELECT s.content_hash FROM _stage_jobs s
+                              WHERE s.external_id = jobs.external_id)
+        """,
+        (now, source_ats),
+    )
+
+    columns = ", ".join(_STAGE_COLUMNS)
+    conn.execute(
+        f"""
+        INSERT INTO jobs (source_ats, {columns}, first_seen, last_seen, status)
+        SELECT ?, {columns}, ?, ?, 'active' FROM _stage_jobs s
+        WHERE NOT EXISTS (
+            SELECT 1 FROM jobs j
+            WHERE j.source_ats = ? AND j.external_id = s.external_id
+              AND j.status = 'active' AND j.content_hash = s.content_hash
         )
+        ORDER BY pos
+        ON CONFLICT(source_ats, external_id) DO UPDATE SET
+            {", ".join(f"{col} = excluded.{col}" for col in _STAGE_COLUMNS if col != "external_id")},
+            last_seen = excluded.last_seen,
+            status = 'active',
+            detail_hash = NULL
+        """,
+        (source_ats, now, now, source_ats),
+    )
 
+    # A real ATS posting supersedes any tracker duplicates of the same role.
+    superseded = 0 if is_low_priority else _supersede_staged_trackers(conn, source_ats, now)
+
+    cursor = conn.execute(
+        """
+        UPDATE jobs
+        SET status = 'expired'
+        WHERE source_ats = ?
+          AND company = ?
+          AND status = 'active'
+          AND NOT EXISTS (SELECT 1 FROM _stage_jobs s WHERE s.external_id = jobs.external_id)
+        """,
+        (source_ats, company_scope),
+    )
     expired = cursor.rowcount if cursor.rowcount != -1 else 0
+    conn.execute("DELETE FROM _stage_jobs")
     return {
-        "new": inserted,
-        "updated": updated,
+        "new": int(counts["inserted"]),
+        "updated": int(counts["updated"]),
         "expired": expired,
         "suppressed": suppressed,
         "superseded": superseded,
     }
 
 
+def touch_company_jobs(conn: sqlite3.Connection, source_ats: str, company_scope: str) -> int:
+    """Bump last_seen on a company's active rows — the upsert's effect for a
+    sweep whose board came back not modified."""
+    cursor = conn.execute(
+        "UPDATE jobs SET last_seen = ? WHERE source_ats = ? AND company = ? AND status = 'active'",
+        (utc_now_iso(), source_ats, company_scope),
+    )
+    return cursor.rowcount if cursor.rowcount != -1 else 0
+
+
+def save_job_details(conn: sqlite3.Connection, rows: list[dict[str, Any]]) -> None:
+    """Write hydrated descriptions (and the flags/tags recomputed from them)
+    onto active rows; content_hash is left alone so the next sweep of an
+    unchanged posting keeps the hydrated text."""
+    now = utc_now_iso()
+    conn.executemany(
+        """
+        UPDATE jobs SET description_text = ?, detail_hash = ?, remote_flag = ?,
+            is_internship = ?, location_match = ?, sponsorship_knockout = ?,
+            matched_searches = ?, last_seen = ?
+        WHERE source_ats = ? AND external_id = ? AND status = 'active'
+        """,
+        [
+            (
+                row["description_text"], row["detail_hash"], int(bool(row.get("remote_flag"))),
+                int(bool(row.get("is_internship"))), int(bool(row.get("location_match"))),
+                int(bool(row.get("sponsorship_knockout"))),
+                json.dumps(row.get("matched_searches") or [], ensure_ascii=True),
+                row.get("last_seen") or now, row["source_ats"], row["external_id"],
+            )
+            for row in rows
+        ],
+    )
+
+
 def count_all_rows(conn: sqlite3.Connection) -> int:
     row = conn.execute("SELECT COUNT(*) AS c FROM jobs").fetchone()
     return int(row["c"]) if row else 0
@@ -416,34 +665,119 @@ def count_all_rows(conn: sqlite3.Connection) -> int:
 
 
 def stats(db_path: Path | str = DB_PATH) -> dict[str, Any]:
-    """Read-only jobs.db summary for the dashboard sourcing page."""
+    """Read-only jobs.db summary for the dashboard sourcing page, read from the
+    materialized job_counts rather than aggregated over jobs."""
+    cols = ", ".join(f"SUM({c}) AS {c}" for c in _COUNTERS)
     with get_conn(db_path) as conn:
         row = conn.execute(
-            """
-            SELECT
-                COUNT(*) AS total,
-                SUM(CASE WHEN status = 'active' THEN 1 ELSE 0 END) AS active,
-                SUM(CASE WHEN status = 'active' AND is_internship = 1 THEN 1 ELSE 0 END) AS internships,
-                SUM(CASE WHEN status = 'active' AND location_match = 1 THEN 1 ELSE 0 END) AS location_matches,
-                SUM(CASE WHEN first_seen >= datetime('now', '-1 day') THEN 1 ELSE 0 END) AS new_24h,
-                COUNT(DISTINCT company) AS companies,
+            f"""
+            SELECT {cols},
+                COUNT(DISTINCT CASE WHEN total > 0 THEN company END) AS companies,
                 MAX(last_seen) AS last_seen
-            FROM jobs
+            FROM job_counts
             """
         ).fetchone()
+        new_24h = conn.execute(
+            "SELECT COUNT(*) AS c FROM jobs WHERE first_seen >= datetime('now', '-1 day')"
+        ).fetchone()["c"]
+        by_source = conn.execute(
+            f"SELECT source_ats, {cols} FROM job_counts GROUP BY source_ats ORDER BY source_ats"
+        ).fetchall()
     return {
         "total": row["total"] or 0,
         "active": row["active"] or 0,
         "internships": row["internships"] or 0,
         "location_matches": row["location_matches"] or 0,
-        "new_24h": row["new_24h"] or 0,
+        "new_24h": new_24h or 0,
         "companies": row["companies"] or 0,
         "last_seen": row["last_seen"],
+        "by_source": {r["source_ats"]: {c: r[c] or 0 for c in _COUNTERS} for r in by_source},
+    }
+
+
+def check_stats(conn: sqlite3.Connection) -> list[dict[str, Any]]:
+    """Counter rows that disagree with a fresh aggregate over jobs (empty when
+    job_counts is in sync)."""
+    sums = ", ".join(f"COALESCE(SUM({expr.format(r='jobs')}), 0) AS {c}" for c, expr in _COUNTERS.items())
+    actual = {
+        (r["source_ats"], r["company"]): r
+        for r in conn.execute(f"SELECT source_ats, company, {sums} FROM jobs GROUP BY source_ats, company")
     }
+    stored = {(r["source_ats"], r["company"]): r for r in conn.execute("SELECT * FROM job_counts")}
+    drift: list[dict[str, Any]] = []
+    for key in sorted(actual.keys() | stored.keys()):
+        for col in _COUNTERS:
+            want = actual[key][col] if key in actual else 0
+            have = stored[key][col] if key in stored else 0
+            if want != have:
+                drift.append({"source_ats": key[0], "company": key[1], "counter": col,
+                              "stored": have, "actual": want})
+    return drift
+
+
+def rebuild_stats(db_path: Path | str = DB_PATH) -> dict[str, int]:
+    """Recompute job_counts and run_source_stats from jobs and runs."""
+    with get_conn(db_path) as conn:
+        drifted = len(check_stats(conn))
+        _rebuild_counters(conn)
+        rows = conn.execute("SELECT COUNT(*) AS c FROM job_counts").fetchone()["c"]
+    print(f"[stats] rebuilt job_counts rows={rows} drifted={drifted}")
+    return {"rows": int(rows), "drifted": drifted}
 
 
 # ── "Latest jobs" freshness view (spec §5.3) ──────────────────────────────────
 
+_SEARCH_TERM_RE = re.compile(r'"([^"]*)"(\*?)|(\S+)')
+_WORD_RE = re.compile(r"\w")
+
+
+def _phrase(text: str, prefix: bool) -> str | None:
+    clean = " ".join(text.replace('"', " ").rstrip("*").split())
+    if not _WORD_RE.search(clean):
+        return None
+    return f'"{clean}"' + ("*" if prefix else "")
+
+
+def fts_query(text: str) -> str | None:
+    """User search text → FTS5 MATCH expression.
+
+    "quoted text" is a phrase, a trailing * makes a prefix search, OR between
+    two terms is kept and every other pair of terms is ANDed. Everything else
+    is quoted, so FTS5 operators and column filters cannot be injected."""
+    parts: list[str] = []
+    for phrase, star, word in _SEARCH_TERM_RE.findall(text or ""):
+        if word == "OR":
+            if parts and parts[-1] != "OR":
+                parts.append("OR")
+            continue
+        term = _phrase(phrase, bool(star)) if not word else _phrase(word, word.endswith("*"))
+        if term:
+            parts.append(term)
+    while parts and parts[-1] == "OR":
+        parts.pop()
+    return " ".join(parts) or None
+
+
+def _encode_cursor(order: str, key: Any, rowid: int) -> str:
+    raw = json.dumps([order, key, rowid], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str, order: str) -> tuple[Any, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_order, key, rowid = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError) as exc:
+        raise ValueError("invalid cursor") from exc
+    if cursor_order != order:
+        raise ValueError(f"cursor was issued for order={cursor_order!r}, not {order!r}")
+    return key, int(rowid)
+
+
+def _has_search_index(conn: sqlite3.Connection) -> bool:
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'jobs_search'").fetchone() is not None
+
+
 def latest_jobs(
     db_path: Path | str = DB_PATH,
     *,
@@ -452,43 +786,220 @@ def latest_jobs(
     keywords: list[str] | None = None,
     companies: list[str] | None = None,
     limit: int = 100,
+    search: str | None = None,
+    order: str | None = None,
+    cursor: str | None = None,
 ) -> list[dict[str, Any]]:
     """Active jobs first seen within the window, newest first.
 
     posted_at is often NULL from ATS feeds, so the optional days_posted filter
     keeps NULL-posted rows rather than dropping them. keywords match (case-
-    insensitively) against title OR description_text (any term)."""
-    where = ["status = 'active'", "first_seen >= ?"]
+    insensitively) against title OR description_text (any term, as word
+    prefixes). search is free text over title, company, location and
+    description (see fts_query) and orders by relevance unless order="recent".
+
+    Every row carries a ``cursor``; pass the last one back as `cursor` (same
+    filters and order) for the next page."""
+    order = order or ("rank" if search else "recent")
+    if order not in {"recent", "rank"}:
+        raise ValueError(f"unknown order: {order!r}")
+    where = ["j.status = 'active'", "j.first_seen >= ?"]
     cutoff = (datetime.now(timezone.utc) - timedelta(hours=int(hours_first_seen))).isoformat()
     params: list[Any] = [cutoff]
 
     if days_posted is not None:
         posted_cutoff = (datetime.now(timezone.utc) - timedelta(days=int(days_posted))).isoformat()
-        where.append("(posted_at IS NULL OR posted_at >= ?)")
+        where.append("(j.posted_at IS NULL OR j.posted_at >= ?)")
         params.append(posted_cutoff)
 
     if companies:
-        where.append("(" + " OR ".join("company = ?" for _ in companies) + ")")
+        where.append("(" + " OR ".join("j.company = ?" for _ in companies) + ")")
         params.extend(companies)
 
-    if keywords:
-        kw_clauses = []
-        for kw in keywords:
-            kw_clauses.append("(LOWER(title) LIKE ? OR LOWER(description_text) LIKE ?)")
-            like = f"%{str(kw).lower()}%"
-            params.extend([like, like])
-        where.append("(" + " OR ".join(kw_clauses) + ")")
-
-    sql = (
-        "SELECT source_ats, company, external_id, title, location, apply_url, "
-        "posted_at, first_seen, last_seen, is_internship, matched_searches "
-        f"FROM jobs WHERE {' AND '.join(where)} "
-        "ORDER BY first_seen DESC LIMIT ?"
-    )
-    params.append(int(limit))
     with get_conn(db_path) as conn:
+        use_fts = _has_search_index(conn)
+        match: list[str] = []
+        if keywords and use_fts:
+            terms = [t for t in (_phrase(str(kw), True) for kw in keywords) if t]
+            if terms:
+                match.append("{title description_text} : (" + " OR ".join(terms) + ")")
+        elif keywords:
+            kw_clauses = []
+            for kw in keywords:
+                kw_clauses.append("(LOWER(j.title) LIKE ? OR LOWER(j.description_text) LIKE ?)")
+                like = f"%{str(kw).lower()}%"
+                params.extend([like, like])
+            where.append("(" + " OR ".join(kw_clauses) + ")")
+        if search and use_fts:
+            expr = fts_query(search)
+            if expr:
+                match.append(f"({expr})")
+        elif search:
+            for term in search.replace('"', " ").split():
+                like = f"%{term.rstrip('*').lower()}%"
+                where.append("(LOWER(j.title) LIKE ? OR LOWER(j.company) LIKE ? "
+                             "OR LOWER(j.location) LIKE ? OR LOWER(j.description_text) LIKE ?)")
+                params.extend([like] * 4)
+
+        source = "jobs j"
+        rank_sql = "0.0"
+        if match:
+            source = "jobs j JOIN jobs_search ON jobs_search.rowid = j.rowid"
+            where.append("jobs_search MATCH ?")
+            params.append(" AND ".join(match))
+            rank_sql = "bm25(jobs_search, 10.0, 4.0, 2.0, 1.0)"
+        if order == "rank" and not match:
+            order = "recent"  # nothing to rank by
+
+        inner = (
+            "SELECT j.source_ats, j.company, j.external_id, j.title, j.location, j.apply_url, "
+            "j.posted_at, j.first_seen, j.last_seen, j.is_internship, j.matched_searches, "
+            f"j.rowid AS _rid, {rank_sql} AS _rank "
+            f"FROM {source} WHERE {' AND '.join(where)}"
+        )
+        if order == "rank":
+            sort_key, keyset, order_by = "_rank", "(_rank > ? OR (_rank = ? AND _rid > ?))", "_rank, _rid"
+        else:
+            sort_key, keyset, order_by = (
+                "first_seen", "(first_seen < ? OR (first_seen = ? AND _rid < ?))", "first_seen DESC, _rid DESC"
+            )
+        sql = f"SELECT * FROM ({inner})"
+        if cursor:
+            key, rowid = _decode_cursor(cursor, order)
+            sql += f" WHERE {keyset}"
+            params.extend([key, key, rowid])
+        sql += f" ORDER BY {order_by} LIMIT ?"
+        params.append(int(limit))
         rows = conn.execute(sql, params).fetchall()
-    return [dict(r) for r in rows]
+
+    out: list[dict[str, Any]] = []
+    for r in rows:
+        item = dict(r)
+        rowid, rank = item.pop("_rid"), item.pop("_rank")
+        item["cursor"] = _encode_cursor(order, rank if order == "rank" else item["first_seen"], rowid)
+        out.append(item)
+    return out
+
+
+# ── Conditional-fetch validators ───────────────────────────────────────────────
+
+def load_http_validators(db_path: Path | str = DB_PATH) -> dict[str, dict[str, Any]]:
+    """{url: {etag, last_modified, content_type, body_hash, signature}} — bodies
+    stay on disk until a 304 needs one (load_http_body)."""
+    with get_conn(db_path) as conn:
+        rows = conn.execute(
+            "SELECT url, etag, last_modified, content_type, body_hash, signature FROM http_validators"
+        ).fetchall()
+    return {r["url"]: dict(r) for r in rows}
+
+
+def load_http_body(db_path: Path | str, url: str) -> bytes | None:
+    with get_conn(db_path) as conn:
+        row = conn.execute("SELECT body FROM http_validators WHERE url = ?", (url,)).fetchone()
+    return zlib.decompress(row["body"]) if row else None
+
+
+def save_http_validators(conn: sqlite3.Connection, rows: list[dict[str, Any]]) -> None:
+    """Upsert validators inside the caller's transaction (after the company's
+    jobs were stored, so a failed sweep never looks unchanged next run)."""
+    now = utc_now_iso()
+    conn.executemany(
+        """
+        INSERT INTO http_validators (url, etag, last_modified, content_type, body_hash,
+            body, signature, checked_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(url) DO UPDATE SET
+            etag = excluded.etag,
+            last_modified = excluded.last_modified,
+            content_type = excluded.content_type,
+            body_hash = excluded.body_hash,
+            body = excluded.body,
+            signature = excluded.signature,
+            checked_at = excluded.checked_at
+        """,
+        [
+            (
+                row["url"], row.get("etag"), row.get("last_modified"), row.get("content_type"),
+                row["body_hash"], zlib.compress(row["body"]), row["signature"], now,
+            )
+            for row in rows
+        ],
+    )
+
+
+# ── Liveness verdicts ──────────────────────────────────────────────────────────
+
+def load_liveness_checks(
+    conn: sqlite3.Connection, urls: list[str], *, since: str | None = None
+) -> dict[str, dict[str, Any]]:
+    """{url: {result, code, reason, checked_at, url}} for `urls` checked at or
+    after `since` (all stored verdicts when None)."""
+    out: dict[str, dict[str, Any]] = {}
+    unique = list(dict.fromkeys(u for u in urls if u))
+    for start in range(0, len(unique), 500):
+        chunk = unique[start:start + 500]
+        sql = (
+            "SELECT url, result, code, reason, checked_at FROM liveness_checks "
+            f"WHERE url IN ({', '.join('?' * len(chunk))})"
+        )
+        params: list[Any] = list(chunk)
+        if since is not None:
+            sql += " AND checked_at >= ?"
+            params.append(since)
+        for row in conn.execute(sql, params).fetchall():
+            out[row["url"]] = dict(row)
+    return out
+
+
+def stale_liveness_urls(conn: sqlite3.Connection, *, before: str, limit: int | None = None) -> list[str]:
+    """Stored URLs whose verdict was checked before `before`, oldest first."""
+    sql = "SELECT url FROM liveness_checks WHERE checked_at < ? ORDER BY checked_at"
+    params: list[Any] = [before]
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(int(limit))
+    return [row["url"] for row in conn.execute(sql, params).fetchall()]
+
+
+def unchecked_liveness_urls(conn: sqlite3.Connection, *, limit: int) -> list[str]:
+    """Apply URLs of active jobs that have never been checked, newest first."""
+    rows = conn.execute(
+        """
+        SELECT apply_url FROM jobs j
+        WHERE status = 'active' AND apply_url LIKE 'http%'
+          AND NOT EXISTS (SELECT 1 FROM liveness_checks c WHERE c.url = j.apply_url)
+        GROUP BY apply_url
+        ORDER BY MAX(first_seen) DESC
+        LIMIT ?
+        """,
+        (int(limit),),
+    ).fetchall()
+    return [row["apply_url"] for row in rows]
+
+
+def save_liveness_checks(conn: sqlite3.Connection, rows: list[dict[str, Any]]) -> None:
+    """Upsert verdicts; rows carrying source_ats/external_id are also mirrored
+    onto that jobs row (liveness, liveness_checked_at)."""
+    conn.executemany(
+        """
+        INSERT INTO liveness_checks (url, result, code, reason, checked_at)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(url) DO UPDATE SET
+            result = excluded.result,
+            code = excluded.code,
+            reason = excluded.reason,
+            checked_at = excluded.checked_at
+        """,
+        [(r["url"], r["result"], r["code"], r["reason"], r["checked_at"]) for r in rows],
+    )
+    conn.executemany(
+        "UPDATE jobs SET liveness = ?, liveness_checked_at = ? WHERE source_ats = ? AND external_id = ?",
+        [
+            (r["result"], r["checked_at"], r["source_ats"], r["external_id"])
+            for r in rows
+            if r.get("source_ats") and r.get("external_id")
+        ],
+    )
 
 
 # ── Run history (spec §9) ─────────────────────────────────────────────────────
@@ -527,6 +1038,45 @@ def record_run_end(
                 int(run_id),
             ),
         )
+        _save_run_source_stats(conn, int(run_id), provider_stats)
+
+
+def _save_run_source_stats(
+    conn: sqlite3.Connection, run_id: int, provider_stats: dict[str, Any], *, snapshot: bool = True
+) -> None:
+    """Per-source rollup of one run; `snapshot` also records each source's
+    active job count from job_counts as of now."""
+    if not isinstance(provider_stats, dict):
+        return
+    active = (
+        {r["source_ats"]: r["active"] for r in conn.execute(
+            "SELECT source_ats, SUM(active) AS active FROM job_counts GROUP BY source_ats")}
+        if snapshot else {}
+    )
+    rows = [
+        (run_id, pid, *(int(pstats.get(f) or 0) for f in _RUN_STAT_FIELDS), active.get(pid))
+        for pid, pstats in provider_stats.items()
+        if isinstance(pstats, dict) and "fetched" in pstats
+    ]
+    conn.executemany(
+        f"INSERT OR REPLACE INTO run_source_stats (run_id, source_ats, {', '.join(_RUN_STAT_FIELDS)}, active) "
+        f"VALUES (?, ?, {', '.join('?' for _ in _RUN_STAT_FIELDS)}, ?)",
+        rows,
+    )
+
+
+def coverage_baselines(db_path: Path | str = DB_PATH, runs: int = 5) -> dict[str, float]:
+    """{source_ats: mean fetched} over the sources present in the last `runs` runs."""
+    with get_conn(db_path) as conn:
+        rows = conn.execute(
+            """
+            SELECT source_ats, AVG(fetched) AS mean FROM run_source_stats
+            WHERE run_id IN (SELECT id FROM runs ORDER BY id DESC LIMIT ?)
+            GROUP BY source_ats
+            """,
+            (int(runs),),
+        ).fetchall()
+    return {r["source_ats"]: float(r["mean"]) for r in rows}
 
 
 def recent_runs(db_path: Path | str = DB_PATH, limit: int = 5) -> list[dict[str, Any]]:
@@ -548,6 +1098,11 @@ def recent_runs(db_path: Path | str = DB_PATH, limit: int = 5) -> list[dict[str,
 
 # ── Per-source health + cooldown (spec §1.3 / §7.1) ───────────────────────────
 
+# Consecutive failures before a source cools off (shared with the fetch engine's
+# in-run breaker).
+COOLDOWN_AFTER = 3
+
+
 def update_source_health(
     db_path: Path | str,
     source_ats: str,
@@ -556,7 +1111,7 @@ def update_source_health(
     latency_ms: float | None = None,
     error: str | None = None,
     cooldown_hours: float = 6.0,
-    cooldown_after: int = 3,
+    cooldown_after: int = COOLDOWN_AFTER,
 ) -> None:
     """Record a source's outcome. On success: reset the error streak, clear any
     cooldown, and fold latency into an EMA (0.3 new / 0.7 old). On failure:
@@ -623,3 +1178,24 @@ def sources_in_cooldown(db_path: Path | str = DB_PATH) -> dict[str, str]:
             (now,),
         ).fetchall()
     return {r["source_ats"]: r["cooldown_until"] for r in rows}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="jobs.db maintenance")
+    parser.add_argument("--check-stats", action="store_true", help="Report counter drift and exit")
+    parser.add_argument("--rebuild-stats", action="store_true", help="Recompute the materialized counters")
+    parser.add_argument("--db", default=str(DB_PATH), help="Path to jobs.db")
+    args = parser.parse_args()
+    if args.rebuild_stats:
+        rebuild_stats(args.db)
+        return
+    with get_conn(args.db) as conn:
+        drift = check_stats(conn)
+    for d in drift:
+        print(f"[stats] drift {d['source_ats']}/{d['company']} {d['counter']}: "
+              f"stored={d['stored']} actual={d['actual']}")
+    print(f"[stats] {len(drift)} drifted counter(s)" + ("; run --rebuild-stats" if drift else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""Tests for conditional fetching (providers.conditional) end to end.
+
+Offline: a ThreadingHTTPServer on 127.0.0.1 plays a job board that honours
+If-None-Match (or, under /plain, sends no validators at all); the provider is a
+tiny Greenhouse-shaped stand-in fetching through providers.base, and
+execute_run writes to a tmp jobs.db.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+
+from backend.scraper import run as run_mod
+from backend.scraper import store
+from backend.scraper.providers import base, conditional, ratelimit
+
+
+class _Board(BaseHTTPRequestHandler):
+    state: dict = {}
+
+    def do_GET(self):  # noqa: N802
+        st = self.state
+        token = self.path.rsplit("/", 1)[-1]
+        body = json.dumps({"jobs": st["boards"][token]}).encode()
+        etag = f'"{hashlib.sha1(body + st.get("etag_salt", b"")).hexdigest()[:12]}"'
+        with st["lock"]:
+            st["hits"] += 1
+            st["conditional"] += "If-None-Match" in self.headers
+        if not self.path.startswith("/plain") and self.headers.get("If-None-Match") == etag:
+            with st["lock"]:
+                st["not_modified"] += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if not self.path.startswith("/plain"):
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # keep pytest output clean
+        pass
+
+
+def _job(ext: int, title: str = "ML Intern") -> dict:
+    return {"id": ext, "title": title, "company_name": "Acme", "location": {"name": "Remote"},
+            "content": "<p>Python and PyTorch.</p>", "absolute_url": f"https://acme/jobs/{ext}",
+            "updated_at": "2026-09-01T00:00:00Z"}
+
+
+@pytest.fixture
+def board(monkeypatch, tmp_path):
+    state = {"lock": threading.Lock(), "hits": 0, "conditional": 0, "not_modified": 0,
+             "boards": {"acme": [_job(1), _job(2)]}}
+    handler = type("Handler", (_Board,), {"state": state})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(base, "HOST_LIMITER", ratelimit.HostLimiter())
+    monkeypatch.setitem(ratelimit.HOST_POLICIES, "127.0.0.1",
+                        ratelimit.HostPolicy(rate_per_sec=1000.0, burst=100, max_concurrency=4))
+    monkeypatch.setattr(run_mod, "CONDITIONAL_FETCH", True)
+
+    root = f"http://127.0.0.1:{server.server_address[1]}"
+    paths = {"prefix": ""}
+    provider = SimpleNamespace(
+        id="greenhouse",
+        fetch=lambda entry: base.http_get_json(f"{root}{paths['prefix']}/{entry.token}", retries=0)["jobs"],
+    )
+    empty = SimpleNamespace(id="tracker", fetch=lambda entry: [])
+    monkeypatch.setattr(run_mod, "load_providers", lambda: {})
+    monkeypatch.setattr(run_mod, "resolve_provider",
+                        lambda entry, providers: provider if entry.ats == "greenhouse" else empty)
+
+    normalized = {"calls": 0}
+    real_normalize = run_mod.normalize_job
+
+    def counting_normalize(pid, token, job):
+        normalized["calls"] += 1
+        return real_normalize(pid, token, job)
+
+    monkeypatch.setattr(run_mod, "normalize_job", counting_normalize)
+
+    companies = tmp_path / "companies.yaml"
+    companies.write_text("companies:\n  - {ats: greenhouse, token: acme}\n", encoding="utf-8")
+    db = tmp_path / "jobs.db"
+
+    def run():
+        normalized["calls"] = 0
+        return run_mod.execute_run(companies_path=companies, mode="on_demand", db_path=db)
+
+    yield SimpleNamespace(state=state, run=run, db=db, paths=paths, normalized=normalized)
+    server.shutdown()
+    server.server_close()
+
+
+def _active_rows(db) -> dict[str, str]:
+    with store.get_conn(db) as conn:
+        rows = conn.execute("SELECT external_id, last_seen FROM jobs WHERE status = 'active'").fetchall()
+    return {r["external_id"]: r["last_seen"] for r in rows}
+
+
+def test_not_modified_board_skips_normalize_and_upsert(board):
+    first = board.run()
+    assert first["new"] == 2 and first["not_modified"] == 0
+    before = _active_rows(board.db)
+
+    second = board.run()
+    assert board.state["not_modified"] == 1
+    assert second["fetched"] == 2 and second["not_modified"] == 1
+    assert second["new"] == second["updated"] == second["expired"] == 0
+    assert board.normalized["calls"] == 1  # company scope only
+    after = _active_rows(board.db)
+    assert set(after) == set(before)
+    assert all(after[k] >= before[k] for k in after)
+
+
+def test_changed_board_is_stored_and_revalidated(board):
+    board.run()
+    board.state["boards"]["acme"] = [_job(1), _job(3, "Data Intern")]
+    changed = board.run()
+    assert changed["new"] == 1 and changed["expired"] == 1 and changed["not_modified"] == 0
+    assert board.state["not_modified"] == 0
+
+    board.run()
+    assert board.state["not_modified"] == 1  # the new ETag was stored
+    assert set(_active_rows(board.db)) == {"1", "3"}
+
+
+def test_rotated_etag_on_identical_body_is_stored(board):
+    board.run()
+    board.state["etag_salt"] = b"rotated"  # e.g. a CDN re-deploy: same body, new ETag
+    again = board.run()
+    assert board.state["not_modified"] == 0 and again["not_modified"] == 1
+
+    board.run()
+    assert board.state["not_modified"] == 1  # the rotated ETag was stored
+
+
+def test_identical_body_without_validators_short_circuits(board):
+    board.paths["prefix"] = "/plain"
+    board.run()
+    again = board.run()
+    assert board.state["conditional"] == 0  # nothing to send without validators
+    assert again["not_modified"] == 1 and again["new"] == again["updated"] == 0
+    assert board.normalized["calls"] == 1
+
+
+def test_failed_normalize_keeps_board_dirty(board, monkeypatch):
+    real = run_mod.normalize_job
+
+    def broken(pid, token, job):
+        raise ValueError("bad payload")
+
+    monkeypatch.setattr(run_mod, "normalize_job", broken)
+    board.run()
+    monkeypatch.setattr(run_mod, "normalize_job", real)
+    retried = board.run()
+    assert board.state["conditional"] == 0  # no validators were saved
+    assert retried["new"] == 2 and retried["not_modified"] == 0
+
+
+def test_normalize_signature_change_rereads_board(board, monkeypatch):
+    board.run()
+    monkeypatch.setattr(run_mod, "normalize_signature", lambda: "edited-searches")
+    again = board.run()
+    assert board.state["conditional"] == 0
+    assert again["not_modified"] == 0 and board.normalized["calls"] == 2
+
+
+def test_replayed_304_reaches_text_helpers(board):
+    board.run()
+    url = next(iter(store.load_http_validators(board.db)))
+    cache = run_mod._validator_cache(board.db)
+    with conditional.active(cache), conditional.tracking() as tracker:
+        status, _final_url, text = base.http_get_text(url)
+    assert board.state["not_modified"] == 1
+    assert status == 200 and json.loads(text)["jobs"][0]["id"] == 1
+    assert tracker.unchanged and tracker.pending == []
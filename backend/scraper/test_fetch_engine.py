@@ -0,0 +1,150 @@
+"""Tests for the async fetch engine + per-host limiter against a local stub ATS.
+
+Offline: a ThreadingHTTPServer on 127.0.0.1 plays the ATS; providers are tiny
+stand-ins that GET from it through providers.base (shared session + limiter).
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from backend.scraper import fetch_engine
+from backend.scraper import run as run_mod
+from backend.scraper.providers import base, ratelimit
+from backend.scraper.providers.base import CompanyEntry
+
+
+class _StubATS(BaseHTTPRequestHandler):
+    state: dict = {}
+
+    def do_GET(self):  # noqa: N802
+        st = self.state
+        with st["lock"]:
+            st["hits"] += 1
+            st["active"] += 1
+            st["peak"] = max(st["peak"], st["active"])
+            st["times"].append(time.monotonic())
+        try:
+            time.sleep(st["delay"])
+            if self.path.startswith(("/down", "/gone")):
+                self.send_response(500 if self.path.startswith("/down") else 404)
+                self.end_headers()
+                return
+            body = json.dumps({"jobs": [{"id": self.path}]}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with st["lock"]:
+                st["active"] -= 1
+
+    def log_message(self, *args):  # keep pytest output clean
+        pass
+
+
+@pytest.fixture
+def stub_ats(monkeypatch):
+    state = {"lock": threading.Lock(), "hits": 0, "active": 0, "peak": 0, "times": [], "delay": 0.05}
+    handler = type("Handler", (_StubATS,), {"state": state})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    # Fresh limiter so buckets from other tests never leak in.
+    monkeypatch.setattr(base, "HOST_LIMITER", ratelimit.HostLimiter())
+    yield SimpleNamespace(url=f"http://127.0.0.1:{server.server_address[1]}", state=state)
+    server.shutdown()
+    server.server_close()
+
+
+def _providers(root: str) -> dict:
+    def detect(entry):
+        return f"{root}/{entry.token}"
+
+    def fetch(entry):
+        return base.http_get_json(detect(entry), retries=0)["jobs"]
+
+    return {"stub": SimpleNamespace(id="stub", detect=detect, fetch=fetch)}
+
+
+def _policy(monkeypatch, **kw):
+    monkeypatch.setitem(ratelimit.HOST_POLICIES, "127.0.0.1", ratelimit.HostPolicy(**kw))
+
+
+def test_per_host_concurrency_cap(stub_ats, monkeypatch):
+    _policy(monkeypatch, rate_per_sec=1000.0, burst=100, max_concurrency=2)
+    entries = [CompanyEntry(ats="stub", token=f"c{i}") for i in range(8)]
+    results = fetch_engine.fetch_all(entries, _providers(stub_ats.url), run_mod._fetch_one, max_in_flight=8)
+    assert len(results) == 8
+    assert all(isinstance(raw, list) and raw for _, _, raw, _ in results)
+    assert stub_ats.state["peak"] <= 2
+
+
+def test_token_bucket_paces_requests(stub_ats, monkeypatch):
+    stub_ats.state["delay"] = 0.0
+    _policy(monkeypatch, rate_per_sec=20.0, burst=1, max_concurrency=4)
+    entries = [CompanyEntry(ats="stub", token=f"c{i}") for i in range(6)]
+    fetch_engine.fetch_all(entries, _providers(stub_ats.url), run_mod._fetch_one, max_in_flight=4)
+    times = sorted(stub_ats.state["times"])
+    assert len(times) == 6
+    # Burst of 1 at 20/s: 5 refills of 50ms each between first and last request.
+    assert times[-1] - times[0] >= 0.2
+
+
+def test_breaker_skips_provider_after_consecutive_failures(stub_ats, monkeypatch):
+    _policy(monkeypatch, rate_per_sec=1000.0, burst=100, max_concurrency=4)
+    providers = _providers(f"{stub_ats.url}/down")
+    entries = [CompanyEntry(ats="stub", token=f"c{i}") for i in range(5)]
+    results = fetch_engine.fetch_all(
+        entries, providers, run_mod._fetch_one, max_in_flight=1, cooldown_after=3
+    )
+    errors = [raw for _, _, raw, _ in results]
+    assert sum(isinstance(e, requests.HTTPError) for e in errors) == 3
+    assert sum(isinstance(e, fetch_engine.SourceCooldownError) for e in errors) == 2
+    assert stub_ats.state["hits"] == 3
+
+
+def test_breaker_ignores_stale_token_404s(stub_ats, monkeypatch):
+    _policy(monkeypatch, rate_per_sec=1000.0, burst=100, max_concurrency=4)
+    providers = _providers(stub_ats.url)
+
+    # Three stale tokens (404) do not trip the breaker for a healthy board.
+    entries = [CompanyEntry(ats="stub", token=t) for t in ("gone/a", "gone/b", "gone/c", "ok")]
+    results = fetch_engine.fetch_all(entries, providers, run_mod._fetch_one, max_in_flight=1, cooldown_after=3)
+    assert isinstance(results[-1][2], list) and stub_ats.state["hits"] == 4
+
+    # ...and a 404 between 500s neither resets nor extends the streak.
+    tokens = ("down/a", "gone/a", "down/b", "down/c", "ok")
+    entries = [CompanyEntry(ats="stub", token=t) for t in tokens]
+    results = fetch_engine.fetch_all(entries, providers, run_mod._fetch_one, max_in_flight=1, cooldown_after=3)
+    assert isinstance(results[-1][2], fetch_engine.SourceCooldownError)
+    assert stub_ats.state["hits"] == 8
+
+
+def test_interleave_round_robins_providers():
+    routed = [(i, pid, "") for i, pid in enumerate(["a", "a", "a", "b", "c"])]
+    assert [pid for _, pid, _ in fetch_engine.interleave(routed)] == ["a", "b", "c", "a", "a"]
+
+
+def test_token_bucket_penalty_blocks_until_elapsed():
+    now = [0.0]
+    slept: list[float] = []
+
+    def sleep(s):
+        slept.append(s)
+        now[0] += s
+
+    bucket = ratelimit.TokenBucket(100.0, 5, clock=lambda: now[0], sleep=sleep)
+    bucket.acquire()
+    bucket.penalize(7.0)
+    bucket.acquire()
+    assert now[0] >= 7.0
+    assert sum(slept) == pytest.approx(7.0)
@@ -1,11 +1,15 @@
 """Tests for HTTP retry/backoff (sourcing-v3 §2.2).
 
-Fully offline: requests.get/post are monkeypatched, time.sleep and random.uniform
-are stubbed so backoff is instant and deterministic. No real network.
+Fully offline: the shared session's get/post are monkeypatched, time.sleep and
+random.uniform are stubbed so backoff is instant and deterministic, and the
+per-host limiter is swapped for a pass-through. No real network.
 """
 
 from __future__ import annotations
 
+from contextlib import nullcontext
+from types import SimpleNamespace
+
 import requests
 import pytest
 
@@ -32,11 +36,19 @@ def _no_sleep(monkeypatch):
     sleeps: list[float] = []
     monkeypatch.setattr(base.time, "sleep", lambda s: sleeps.append(s))
     monkeypatch.setattr(base.random, "uniform", lambda a, b: 0.0)
+    monkeypatch.setattr(
+        base, "HOST_LIMITER",
+        SimpleNamespace(slot=lambda url: nullcontext(), penalize=lambda url, s: None),
+    )
     return sleeps
 
 
+def _patch_session(monkeypatch, **methods):
+    monkeypatch.setattr(base, "_session", lambda: SimpleNamespace(**methods))
+
+
 def _seq_get(monkeypatch, responses):
-    """Patch requests.get to yield the given responses/exceptions in order."""
+    """Patch the session's get to yield the given responses/exceptions in order."""
     calls = {"n": 0}
 
     def fake_get(url, **kw):
@@ -47,7 +59,7 @@ def _seq_get(monkeypatch, responses):
             raise item
         return item
 
-    monkeypatch.setattr(base.requests, "get", fake_get)
+    _patch_session(monkeypatch, get=fake_get)
     return calls
 
 
@@ -121,7 +133,7 @@ def test_post_retries_and_returns_latency(monkeypatch, _no_sleep):
             raise requests.exceptions.Timeout("slow")
         return FakeResp(200, {"posted": True})
 
-    monkeypatch.setattr(base.requests, "post", fake_post)
+    _patch_session(monkeypatch, post=fake_post)
     payload, latency = base.timed_post_json("http://x", {"q": "ml"}, retries=2)
     assert payload == {"posted": True}
     assert isinstance(latency, float) and latency >= 0.0
@@ -0,0 +1,114 @@
+"""Tests for lazy description hydration (scraper.hydrate).
+
+Offline: jobs are real Workday-normalized rows in a tmp jobs.db; the provider's
+fetch_detail is a fake that counts calls.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+
+from backend.matcher.prefilter import prefilter_jobs
+from backend.scraper import hydrate, store
+from backend.scraper.normalize import normalize_job
+from backend.scraper.providers import workday
+
+FILTERS = Path(__file__).resolve().parent / "filters.yaml"
+BASE = "https://acme.wd5.myworkdayjobs.com/External"
+
+
+def _raw(idx: int, title: str = "Machine Learning Intern", location: str = "Remote, US") -> dict:
+    return {"title": title, "externalPath": f"/job/Remote/Role_{idx}", "locationsText": location,
+            "postedOn": "Posted Today", "bulletFields": [f"R{idx}"], "_job_base": BASE,
+            "_tenant": "acme", "_site": "External", "id": f"/job/Remote/Role_{idx}"}
+
+
+def _sweep(db, raws):
+    jobs = [normalize_job("workday", "acme/External", raw) for raw in raws]
+    with store.get_conn(db) as conn:
+        return store.upsert_company_jobs(conn, "workday", "acme", jobs)
+
+
+def _fake(pages: dict[str, str] | None = None, fail: set[str] | None = None):
+    calls: list[str] = []
+
+    def fetch_detail(job):
+        calls.append(job["external_id"])
+        if job["external_id"] in (fail or set()):
+            raise ConnectionError("detail down")
+        return (pages or {}).get(job["external_id"], "<p>Build PyTorch models in Python.</p>")
+
+    return {"workday": SimpleNamespace(id="workday", fetch_detail=fetch_detail)}, calls
+
+
+def _row(db, ext):
+    with store.get_conn(db) as conn:
+        return dict(conn.execute("SELECT * FROM jobs WHERE external_id = ?", (ext,)).fetchone())
+
+
+def test_only_survivors_are_hydrated_and_cached(tmp_path):
+    db = tmp_path / "jobs.db"
+    _sweep(db, [_raw(1), _raw(2), _raw(3, location="Berlin, Germany")])
+    providers, calls = _fake()
+
+    survivors = prefilter_jobs(db, "both", FILTERS)
+    stats = hydrate.hydrate_jobs(survivors, db, providers=providers)
+    assert stats["hydrated"] == 2 and sorted(calls) == ["/job/Remote/Role_1", "/job/Remote/Role_2"]
+    row = _row(db, "/job/Remote/Role_1")
+    assert row["description_text"] == "Build PyTorch models in Python." and row["detail_hash"]
+    assert survivors[0]["description_text"] == row["description_text"]
+
+    calls.clear()
+    hydrate.hydrate_jobs(prefilter_jobs(db, "both", FILTERS), db, providers=providers)
+    assert calls == []
+
+
+def test_unchanged_sweep_keeps_detail_and_changed_posting_rehydrates(tmp_path):
+    db = tmp_path / "jobs.db"
+    _sweep(db, [_raw(1), _raw(2)])
+    providers, calls = _fake()
+    hydrate.hydrate_jobs(prefilter_jobs(db, "both", FILTERS), db, providers=providers)
+
+    _sweep(db, [_raw(1), _raw(2)])
+    assert _row(db, "/job/Remote/Role_1")["detail_hash"]
+
+    _sweep(db, [_raw(1), _raw(2, title="Machine Learning Intern II")])
+    assert _row(db, "/job/Remote/Role_2")["detail_hash"] is None
+    calls.clear()
+    hydrate.hydrate_jobs(prefilter_jobs(db, "both", FILTERS), db, providers=providers)
+    assert calls == ["/job/Remote/Role_2"]
+
+
+def test_detail_page_recomputes_knockout_flags(tmp_path):
+    db = tmp_path / "jobs.db"
+    _sweep(db, [_raw(1)])
+    providers, _ = _fake({"/job/Remote/Role_1": "<p>Applicants must be U.S. citizens.</p>"})
+    survivors = prefilter_jobs(db, "both", FILTERS)
+    hydrate.hydrate_jobs(survivors, db, providers=providers)
+    assert survivors[0]["sponsorship_knockout"]
+    assert _row(db, "/job/Remote/Role_1")["sponsorship_knockout"] == 1
+    assert prefilter_jobs(db, "both", FILTERS) == []
+
+
+def test_failures_retry_later_and_limit_defers(tmp_path):
+    db = tmp_path / "jobs.db"
+    _sweep(db, [_raw(1), _raw(2), _raw(3)])
+    providers, calls = _fake(fail={"/job/Remote/Role_1"})
+    stats = hydrate.hydrate_jobs(prefilter_jobs(db, "both", FILTERS), db, providers=providers, limit=2)
+    assert stats == {"candidates": 3, "hydrated": 1, "failed": 1, "deferred": 1}
+    assert _row(db, "/job/Remote/Role_1")["detail_hash"] is None
+
+    calls.clear()
+    hydrate.hydrate_jobs(prefilter_jobs(db, "both", FILTERS), db, providers=providers)
+    assert sorted(calls) == ["/job/Remote/Role_1", "/job/Remote/Role_3"]
+
+
+def test_workday_detail_url_from_apply_url():
+    assert workday.detail_url(f"{BASE}/job/Remote/Role_1") == (
+        "https://acme.wd5.myworkdayjobs.com/wday/cxs/acme/External/job/Remote/Role_1"
+    )
+    assert workday.detail_url("https://acme.wd5.myworkdayjobs.com/en-US/External/job/X_1?q=1") == (
+        "https://acme.wd5.myworkdayjobs.com/wday/cxs/acme/External/job/X_1"
+    )
+    assert workday.detail_url("https://example.com/job/1") is None
@@ -0,0 +1,199 @@
+"""Tests for cached, streamed liveness checks (scraper.liveness).
+
+Offline: providers.base's session is replaced by a fake whose responses stream
+canned chunks and count how many were read; databases are tmp_path.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from backend.matcher import store as matcher_store
+from backend.scraper import liveness, store
+from backend.scraper.providers import base, ratelimit
+
+APPLY_PAGE = "<html><body><h1>ML Intern</h1>" + "<p>About the team.</p>" * 30 + "<button>Apply</button>"
+
+
+class _Resp:
+    def __init__(self, url: str, chunks: list[bytes], status: int = 200) -> None:
+        self.url, self.status_code, self.encoding = url, status, "utf-8"
+        self._chunks, self.read, self.closed = chunks, 0, False
+
+    def iter_content(self, _size):
+        for chunk in self._chunks:
+            self.read += 1
+            yield chunk
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def pages(monkeypatch):
+    served: dict[str, list[bytes]] = {}
+    hits: list[_Resp] = []
+    lock = threading.Lock()
+
+    def get(url, **kw):
+        assert kw.get("stream") is True
+        resp = _Resp(url, served[url])
+        with lock:
+            hits.append(resp)
+        return resp
+
+    monkeypatch.setattr(base, "_session", lambda: SimpleNamespace(get=get))
+    monkeypatch.setattr(base, "HOST_LIMITER", ratelimit.HostLimiter())
+    return SimpleNamespace(served=served, hits=hits)
+
+
+def test_streamed_read_stops_once_decisive(pages, monkeypatch):
+    banner = b"<html><body><h2>This job has expired</h2>"
+    filler = [b"<p>" + b"x" * 16000 + b"</p>"] * 50
+    pages.served["https://jobs.example/1"] = [banner, *filler]
+    result = liveness.check_url("https://jobs.example/1")
+    assert result["result"] == "expired" and result["code"] == "expired_body"
+    assert pages.hits[0].read == 1 and pages.hits[0].closed
+
+    # Nothing decisive: the read is capped at READ_LIMIT_BYTES.
+    monkeypatch.setattr(liveness, "READ_LIMIT_BYTES", 64_000)
+    pages.served["https://jobs.example/2"] = [APPLY_PAGE.encode(), *filler]
+    assert liveness.check_url("https://jobs.example/2")["result"] == "live"
+    assert pages.hits[1].read == 5
+
+
+def test_unterminated_script_is_not_read_as_page_text():
+    partial = "<p>Open role, apply below</p><script>var t = 'this job has expired';"
+    assert "expired" not in liveness.visible_text(partial)
+    assert "expired" not in liveness.visible_text(partial + "</script>")
+
+
+def test_check_jobs_reuses_fresh_verdicts(pages, tmp_path):
+    db = tmp_path / "jobs.db"
+    pages.served["https://jobs.example/a"] = [APPLY_PAGE.encode()]
+    pages.served["https://jobs.example/b"] = [b"<h1>Position has been filled</h1>"]
+    jobs = [
+        {"source_ats": "greenhouse", "external_id": "a", "apply_url": "https://jobs.example/a"},
+        {"source_ats": "greenhouse", "external_id": "b", "apply_url": "https://jobs.example/b"},
+        {"source_ats": "greenhouse", "external_id": "c", "apply_url": ""},
+    ]
+    verdicts = liveness.check_jobs(jobs, db_path=db)
+    assert {u: v["result"] for u, v in verdicts.items()} == {
+        "https://jobs.example/a": "live", "https://jobs.example/b": "expired",
+    }
+    assert len(pages.hits) == 2
+
+    again = liveness.check_jobs(jobs, db_path=db)
+    assert len(pages.hits) == 2 and again["https://jobs.example/b"]["code"] == "expired_body"
+
+    liveness.check_jobs(jobs, db_path=db, ttl_hours=0)
+    assert len(pages.hits) == 4
+    assert liveness.sweep(db, ttl_hours=0)["checked"] == 2
+
+
+def test_gate_and_store_reads_cache_and_patches_pending(pages, tmp_path, monkeypatch):
+    jobs_db, matches_db = tmp_path / "jobs.db", tmp_path / "matches.db"
+    pages.served["https://jobs.example/new"] = [APPLY_PAGE.encode()]
+    with store.get_conn(jobs_db) as conn:
+        store.save_liveness_checks(conn, [{
+            "url": "https://jobs.example/old", "result": "expired", "code": "http_gone",
+            "reason": "HTTP 404", "checked_at": liveness._fresh_since(0),
+        }])
+
+    # gate_and_store imports liveness the way the app does (scraper.* when
+    # backend/ is on sys.path), which may be a second copy of the module.
+    live_mod = matcher_store._liveness_module()
+    monkeypatch.setattr(live_mod.base, "_session", base._session)
+    monkeypatch.setattr(live_mod.base, "HOST_LIMITER", base.HOST_LIMITER)
+    threads: list[threading.Thread] = []
+    real_refresh = live_mod.refresh_in_background
+
+    def capture(*args, **kwargs):
+        threads.append(real_refresh(*args, **kwargs))
+        return threads[-1]
+
+    monkeypatch.setattr(live_mod, "refresh_in_background", capture)
+    fitted = [
+        {"job": {"source_ats": "greenhouse", "external_id": ext, "apply_url": f"https://jobs.example/{ext}",
+                 "company": "Acme", "title": "ML Intern"}, "match_pct": 90, "fit": {}}
+        for ext in ("old", "new")
+    ]
+    matcher_store.gate_and_store(matches_db, "p1", fitted, jobs_db_path=jobs_db)
+
+    def fits():
+        with matcher_store._connect(matches_db) as conn:
+            rows = conn.execute("SELECT external_id, fit_json FROM matches").fetchall()
+        return {r["external_id"]: json.loads(r["fit_json"])["liveness"] for r in rows}
+
+    stored = fits()
+    assert stored["old"]["result"] == "expired"
+    assert stored["new"]["code"] == "pending"
+    assert len(threads) == 1
+    threads[0].join(timeout=10)
+    assert fits()["new"]["result"] == "live"
+    assert [h.url for h in pages.hits] == ["https://jobs.example/new"]
+
+
+def test_sweep_checks_active_jobs_never_checked(pages, tmp_path):
+    db = tmp_path / "jobs.db"
+    pages.served["https://jobs.example/fresh"] = [APPLY_PAGE.encode()]
+    job = {
+        "external_id": "fresh", "company": "Acme", "title": "ML Intern", "location": "Remote",
+        "remote_flag": 1, "is_internship": 1, "location_match": 1, "sponsorship_knockout": 0,
+        "department": "Eng", "description_text": "d", "apply_url": "https://jobs.example/fresh",
+        "posted_at": None, "updated_at": None, "raw_json": "{}", "matched_searches": [],
+    }
+    with store.get_conn(db) as conn:
+        store.upsert_company_jobs(conn, "greenhouse", "Acme", [job])
+
+    assert liveness.sweep(db)["live"] == 1
+    assert liveness.cached_verdicts(["https://jobs.example/fresh"], db_path=db)
+    assert liveness.sweep(db)["checked"] == 0   # checked and fresh: nothing left to do
+    assert len(pages.hits) == 1
+
+
+def test_earlier_pending_matches_are_settled_and_joined(pages, tmp_path, monkeypatch):
+    jobs_db, matches_db = tmp_path / "jobs.db", tmp_path / "matches.db"
+    pages.served["https://jobs.example/late"] = [APPLY_PAGE.encode()]
+    live_mod = matcher_store._liveness_module()
+    monkeypatch.setattr(live_mod.base, "_session", base._session)
+    monkeypatch.setattr(live_mod.base, "HOST_LIMITER", base.HOST_LIMITER)
+
+    # The first run's refresh never got to write (its process exited).
+    real_refresh, refreshes = live_mod.refresh_in_background, []
+
+    def first_run_dies(*args, **kwargs):
+        refreshes.append(args[0])
+        return real_refresh(*args, **kwargs) if len(refreshes) > 1 else None
+
+    monkeypatch.setattr(live_mod, "refresh_in_background", first_run_dies)
+    first = [{"job": {"source_ats": "greenhouse", "external_id": "late", "company": "Acme",
+                      "title": "ML Intern", "apply_url": "https://jobs.example/late"},
+              "match_pct": 90, "fit": {}}]
+    matcher_store.gate_and_store(matches_db, "p1", first, jobs_db_path=jobs_db)
+
+    # The next run re-queues it even though it is no longer among the survivors.
+    matcher_store.gate_and_store(matches_db, "p1", [], jobs_db_path=jobs_db)
+    assert len(refreshes) == 2 and refreshes[1][0]["apply_url"] == "https://jobs.example/late"
+    assert matcher_store.wait_for_liveness(10) == 0
+    with matcher_store._connect(matches_db) as conn:
+        fit = json.loads(conn.execute("SELECT fit_json FROM matches").fetchone()["fit_json"])
+    assert fit["liveness"]["result"] == "live"
+    assert [h.url for h in pages.hits] == ["https://jobs.example/late"]
+
+
+def test_fetch_errors_are_not_cached(pages, tmp_path):
+    db = tmp_path / "jobs.db"
+    url = "https://jobs.example/flaky"
+    jobs = [{"source_ats": "greenhouse", "external_id": "f", "apply_url": url}]
+    first = liveness.check_jobs(jobs, db_path=db)   # nothing served: the fetch raises
+    assert first[url]["code"] == "fetch_error"
+    assert liveness.cached_verdicts([url], db_path=db) == {}
+
+    pages.served[url] = [APPLY_PAGE.encode()]
+    assert liveness.check_jobs(jobs, db_path=db)[url]["result"] == "live"
+    assert liveness.cached_verdicts([url], db_path=db)[url]["result"] == "live"
@@ -0,0 +1,111 @@
+"""Tests for the compiled targeting/search matcher (scraper.matchers).
+
+The reference implementations below are the per-pattern loops the matcher
+replaced; the compiled version must agree with them on every job.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+
+from backend.scraper import matchers, searches
+from backend.scraper.normalize import compute_targeting_flags, normalize_job
+
+TEXTS = [
+    ("Machine Learning Intern", "Remote, US", "Build LLM research prototypes in PyTorch."),
+    ("Senior Staff Engineer", "Berlin, Germany", "Applicants must be U.S. citizens."),
+    ("Research Associate", "Houston, TX", "We apply spatial proteomics to tissue atlases."),
+    ("Computer Vision Co-op", "Toronto", "Must be authorized to work in Canada without sponsorship."),
+    ("Data Scientist", "Seattle", "Large language model evaluation; summer intern cohort."),
+    # re.IGNORECASE matches dotted İ against i; casefold() spells it i + U+0307
+    ("MACHİNE LEARNİNG İNTERN", "Remote, US", "APPLİCANTS MUST BE US CİTİZENS. LARGE LANGUAGE MODEL RESEARCH."),
+    ("", "", ""),
+]
+
+
+def _reference_flags(filters, title, location, description):
+    return {
+        "is_internship": any(p.lower() in title.lower() for p in filters["internship_patterns"]),
+        "location_match": any(p.lower() in location.lower() for p in filters["location_allow"]),
+        "sponsorship_knockout": any(re.search(p, description, re.I) for p in filters["sponsorship_knockout"]),
+    }
+
+
+def _reference_searches(entries, title, description):
+    hits = []
+    for e in entries:
+        hay = {"title": title, "description": description}.get(e["fields"], f"{title}\n{description}")
+        if searches._compile_query(e["query"]).search(hay):
+            hits.append(e["name"])
+    return hits
+
+
+def test_compiled_matcher_agrees_with_pattern_loops():
+    filters = matchers.read_filters()
+    entries = searches.load_searches()
+    matcher = matchers.current_matcher()
+    for title, location, description in TEXTS:
+        flags, names = matcher.classify(title, location, description)
+        assert flags == _reference_flags(filters, title, location, description)
+        assert names == _reference_searches(entries, title, description)
+        assert compute_targeting_flags(title, location, description) == flags
+        assert searches.match_searches(title, description) == names
+
+
+def test_trigger_literals_gate_regexes():
+    # both groups are required; the one with the longer shortest literal wins
+    assert matchers.trigger_literals("(LLM|large language model).{0,60}(intern|research)") == (
+        "intern", "research",
+    )
+    assert matchers.trigger_literals("computer vision|cv intern|vision co-?op") == (
+        "computer vision", "cv intern", "vision co",
+    )
+    assert matchers.trigger_literals("must be authorized to work.*without sponsorship") == (
+        "must be authorized to work",
+    )
+    assert matchers.trigger_literals(r"\w+ly") == ("ly",)
+    assert matchers.trigger_literals(r"\d{3}|[ab]c?") is None  # nothing every match needs
+    assert matchers.trigger_literals("(unbalanced") is None
+
+    m = matchers.SearchMatcher.build([
+        {"name": "digits", "query": r"\d{4}", "fields": "description", "boost": 5},
+        {"name": "ml", "query": "machine learning", "fields": "both", "boost": 5},
+        {"name": "title only", "query": "intern", "fields": "title", "boost": 5},
+    ])
+    assert m.match("ML INTERN", "MACHINE LEARNING since 2019") == ["digits", "ml", "title only"]
+    assert m.match("Engineer", "intern machine\nlearning") == []
+    # re.IGNORECASE matches dotless ı against i; the prescreen must not drop it
+    assert m.match("\u0131ntern", "") == ["title only"]
+    assert m.match("\u0130NTERN", "MACH\u0130NE LEARN\u0130NG") == ["ml", "title only"]
+    rule = matchers._rule(0, re.compile("visa", re.I))
+    assert rule.search("V\u0130SA", matchers.fold("V\u0130SA"))
+
+
+def test_matcher_reloads_when_config_changes(tmp_path):
+    filters = tmp_path / "filters.yaml"
+    filters.write_text('internship_patterns: ["intern"]\nlocation_allow: ["remote"]\n'
+                       'sponsorship_knockout: ["no sponsorship"]\n', encoding="utf-8")
+    config = tmp_path / "searches.yaml"
+    config.write_text("searches:\n  - {name: ml, query: machine learning}\n", encoding="utf-8")
+
+    first = matchers.current_matcher(filters, config)
+    assert matchers.current_matcher(filters, config) is first
+    assert first.searches.match("x", "quantum computing") == []
+
+    config.write_text("searches:\n  - {name: quantum, query: quantum computing}\n", encoding="utf-8")
+    stat = config.stat()
+    os.utime(config, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    reloaded = matchers.current_matcher(filters, config)
+    assert reloaded is not first
+    assert reloaded.searches.match("x", "quantum computing") == ["quantum"]
+    assert searches.match_searches("x", "quantum computing", path=str(config)) == ["quantum"]
+
+
+def test_normalize_job_uses_matcher_tags():
+    job = normalize_job("greenhouse", "acme", {
+        "id": 1, "title": "Machine Learning Intern", "location": {"name": "Remote"},
+        "content": "<p>Spatial proteomics and LLM research.</p>", "absolute_url": "https://a/1",
+    })
+    assert job["is_internship"] and job["location_match"] and not job["sponsorship_knockout"]
+    assert job["matched_searches"] == ["spatial proteomics", "LLM research intern", "machine learning intern"]
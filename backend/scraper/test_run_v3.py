@@ -7,8 +7,10 @@ detection) is exercised end-to-end without network or real providers.
 
 from __future__ import annotations
 
-import requests
+import time
+
 import pytest
+import requests
 
 from backend.scraper import run as run_mod
 from backend.scraper import store
@@ -43,7 +45,6 @@ def wired(monkeypatch, tmp_path):
         "  - {ats: lever, token: beta}\n",
         encoding="utf-8",
     )
-    monkeypatch.setattr(run_mod, "SLEEP_BETWEEN_CALLS_SECONDS", 0.0)
 
     # Stub normalize_job to a deterministic pass-through — provider-specific
     # normalizers each want a different raw shape, and this test targets the
@@ -170,3 +171,91 @@ def test_partial_failure_does_not_abort_run(monkeypatch, wired):
     totals = run_mod.execute_run(companies_path=companies, mode="on_demand", db_path=db)
     assert totals["fetched"] == 2  # lever ingested despite greenhouse failing
     assert totals["by_provider"]["greenhouse"]["errors"] == 1
+
+
+def test_breaker_skips_do_not_dilute_latency(monkeypatch, wired):
+    db, companies = wired
+    companies.write_text(
+        "companies:\n" + "".join(f"  - {{ats: greenhouse, token: c{i}}}\n" for i in range(6)),
+        encoding="utf-8",
+    )
+
+    class Down(FakeProvider):
+        def fetch(self, entry):
+            time.sleep(0.02)
+            raise requests.ConnectionError("refused")
+
+    _patch_providers(monkeypatch, {"greenhouse": Down("greenhouse"), "tracker": FakeProvider("tracker")})
+    recorded: dict[str, float | None] = {}
+    monkeypatch.setattr(run_mod, "update_source_health",
+                        lambda db_path, pid, **kw: recorded.__setitem__(pid, kw["latency_ms"]))
+    totals = run_mod.execute_run(companies_path=companies, mode="on_demand", db_path=db, max_in_flight=1)
+    assert totals["by_provider"]["greenhouse"]["skipped_cooldown"] == 6 - store.COOLDOWN_AFTER
+    assert recorded["greenhouse"] >= 20.0  # mean of the real fetches only
+
+
+def test_store_queue_throttles_fetching(monkeypatch, wired):
+    started: list[str] = []
+
+    class Counting(FakeProvider):
+        def fetch(self, entry):
+            started.append(entry.token)
+            return [_raw_job(entry.token)]
+
+    _patch_providers(monkeypatch, {"greenhouse": Counting("greenhouse")})
+    monkeypatch.setattr(run_mod, "STORE_QUEUE_SIZE", 1)
+    entries = [CompanyEntry(ats="greenhouse", token=f"c{i}") for i in range(8)]
+
+    batches = run_mod._stream_batches(entries, {}, max_in_flight=2)
+    first = next(batches)
+    time.sleep(0.3)  # a writer that stalls: workers must stop pulling companies
+    # one handed to the writer + one queued + two holding their slots
+    assert len(started) == 4
+    rest = list(batches)
+    assert len(started) == 8 and len(rest) == 7
+    assert first.jobs and all(b.jobs[0]["external_id"] == b.entry.token for b in [first, *rest])
+
+
+def test_writer_failure_cancels_remaining_fetches(monkeypatch, wired):
+    started: list[str] = []
+
+    class Slow(FakeProvider):
+        def fetch(self, entry):
+            started.append(entry.token)
+            time.sleep(0.05)
+            return [_raw_job(entry.token)]
+
+    _patch_providers(monkeypatch, {"greenhouse": Slow("greenhouse")})
+    monkeypatch.setattr(run_mod, "STORE_QUEUE_SIZE", 1)
+    entries = [CompanyEntry(ats="greenhouse", token=f"c{i}") for i in range(40)]
+
+    batches = run_mod._stream_batches(entries, {}, max_in_flight=2)
+    next(batches)
+    began = time.monotonic()
+    batches.close()  # the writer raised: the generator is torn down
+    assert time.monotonic() - began < 1.0
+    assert len(started) <= 5
+
+
+def test_each_company_is_committed_as_it_is_stored(monkeypatch, wired):
+    db, companies = wired
+    _patch_providers(monkeypatch, {
+        "greenhouse": FakeProvider("greenhouse", jobs=[_raw_job("g1")]),
+        "lever": FakeProvider("lever", jobs=[_raw_job("l1")]),
+        "tracker": FakeProvider("tracker", jobs=[]),
+    })
+    real_upsert = run_mod.upsert_company_jobs
+    calls: list[str] = []
+
+    def upsert_then_fail(conn, pid, scope, jobs):
+        calls.append(pid)
+        if len(calls) == 2:
+            raise RuntimeError("disk full")
+        return real_upsert(conn, pid, scope, jobs)
+
+    monkeypatch.setattr(run_mod, "upsert_company_jobs", upsert_then_fail)
+    with pytest.raises(RuntimeError):
+        run_mod.execute_run(companies_path=companies, mode="on_demand", db_path=db, max_in_flight=1)
+    with store.get_conn(db) as conn:
+        stored = {r["source_ats"] for r in conn.execute("SELECT source_ats FROM jobs").fetchall()}
+    assert stored == {calls[0]}
@@ -76,6 +76,38 @@ def test_migration_preserves_data_and_adds_v3_objects(tmp_path):
         assert row["title"] == "Old Job" and row["status"] == "active"
 
 
+def test_migration_adds_flag_columns_before_indexing_them(tmp_path):
+    db = tmp_path / "jobs.db"
+    # Pre-targeting schema: no is_internship / location_match / sponsorship_knockout.
+    conn = sqlite3.connect(str(db))
+    conn.execute(
+        """
+        CREATE TABLE jobs (
+            source_ats TEXT NOT NULL, company TEXT NOT NULL, external_id TEXT NOT NULL,
+            title TEXT, location TEXT, remote_flag INTEGER NOT NULL DEFAULT 0, department TEXT,
+            description_text TEXT, apply_url TEXT, posted_at TEXT, updated_at TEXT,
+            raw_json TEXT NOT NULL, first_seen TEXT NOT NULL, last_seen TEXT NOT NULL,
+            status TEXT NOT NULL CHECK(status IN ('active', 'expired')),
+            PRIMARY KEY (source_ats, external_id)
+        )
+        """
+    )
+    conn.execute(
+        "INSERT INTO jobs (source_ats, company, external_id, title, location, raw_json, "
+        "first_seen, last_seen, status) VALUES "
+        "('greenhouse','Acme','OLD1','Old Job','NYC','{}','2020-01-01','2020-01-01','active')"
+    )
+    conn.commit()
+    conn.close()
+
+    with store.get_conn(db) as conn:
+        cols = {r["name"] for r in conn.execute("PRAGMA table_info(jobs)").fetchall()}
+        assert {"is_internship", "location_match", "sponsorship_knockout"} <= cols
+        indexes = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+        assert "idx_jobs_targeted" in indexes
+    assert store.stats(db)["total"] == 1
+
+
 def test_init_db_is_idempotent(tmp_path):
     db = tmp_path / "jobs.db"
     with store.get_conn(db):
@@ -155,6 +187,37 @@ def test_distinct_jobs_not_deduped(tmp_path):
         assert res["suppressed"] == 0 and res["new"] == 1
 
 
+# ── set-based ingestion ───────────────────────────────────────────────────────
+def test_bulk_upsert_counts_new_updated_and_expired(tmp_path):
+    db = tmp_path / "jobs.db"
+    sweep = [_job(f"g{i}", title=f"Role {i}") for i in range(2500)]
+    with store.get_conn(db) as conn:
+        first = store.upsert_company_jobs(conn, "greenhouse", "Acme", sweep)
+        assert first["new"] == 2500 and first["updated"] == 0 and first["expired"] == 0
+
+        again = [dict(j) for j in sweep[:2400]]  # 100 postings vanished
+        again[0]["description_text"] = "edited"
+        second = store.upsert_company_jobs(conn, "greenhouse", "Acme", again)
+        assert second == {"new": 0, "updated": 1, "expired": 100, "suppressed": 0, "superseded": 0}
+
+        # A vanished posting coming back is an update (status flip), not a new row.
+        third = store.upsert_company_jobs(conn, "greenhouse", "Acme", again + [sweep[2450]])
+        assert third["new"] == 0 and third["updated"] == 1 and third["expired"] == 0
+        row = conn.execute(
+            "SELECT status, description_text, first_seen <= last_seen AS ordered FROM jobs "
+            "WHERE external_id = 'g0'").fetchone()
+        assert row["status"] == "active" and row["description_text"] == "edited" and row["ordered"]
+
+
+def test_bulk_upsert_repeated_id_in_batch_keeps_last(tmp_path):
+    db = tmp_path / "jobs.db"
+    with store.get_conn(db) as conn:
+        res = store.upsert_company_jobs(
+            conn, "greenhouse", "Acme", [_job("g1", title="Old"), _job("g1", title="New")])
+        assert res["new"] == 1
+        assert conn.execute("SELECT title FROM jobs WHERE external_id='g1'").fetchone()["title"] == "New"
+
+
 # ── latest jobs window ────────────────────────────────────────────────────────
 def test_latest_jobs_first_seen_window(tmp_path):
     db = tmp_path / "jobs.db"
@@ -230,3 +293,154 @@ def test_health_no_cooldown_before_threshold(tmp_path):
     store.update_source_health(db, "lever", ok=False, error="timeout", cooldown_after=3)
     store.update_source_health(db, "lever", ok=False, error="timeout", cooldown_after=3)
     assert store.sources_in_cooldown(db) == {}  # 2 < 3, no cooldown yet
+
+
+# ── content fingerprint ───────────────────────────────────────────────────────
+def test_content_fingerprint_ignores_raw_json_and_normalizes_flags():
+    from backend.scraper.normalize import content_fingerprint
+    base = _job("g1")
+    assert content_fingerprint(base) == content_fingerprint({**base, "raw_json": '{"views": 9}'})
+    assert content_fingerprint(base) == content_fingerprint({**base, "remote_flag": True})
+    assert content_fingerprint(base) != content_fingerprint({**base, "description_text": "new"})
+    assert content_fingerprint(base) != content_fingerprint({**base, "matched_searches": ["ml"]})
+
+
+def test_unchanged_sighting_only_bumps_last_seen(tmp_path):
+    db = tmp_path / "jobs.db"
+    with store.get_conn(db) as conn:
+        store.upsert_company_jobs(conn, "greenhouse", "Acme", [_job("g1", raw_json='{"v": 1}')])
+        conn.execute("UPDATE jobs SET last_seen = '2020-01-01'")
+        res = store.upsert_company_jobs(conn, "greenhouse", "Acme", [_job("g1", raw_json='{"v": 2}')])
+        row = conn.execute("SELECT raw_json, last_seen, content_hash FROM jobs").fetchone()
+    assert res["updated"] == 0
+    assert row["raw_json"] == '{"v": 1}'          # not rewritten
+    assert row["last_seen"] > "2020-01-01"
+    assert row["content_hash"]
+
+
+def test_legacy_row_without_hash_backfilled_without_counting_update(tmp_path):
+    db = tmp_path / "jobs.db"
+    with store.get_conn(db) as conn:
+        store.upsert_company_jobs(conn, "greenhouse", "Acme", [_job("g1")])
+        conn.execute("UPDATE jobs SET content_hash = NULL")
+        res = store.upsert_company_jobs(conn, "greenhouse", "Acme", [_job("g1")])
+        assert res["updated"] == 0
+        assert conn.execute("SELECT content_hash FROM jobs").fetchone()["content_hash"]
+        res = store.upsert_company_jobs(conn, "greenhouse", "Acme", [_job("g1", title="Renamed")])
+        assert res["updated"] == 1
+        assert conn.execute("SELECT title FROM jobs").fetchone()["title"] == "Renamed"
+
+
+# ── full-text job search ──────────────────────────────────────────────────────
+def _search_ids(db, **kw):
+    return [j["external_id"] for j in store.latest_jobs(db, **kw)]
+
+
+def test_fts_query_quotes_terms():
+    assert store.fts_query('"machine learning" intern*') == '"machine learning" "intern"*'
+    assert store.fts_query("OR pytorch OR jax OR") == '"pytorch" OR "jax"'
+    assert store.fts_query('title:x NEAR("a" b)') == '"title:x" "NEAR( a" "b)"'
+    assert store.fts_query("  -- ") is None
+
+
+def test_search_ranks_phrase_and_prefix(tmp_path):
+    db = tmp_path / "jobs.db"
+    with store.get_conn(db) as conn:
+        store.upsert_company_jobs(conn, "greenhouse", "Acme", [
+            _job("title", title="Robotics Intern", description_text="Perception stack."),
+            _job("desc", title="Software Intern", description_text="Some robotics exposure."),
+            _job("split", title="Learning Machine Intern", description_text="Deep nets."),
+            _job("phrase", title="Machine Learning Intern", description_text="Deep nets."),
+        ])
+    assert _search_ids(db, search="robotics") == ["title", "desc"]
+    assert _search_ids(db, search="robot*") == ["title", "desc"]
+    assert _search_ids(db, search='"machine learning"') == ["phrase"]
+    assert set(_search_ids(db, search="machine learning")) == {"phrase", "split"}
+    assert set(_search_ids(db, search="robotics OR perception")) == {"title", "desc"}
+    assert _search_ids(db, search="remote acme robotics")[0] == "title"  # location + company columns
+
+
+def test_search_keyset_pages_do_not_overlap(tmp_path):
+    db = tmp_path / "jobs.db"
+    with store.get_conn(db) as conn:
+        store.upsert_company_jobs(conn, "greenhouse", "Acme", [
+            _job(f"j{i}", description_text="pytorch " * (i + 1)) for i in range(7)
+        ])
+    cursors = {}
+    for order in ("rank", "recent"):
+        seen, cursor = [], None
+        while True:
+            page = store.latest_jobs(db, search="pytorch", order=order, limit=3, cursor=cursor)
+            seen += [j["external_id"] for j in page]
+            if len(page) < 3:
+                break
+            cursor = cursors[order] = page[-1]["cursor"]
+        assert sorted(seen) == sorted(f"j{i}" for i in range(7)) and len(seen) == 7
+    assert _search_ids(db, search="pytorch")[0] == "j6"
+    with pytest.raises(ValueError):
+        store.latest_jobs(db, search="pytorch", order="recent", cursor=cursors["rank"])
+    with pytest.raises(ValueError):
+        store.latest_jobs(db, cursor="not-a-cursor")
+
+
+def test_search_index_follows_upserts(tmp_path):
+    db = tmp_path / "jobs.db"
+    with store.get_conn(db) as conn:
+        store.upsert_company_jobs(conn, "greenhouse", "Acme", [_job("a", title="Quantum Intern")])
+        store.upsert_company_jobs(conn, "greenhouse", "Acme", [_job("a", title="Photonics Intern")])
+    assert _search_ids(db, search="photonics") == ["a"]
+    assert _search_ids(db, search="quantum") == []
+    with store.get_conn(db) as conn:
+        conn.execute("UPDATE jobs SET last_seen = ?", (store.utc_now_iso(),))
+        conn.execute("DELETE FROM jobs WHERE external_id = 'a'")
+        assert conn.execute("INSERT INTO jobs_search(jobs_search) VALUES ('integrity-check')")
+    assert _search_ids(db, search="photonics") == []
+
+
+# ── materialized stats ────────────────────────────────────────────────────────
+def test_counters_follow_every_write_path(tmp_path):
+    db = tmp_path / "jobs.db"
+    with store.get_conn(db) as conn:
+        store.upsert_company_jobs(conn, "greenhouse", "Acme", [
+            _job("a"), _job("b", location_match=0), _job("c", is_internship=0)])
+        store.upsert_company_jobs(conn, "lever", "Beta", [_job("l1", company="Beta")])
+        # b expires by absence, c gains the internship flag via hydration
+        store.upsert_company_jobs(conn, "greenhouse", "Acme", [_job("a"), _job("c", is_internship=0)])
+        store.save_job_details(conn, [{"source_ats": "greenhouse", "external_id": "c",
+                                       "description_text": "x", "detail_hash": "h",
+                                       "is_internship": 1, "location_match": 1}])
+        store.touch_company_jobs(conn, "lever", "Beta")
+        assert store.check_stats(conn) == []
+    out = store.stats(db)
+    assert {k: out[k] for k in ("total", "active", "internships", "location_matches", "companies")} == {
+        "total": 4, "active": 3, "internships": 3, "location_matches": 3, "companies": 2,
+    }
+    assert out["by_source"]["greenhouse"] == {"total": 3, "active": 2, "internships": 2, "location_matches": 2}
+    assert out["new_24h"] == 4 and out["last_seen"]
+
+
+def test_rebuild_stats_repairs_drift(tmp_path):
+    db = tmp_path / "jobs.db"
+    with store.get_conn(db) as conn:
+        store.upsert_company_jobs(conn, "greenhouse", "Acme", [_job("a"), _job("b")])
+        conn.execute("UPDATE job_counts SET active = 7")
+        assert [d["counter"] for d in store.check_stats(conn)] == ["active"]
+    assert store.rebuild_stats(db) == {"rows": 1, "drifted": 1}
+    with store.get_conn(db) as conn:
+        assert store.check_stats(conn) == []
+    assert store.stats(db)["active"] == 2
+
+
+def test_run_rollup_feeds_coverage_baselines(tmp_path):
+    db = tmp_path / "jobs.db"
+    for fetched in (100, 80):
+        rid = store.record_run_start(db, "scheduled")
+        store.record_run_end(db, rid, totals={"fetched": fetched},
+                             provider_stats={"greenhouse": {"fetched": fetched, "new": 3},
+                                             "lever": {"errors": 1}}, anomalies=[])
+    assert store.coverage_baselines(db) == {"greenhouse": 90.0}
+    assert store.coverage_baselines(db, runs=1) == {"greenhouse": 80.0}
+    with store.get_conn(db) as conn:
+        conn.execute("DELETE FROM run_source_stats")
+    store.rebuild_stats(db)
+    assert store.coverage_baselines(db) == {"greenhouse": 90.0}
@@ -0,0 +1,98 @@
+"""Tests for Workday's concurrent pagination (providers.workday).
+
+Offline: workday.http_post_json is replaced by a fake CXS endpoint that serves
+a tenant of N postings and can fail chosen offsets.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+import requests
+
+from backend.scraper.providers import workday
+from backend.scraper.providers.base import CompanyEntry
+
+ENTRY_URL = "https://acme.wd5.myworkdayjobs.com/en-US/External"
+
+
+class FakeCXS:
+    def __init__(self, total: int, *, report_total: bool = True, fail: dict[int, int] | None = None):
+        self.total = total
+        self.report_total = report_total
+        self.fail = dict(fail or {})  # offset -> failures left (-1 = always)
+        self.lock = threading.Lock()
+        self.calls: list[int] = []
+        self.active = 0
+        self.peak = 0
+
+    def __call__(self, url, body=None, **kw):
+        offset = int(body["offset"])
+        with self.lock:
+            self.calls.append(offset)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            left = self.fail.get(offset, 0)
+            if left > 0:
+                self.fail[offset] = left - 1
+        try:
+            time.sleep(0.02)
+            if left:
+                raise requests.exceptions.ConnectionError(f"offset {offset} down")
+            end = min(offset + int(body["limit"]), self.total)
+            payload = {"jobPostings": [
+                {"title": f"Role {i}", "externalPath": f"/job/{i}", "locationsText": "Remote"}
+                for i in range(offset, end)
+            ]}
+            if self.report_total and offset == 0:
+                payload["total"] = self.total
+            return payload
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+@pytest.fixture(autouse=True)
+def _no_delay(monkeypatch):
+    monkeypatch.setattr(workday, "INTER_PAGE_DELAY_S", 0.0)
+
+
+def _ids(jobs):
+    return [int(j["externalPath"].rsplit("/", 1)[-1]) for j in jobs]
+
+
+def test_pages_fetched_concurrently_and_reassembled_in_order(monkeypatch):
+    cxs = FakeCXS(total=195)
+    monkeypatch.setattr(workday, "http_post_json", cxs)
+    jobs = workday.fetch(CompanyEntry(careers_url=ENTRY_URL))
+    assert _ids(jobs) == list(range(195))
+    assert sorted(cxs.calls) == [p * workday.PAGE_SIZE for p in range(10)]
+    assert 1 < cxs.peak <= workday.PAGE_CONCURRENCY
+
+
+def test_failed_page_is_retried_and_lost_page_leaves_the_rest(monkeypatch):
+    size = workday.PAGE_SIZE
+    cxs = FakeCXS(total=100, fail={2 * size: 1, 3 * size: -1})
+    monkeypatch.setattr(workday, "http_post_json", cxs)
+    jobs = workday.fetch(CompanyEntry(careers_url=ENTRY_URL))
+    expected = [i for i in range(100) if not 3 * size <= i < 4 * size]
+    assert _ids(jobs) == expected
+    assert cxs.calls.count(2 * size) == 2
+    assert cxs.calls.count(3 * size) == 1 + workday.PAGE_RETRY_PASSES
+
+
+def test_max_pages_caps_known_total(monkeypatch):
+    cxs = FakeCXS(total=500)
+    monkeypatch.setattr(workday, "http_post_json", cxs)
+    jobs = workday.fetch(CompanyEntry(careers_url=ENTRY_URL, max_pages=3))
+    assert _ids(jobs) == list(range(3 * workday.PAGE_SIZE))
+
+
+def test_without_total_walks_sequentially_until_short_page(monkeypatch):
+    cxs = FakeCXS(total=45, report_total=False)
+    monkeypatch.setattr(workday, "http_post_json", cxs)
+    jobs = workday.fetch(CompanyEntry(careers_url=ENTRY_URL))
+    assert _ids(jobs) == list(range(45))
+    assert cxs.calls == [0, 20, 40] and cxs.peak == 1
@@ -0,0 +1,189 @@
+"""Shared SQLite access layer — pooled, WAL-mode connections for every store.
+
+Every store (jobs.db, knowledge.db, matches.db, tracker.db, reviews.db) used to
+open a brand-new connection per call and re-run its schema DDL on connect. This
+module gives them one access path instead:
+
+- **Per-thread pools per database file.** sqlite3 connections are not safe to
+  share across threads, so each thread keeps a small idle list per resolved
+  path. A checkout pops an idle connection (or opens one); the context exit
+  commits (rolls back on error) and returns it. Nested checkouts in the same
+  thread get a second connection, so an inner commit never flushes an outer
+  transaction.
+- **Tuned pragmas on open.** journal_mode=WAL (readers stop blocking on the
+  writer), synchronous=NORMAL (durable at checkpoints, safe under WAL),
+  a larger page cache, mmap reads, and a busy timeout instead of instant
+  "database is locked" errors.
+- **Migrations exactly once.** The store that owns a file registers one
+  ``Schema`` (name, version, migrate callable). Opening a physical connection
+  compares ``PRAGMA user_version`` with the schema version; the migration only
+  runs when the stamp is behind, then the stamp is bumped — so a database is
+  migrated once, not once per query or per process. Pooled checkouts skip even
+  that read. Bump ``version`` whenever the migrate callable gains a step.
+- **Per-connection setup.** ``Schema.on_connect`` runs once per new physical
+  connection (e.g. ``PRAGMA foreign_keys``, loading sqlite-vec), and
+  ``ensure_once`` lets a secondary module (one that shares a file it does not
+  own) run its idempotent DDL once per pooled connection rather than per call.
+
+Usage::
+
+    _SCHEMA = sqlite_pool.Schema("tracker", 1, _migrate)
+
+    with sqlite_pool.connection(path, _SCHEMA) as conn:
+        conn.execute(...)
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator
+
+# Pragmas applied to every new connection. cache_size is negative => KiB.
+SYNCHRONOUS = os.getenv("SMARTAPPLY_SQLITE_SYNCHRONOUS", "NORMAL")
+CACHE_SIZE_KIB = int(os.getenv("SMARTAPPLY_SQLITE_CACHE_KIB", "16384"))
+MMAP_SIZE = int(os.getenv("SMARTAPPLY_SQLITE_MMAP_BYTES", str(256 * 1024 * 1024)))
+BUSY_TIMEOUT_MS = 5000
+# Idle connections kept per (thread, file); extras are closed on return.
+MAX_IDLE_PER_THREAD = 4
+
+
+@dataclass(frozen=True, slots=True)
+class Schema:
+    """A store's schema: ``migrate`` must be idempotent (CREATE IF NOT EXISTS,
+    guarded ALTERs) because it also runs against databases created before the
+    user_version stamp existed."""
+
+    name: str
+    version: int
+    migrate: Callable[[sqlite3.Connection], None]
+    on_connect: Callable[[sqlite3.Connection], None] | None = None
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3.Connection that can carry per-connection setup markers."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.prepared: set[str] = set()
+
+
+_local = threading.local()
+_migrated: set[tuple[str, str]] = set()
+_migrate_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = {"opened": 0, "reused": 0, "migrations": 0}
+
+
+def _resolve(path: str | Path) -> str:
+    return str(Path(path).resolve())
+
+
+def _idle(key: str) -> list[PooledConnection]:
+    pools = getattr(_local, "pools", None)
+    if pools is None:
+        pools = _local.pools = {}
+    return pools.setdefault(key, [])
+
+
+def _bump(counter: str) -> None:
+    with _stats_lock:
+        _stats[counter] += 1
+
+
+def _open(key: str, schema: Schema | None) -> PooledConnection:
+    Path(key).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(key, timeout=BUSY_TIMEOUT_MS / 1000.0, factory=PooledConnection)
+    conn.row_factory = sqlite3.Row
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute(f"PRAGMA synchronous = {SYNCHRONOUS}")
+    conn.execute(f"PRAGMA cache_size = {-abs(CACHE_SIZE_KIB)}")
+    conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    if schema is not None:
+        if schema.on_connect is not None:
+            schema.on_connect(conn)
+        # A new physical connection always re-reads the stamp, so a database
+        # file that was deleted and recreated at the same path is migrated again.
+        _ensure_migrated(conn, key, schema, check_stamp=True)
+    _bump("opened")
+    return conn
+
+
+def _ensure_migrated(
+    conn: sqlite3.Connection, key: str, schema: Schema, *, check_stamp: bool = False
+) -> None:
+    memo = (key, schema.name)
+    if memo in _migrated and not check_stamp:
+        return
+    with _migrate_lock:
+        current = int(conn.execute("PRAGMA user_version").fetchone()[0])
+        if current < schema.version:
+            schema.migrate(conn)
+            conn.execute(f"PRAGMA user_version = {int(schema.version)}")
+            conn.commit()
+            _bump("migrations")
+        _migrated.add(memo)
+
+
+@contextmanager
+def connection(path: str | Path, schema: Schema | None = None) -> Iterator[sqlite3.Connection]:
+    """Check out a pooled connection to ``path``; commit on success, roll back
+    on error, and return it to this thread's pool."""
+    key = _resolve(path)
+    idle = _idle(key)
+    if idle:
+        conn = idle.pop()
+        _bump("reused")
+    else:
+        conn = _open(key, schema)
+    if schema is not None and (key, schema.name) not in _migrated:
+        # The file was opened earlier without this schema (or the memo was reset).
+        _ensure_migrated(conn, key, schema)
+    try:
+        yield conn
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        if len(idle) < MAX_IDLE_PER_THREAD:
+            idle.append(conn)
+        else:
+            conn.close()
+
+
+def ensure_once(conn: sqlite3.Connection, name: str, setup: Callable[[sqlite3.Connection], None]) -> None:
+    """Run ``setup(conn)`` once per physical connection (always, for a plain
+    sqlite3.Connection that did not come from this pool)."""
+    prepared = getattr(conn, "prepared", None)
+    if prepared is not None and name in prepared:
+        return
+    setup(conn)
+    if prepared is not None:
+        prepared.add(name)
+
+
+def stats() -> dict[str, int]:
+    """Process-wide counters: connections opened vs reused, migrations run."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def close_all() -> None:
+    """Close this thread's idle connections and forget migration memos (tests,
+    shutdown, or after a database file was replaced). Other threads' pools are
+    left alone — sqlite3 forbids closing a connection from a foreign thread."""
+    pools = getattr(_local, "pools", None)
+    if pools is not None:
+        for idle in pools.values():
+            for conn in idle:
+                conn.close()
+        pools.clear()
+    with _migrate_lock:
+        _migrated.clear()
@@ -12,6 +12,11 @@ import copy
 import re
 from typing import Any, Callable
 
+try:
+    from scoring import batched_search
+except ImportError:  # pragma: no cover - package-style import
+    from backend.scoring import batched_search
+
 STATUSES = {"proposed", "needs_your_call", "accepted", "rejected"}
 STRETCH_LEVELS = {"grounded", "stretch", "fabrication"}
 
@@ -200,6 +205,29 @@ def _claim_terms_for_edit(
     return jd_claims or meaningful
 
 
+def _evidence_query(
+    edit: dict[str, Any],
+    jd_text: str,
+    origin_ref: str | None,
+    profile_terms: set[str] | None,
+) -> tuple[set[str], str | None]:
+    """(claim terms, knowledge query) for a validated edit; query is None when
+    the edit is a self-evidenced rewrite that needs no retrieval."""
+    before, after = edit.get("before", ""), edit.get("after", "")
+    claim_terms = _claim_terms_for_edit(before, after, jd_text, profile_terms)
+    if not claim_terms and before.strip() and origin_ref:
+        return claim_terms, None
+    added_terms = _new_terms(before, after)
+    query = " ".join(
+        [
+            edit.get("field", ""),
+            after[:220],
+            " ".join(sorted(claim_terms or added_terms)[:12]),
+        ]
+    ).strip()
+    return claim_terms, query
+
+
 def ground_edit(
     edit: dict[str, Any],
     *,
@@ -217,12 +245,9 @@ def ground_edit(
     evidence is a stretch (Keep / Soften / Drop).
     """
     out = copy.deepcopy(validate_edit_object(edit))
-    claim_terms = _claim_terms_for_edit(
-        out.get("before", ""), out.get("after", ""), jd_text, profile_terms,
-    )
-    added_terms = _new_terms(out.get("before", ""), out.get("after", ""))
+    claim_terms, query = _evidence_query(out, jd_text, origin_ref, profile_terms)
 
-    if not claim_terms and out.get("before", "").strip() and origin_ref:
+    if query is None:
         # Pure rewrite/reorder of the candidate's own text: self-evidenced.
         out["evidence_ref"] = origin_ref
         out["status"] = "accepted"
@@ -232,13 +257,6 @@ def ground_edit(
         out.pop("stretch_reason", None)
         return out
 
-    query = " ".join(
-        [
-            out.get("field", ""),
-            out.get("after", "")[:220],
-            " ".join(sorted(claim_terms or added_terms)[:12]),
-        ]
-    ).strip()
     evidence_ref = _pick_evidence_ref(pid, query, claim_terms, knowledge_search)
     out["evidence_ref"] = evidence_ref
 
@@ -275,6 +293,40 @@ def ground_edit(
     return out
 
 
+def ground_edits(
+    edits: list[dict[str, Any]],
+    *,
+    pid: str,
+    jd_text: str,
+    knowledge_search: Callable[[str, str, int], list[dict[str, Any]]],
+    knowledge_search_many: Callable[[str, list[str], int], list[list[dict[str, Any]]]] | None = None,
+    profile_terms: set[str] | None = None,
+) -> list[dict[str, Any]]:
+    """ground_edit over a batch. Each edit's ``_origin_ref`` (if any) is popped
+    and used as its origin; all evidence queries go out in one batched lookup."""
+    prepared: list[tuple[dict[str, Any], str | None]] = []
+    queries: list[str] = []
+    for edit in edits:
+        edit = dict(edit)
+        origin_ref = edit.pop("_origin_ref", None)
+        prepared.append((edit, origin_ref))
+        _, query = _evidence_query(validate_edit_object(edit), jd_text, origin_ref, profile_terms)
+        if query:
+            queries.append(query)
+    search = batched_search(pid, queries, 5, knowledge_search, knowledge_search_many)
+    return [
+        ground_edit(
+            edit,
+            pid=pid,
+            jd_text=jd_text,
+            knowledge_search=search,
+            origin_ref=origin_ref,
+            profile_terms=profile_terms,
+        )
+        for edit, origin_ref in prepared
+    ]
+
+
 def soften_edit_text(
     edit: dict[str, Any],
     *,
@@ -4,7 +4,14 @@ from __future__ import annotations
 
 import os
 import sqlite3
+from contextlib import contextmanager
 from datetime import date, datetime, timezone
+from typing import Iterator
+
+try:
+    from backend import sqlite_pool
+except ImportError:  # pragma: no cover - backend/ on sys.path
+    import sqlite_pool  # type: ignore
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "reviews.db")
 
@@ -13,11 +20,10 @@ def _utc_now() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
-def _connect() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    _ensure_schema(conn)
-    return conn
+@contextmanager
+def _connect() -> Iterator[sqlite3.Connection]:
+    with sqlite_pool.connection(DB_PATH, _SCHEMA) as conn:
+        yield conn
 
 
 def _ensure_schema(conn: sqlite3.Connection) -> None:
@@ -42,6 +48,9 @@ def _ensure_schema(conn: sqlite3.Connection) -> None:
     conn.commit()
 
 
+_SCHEMA = sqlite_pool.Schema("reviews", 1, _ensure_schema)
+
+
 def get_state(pid: str, skill: str) -> dict | None:
     with _connect() as conn:
         row = conn.execute(
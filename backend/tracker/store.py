@@ -8,6 +8,7 @@ laptop→VM by config. Rows carry a link to the exact resume artifact
 
 from __future__ import annotations
 
+from contextlib import contextmanager
 from datetime import datetime, timezone
 import json
 import os
@@ -15,7 +16,12 @@ import re
 import sqlite3
 import uuid
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
+
+try:
+    from backend import sqlite_pool
+except ImportError:  # pragma: no cover - backend/ on sys.path
+    import sqlite_pool  # type: ignore
 
 try:
     from .config import ALL_STATUSES, CALLBACK_STATUSES, STATUS_APPLIED, STATUS_APPROVED
@@ -71,12 +77,11 @@ _APP_COLUMNS: tuple[tuple[str, str], ...] = (
 )
 
 
-def _connect(path: str | Path | None = None) -> sqlite3.Connection:
-    db_path = Path(path or default_db_path())
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(db_path))
-    conn.row_factory = sqlite3.Row
+def _foreign_keys_on(conn: sqlite3.Connection) -> None:
     conn.execute("PRAGMA foreign_keys = ON")
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
     conn.execute(
         """
         CREATE TABLE IF NOT EXISTS applications (
@@ -128,7 +133,16 @@ def _connect(path: str | Path | None = None) -> sqlite3.Connection:
     conn.execute(
         "CREATE INDEX IF NOT EXISTS idx_apps_company ON applications(profile_id, company_norm)"
     )
-    return conn
+
+
+# Bump the version whenever _migrate gains a step so stamped databases re-run it.
+_SCHEMA = sqlite_pool.Schema("tracker", 1, _migrate, on_connect=_foreign_keys_on)
+
+
+@contextmanager
+def _connect(path: str | Path | None = None) -> Iterator[sqlite3.Connection]:
+    with sqlite_pool.connection(path or default_db_path(), _SCHEMA) as conn:
+        yield conn
 
 
 # ── serialization ─────────────────────────────────────────────────────────────
@@ -0,0 +1,15 @@
+"""Offline throughput/latency benchmarks for the matcher, scraper and tailoring hot paths.
+
+Everything runs against deterministic synthetic fixtures (``benchmarks.fixtures``):
+a jobs.db with thousands of postings, a candidate profile, a hash-seeded fake
+embedder and a canned LLM stand-in — no network, no model download, no Ollama.
+
+    python -m benchmarks                          # run all cases, print JSON
+    python -m benchmarks --only matcher.          # name-prefix filter
+    python -m benchmarks --compare                # diff against benchmarks/baseline.json
+    python -m benchmarks --save-baseline          # overwrite the stored baseline
+
+``--compare`` exits 1 when any case's median regresses past ``--tolerance``
+(default 1.25× the baseline median). Baselines are machine-specific: record one
+on the box you compare on.
+"""
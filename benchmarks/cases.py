@@ -0,0 +1,275 @@
+"""Benchmark cases — one per hot path.
+
+A case is a function ``(ctx) -> Timed``; everything it does before returning
+is untimed setup. ``Timed.run`` is the measured call and ``Timed.before`` (if
+set) resets state before every repetition without being timed, and
+``Timed.cleanup`` undoes any patching once the case is done.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+import shutil
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+from unittest import mock
+
+import numpy as np
+
+from . import fixtures
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+FILTERS_PATH = REPO_ROOT / "backend" / "scraper" / "filters.yaml"
+
+
+@dataclass(slots=True)
+class Context:
+    workdir: Path
+    jobs: int
+    seed: int
+    _cache: dict[str, Any] = field(default_factory=dict)
+
+    def memo(self, key: str, build: Callable[[], Any]) -> Any:
+        if key not in self._cache:
+            self._cache[key] = build()
+        return self._cache[key]
+
+    # ── shared fixtures (built once per run, outside any timing) ─────────
+    def raw_jobs(self) -> list[tuple[str, dict[str, Any]]]:
+        return self.memo("raw_jobs", lambda: fixtures.make_raw_jobs(self.jobs, seed=self.seed))
+
+    def normalized_jobs(self) -> list[dict[str, Any]]:
+        return self.memo("normalized", lambda: fixtures.normalize_all(self.raw_jobs()))
+
+    def jobs_db(self) -> Path:
+        def build() -> Path:
+            path = self.workdir / "jobs.db"
+            fixtures.write_jobs_db(path, self.normalized_jobs())
+            return path
+        return self.memo("jobs_db", build)
+
+    def ontology(self) -> dict[str, Any]:
+        from backend.matcher.ontology import load_ontology
+        return self.memo("ontology", load_ontology)
+
+    def survivors(self) -> list[dict[str, Any]]:
+        from backend.matcher.prefilter import prefilter_jobs
+        return self.memo("survivors", lambda: prefilter_jobs(self.jobs_db(), "both", FILTERS_PATH))
+
+    def features_db(self) -> Path:
+        def build() -> Path:
+            from backend.matcher.features import ensure_job_features
+            path = self.workdir / "features.db"
+            ensure_job_features(self.survivors(), path, ontology=self.ontology(), embed_fn=fixtures.fake_embed)
+            return path
+        return self.memo("features_db", build)
+
+    def candidate(self) -> dict[str, Any]:
+        def build() -> dict[str, Any]:
+            from backend.matcher.ontology import map_text_to_skills
+            profile = fixtures.PROFILE
+            bullets = [b for exp in profile["experience"] for b in exp["details"]]
+            skills_text = " ".join(s for items in profile["skills"].values() for s in items)
+            text = " ".join([profile["summary"], skills_text, *bullets])
+            vectors = np.asarray(fixtures.fake_embed([profile["summary"], *bullets]), dtype=np.float32)
+            return {
+                "skills": map_text_to_skills(text, self.ontology()),
+                "domains": ["ml", "nlp"],
+                "target_level": "intern",
+                "profile_embedding": vectors[0],
+                "experience_embeddings": list(vectors[1:]),
+                "query_terms": ["python", "machine learning", "pytorch", "rag"],
+            }
+        return self.memo("candidate", build)
+
+
+@dataclass(slots=True)
+class Timed:
+    run: Callable[[], Any]
+    items: int = 1
+    before: Callable[[], Any] | None = None
+    repeat: int | None = None
+    notes: str = ""
+    cleanup: Callable[[], Any] | None = None
+
+
+CASES: dict[str, Callable[[Context], Timed]] = {}
+
+
+def case(name: str) -> Callable[[Callable[[Context], Timed]], Callable[[Context], Timed]]:
+    def register(fn: Callable[[Context], Timed]) -> Callable[[Context], Timed]:
+        CASES[name] = fn
+        return fn
+    return register
+
+
+def _remove_db(path: Path) -> None:
+    try:
+        from backend import sqlite_pool
+        sqlite_pool.close_all()
+    except ImportError:  # pragma: no cover
+        pass
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{path}{suffix}").unlink(missing_ok=True)
+
+
+# ── matcher ──────────────────────────────────────────────────────────────────
+@case("matcher.prefilter_jobs")
+def bench_prefilter(ctx: Context) -> Timed:
+    from backend.matcher.prefilter import prefilter_jobs
+    db = ctx.jobs_db()
+    return Timed(lambda: prefilter_jobs(db, "both", FILTERS_PATH), items=ctx.jobs)
+
+
+@case("matcher.ensure_job_features.cold")
+def bench_features_cold(ctx: Context) -> Timed:
+    from backend.matcher.features import ensure_job_features
+    jobs, ontology = ctx.survivors(), ctx.ontology()
+    db = ctx.workdir / "features_cold.db"
+    return Timed(
+        lambda: ensure_job_features(jobs, db, ontology=ontology, embed_fn=fixtures.fake_embed),
+        items=len(jobs), before=lambda: _remove_db(db), repeat=3,
+    )
+
+
+@case("matcher.ensure_job_features.warm")
+def bench_features_warm(ctx: Context) -> Timed:
+    from backend.matcher.features import ensure_job_features
+    jobs, ontology, db = ctx.survivors(), ctx.ontology(), ctx.features_db()
+    return Timed(
+        lambda: ensure_job_features(jobs, db, ontology=ontology, embed_fn=fixtures.fake_embed),
+        items=len(jobs), notes="every job unchanged — reuse path",
+    )
+
+
+@case("matcher.map_text_to_skills")
+def bench_map_text_to_skills(ctx: Context) -> Timed:
+    from backend.matcher.ontology import map_text_to_skills
+    jobs, ontology = ctx.normalized_jobs(), ctx.ontology()
+    texts = [(job["description_text"], job["title"]) for job in jobs]
+
+    def run() -> None:
+        for text, title in texts:
+            map_text_to_skills(text, ontology, title=title)
+
+    return Timed(run, items=len(texts), repeat=3)
+
+
+@case("matcher.score_jobs_hybrid")
+def bench_score_jobs_hybrid(ctx: Context) -> Timed:
+    from backend.matcher.hybrid import score_jobs_hybrid
+    jobs, db, candidate, ontology = ctx.survivors(), ctx.features_db(), ctx.candidate(), ctx.ontology()
+    return Timed(
+        lambda: score_jobs_hybrid(candidate, jobs, db, ontology=ontology, explain_top=25),
+        items=len(jobs),
+    )
+
+
+# ── scraper ──────────────────────────────────────────────────────────────────
+@case("scraper.normalize_job")
+def bench_normalize_job(ctx: Context) -> Timed:
+    raw = ctx.raw_jobs()
+    return Timed(lambda: fixtures.normalize_all(raw), items=len(raw))
+
+
+def _upsert_all(db: Path, groups: dict[str, list[dict[str, Any]]]) -> None:
+    from backend.scraper import store as scraper_store
+    with scraper_store.get_conn(db) as conn:
+        for company, jobs in groups.items():
+            scraper_store.upsert_company_jobs(conn, "greenhouse", company, jobs)
+
+
+@case("scraper.upsert_company_jobs.insert")
+def bench_upsert_insert(ctx: Context) -> Timed:
+    groups = fixtures.group_by_company(ctx.normalized_jobs())
+    db = ctx.workdir / "upsert_insert.db"
+    return Timed(lambda: _upsert_all(db, groups), items=ctx.jobs, before=lambda: _remove_db(db), repeat=3)
+
+
+@case("scraper.upsert_company_jobs.unchanged")
+def bench_upsert_unchanged(ctx: Context) -> Timed:
+    groups = fixtures.group_by_company(ctx.normalized_jobs())
+    db = ctx.workdir / "upsert_unchanged.db"
+    _upsert_all(db, groups)
+    return Timed(lambda: _upsert_all(db, groups), items=ctx.jobs, notes="re-upsert of an identical sweep")
+
+
+# ── tailoring ────────────────────────────────────────────────────────────────
+@case("llm.clean_json")
+def bench_clean_json(ctx: Context) -> Timed:
+    from backend.llm_provider import clean_json
+    samples = fixtures.CLEAN_JSON_SAMPLES * 200
+
+    def run() -> None:
+        for raw in samples:
+            clean_json(raw)
+
+    return Timed(run, items=len(samples))
+
+
+def _import_main():
+    """main.py uses top-level imports (``import scoring``), so load it the way
+    uvicorn does — with backend/ on sys.path."""
+    import sys
+    backend_dir = str(REPO_ROOT / "backend")
+    if backend_dir not in sys.path:
+        sys.path.insert(0, backend_dir)
+    import main
+    return main
+
+
+@case("tailoring.run_tailoring")
+def bench_run_tailoring(ctx: Context) -> Timed:
+    main = _import_main()
+    import scoring
+
+    patches = contextlib.ExitStack()
+    patches.enter_context(mock.patch.object(main, "call_llm", fixtures.fake_llm))
+    patches.enter_context(mock.patch.object(scoring, "call_llm", fixtures.fake_llm))
+    patches.enter_context(mock.patch.object(main, "load_pdata", lambda pid: fixtures.PROFILE))
+    patches.enter_context(mock.patch.object(
+        main.knowledge_semantic, "search", lambda pid, q, k=10, kind_filter=None: []))
+    patches.enter_context(mock.patch.object(
+        main.knowledge_semantic, "search_many", lambda pid, qs, k=10, kind_filter=None: [[] for _ in qs]))
+
+    def run() -> dict:
+        return asyncio.run(main.run_tailoring("bench", fixtures.JD_TEXT, role="ML Engineer Intern",
+                                              company="Company000", llm="ollama"))
+
+    return Timed(run, repeat=10, cleanup=patches.close,
+                 notes="LLM + knowledge search stubbed; measures pipeline overhead")
+
+
+@case("pdf.compile_with_retry")
+def bench_compile_with_retry(ctx: Context) -> Timed:
+    main = _import_main()
+    import compile_loop
+
+    tex = main._render_tex_from_master(fixtures.PROFILE)
+    workdir = ctx.workdir / "pdf"
+    workdir.mkdir(exist_ok=True)
+    notes = "real pdflatex"
+    patches = contextlib.ExitStack()
+    if not (compile_loop.PDFLATEX_BIN and os.path.exists(compile_loop.PDFLATEX_BIN)):
+        # No TeX here: a stand-in reports two pages until two bullets have been
+        # trimmed, which still drives the trim-and-recompile loop on the real
+        # rendered source.
+        full_bullets = tex.count("\\resumeItem{")
+
+        def fake_compile(tex_content, work_dir, name="tailored_resume", timeout=None):
+            result = compile_loop.CompileResult()
+            result.success = True
+            result.page_count = 2 if tex_content.count("\\resumeItem{") > full_bullets - 2 else 1
+            result.pdf_path = os.path.join(work_dir, f"{name}.pdf")
+            result.pdf_bytes = b"%PDF-1.4 bench"
+            return result
+
+        patches.enter_context(mock.patch.object(compile_loop, "compile_pdf", fake_compile))
+        notes = "pdflatex not found — compile_pdf stubbed (trim loop only)"
+
+    return Timed(lambda: compile_loop.compile_with_retry(tex, str(workdir)),
+                 before=lambda: shutil.rmtree(workdir, ignore_errors=True) or workdir.mkdir(),
+                 repeat=5, notes=notes, cleanup=patches.close)
@@ -0,0 +1,227 @@
+"""Deterministic synthetic fixtures for the benchmark runner.
+
+Same seed → byte-identical jobs, profile and embeddings, so two runs (or two
+machines) time the same work. Nothing here touches the network or a model.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from backend.scraper import store as scraper_store
+from backend.scraper.normalize import normalize_job
+
+EMBED_DIM = 384  # all-MiniLM-L6-v2, the production embedder's width
+
+_SKILL_PHRASES = [
+    "Python", "SQL", "Java", "Go", "TypeScript", "C++", "machine learning",
+    "deep learning", "PyTorch", "TensorFlow", "scikit-learn", "LangChain",
+    "large language models", "RAG pipelines", "NLP", "computer vision",
+    "Kubernetes", "Docker", "AWS", "GCP", "Azure", "Spark", "Airflow",
+    "data pipelines", "REST APIs", "microservices", "statistics", "A/B testing",
+    "feature engineering", "MLOps", "vector databases", "FastAPI", "React",
+    "distributed systems", "CI/CD", "Terraform", "Pandas", "NumPy",
+]
+_TITLES = [
+    "Machine Learning Engineer", "Data Scientist", "Software Engineer",
+    "AI Research Engineer", "Backend Engineer", "Data Engineer",
+    "Applied Scientist", "NLP Engineer", "Platform Engineer", "MLOps Engineer",
+]
+_TITLE_PREFIXES = ["", "", "", "Senior ", "Staff ", "Junior "]
+_TITLE_SUFFIXES = ["", "", " Intern", " Intern (Summer 2026)", " II", " - Co-op"]
+_LOCATIONS = [
+    "Remote - United States", "Seattle, WA", "San Francisco, CA", "Austin, TX",
+    "Houston, TX", "New York, NY", "London, UK", "Bangalore, India", "Toronto, Canada",
+]
+_BOILERPLATE = (
+    "We are an equal opportunity employer and value diversity at our company. "
+    "Our team builds products used by millions of customers worldwide. "
+)
+_SPONSORSHIP = "Applicants must be U.S. citizens; no sponsorship is available. "
+
+
+def _rng(seed: int, salt: str) -> random.Random:
+    return random.Random(f"{seed}:{salt}")
+
+
+def company_names(count: int) -> list[str]:
+    return [f"Company{idx:03d}" for idx in range(count)]
+
+
+def make_raw_jobs(n: int, *, seed: int = 7, companies: int = 60) -> list[tuple[str, dict[str, Any]]]:
+    """``n`` Greenhouse-shaped raw postings as (board token, raw job) pairs."""
+    rng = _rng(seed, "jobs")
+    names = company_names(companies)
+    out: list[tuple[str, dict[str, Any]]] = []
+    for idx in range(n):
+        company = names[idx % companies]
+        title = rng.choice(_TITLE_PREFIXES) + rng.choice(_TITLES) + rng.choice(_TITLE_SUFFIXES)
+        required = rng.sample(_SKILL_PHRASES, 5)
+        preferred = rng.sample(_SKILL_PHRASES, 4)
+        paragraphs = [
+            f"<p>{_BOILERPLATE * rng.randint(1, 3)}</p>",
+            f"<p>As a {title} you will own {', '.join(required[:3])} work end to end.</p>",
+            "<h3>Requirements:</h3><ul>"
+            + "".join(f"<li>Experience with {skill}.</li>" for skill in required)
+            + "</ul>",
+            "<h3>Preferred:</h3><ul>"
+            + "".join(f"<li>Familiarity with {skill}.</li>" for skill in preferred)
+            + "</ul>",
+        ]
+        if rng.random() < 0.08:
+            paragraphs.append(f"<p>{_SPONSORSHIP}</p>")
+        out.append((company.lower(), {
+            "id": 100000 + idx,
+            "title": title,
+            "company_name": company,
+            "location": {"name": rng.choice(_LOCATIONS)},
+            "departments": [{"name": "Engineering"}],
+            "content": "".join(paragraphs),
+            "absolute_url": f"https://boards.example.com/{company.lower()}/jobs/{100000 + idx}",
+            "first_published": f"2026-0{1 + idx % 9}-{1 + idx % 28:02d}T00:00:00Z",
+            "updated_at": "2026-09-01T00:00:00Z",
+        }))
+    return out
+
+
+def normalize_all(raw_jobs: list[tuple[str, dict[str, Any]]]) -> list[dict[str, Any]]:
+    return [normalize_job("greenhouse", token, raw) for token, raw in raw_jobs]
+
+
+def group_by_company(normalized: list[dict[str, Any]]) -> dict[str, list[dict[str, Any]]]:
+    groups: dict[str, list[dict[str, Any]]] = {}
+    for job in normalized:
+        groups.setdefault(job["company"], []).append(job)
+    return groups
+
+
+def write_jobs_db(path: str | Path, normalized: list[dict[str, Any]]) -> None:
+    """Populate a jobs.db exactly the way a scraper run would."""
+    with scraper_store.get_conn(path) as conn:
+        for company, jobs in group_by_company(normalized).items():
+            scraper_store.upsert_company_jobs(conn, "greenhouse", company, jobs)
+
+
+def fake_embed(texts: list[str], dim: int = EMBED_DIM) -> list[list[float]]:
+    """Hash-seeded unit vectors: deterministic, and as wide as the real model."""
+    out = []
+    for text in texts:
+        seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big")
+        vec = np.random.default_rng(seed).standard_normal(dim)
+        out.append((vec / np.linalg.norm(vec)).tolist())
+    return out
+
+
+PROFILE: dict[str, Any] = {
+    "contact_info": {"name": "Bench Candidate", "email": "bench@example.com"},
+    "summary": "ML engineer building production LLM and RAG systems in Python.",
+    "education": [{
+        "degree": "M.S. in Data Science",
+        "university": "State University",
+        "graduation_date": "Expected 2027",
+        "details": "Machine learning, NLP, distributed systems.",
+    }],
+    "experience": [
+        {
+            "role": "AI Engineer",
+            "company": "Example Corp",
+            "duration": "Aug 2023 - Aug 2025",
+            "location": "Remote",
+            "details": [
+                "Built RAG pipelines with LangChain and FastAPI serving 2k daily users.",
+                "Shipped PyTorch ranking models behind REST APIs on Docker.",
+                "Automated data pipelines in Airflow and SQL for model retraining.",
+                "Cut LLM inference cost 40% by caching prompts and batching embedding calls.",
+                "Led evaluation of retrieval quality with offline relevance judgments and dashboards.",
+                "Mentored four engineers on testing practices for ML services.",
+            ],
+        },
+        {
+            "role": "Data Science Intern",
+            "company": "Sample Labs",
+            "duration": "May 2022 - Aug 2022",
+            "location": "Seattle, WA",
+            "details": [
+                "Ran A/B testing analysis in Pandas and statistics tooling.",
+                "Prototyped computer vision models in TensorFlow.",
+            ],
+        },
+    ],
+    "projects": [
+        {"title": "Semantic Job Matcher", "tech_stack": ["Python", "NumPy", "SQLite"],
+         "description": "Hybrid BM25 + embedding ranking over scraped postings."},
+        {"title": "Resume Tailor", "tech_stack": ["FastAPI", "LangChain"],
+         "description": "Evidence-grounded resume rewriting with LLMs."},
+    ],
+    "skills": {
+        "languages": ["Python", "SQL", "Java"],
+        "frameworks": ["PyTorch", "TensorFlow", "LangChain", "FastAPI", "scikit-learn"],
+        "tools": ["Docker", "Git", "Airflow", "Kubernetes"],
+    },
+    "publications": [],
+    "certifications": [{"name": "AWS Machine Learning Specialty", "issuer": "AWS", "date": "2025"}],
+    "awards": [],
+    "leadership": [],
+    "research_interests": ["Large Language Models", "Information Retrieval"],
+    "autofill": {"current_title": "AI Engineer"},
+    "common_answers": {},
+}
+
+JD_TEXT = (
+    "Machine Learning Engineer Intern. Requirements: Python, PyTorch, SQL and "
+    "experience shipping RAG pipelines with LangChain. Preferred: Kubernetes, "
+    "AWS, MLOps and A/B testing. You will build retrieval and ranking systems."
+)
+
+
+def fake_llm(messages, temperature=0.3, system="", prefer="ollama", timeout=600, model=None, **kwargs) -> str:
+    """Canned replies shaped like the real prompts' expected JSON."""
+    prompt = messages[-1]["content"]
+    if '"dimensions"' in prompt:
+        return json.dumps({"dimensions": {
+            "technical_skills": {"score": 82, "note": "Python PyTorch RAG"},
+            "experience_match": {"score": 78, "note": "applied ML"},
+            "education_fit": {"score": 80, "note": "relevant"},
+            "career_alignment": {"score": 85, "note": "intern target"},
+        }, "location": "PASS", "work_auth": "PASS"})
+    if '"tailored_summary"' in prompt and "SOURCE SUMMARY" in prompt:
+        summary = "ML engineer shipping production RAG pipelines in Python with PyTorch and LangChain."
+        return json.dumps({
+            "tailored_summary": summary,
+            "summary_diff": {"original": PROFILE["summary"], "tailored": summary},
+            "keywords_inserted": ["PyTorch"],
+            "score_estimate": 88,
+        })
+    if "EXPERIENCE ENTRY TO EDIT" in prompt:
+        exp = PROFILE["experience"][0]
+        return json.dumps({
+            "experience": [{
+                "company": exp["company"],
+                "title": exp["role"],
+                "dates": exp["duration"],
+                "bullets": [
+                    {"text": "Built production RAG pipelines with LangChain and FastAPI serving 2k daily users.",
+                     "status": "edited", "original": exp["details"][0]},
+                    {"text": exp["details"][1], "status": "kept", "original": exp["details"][1]},
+                ],
+            }],
+            "keywords_inserted": ["RAG"],
+        })
+    return json.dumps({})
+
+
+# LLM outputs in the shapes clean_json has to recover from.
+CLEAN_JSON_SAMPLES = [
+    '{"role": "ML Engineer", "must_have_skills": [{"skill": "Python", "matched": true}]}',
+    'Sure! Here is the JSON:\n```json\n{"score": 82, "gaps": ["AWS", "Kubernetes"]}\n```\nLet me know!',
+    "```\n[{\"item\": 1, \"verdict\": \"equivalent\"}, {\"item\": 2, \"verdict\": \"gap\"}]\n```",
+    'Analysis follows. {"tailored_summary": "x", "keywords_inserted": ["a", "b"], "score_estimate": 91} Done.',
+    '{"experience": [{"company": "A", "bullets": [{"text": "t", "status": "edited"}]}], "keywords_inserted": []}',
+    '```json\n{"a": 1, "b":\n```',  # truncated — recovery must fail cleanly
+]
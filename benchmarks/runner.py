@@ -0,0 +1,173 @@
+"""Benchmark runner: time each case, emit JSON, compare against a stored baseline."""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from .cases import CASES, Context, Timed
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_JOBS = 2000
+DEFAULT_REPEAT = 5
+DEFAULT_TOLERANCE = 1.25
+SCHEMA_VERSION = 1
+
+
+def _time_case(timed: Timed, repeat: int, warmup: int) -> list[float]:
+    samples: list[float] = []
+    for idx in range(warmup + repeat):
+        if timed.before is not None:
+            timed.before()
+        gc.collect()
+        start = time.perf_counter()
+        timed.run()
+        elapsed = time.perf_counter() - start
+        if idx >= warmup:
+            samples.append(elapsed)
+    return samples
+
+
+def _summarize(samples: list[float], items: int) -> dict[str, Any]:
+    ordered = sorted(samples)
+    median = statistics.median(ordered)
+    p95 = ordered[min(len(ordered) - 1, round(0.95 * (len(ordered) - 1)))]
+    return {
+        "runs": len(ordered),
+        "items": items,
+        "min_ms": round(ordered[0] * 1000, 3),
+        "median_ms": round(median * 1000, 3),
+        "p95_ms": round(p95 * 1000, 3),
+        "items_per_sec": round(items / median, 1) if median > 0 else None,
+    }
+
+
+def environment() -> dict[str, Any]:
+    import sqlite3
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "sqlite": sqlite3.sqlite_version,
+    }
+
+
+def run_benchmarks(
+    *,
+    only: list[str] | None = None,
+    jobs: int = DEFAULT_JOBS,
+    repeat: int = DEFAULT_REPEAT,
+    warmup: int = 1,
+    seed: int = 7,
+    workdir: str | Path | None = None,
+    quiet: bool = True,
+) -> dict[str, Any]:
+    """Run the selected cases (name-prefix match) and return the report dict."""
+    names = [n for n in CASES if not only or any(n.startswith(p) for p in only)]
+    report: dict[str, Any] = {
+        "schema": SCHEMA_VERSION,
+        "params": {"jobs": jobs, "repeat": repeat, "warmup": warmup, "seed": seed},
+        "environment": environment(),
+        "results": {},
+    }
+    with contextlib.ExitStack() as stack:
+        root = Path(workdir) if workdir else Path(stack.enter_context(tempfile.TemporaryDirectory(prefix="smartapply-bench-")))
+        if quiet:
+            # The hot paths print progress lines and log at INFO; keep the JSON clean.
+            stack.enter_context(contextlib.redirect_stdout(io.StringIO()))
+            logging.disable(logging.INFO)
+            stack.callback(logging.disable, logging.NOTSET)
+        ctx = Context(workdir=root, jobs=jobs, seed=seed)
+        for name in names:
+            timed = CASES[name](ctx)
+            try:
+                samples = _time_case(timed, timed.repeat or repeat, warmup)
+            except Exception as exc:  # noqa: BLE001 — one broken case never hides the rest
+                report["results"][name] = {"error": f"{type(exc).__name__}: {exc}"}
+                continue
+            finally:
+                if timed.cleanup is not None:
+                    timed.cleanup()
+            entry = _summarize(samples, timed.items)
+            if timed.notes:
+                entry["notes"] = timed.notes
+            report["results"][name] = entry
+    return report
+
+
+def compare(report: dict[str, Any], baseline: dict[str, Any], tolerance: float = DEFAULT_TOLERANCE) -> dict[str, Any]:
+    """Per-case median ratio vs the baseline; ``regressed`` lists cases slower
+    than ``tolerance``× (cases missing on either side are reported, not failed)."""
+    rows: dict[str, Any] = {}
+    regressed: list[str] = []
+    base_results = baseline.get("results") or {}
+    for name, current in (report.get("results") or {}).items():
+        base = base_results.get(name)
+        if not base or "median_ms" not in base or "median_ms" not in current:
+            rows[name] = {"status": "new" if not base else "error"}
+            continue
+        ratio = current["median_ms"] / base["median_ms"] if base["median_ms"] else float("inf")
+        status = "regressed" if ratio > tolerance else ("improved" if ratio < 1 / tolerance else "ok")
+        if status == "regressed":
+            regressed.append(name)
+        rows[name] = {
+            "baseline_ms": base["median_ms"],
+            "current_ms": current["median_ms"],
+            "ratio": round(ratio, 3),
+            "status": status,
+        }
+    if baseline.get("params") != report.get("params"):
+        rows["_warning"] = "baseline was recorded with different params; ratios are not comparable"
+    return {"tolerance": tolerance, "cases": rows, "regressed": regressed}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument("--only", action="append", help="case name prefix (repeatable)")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS, help="synthetic postings to generate")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument("--compare", action="store_true", help="compare against --baseline")
+    parser.add_argument("--save-baseline", action="store_true", help="write results to --baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--output", help="also write the JSON report here")
+    parser.add_argument("--list", action="store_true", help="list case names and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(CASES))
+        return 0
+
+    report = run_benchmarks(only=args.only, jobs=args.jobs, repeat=args.repeat,
+                            warmup=args.warmup, seed=args.seed)
+    exit_code = 0
+    if args.compare:
+        baseline_path = Path(args.baseline)
+        if not baseline_path.exists():
+            print(f"no baseline at {baseline_path}", file=sys.stderr)
+            return 2
+        report["comparison"] = compare(report, json.loads(baseline_path.read_text()), args.tolerance)
+        exit_code = 1 if report["comparison"]["regressed"] else 0
+
+    text = json.dumps(report, indent=2, sort_keys=True)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+    if args.save_baseline:
+        baseline = {k: v for k, v in report.items() if k != "comparison"}
+        Path(args.baseline).write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+    return exit_code
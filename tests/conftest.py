@@ -1,8 +1,14 @@
 """
 Shared pytest configuration for SmartApplyAI test suite.
 """
+import os
+
 import pytest
 
+# Tests stub LLM providers with canned replies; keep them out of (and away
+# from) the real LLM response cache. test_llm_cache.py opts back in explicitly.
+os.environ.setdefault("SMARTAPPLY_LLM_CACHE", "0")
+
 
 def pytest_addoption(parser):
     parser.addoption(
@@ -47,6 +47,8 @@ def client(monkeypatch):
     monkeypatch.setattr(main, "load_pdata", lambda pid: PROFILE)
     monkeypatch.setattr(main.knowledge_semantic, "search",
                         lambda pid, q, k=10, kind_filter=None: [])
+    monkeypatch.setattr(main.knowledge_semantic, "search_many",
+                        lambda pid, qs, k=10, kind_filter=None: [[] for _ in qs])
 
     FIVE_DIM_JSON = (
         '{"dimensions":{'
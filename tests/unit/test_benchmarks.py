@@ -0,0 +1,47 @@
+"""Smoke tests for the offline benchmark runner (benchmarks/).
+
+Tiny fixture sizes and one repetition — this checks wiring and the report
+shape, not speed.
+"""
+
+from __future__ import annotations
+
+import json
+
+from benchmarks import fixtures, runner
+
+
+def test_fixtures_are_deterministic():
+    a = fixtures.make_raw_jobs(25, seed=3)
+    b = fixtures.make_raw_jobs(25, seed=3)
+    assert json.dumps(a) == json.dumps(b)
+    assert fixtures.fake_embed(["x"]) == fixtures.fake_embed(["x"])
+    assert len(fixtures.fake_embed(["x"])[0]) == fixtures.EMBED_DIM
+
+
+def test_runner_reports_selected_cases(tmp_path):
+    report = runner.run_benchmarks(
+        only=["scraper.", "llm.clean_json", "matcher.prefilter_jobs"],
+        jobs=40, repeat=1, warmup=0, workdir=tmp_path,
+    )
+    results = report["results"]
+    assert set(results) == {
+        "scraper.normalize_job", "scraper.upsert_company_jobs.insert",
+        "scraper.upsert_company_jobs.unchanged", "llm.clean_json", "matcher.prefilter_jobs",
+    }
+    for name, entry in results.items():
+        assert "error" not in entry, (name, entry)
+        assert entry["median_ms"] >= 0 and entry["runs"] >= 1
+    assert results["scraper.normalize_job"]["items"] == 40
+    json.dumps(report)  # machine-readable end to end
+
+
+def test_compare_flags_regressions_beyond_tolerance():
+    params = {"jobs": 10}
+    baseline = {"params": params, "results": {"a": {"median_ms": 10.0}, "b": {"median_ms": 10.0}}}
+    report = {"params": params, "results": {
+        "a": {"median_ms": 13.0}, "b": {"median_ms": 5.0}, "c": {"median_ms": 1.0}}}
+    out = runner.compare(report, baseline, tolerance=1.25)
+    assert out["regressed"] == ["a"]
+    assert out["cases"]["b"]["status"] == "improved"
+    assert out["cases"]["c"]["status"] == "new"
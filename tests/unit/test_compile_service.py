@@ -0,0 +1,136 @@
+"""Tests for the isolated pdflatex compile pool (backend/compile_service.py).
+
+compile_loop.compile_with_retry / compile_pdf are faked — no TeX needed.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend"))
+
+import compile_loop  # noqa: E402
+import compile_service  # noqa: E402
+
+
+def _ok_result(work_dir: str) -> compile_loop.CompileResult:
+    result = compile_loop.CompileResult()
+    result.success = True
+    result.attempts = 1
+    result.pdf_path = os.path.join(work_dir, "tailored_resume.pdf")
+    result.pdf_bytes = b"%PDF-1.4 " + work_dir.encode()
+    return result
+
+
+@pytest.fixture
+def service():
+    svc = compile_service.CompileService(workers=3, max_queue=16, job_timeout=30)
+    yield svc
+    svc.shutdown()
+
+
+def test_jobs_run_in_parallel_in_isolated_dirs(monkeypatch, service):
+    state = {"active": 0, "peak": 0, "dirs": []}
+    lock = threading.Lock()
+
+    def fake_compile(tex, work_dir, **kw):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            state["dirs"].append(work_dir)
+        assert os.path.isdir(work_dir)
+        time.sleep(0.1)
+        with lock:
+            state["active"] -= 1
+        return _ok_result(work_dir)
+
+    monkeypatch.setattr(compile_loop, "compile_with_retry", fake_compile)
+    futures = [service.submit(f"tex {i}") for i in range(6)]
+    results = [f.result(timeout=10) for f in futures]
+
+    assert all(r.success and r.pdf_bytes for r in results)
+    assert state["peak"] == 3                      # bounded by the worker count
+    assert len(set(state["dirs"])) == 6           # one work dir per job
+    assert not any(os.path.exists(d) for d in state["dirs"])  # cleaned up
+    stats = service.stats()
+    assert stats["completed"] == 6 and stats["queue_depth"] == 0 and stats["running"] == 0
+
+
+def test_queue_limit_rejects_and_counts(monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(compile_loop, "compile_with_retry",
+                        lambda tex, work_dir, **kw: release.wait(10) and _ok_result(work_dir))
+    svc = compile_service.CompileService(workers=1, max_queue=1)
+    try:
+        running = svc.submit("a")
+        deadline = time.monotonic() + 5
+        while svc.stats()["running"] != 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        waiting = svc.submit("b")
+        assert svc.stats()["queue_depth"] == 1
+        with pytest.raises(compile_service.CompileQueueFull):
+            svc.submit("c")
+        assert svc.stats()["rejected"] == 1
+        release.set()
+        assert running.result(timeout=10).success and waiting.result(timeout=10).success
+    finally:
+        release.set()
+        svc.shutdown()
+
+
+def test_publish_to_writes_stable_copy(monkeypatch, service, tmp_path):
+    monkeypatch.setattr(compile_loop, "compile_with_retry",
+                        lambda tex, work_dir, **kw: _ok_result(work_dir))
+    dest = tmp_path / "tailored_resume.pdf"
+    result = service.submit("tex", publish_to=str(dest)).result(timeout=10)
+    assert result.pdf_path == str(dest)
+    assert dest.read_bytes() == result.pdf_bytes
+    assert [p.name for p in tmp_path.iterdir()] == ["tailored_resume.pdf"]
+
+
+def test_job_timeout_stops_retry_loop(monkeypatch, tmp_path):
+    calls = []
+
+    def failing_compile(tex, work_dir, name="tailored_resume", timeout=120):
+        calls.append(timeout)
+        time.sleep(0.05)
+        result = compile_loop.CompileResult()
+        result.errors = [{"type": "unbalanced_brace", "line": None, "message": "Missing }"}]
+        return result
+
+    # Each "repair" changes the tex, so only the deadline can end the loop.
+    monkeypatch.setattr(compile_loop, "compile_pdf", failing_compile)
+    monkeypatch.setitem(compile_loop.REPAIR_HANDLERS, "unbalanced_brace",
+                        lambda tex, err: (tex + "}", "added brace"))
+    result = compile_loop.compile_with_retry("x", str(tmp_path), max_attempts=50, timeout_s=0.2)
+    assert not result.success
+    assert any(e["type"] == "timeout" for e in result.errors)
+    assert 1 <= len(calls) < 50
+    assert all(t <= 0.2 for t in calls)
+
+
+def test_deadline_after_over_page_compile_accepts_it(monkeypatch, tmp_path):
+    calls = []
+
+    def two_page_compile(tex, work_dir, name="tailored_resume", timeout=120):
+        calls.append(tex)
+        time.sleep(0.1)  # the whole budget
+        result = _ok_result(work_dir)
+        result.page_count = 2
+        return result
+
+    monkeypatch.setattr(compile_loop, "compile_pdf", two_page_compile)
+    monkeypatch.setattr(compile_loop, "_trim_to_fit_one_page", lambda tex: (tex + "%", "trimmed"))
+    monkeypatch.setattr(compile_loop, "validate_ats_extractability",
+                        lambda pdf, expected: {"overall_ok": True, "extracted_text_len": 10})
+    monkeypatch.setattr(compile_loop, "pdftotext", lambda pdf: "text")
+    result = compile_loop.compile_with_retry("x", str(tmp_path), timeout_s=0.05, ats_expected={"name": "A"})
+    assert len(calls) == 1
+    assert result.success and not result.errors
+    assert any("could not trim further" in w for w in result.warnings)
+    assert result.ats_validation["overall_ok"] and result.extracted_text == "text"
@@ -121,6 +121,29 @@ def test_legacy_call_without_new_kwargs_does_not_crash():
     assert out["status"] == "rejected"
 
 
+def test_ground_edits_batches_queries_and_pops_origin():
+    batches: list[list[str]] = []
+
+    def search_many(pid, queries, k):
+        batches.append(list(queries))
+        return [[{"evidence_ref": "project:2", "score": 0.72,
+                  "text": "Deployed services on Kubernetes clusters"}] for _ in queries]
+
+    rewrite = dict(_edit("Built LLM workflows for enterprise clients using Python and RAG.",
+                         "Designed production RAG workflows in Python for enterprise clients."),
+                   _origin_ref="experience_bullet:0:0")
+    claim = _edit("Built LLM workflows.", "Built LLM workflows and operated Kubernetes deployments.")
+    out = tailor_edits.ground_edits(
+        [rewrite, claim], pid="default", jd_text=JD, knowledge_search=_no_hits,
+        knowledge_search_many=search_many, profile_terms=PROFILE_TERMS)
+
+    assert len(batches) == 1 and len(batches[0]) == 1  # only the new claim is searched
+    assert [o["stretch_level"] for o in out] == ["grounded", "stretch"]
+    assert out[0]["evidence_ref"] == "experience_bullet:0:0"
+    assert out[1]["evidence_ref"] == "project:2"
+    assert "_origin_ref" in rewrite  # caller's dicts are not mutated
+
+
 def test_ungrounded_terms_survive_validation():
     out = _ground(_edit(
         "Built LLM workflows.",
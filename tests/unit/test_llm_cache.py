@@ -0,0 +1,175 @@
+"""Tests for the LLM response cache + single-flight in llm_provider.call_llm.
+
+Providers are stubbed via llm_provider._dispatch_provider; the cache lives in
+tmp_path.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend"))
+
+import llm_cache  # noqa: E402
+import llm_provider  # noqa: E402
+
+MSG = [{"role": "user", "content": "Extract skills from this JD"}]
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("SMARTAPPLY_LLM_CACHE", "1")
+    c = llm_cache.LLMResponseCache(str(tmp_path / "llm_cache.db"))
+    monkeypatch.setattr(llm_provider, "_response_cache", c)
+    return c
+
+
+@pytest.fixture
+def dispatch(monkeypatch):
+    calls: list[tuple[str, float]] = []
+
+    def fake(provider, messages, temperature, system, timeout, model):
+        calls.append((provider, temperature))
+        return f"{provider}:{len(calls)}"
+
+    monkeypatch.setattr(llm_provider, "_dispatch_provider", fake)
+    return calls
+
+
+def test_second_identical_call_is_served_from_cache(cache, dispatch):
+    first = llm_provider.call_llm(MSG, temperature=0.1, cache=True)
+    second = llm_provider.call_llm(MSG, temperature=0.1, cache=True)
+    assert first == second == "ollama:1"
+    assert len(dispatch) == 1
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1 and stats["hit_rate"] == 0.5
+
+
+def test_key_includes_temperature_system_and_model(cache, dispatch):
+    llm_provider.call_llm(MSG, temperature=0.1, cache=True)
+    llm_provider.call_llm(MSG, temperature=0.2, cache=True)
+    llm_provider.call_llm(MSG, temperature=0.1, system="be terse", cache=True)
+    llm_provider.call_llm(MSG, temperature=0.1, prefer="ollama/llama3.2:3b", cache=True)
+    assert len(dispatch) == 4
+
+
+def test_cache_off_by_default_and_env_off_bypass(cache, dispatch, monkeypatch):
+    llm_provider.call_llm(MSG)
+    llm_provider.call_llm(MSG, temperature=0.5)
+    monkeypatch.setenv("SMARTAPPLY_LLM_CACHE", "0")
+    llm_provider.call_llm(MSG, cache=True)
+    assert len(dispatch) == 3
+    assert cache.stats()["stores"] == 0
+
+
+def test_reply_failing_validation_is_not_stored(cache, monkeypatch):
+    replies = iter(['{"skills": ["py', '```json\n{"skills": ["python"]}\n```'])
+    monkeypatch.setattr(llm_provider, "_dispatch_provider", lambda *a: next(replies))
+    ask = lambda: llm_provider.call_llm(MSG, cache=True, validate=llm_provider.json_reply_ok)  # noqa: E731
+    assert ask() == '{"skills": ["py'                 # truncated: returned, not pinned
+    assert ask().startswith("```json")                # the retry reaches the model
+    assert ask().startswith("```json")                # ...and its valid reply is cached
+    assert cache.stats()["stores"] == 1
+
+
+def test_scoring_json_prompts_opt_in(cache, dispatch, monkeypatch):
+    import scoring
+
+    monkeypatch.setattr(llm_provider, "_dispatch_provider",
+                        lambda *a: dispatch.append(a[0]) or '{"role": "ML Intern"}')
+    for _ in range(2):
+        scoring.extract_jd_requirements("We need Python.", llm="ollama")
+    assert dispatch == ["ollama"]
+
+
+def test_fallback_answer_is_not_cached(cache, monkeypatch):
+    calls = []
+
+    def flaky(provider, *a):
+        calls.append(provider)
+        if provider == "ollama":
+            raise RuntimeError("down")
+        return "from-claude"
+
+    monkeypatch.setattr(llm_provider, "_dispatch_provider", flaky)
+    assert llm_provider.call_llm(MSG, cache=True) == "from-claude"
+    assert llm_provider.call_llm(MSG, cache=True) == "from-claude"
+    assert calls == ["ollama", "claude", "ollama", "claude"]
+
+
+def test_concurrent_identical_calls_coalesce(cache, monkeypatch):
+    calls = []
+    gate = threading.Event()
+
+    def slow(provider, *a):
+        calls.append(provider)
+        gate.wait(5)
+        return "answer"
+
+    monkeypatch.setattr(llm_provider, "_dispatch_provider", slow)
+    results: list[str] = []
+    threads = [threading.Thread(target=lambda: results.append(llm_provider.call_llm(MSG, cache=True)))
+               for _ in range(5)]
+    for t in threads:
+        t.start()
+    deadline = time.monotonic() + 5
+    while cache.stats()["coalesced"] < 4 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    gate.set()
+    for t in threads:
+        t.join()
+    assert results == ["answer"] * 5
+    assert calls == ["ollama"]
+    assert cache.stats()["coalesced"] == 4
+
+
+def test_leader_error_propagates_to_followers(cache, monkeypatch):
+    gate = threading.Event()
+
+    def boom(provider, *a):
+        gate.wait(5)
+        raise RuntimeError("down")
+
+    monkeypatch.setattr(llm_provider, "_dispatch_provider", boom)
+    errors: list[BaseException] = []
+
+    def ask():
+        try:
+            llm_provider.call_llm(MSG, cache=True)
+        except RuntimeError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=ask) for _ in range(3)]
+    for t in threads:
+        t.start()
+    deadline = time.monotonic() + 5
+    while cache.stats()["coalesced"] < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    gate.set()
+    for t in threads:
+        t.join()
+    assert len(errors) == 3
+    assert cache.stats()["stores"] == 0
+
+
+def test_ttl_expiry_and_row_cap(tmp_path, monkeypatch):
+    c = llm_cache.LLMResponseCache(str(tmp_path / "c.db"), ttl_seconds=60, max_rows=3)
+    key = ("ollama", "m", "h", "f")
+    c.put(key, "old")
+    assert c.get(key) == "old"
+    later = time.time() + 120
+    monkeypatch.setattr(llm_cache._time, "time", lambda: later)
+    assert c.get(key) is None                      # expired
+    monkeypatch.undo()
+
+    monkeypatch.setattr(llm_cache, "_PRUNE_EVERY", 1)
+    for i in range(6):
+        c.put(("ollama", "m", f"h{i}", "f"), str(i))
+    with llm_cache.sqlite_pool.connection(c.db_path, llm_cache._SCHEMA) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] == 3
+    assert c.get(("ollama", "m", "h5", "f")) == "5"   # most recent survive
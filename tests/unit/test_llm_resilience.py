@@ -46,6 +46,7 @@ def _mock_analyze_pipeline(monkeypatch):
     monkeypatch.setattr(scoring, "call_llm", lambda *a, **kw: _extraction_json())
     monkeypatch.setattr(main, "call_llm", lambda *a, **kw: _summary_json())
     monkeypatch.setattr(main.knowledge_semantic, "search", lambda *a, **kw: [])
+    monkeypatch.setattr(main.knowledge_semantic, "search_many", lambda pid, qs, *a, **kw: [[] for _ in qs])
 
 
 # ── call_llm unit tests ───────────────────────────────────────────────────────
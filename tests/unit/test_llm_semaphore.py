@@ -1,6 +1,6 @@
 """Concurrency tests for the narrowed lock architecture: _run_llm caps
-in-flight LLM calls at LLM_CONCURRENCY; processing_lock still serializes the
-PDF compile path. No live providers.
+in-flight LLM calls at LLM_CONCURRENCY; PDF compiles run on their own pool
+and never block LLM endpoints. No live providers.
 """
 
 from __future__ import annotations
@@ -43,26 +43,34 @@ def test_run_llm_caps_concurrency(monkeypatch):
     assert state["max_in_flight"] >= 2  # calls genuinely overlapped
 
 
-def test_llm_endpoints_do_not_hold_processing_lock(monkeypatch):
-    """/suggest-questions must proceed even while the PDF lock is held —
-    the compile lock no longer serializes LLM endpoints."""
+def test_llm_endpoints_not_blocked_by_busy_compile_pool(monkeypatch):
+    """/suggest-questions must proceed while every PDF compile worker is busy —
+    compiles no longer share a lock with LLM endpoints."""
     from fastapi.testclient import TestClient
 
+    import compile_service
+
+    release = threading.Event()
+    service = compile_service.CompileService(workers=1, max_queue=4)
+    monkeypatch.setattr(compile_service, "_service", service)
+    monkeypatch.setattr(main.compile_loop, "compile_with_retry",
+                        lambda *a, **kw: release.wait(10) and main.compile_loop.CompileResult())
     monkeypatch.setattr(main, "call_llm",
                         lambda *a, **kw: '["Q1", "Q2", "Q3"]')
     client = TestClient(main.app)
 
-    async def _hold_lock_and_call():
-        async with main.processing_lock:
-            return await asyncio.wait_for(
-                asyncio.to_thread(
-                    client.post, "/suggest-questions",
-                    json={"jd_text": "Python role", "llm": "ollama"},
-                    headers={"X-Profile-ID": "default"},
-                ),
-                timeout=5.0,  # would deadlock/timeout if the endpoint took the lock
-            )
-
-    r = asyncio.run(_hold_lock_and_call())
+    busy = service.submit("\\documentclass{article}")
+    try:
+        t0 = time.monotonic()
+        r = client.post(
+            "/suggest-questions",
+            json={"jd_text": "Python role", "llm": "ollama"},
+            headers={"X-Profile-ID": "default"},
+        )
+        assert time.monotonic() - t0 < 5.0
+    finally:
+        release.set()
+        busy.result(timeout=10)
+        service.shutdown()
     assert r.status_code == 200
     assert r.json() == ["Q1", "Q2", "Q3"]
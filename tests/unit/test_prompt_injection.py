@@ -64,7 +64,8 @@ class PromptRecorder:
         self.prompts: list[str] = []
         self.prefer_calls: list[str] = []
 
-    def __call__(self, messages, temperature=0.3, system="", prefer="ollama", timeout=600, model=None):
+    def __call__(self, messages, temperature=0.3, system="", prefer="ollama", timeout=600, model=None,
+                 cache=False, validate=None):
         prompt = messages[-1]["content"] if messages else ""
         self.prompts.append(prompt)
         self.prefer_calls.append(prefer)
@@ -150,6 +151,8 @@ def recorder(monkeypatch):
     monkeypatch.setattr(main.constraints_engine, "validate_tailored_resume", _ok_validation)
     monkeypatch.setattr(main.constraints_engine, "humanize_tailored_output", lambda x: x)
     monkeypatch.setattr(main.knowledge_semantic, "search", _no_evidence_search)
+    monkeypatch.setattr(main.knowledge_semantic, "search_many",
+                        lambda pid, qs, k=10, kind_filter=None: [[] for _ in qs])
     return rec
 
 
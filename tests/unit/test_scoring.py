@@ -47,6 +47,31 @@ def test_lexical_match_is_met():
     assert j["verdict"] == "met" and j["basis"] == "lexical"
 
 
+def test_judge_requirements_batches_evidence_lookups():
+    batches: list[list[str]] = []
+
+    def search_many(pid, queries, k):
+        batches.append(list(queries))
+        return [[{"evidence_ref": "project:1", "text": q, "score": 0.82}] for q in queries]
+
+    def search_single(pid, query, k):
+        raise AssertionError("per-requirement search should not run")
+
+    js = scoring.judge_requirements("default", ["retrieval xyz", "ranking abc", " "], PROFILE,
+                                    search_single, knowledge_search_many=search_many)
+    assert batches == [["retrieval xyz", "ranking abc"]]
+    assert [j["verdict"] for j in js] == ["met", "met", "gap"]
+
+
+def test_judge_requirements_falls_back_when_batch_fails():
+    def search_many(pid, queries, k):
+        raise RuntimeError("knowledge service down")
+
+    j = scoring.judge_requirements("default", ["retrieval xyz"], PROFILE, _search_hit(0.60),
+                                   knowledge_search_many=search_many)[0]
+    assert j["verdict"] == "equivalent"
+
+
 def test_semantic_high_score_is_met():
     j = scoring.judge_requirement("default", "retrieval systems xyz", "", _search_hit(0.82))
     assert j["verdict"] == "met" and j["basis"] == "semantic"
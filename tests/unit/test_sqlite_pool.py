@@ -0,0 +1,121 @@
+"""Tests for the shared pooled SQLite access layer (backend/sqlite_pool.py).
+
+tmp_path databases only.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend"))
+
+import sqlite_pool  # noqa: E402
+
+
+@pytest.fixture
+def counting_schema():
+    calls = {"migrate": 0, "on_connect": 0}
+
+    def migrate(conn):
+        calls["migrate"] += 1
+        conn.execute("CREATE TABLE IF NOT EXISTS t (id INTEGER PRIMARY KEY, v TEXT)")
+
+    def on_connect(conn):
+        calls["on_connect"] += 1
+
+    yield sqlite_pool.Schema("t", 1, migrate, on_connect=on_connect), calls
+    sqlite_pool.close_all()
+
+
+def test_connections_are_reused_and_wal(tmp_path, counting_schema):
+    schema, calls = counting_schema
+    db = tmp_path / "a.db"
+    with sqlite_pool.connection(db, schema) as first:
+        mode = first.execute("PRAGMA journal_mode").fetchone()[0]
+    with sqlite_pool.connection(db, schema) as second:
+        pass
+    assert mode == "wal"
+    assert first is second
+    assert calls == {"migrate": 1, "on_connect": 1}
+
+
+def test_migration_stamps_user_version_and_is_skipped_after(tmp_path, counting_schema):
+    schema, calls = counting_schema
+    db = tmp_path / "b.db"
+    with sqlite_pool.connection(db, schema):
+        pass
+    sqlite_pool.close_all()  # fresh physical connection, fresh memo
+    with sqlite_pool.connection(db, schema) as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == 1
+    assert calls["migrate"] == 1          # stamp was current — DDL not re-run
+
+    bumped = sqlite_pool.Schema("t", 2, schema.migrate)
+    sqlite_pool.close_all()
+    with sqlite_pool.connection(db, bumped) as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == 2
+    assert calls["migrate"] == 2
+
+
+def test_nested_checkout_gets_separate_connection(tmp_path, counting_schema):
+    schema, _ = counting_schema
+    db = tmp_path / "c.db"
+    with sqlite_pool.connection(db, schema) as outer:
+        with sqlite_pool.connection(db, schema) as inner:
+            assert inner is not outer
+
+
+def test_error_rolls_back(tmp_path, counting_schema):
+    schema, _ = counting_schema
+    db = tmp_path / "d.db"
+    with pytest.raises(RuntimeError):
+        with sqlite_pool.connection(db, schema) as conn:
+            conn.execute("INSERT INTO t (v) VALUES ('x')")
+            raise RuntimeError("boom")
+    with sqlite_pool.connection(db, schema) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+
+
+def test_threads_use_their_own_connections(tmp_path, counting_schema):
+    schema, _ = counting_schema
+    db = tmp_path / "e.db"
+    with sqlite_pool.connection(db, schema) as main_conn:
+        main_id = id(main_conn)
+    seen: list[int] = []
+    errors: list[BaseException] = []
+
+    def worker():
+        try:
+            with sqlite_pool.connection(db, schema) as conn:
+                conn.execute("INSERT INTO t (v) VALUES ('w')")
+                seen.append(id(conn))
+        except BaseException as exc:  # noqa: BLE001
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    assert main_id not in seen
+    with sqlite_pool.connection(db, schema) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 4
+
+
+def test_ensure_once_runs_once_per_pooled_connection(tmp_path, counting_schema):
+    schema, _ = counting_schema
+    db = tmp_path / "f.db"
+    ran = []
+    for _ in range(3):
+        with sqlite_pool.connection(db, schema) as conn:
+            sqlite_pool.ensure_once(conn, "extra", lambda c: ran.append(1))
+    assert ran == [1]
+    plain = sqlite3.connect(str(db))
+    sqlite_pool.ensure_once(plain, "extra", lambda c: ran.append(2))
+    plain.close()
+    assert ran == [1, 2]                  # plain connections are never memoized
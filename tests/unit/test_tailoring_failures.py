@@ -225,6 +225,8 @@ def tailor_mocks(monkeypatch):
         return SimpleNamespace(ok=True, violations=[], fatal_violations=[])
 
     monkeypatch.setattr(main.knowledge_semantic, "search", _no_evidence)
+    monkeypatch.setattr(main.knowledge_semantic, "search_many",
+                        lambda pid, qs, k=10, kind_filter=None: [[] for _ in qs])
     monkeypatch.setattr(main.constraints_engine, "validate_tailored_resume", _ok_validation)
     monkeypatch.setattr(main.constraints_engine, "humanize_tailored_output", lambda x: x)
 
@@ -440,6 +442,7 @@ def analyze_recorder(monkeypatch):
     monkeypatch.setattr(scoring, "call_llm", _extraction)
     monkeypatch.setattr(main, "call_llm", _summary)
     monkeypatch.setattr(main.knowledge_semantic, "search", lambda *a, **kw: [])
+    monkeypatch.setattr(main.knowledge_semantic, "search_many", lambda pid, qs, *a, **kw: [[] for _ in qs])
     return rec
 
 